@@ -2,17 +2,20 @@
 Attribute validation agent: LLM-backed consistency, typos, outliers (issue #73).
 
 Uses services.attribute_extractor for sampled attribute data and services.llm_service
-for inconsistency detection. Appends attribute issues into state["issues"] using
-GeometryIssue-compatible structure (type=attribute_*, description=field + suggestion).
+for inconsistency detection. Returns attribute issues for state["issues"] (the
+merge_issues reducer adds them to the other nodes' issues) using GeometryIssue-compatible
+structure (type=attribute_*, description=field + suggestion).
+
+Before the LLM, the full columns are profiled (attribute_extractor.profile_attributes):
+missing values, outliers, type mismatches and spelling variants are reported directly, and
+only the free-text fields are sampled for the LLM. No free-text field means no LLM call.
 """
 from typing import Any, Dict, List, Optional
 
-import geopandas as gpd
-
 from api.models import GeometryIssue
-from agents.state import ValidationState
+from agents.state import ValidationState, get_dataset
 from core.config import settings
-from services.attribute_extractor import get_attribute_columns, get_attribute_records
+from services.attribute_extractor import AttributeProfile, profile_attributes, sample_attributes
 from services.llm_service import (
     AttributeIssue as LLMAttributeIssue,
     SupportsInvoke,
@@ -45,14 +48,18 @@ def run(
     *,
     sample_size: Optional[int] = None,
     llm: Optional[SupportsInvoke] = None,
+    profile: Optional[AttributeProfile] = None,
 ) -> dict:
     """
     Run attribute validation on the dataset in state (issue #73).
 
-    - Loads the dataset from state["dataset_path"] and extracts attribute samples
-      (no geometry) via services.attribute_extractor.
-    - Calls the LLM service for inconsistency detection.
-    - Converts results to GeometryIssue-like entries and appends them to state["issues"].
+    - Uses the shared dataset from state["dataset"] (loaded once per run; falls back to
+      state["dataset_path"]) and extracts attribute samples (no geometry) via
+      services.attribute_extractor.
+    - Profiles every attribute column over all rows and reports missing values, outliers,
+      type mismatches and spelling variants without the LLM (settings.ATTRIBUTE_PROFILING_ENABLED).
+    - Calls the LLM service for inconsistency detection on the remaining free-text fields.
+    - Converts results to GeometryIssue-like entries; the state["issues"] reducer appends them.
 
     Deterministic: uses fixed random_state when sampling. Side-effect free apart from
     the returned state update (no global state mutation).
@@ -61,39 +68,42 @@ def run(
         state: Current validation state (dataset_path, issues, ...).
         sample_size: Max rows to sample; default from settings.ATTRIBUTE_SAMPLE_SIZE.
         llm: Optional LLM instance for testing; if None, default client is used.
+        profile: Profile of the whole layer computed elsewhere (streaming validation, where
+            state["dataset"] holds only a sample); if None, the dataset is profiled here.
 
     Returns:
-        Partial state update: {"issues": existing_issues + new_attribute_issues}.
+        Partial state update: {"issues": new_attribute_issues} (only this node's issues).
     """
-    existing = list(state.get("issues") or [])
-    path = state.get("dataset_path")
-    if not path:
-        return {"issues": existing}
-
-    try:
-        gdf = gpd.read_file(path)
-    except Exception:
-        return {"issues": existing}
-
-    if gdf is None or gdf.empty:
-        return {"issues": existing}
+    # Attributes only: with a working copy the geometry column is not read at all.
+    gdf = get_dataset(state, geometry=False)
+    if gdf is None or len(gdf.index) == 0:
+        return {"issues": []}
 
     n = sample_size if sample_size is not None else settings.ATTRIBUTE_SAMPLE_SIZE
     max_fields = getattr(settings, "ATTRIBUTE_MAX_FIELDS", None)
-    records = get_attribute_records(
-        gdf, sample_size=n, random_state=_ATTRIBUTE_SAMPLE_RANDOM_STATE, max_fields=max_fields
-    )
-    per_field = get_attribute_columns(
+    new_issues: List[GeometryIssue] = []
+    if settings.ATTRIBUTE_PROFILING_ENABLED:
+        if profile is None:
+            profile = profile_attributes(gdf, max_fields=max_fields)
+        new_issues = [_attribute_issue_to_geometry_issue(attr) for attr in profile.issues]
+        if not profile.ambiguous_fields:
+            return {"issues": new_issues}
+        # The LLM only sees the free-text fields ("id" is kept for feature ids).
+        ambiguous = set(profile.ambiguous_fields)
+        gdf = gdf[[c for c in gdf.columns if c == "id" or c in ambiguous]]
+        max_fields = None
+
+    records, per_field = sample_attributes(
         gdf, sample_size=n, random_state=_ATTRIBUTE_SAMPLE_RANDOM_STATE, max_fields=max_fields
     )
 
     if not records and not per_field:
-        return {"issues": existing}
+        return {"issues": new_issues}
 
     raw_issues: List[LLMAttributeIssue] = validate_attributes_with_llm(
         records,
         per_field_values=per_field,
         llm=llm,
     )
-    new_issues = [_attribute_issue_to_geometry_issue(attr) for attr in raw_issues]
-    return {"issues": existing + new_issues}
+    new_issues += [_attribute_issue_to_geometry_issue(attr) for attr in raw_issues]
+    return {"issues": new_issues}
@@ -4,16 +4,30 @@ LangGraph orchestration for the validation pipeline.
 Coordinates geometry, attribute, and topology agents with shared ValidationState.
 StateGraph with nodes and edges (issue #61); conditional routing by severity (issue #62).
 
+Fan-out / join: the three validation nodes are independent, so the graph starts all of
+them in parallel from START and joins them before generate_recommendations. Each node
+returns only its own issues; the merge_issues reducer on state["issues"] appends them in a
+fixed geometry -> attribute -> topology order, so the result does not depend on which node
+finishes first. End-to-end latency is roughly that of the slowest node (usually the LLM call).
+
 Attribute Agent (issue #72, #73): The attribute_validation node is the LLM-backed
-implementation (agents.attribute_agent.run). It appends attribute issues to state["issues"]
-with the same GeometryIssue shape (type=attribute_*, severity, etc.).
+implementation (agents.attribute_agent.run). It profiles every column, sends only free-text
+fields to the LLM, and returns its attribute issues in the GeometryIssue shape
+(type=attribute_*, severity, etc.) as {"issues": [...]}; merge_issues places them after the
+geometry issues.
+
+Shared dataset: empty_state puts a services.dataset_loader.DatasetHandle in state["dataset"].
+The file is parsed on first access and every node reuses the same GeoDataFrame, so a run
+reads the dataset once instead of once per agent. When the dataset has a GeoParquet working
+copy (services.working_copy) each node reads only its columns from it instead.
 
 Topology Agent (issue #81, #82): The topology_validation node uses the real implementation
-(agents.topology_agent.run), not a stub. It loads the dataset from state["dataset_path"],
-runs core.topology.validate_topology, and appends topology issues as GeometryIssue
-(type=topology_gap, topology_overlap, topology_dangle, etc.).
+(agents.topology_agent.run), not a stub. It uses the shared dataset from state["dataset"],
+runs core.topology.validate_topology (or the tiled engine for large layers), and returns
+topology issues as GeometryIssue (type=topology_gap, topology_overlap, topology_dangle,
+etc.), which merge_issues places last.
 
-All issues—geometry, attribute, and topology—are accumulated in state["issues"] and
+All issues—geometry, attribute, and topology—are merged into state["issues"] and
 considered by _route_by_severity for conditional routing (e.g. any critical topology
 issue routes to apply_corrections).
 
@@ -32,12 +46,12 @@ Routing logic (after generate_recommendations):
 from typing import Any, Literal
 
 from api.models import GeometryIssue
-from langgraph.graph import END, StateGraph
+from langgraph.graph import END, START, StateGraph
 
 from agents.attribute_agent import run as attribute_validation
-from agents.geometry_agent import validate as run_geometry_validation
+from agents.geometry_agent import validate_geodataframe as run_geometry_validation
 from agents.recommendation_agent import run as generate_recommendations
-from agents.state import ValidationState, empty_state
+from agents.state import ValidationState, empty_state, get_dataset
 from agents.topology_agent import run as topology_validation
 
 
@@ -53,14 +67,12 @@ def _dict_to_geometry_issue(d: dict) -> GeometryIssue:
 
 
 def _geometry_validation_node(state: ValidationState) -> dict[str, Any]:
-    """Node: run geometry validation and append issues to state."""
-    path = state.get("dataset_path")
-    existing = list(state.get("issues") or [])
-    if not path:
-        return {"issues": existing}
-    raw = run_geometry_validation(path)
-    new_issues = [_dict_to_geometry_issue(d) for d in raw]
-    return {"issues": existing + new_issues}
+    """Node: run geometry validation and return its issues (merged by the issues reducer)."""
+    gdf = get_dataset(state, columns=["id"])
+    if gdf is None:
+        return {"issues": []}
+    raw = run_geometry_validation(gdf)
+    return {"issues": [_dict_to_geometry_issue(d) for d in raw]}
 
 
 def _apply_corrections_node(state: ValidationState) -> dict[str, Any]:
@@ -87,7 +99,12 @@ def _route_by_severity(state: ValidationState) -> Literal["critical", "review"]:
 
 
 def _build_graph() -> Any:
-    """Build and compile the validation StateGraph with conditional routing by severity."""
+    """
+    Build and compile the validation StateGraph.
+
+    geometry, attribute and topology validation fan out from START and run in the same
+    superstep; generate_recommendations waits for all three, then routes by severity.
+    """
     workflow_builder = StateGraph(ValidationState)
 
     workflow_builder.add_node("geometry_validation", _geometry_validation_node)
@@ -96,10 +113,10 @@ def _build_graph() -> Any:
     workflow_builder.add_node("generate_recommendations", generate_recommendations)  # real impl: agents.recommendation_agent.run
     workflow_builder.add_node("apply_corrections", _apply_corrections_node)
 
-    workflow_builder.set_entry_point("geometry_validation")
-    workflow_builder.add_edge("geometry_validation", "attribute_validation")
-    workflow_builder.add_edge("attribute_validation", "topology_validation")
-    workflow_builder.add_edge("topology_validation", "generate_recommendations")
+    validation_nodes = ["geometry_validation", "attribute_validation", "topology_validation"]
+    for node in validation_nodes:
+        workflow_builder.add_edge(START, node)
+    workflow_builder.add_edge(validation_nodes, "generate_recommendations")
 
     # Conditional routing: critical issues -> apply_corrections; else -> END (review)
     workflow_builder.add_conditional_edges(
@@ -4,13 +4,26 @@ Recommendation agent: generate correction suggestions from issues (issue #87, #9
 Consumes state["issues"] (geometry, attribute, topology), produces one CorrectionSuggestion
 per issue (method, confidence, explanation, issue_index). Uses GPT-4 when an LLM is
 provided; otherwise uses rule-based fallbacks. Output is compatible with apply-corrections API.
+
+LLM requests are batched (services.llm_service.chunk_recommendation_issues) so each answer
+fits OPENAI_MAX_TOKENS; batches run concurrently (RECOMMENDATION_MAX_CONCURRENCY) and are
+stitched back by issue_index. A batch that fails or comes back short falls back to rules
+for its own issues only.
+
+Issues are first grouped by signature (type, severity, description with numbers templated),
+so thousands of "Overlap with feature N" issues cost one suggestion, which is then fanned
+out to every issue_index in the group. Rule-based suggestions are computed once per group too.
 """
-from typing import Any, Dict, List, Optional
+import re
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List, Optional, Tuple
 
 from api.models import CorrectionSuggestion
 from agents.state import ValidationState
+from core.config import settings
 from services.llm_service import (
     SupportsInvoke,
+    chunk_recommendation_issues,
     get_recommendation_suggestions_from_llm,
 )
 
@@ -30,6 +43,36 @@ def _issue_to_dict(issue: Any) -> Dict[str, Any]:
     }
 
 
+# Feature ids, coordinates and measures in descriptions ("Overlap with feature 12",
+# "Self-intersection[3.5 7.25]"); replaced by a placeholder when grouping issues.
+_NUMBER_RE = re.compile(r"\d+(?:\.\d+)?(?:[eE][-+]?\d+)?")
+
+IssueSignature = Tuple[str, str, str]
+
+
+def _issue_signature(d: Dict[str, Any]) -> IssueSignature:
+    """
+    Grouping key for an issue dict: (type, severity, templated description).
+
+    Attribute issue descriptions carry the suggested value itself (e.g. "Field 'lanes': use 2"),
+    so they are kept verbatim; for other types numbers are replaced with "<n>".
+    """
+    itype = str(d.get("type") or "")
+    severity = str(d.get("severity") or "")
+    description = str(d.get("description") or "")
+    if not itype.lower().startswith("attribute_"):
+        description = _NUMBER_RE.sub("<n>", description)
+    return itype, severity, description
+
+
+def _group_issues(issue_dicts: List[Dict[str, Any]]) -> List[Tuple[IssueSignature, List[int]]]:
+    """Group issue indices by signature, in order of first occurrence."""
+    groups: Dict[IssueSignature, List[int]] = {}
+    for i, d in enumerate(issue_dicts):
+        groups.setdefault(_issue_signature(d), []).append(i)
+    return list(groups.items())
+
+
 def _rule_based_suggestion(issue: Any) -> Dict[str, Any]:
     """
     Return a default method, confidence, and explanation for known issue types.
@@ -83,6 +126,42 @@ def _rule_based_suggestion(issue: Any) -> Dict[str, Any]:
     }
 
 
+def _llm_suggestions(
+    issue_dicts: List[Dict[str, Any]],
+    llm: SupportsInvoke,
+) -> List[Optional[Dict[str, Any]]]:
+    """
+    Request LLM suggestions in token-budgeted batches, concurrently.
+
+    Returns one entry per issue: the LLM suggestion, or None where its batch failed or
+    returned fewer suggestions than issues (the caller uses rules for those).
+    """
+    batches = chunk_recommendation_issues(issue_dicts)
+
+    def request(batch: List[int]) -> List[Dict[str, Any]]:
+        try:
+            return get_recommendation_suggestions_from_llm(
+                [issue_dicts[i] for i in batch], llm=llm, pad_missing=False
+            )
+        except Exception:
+            return []
+
+    workers = max(1, min(settings.RECOMMENDATION_MAX_CONCURRENCY, len(batches)))
+    if workers == 1:
+        responses = [request(batch) for batch in batches]
+    else:
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="recommendation") as pool:
+            responses = list(pool.map(request, batches))
+
+    suggestions: List[Optional[Dict[str, Any]]] = [None] * len(issue_dicts)
+    for batch, raw in zip(batches, responses):
+        if len(raw) < len(batch):
+            continue
+        for issue_index, suggestion in zip(batch, raw):
+            suggestions[issue_index] = suggestion
+    return suggestions
+
+
 def run(
     state: ValidationState,
     *,
@@ -93,7 +172,10 @@ def run(
 
     - Reads state["issues"] (geometry, attribute, topology).
     - For each issue, produces a suggestion (method, confidence, explanation) using
-      GPT-4 when llm is provided, otherwise rule-based fallbacks.
+      GPT-4 when llm is provided (batched, see _llm_suggestions), otherwise rule-based
+      fallbacks. Issues in a failed or short batch get rule-based suggestions.
+    - Identical issues (same _issue_signature) share one suggestion, requested or
+      computed once per group.
     - Returns {"corrections": [...]} where each item is a CorrectionSuggestion
       (method, confidence, explanation, issue_index) compatible with the apply-corrections API.
 
@@ -109,42 +191,26 @@ def run(
         return {"corrections": []}
 
     issue_dicts = [_issue_to_dict(iss) for iss in issues]
+    groups = _group_issues(issue_dicts)
 
     if llm is not None:
-        try:
-            raw_suggestions = get_recommendation_suggestions_from_llm(issue_dicts, llm=llm)
-        except Exception:
-            raw_suggestions = []
-        if len(raw_suggestions) >= len(issues):
-            suggestions = [
-                CorrectionSuggestion(
-                    method=raw_suggestions[i]["method"],
-                    confidence=raw_suggestions[i]["confidence"],
-                    explanation=raw_suggestions[i]["explanation"],
-                    issue_index=i,
-                )
-                for i in range(len(issues))
-            ]
-        else:
-            # Fallback to rules if LLM returned too few
-            suggestions = []
-            for i, iss in enumerate(issues):
-                rule = _rule_based_suggestion(iss)
-                suggestions.append(
-                    CorrectionSuggestion(
-                        method=rule["method"],
-                        confidence=rule["confidence"],
-                        explanation=rule["explanation"],
-                        issue_index=i,
-                    )
-                )
+        representatives = [
+            {"type": itype, "severity": severity, "description": description}
+            for (itype, severity, description), _ in groups
+        ]
+        llm_suggestions = _llm_suggestions(representatives, llm)
     else:
-        suggestions = [
-            CorrectionSuggestion(
+        llm_suggestions = [None] * len(groups)
+
+    suggestions: List[Optional[CorrectionSuggestion]] = [None] * len(issues)
+    for (_, members), llm_suggestion in zip(groups, llm_suggestions):
+        chosen = llm_suggestion or _rule_based_suggestion(issue_dicts[members[0]])
+        for i in members:
+            suggestions[i] = CorrectionSuggestion(
+                method=chosen["method"],
+                confidence=chosen["confidence"],
+                explanation=chosen["explanation"],
                 issue_index=i,
-                **_rule_based_suggestion(iss),
             )
-            for i, iss in enumerate(issues)
-        ]
 
     return {"corrections": [s.model_dump() for s in suggestions]}
@@ -4,9 +4,35 @@ Shared state schema for the LangGraph validation pipeline.
 Used by the orchestrator and all validation agents (geometry, attribute, topology)
 so they read and update a single state object.
 """
-from typing import Any, List, Optional, TypedDict
+from typing import Annotated, Any, List, Optional, Sequence, TypedDict
+
+import geopandas as gpd
 
 from api.models import GeometryIssue
+from services.dataset_loader import DatasetHandle
+
+
+# Category order used when merging issues from parallel validation nodes.
+_ISSUE_CATEGORY_ORDER = {"attribute": 1, "topology": 2}
+
+
+def _issue_category_rank(issue: Any) -> int:
+    """0 for geometry issues, 1 for attribute_*, 2 for topology_* (by type prefix)."""
+    issue_type = issue.get("type", "") if isinstance(issue, dict) else getattr(issue, "type", "")
+    prefix = (issue_type or "").split("_", 1)[0]
+    return _ISSUE_CATEGORY_ORDER.get(prefix, 0)
+
+
+def merge_issues(left: Optional[List[Any]], right: Optional[List[Any]]) -> List[Any]:
+    """
+    Reducer for state["issues"]: append the update, then order by category.
+
+    Geometry, attribute and topology nodes run in parallel and LangGraph may apply their
+    updates in any order. The stable sort keeps issues grouped geometry -> attribute ->
+    topology (within-node order is preserved), so issue_index values are deterministic.
+    """
+    merged = list(left or []) + list(right or [])
+    return sorted(merged, key=_issue_category_rank)
 
 
 class ValidationState(TypedDict, total=False):
@@ -23,8 +49,12 @@ class ValidationState(TypedDict, total=False):
     dataset_path: Optional[str]
     """Path to the vector file on disk, for agents that need to load the dataset."""
 
-    issues: List[GeometryIssue]
-    """All validation issues found (geometry, attribute, topology)."""
+    dataset: Optional[DatasetHandle]
+    """Shared handle to the loaded dataset; read once per run and reused by every agent."""
+
+    issues: Annotated[List[GeometryIssue], merge_issues]
+    """All validation issues found (geometry, attribute, topology). Nodes return only their
+    new issues; merge_issues appends them in a deterministic order."""
 
     corrections: List[dict]
     """Suggested corrections from Recommendation Agent. Each dict matches api.models.CorrectionSuggestion (method, confidence, explanation, issue_index)."""
@@ -38,7 +68,30 @@ def empty_state(dataset_id: str, dataset_path: Optional[str] = None) -> dict[str
     return {
         "dataset_id": dataset_id,
         "dataset_path": dataset_path,
+        "dataset": DatasetHandle(dataset_path) if dataset_path else None,
         "issues": [],
         "corrections": [],
         "user_approvals": [],
     }
+
+
+def get_dataset(
+    state: ValidationState,
+    columns: Optional[Sequence[str]] = None,
+    geometry: bool = True,
+) -> Optional[gpd.GeoDataFrame]:
+    """
+    Return the dataset GeoDataFrame for a run, or None if it cannot be loaded.
+
+    Uses the shared state["dataset"] handle when present so the file is parsed once per run;
+    falls back to reading state["dataset_path"] for callers that build state by hand.
+    columns / geometry request a projection (see DatasetHandle.load); callers must still
+    accept the full frame.
+    """
+    handle = state.get("dataset")
+    if handle is None:
+        path = state.get("dataset_path")
+        if not path:
+            return None
+        handle = DatasetHandle(path)
+    return handle.load(columns, geometry)
@@ -4,14 +4,17 @@ Topology validation agent: gaps, overlaps, connectivity (issue #81).
 Loads the dataset from state, runs core.topology.validate_topology, and appends
 topology issues to state["issues"] as GeometryIssue (type=topology_gap, topology_overlap,
 topology_dangle). Same pattern as attribute_agent (#73).
+
+Large layers (settings.TOPOLOGY_TILED_MIN_FEATURES) are checked by the tiled, multi-process
+engine in services.tiled_topology, which returns the same violations.
 """
 from typing import Any, Dict, List, Optional
 
-import geopandas as gpd
-
 from api.models import GeometryIssue
-from agents.state import ValidationState
+from agents.state import ValidationState, get_dataset
+from core.config import settings
 from core.topology import validate_topology
+from services.tiled_topology import tiled_topology_inputs, validate_topology_tiled
 
 
 def _violation_to_geometry_issue(v: Dict[str, Any]) -> GeometryIssue:
@@ -22,23 +25,36 @@ def _violation_to_geometry_issue(v: Dict[str, Any]) -> GeometryIssue:
         severity=v.get("severity") or "warning",
         location=v.get("location"),
         description=v.get("description") or None,
+        other_feature_id=v.get("other_feature_id"),
+        bordering_feature_ids=v.get("bordering_feature_ids"),
     )
 
 
+def _dataset_path(state: ValidationState) -> Optional[str]:
+    """Path of the dataset file behind state (handle first, then dataset_path)."""
+    handle = state.get("dataset")
+    if handle is not None:
+        return str(handle.path)
+    return state.get("dataset_path") or None
+
+
 def run(
     state: ValidationState,
     *,
     check_gaps: bool = True,
     check_overlaps: bool = True,
     check_connectivity: bool = True,
-    tolerance: float = 0.0,
+    tolerance: Optional[float] = None,
+    min_gap_area: Optional[float] = None,
 ) -> dict:
     """
     Run topology validation on the dataset in state (issue #81).
 
-    - Loads the dataset from state["dataset_path"] with GeoPandas.
-    - Calls core.topology.validate_topology to get violations (gaps, overlaps, dangles).
-    - Converts violations to GeometryIssue and appends to state["issues"].
+    - Uses the shared dataset from state["dataset"] (loaded once per run; falls back to
+      state["dataset_path"]).
+    - Calls core.topology.validate_topology to get violations (gaps, overlaps, dangles), or
+      services.tiled_topology.validate_topology_tiled for large layers.
+    - Converts violations to GeometryIssue; the state["issues"] reducer appends them.
 
     Deterministic and side-effect free apart from the returned state update.
 
@@ -47,30 +63,28 @@ def run(
         check_gaps: Enable gap detection (holes in polygon coverage).
         check_overlaps: Enable overlap detection.
         check_connectivity: Enable dangle detection (disconnected line endpoints).
-        tolerance: Passed to validate_topology (overlap area / endpoint distance).
+        tolerance: Passed to validate_topology (overlap area / endpoint distance);
+            default from settings.TOPOLOGY_TOLERANCE.
+        min_gap_area: Smallest gap area reported; default from settings.TOPOLOGY_MIN_GAP_AREA.
 
     Returns:
-        Partial state update: {"issues": existing_issues + new_topology_issues}.
+        Partial state update: {"issues": new_topology_issues} (only this node's issues).
     """
-    existing = list(state.get("issues") or [])
-    path = state.get("dataset_path")
-    if not path:
-        return {"issues": existing}
-
-    try:
-        gdf = gpd.read_file(path)
-    except Exception:
-        return {"issues": existing}
-
+    # Geometry plus the "id" column used for feature ids; no other attributes are read.
+    gdf = get_dataset(state, columns=["id"])
     if gdf is None or gdf.empty:
-        return {"issues": existing}
+        return {"issues": []}
 
-    raw: List[Dict[str, Any]] = validate_topology(
-        gdf,
+    options = dict(
         check_gaps=check_gaps,
         check_overlaps=check_overlaps,
         check_connectivity=check_connectivity,
-        tolerance=tolerance,
+        tolerance=tolerance if tolerance is not None else settings.TOPOLOGY_TOLERANCE,
+        min_gap_area=min_gap_area if min_gap_area is not None else settings.TOPOLOGY_MIN_GAP_AREA,
+    )
+    tiled = tiled_topology_inputs(_dataset_path(state), gdf)
+    raw: List[Dict[str, Any]] = (
+        validate_topology_tiled(gdf, *tiled, **options) if tiled is not None else validate_topology(gdf, **options)
     )
     new_issues = [_violation_to_geometry_issue(v) for v in raw]
-    return {"issues": existing + new_issues}
+    return {"issues": new_issues}
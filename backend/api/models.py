@@ -25,12 +25,21 @@ class GeometryIssue(BaseModel):
     severity: str = Field(..., description="critical or warning")
     location: Optional[List[float]] = Field(None, description="[x, y] for map display")
     description: Optional[str] = Field(None, description="Human-readable reason")
+    other_feature_id: Any = Field(None, description="Second feature of a topology_overlap pair")
+    bordering_feature_ids: Optional[List[Any]] = Field(
+        None, description="Features bordering a topology_gap (the gap itself has no feature_id)"
+    )
 
-    @field_validator("feature_id", mode="before")
+    @field_validator("feature_id", "other_feature_id", mode="before")
     @classmethod
     def _coerce_feature_id(cls, v: Any) -> Any:
         return _to_native(v)
 
+    @field_validator("bordering_feature_ids", mode="before")
+    @classmethod
+    def _coerce_bordering_ids(cls, v: Any) -> Any:
+        return [_to_native(fid) for fid in v] if v is not None else None
+
 
 # Error codes for consistent API error responses
 class ErrorCode:
@@ -139,6 +148,13 @@ class ValidateRequest(BaseModel):
     """Request body for POST /validate."""
 
     dataset_id: str = Field(..., description="Dataset identifier (from upload) to validate")
+    incremental: bool = Field(
+        False,
+        description=(
+            "POST /validate after POST /corrections/apply: re-check only the changed features and their neighbours and "
+            "merge into the previous result (falls back to a full run when that is not possible)"
+        ),
+    )
 
 
 class TopologyChecksConfig(BaseModel):
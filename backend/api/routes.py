@@ -1,8 +1,7 @@
 """API route handlers."""
-from io import BytesIO
+import asyncio
 from pathlib import Path
-from typing import Literal
-import uuid
+from typing import List, Literal, Optional
 
 from fastapi import APIRouter, BackgroundTasks, File, HTTPException, Query, UploadFile
 from fastapi.responses import FileResponse, Response
@@ -19,24 +18,35 @@ from api.models import (
     ValidateRequest,
     ValidationResult,
 )
+from api.upload_limit import upload_too_large_detail
 from core.config import settings
 from services.file_handler import (
+    UploadTooLargeError,
     extract_zip_in_upload_dir,
     get_primary_vector_path,
     get_saved_file_path,
     get_upload_path,
-    save_upload,
+    save_upload_stream,
 )
+from services.change_log import read_change_log
 from services.correction_applier import apply_correction_overrides
+from services.result_cache import get_result_cache
 from services.report_builder import export_report_bytes, get_validation_config
 from services.geojson_parser import parse_geojson_metadata
 from services.shapefile_parser import parse_shapefile_metadata
-from agents.orchestrator import empty_state, validation_graph
+from services.spatial_index import build_spatial_index, features_in_bbox
+from services.working_copy import build_working_copy, working_copy_supported
+from services.validation_runner import get_validation_job_async, run_validation_async, submit_validation_job_async
 
 router = APIRouter()
 
-# In-memory store for async validation jobs (issue #64).
-_validation_jobs: dict[str, dict] = {}
+
+def _features_geojson(path: Optional[Path], box: List[float]) -> Optional[str]:
+    """GeoJSON of the features intersecting box, or None if the dataset is missing (blocking)."""
+    if path is None or not path.exists():
+        return None
+    gdf = features_in_bbox(path, box)
+    return gdf.to_json() if gdf is not None else None
 
 
 def _allowed_file(filename: str) -> bool:
@@ -55,10 +65,17 @@ def _allowed_file(filename: str) -> bool:
         500: {"description": "Server error saving file", "model": ErrorResponse},
     },
 )
-async def upload_dataset(file: UploadFile = File(..., description="Shapefile, GeoJSON, KML, or ZIP")):
+async def upload_dataset(
+    background_tasks: BackgroundTasks,
+    file: UploadFile = File(..., description="Shapefile, GeoJSON, KML, or ZIP"),
+):
     """
     Upload a geospatial dataset. Returns a unified UploadResponse with dataset_id,
     filename, and optional metadata (feature_count, geometry_type, crs, bounds).
+
+    After the response is sent the dataset is converted to its GeoParquet working copy
+    (services.working_copy), so validation does not re-parse the original, and its spatial
+    index is built (services.spatial_index).
     """
     if not file.filename or not file.filename.strip():
         raise HTTPException(
@@ -76,18 +93,12 @@ async def upload_dataset(file: UploadFile = File(..., description="Shapefile, Ge
             },
         )
 
-    contents = await file.read()
-    if len(contents) > settings.max_upload_size_bytes:
-        raise HTTPException(
-            status_code=413,
-            detail={
-                "detail": f"File too large. Maximum size is {settings.MAX_UPLOAD_SIZE_MB} MB.",
-                "code": ErrorCode.FILE_TOO_LARGE,
-            },
-        )
-
+    # The request body is limited by api.upload_limit before it is parsed; the file part is
+    # checked again here, without the multipart overhead the middleware allows for.
     try:
-        dataset_id = save_upload(BytesIO(contents), file.filename)
+        dataset_id = await save_upload_stream(file, file.filename)
+    except UploadTooLargeError:
+        raise HTTPException(status_code=413, detail=upload_too_large_detail())
     except OSError as e:
         raise HTTPException(
             status_code=500,
@@ -119,6 +130,12 @@ async def upload_dataset(file: UploadFile = File(..., description="Shapefile, Ge
             crs = meta["crs"]
             bounds = meta["bounds"]
 
+    vector_path = get_primary_vector_path(dataset_id)
+    if vector_path is not None and working_copy_supported():
+        background_tasks.add_task(build_working_copy, vector_path)
+    if vector_path is not None:
+        background_tasks.add_task(build_spatial_index, vector_path)
+
     return UploadResponse(
         dataset_id=dataset_id,
         filename=file.filename,
@@ -142,6 +159,9 @@ async def validate_dataset(body: ValidateRequest):
     Run the LangGraph validation workflow on an uploaded dataset (by dataset_id).
     Runs geometry, attribute, topology agents and generate_recommendations;
     routes by severity (critical -> apply_corrections). Returns issues for frontend.
+    The run executes on the validation worker pool so the event loop stays responsive.
+    With "incremental": true, a dataset edited through POST /corrections/apply is only
+    re-checked around the changed features (services.incremental_validation).
     """
     path = get_primary_vector_path(body.dataset_id)
     if path is None or not path.exists():
@@ -152,11 +172,7 @@ async def validate_dataset(body: ValidateRequest):
                 "code": ErrorCode.DATASET_NOT_FOUND,
             },
         )
-    initial_state = empty_state(body.dataset_id, str(path))
-    final_state = validation_graph.invoke(initial_state)
-    issues = final_state.get("issues") or []
-    corrections = final_state.get("corrections") or []
-    return ValidationResult(dataset_id=body.dataset_id, issues=issues, corrections=corrections if corrections else None)
+    return await run_validation_async(body.dataset_id, str(path), incremental=body.incremental)
 
 
 @router.get(
@@ -169,8 +185,10 @@ async def validate_dataset(body: ValidateRequest):
 )
 async def get_validation_results(dataset_id: str):
     """
-    Run the LangGraph validation workflow for a dataset and return results (same as POST /validate).
-    Runs geometry, attribute, topology agents; returns issues for frontend.
+    Return validation results for a dataset (same pipeline as POST /validate).
+
+    Served from the result cache when the dataset content and validation settings are
+    unchanged since the last run; otherwise runs geometry, attribute, topology agents.
     """
     path = get_primary_vector_path(dataset_id)
     if path is None or not path.exists():
@@ -181,11 +199,7 @@ async def get_validation_results(dataset_id: str):
                 "code": ErrorCode.DATASET_NOT_FOUND,
             },
         )
-    initial_state = empty_state(dataset_id, str(path))
-    final_state = validation_graph.invoke(initial_state)
-    issues = final_state.get("issues") or []
-    corrections = final_state.get("corrections") or []
-    return ValidationResult(dataset_id=dataset_id, issues=issues, corrections=corrections if corrections else None)
+    return await run_validation_async(dataset_id, str(path), use_cache=True)
 
 
 @router.post(
@@ -196,11 +210,13 @@ async def get_validation_results(dataset_id: str):
         404: {"description": "Dataset not found", "model": ErrorResponse},
     },
 )
-async def validate_dataset_async(body: ValidateRequest, background_tasks: BackgroundTasks):
+async def validate_dataset_async(body: ValidateRequest):
     """
     Run validation asynchronously using the LangGraph workflow.
 
     Returns immediately with a job_id; the job can be polled via GET /validate/jobs/{job_id}.
+    Jobs are persisted (services.job_store), so any API worker can answer the poll and
+    queued jobs survive a restart.
     """
     path = get_primary_vector_path(body.dataset_id)
     if path is None or not path.exists():
@@ -212,46 +228,8 @@ async def validate_dataset_async(body: ValidateRequest, background_tasks: Backgr
             },
         )
 
-    job_id = str(uuid.uuid4())
-    _validation_jobs[job_id] = {
-        "job_id": job_id,
-        "dataset_id": body.dataset_id,
-        "status": "pending",
-        "error": None,
-        "result": None,
-    }
-
-    def _run_job(jid: str, dataset_id: str, dataset_path: str) -> None:
-        # Mark as running
-        job = _validation_jobs.get(jid)
-        if not job:
-            return
-        job["status"] = "running"
-        try:
-            state = empty_state(dataset_id, dataset_path)
-            final_state = validation_graph.invoke(state)
-            issues = final_state.get("issues") or []
-            corrections = final_state.get("corrections") or []
-            result = ValidationResult(
-                dataset_id=dataset_id,
-                issues=issues,
-                corrections=corrections if corrections else None,
-            )
-            job["result"] = result
-            job["status"] = "completed"
-        except Exception as exc:  # noqa: BLE001
-            job["status"] = "failed"
-            job["error"] = str(exc)
-
-    background_tasks.add_task(_run_job, job_id, body.dataset_id, str(path))
-
-    return ValidationJobStatus(
-        job_id=job_id,
-        dataset_id=body.dataset_id,
-        status="pending",
-        error=None,
-        result=None,
-    )
+    job = await submit_validation_job_async(body.dataset_id, str(path))
+    return ValidationJobStatus(**job)
 
 
 @router.get(
@@ -268,7 +246,7 @@ async def get_validation_job(job_id: str):
 
     When status is 'completed', the response includes the ValidationResult in 'result'.
     """
-    job = _validation_jobs.get(job_id)
+    job = await get_validation_job_async(job_id)
     if not job:
         raise HTTPException(
             status_code=404,
@@ -313,6 +291,46 @@ async def get_dataset_geojson(dataset_id: str):
     return FileResponse(path, media_type="application/geo+json")
 
 
+@router.get(
+    "/datasets/{dataset_id}/features",
+    responses={
+        200: {"description": "GeoJSON FeatureCollection", "content": {"application/geo+json": {}}},
+        400: {"description": "Invalid bbox", "model": ErrorResponse},
+        404: {"description": "Dataset not found", "model": ErrorResponse},
+    },
+)
+async def get_dataset_features(
+    dataset_id: str,
+    bbox: str = Query(..., description="minX,minY,maxX,maxY in the dataset's CRS"),
+):
+    """
+    Return the features intersecting bbox as GeoJSON (map viewport queries).
+
+    Uses the dataset's persisted spatial index, so only candidate features are decoded. The
+    lookup runs off the event loop: on first use it builds the index (a full dataset read).
+    """
+    try:
+        box = [float(v) for v in bbox.split(",")]
+    except ValueError:
+        box = []
+    if len(box) != 4 or box[0] > box[2] or box[1] > box[3]:
+        raise HTTPException(
+            status_code=400,
+            detail={"detail": "bbox must be minX,minY,maxX,maxY.", "code": "INVALID_BBOX"},
+        )
+
+    content = await asyncio.to_thread(_features_geojson, get_primary_vector_path(dataset_id), box)
+    if content is None:
+        raise HTTPException(
+            status_code=404,
+            detail={
+                "detail": f"Dataset not found or no vector file: {dataset_id}",
+                "code": ErrorCode.DATASET_NOT_FOUND,
+            },
+        )
+    return Response(content=content, media_type="application/geo+json")
+
+
 @router.post(
     "/corrections/apply",
     response_model=ApplyCorrectionsResponse,
@@ -366,6 +384,11 @@ async def apply_corrections(body: ApplyCorrectionsRequest):
             detail={"detail": str(exc), "code": "INVALID_OVERRIDE"},
         ) from exc
 
+    if mutated:
+        # Keep the result the change log is based on: incremental re-validation starts from it.
+        log = read_change_log(path)
+        get_result_cache().invalidate(body.dataset_id, keep=log["base_key"] if log else None)
+
     download_url = f"/api/v1/datasets/{body.dataset_id}/geojson"
     if mutated:
         export_note = (
@@ -0,0 +1,78 @@
+"""
+Request-level upload size limit.
+
+FastAPI parses a multipart body (Starlette spools it to a temporary file) before the
+upload endpoint runs, so a limit checked by the endpoint only applies after the whole body
+has been received. UploadSizeLimitMiddleware enforces settings.max_upload_size_bytes on the
+request itself: a declared Content-Length above the limit is answered with 413 before any
+body is read, and a body without one (chunked) is cut off as soon as it exceeds it, with an
+HTTPException that FastAPI's body parsing re-raises and turns into the same 413 response.
+"""
+import json
+from typing import Any, Awaitable, Callable, Dict
+
+from fastapi import HTTPException
+
+from api.models import ErrorCode
+from core.config import settings
+
+# Room for multipart boundaries and part headers around the file itself.
+_MULTIPART_OVERHEAD = 64 * 1024
+
+Scope = Dict[str, Any]
+Message = Dict[str, Any]
+Receive = Callable[[], Awaitable[Message]]
+Send = Callable[[Message], Awaitable[None]]
+
+
+def upload_too_large_detail() -> Dict[str, str]:
+    """Error body of a 413 upload response (ErrorResponse shape)."""
+    return {
+        "detail": f"File too large. Maximum size is {settings.MAX_UPLOAD_SIZE_MB} MB.",
+        "code": ErrorCode.FILE_TOO_LARGE,
+    }
+
+
+async def _send_413(send: Send) -> None:
+    body = json.dumps({"detail": upload_too_large_detail()}).encode("utf-8")
+    await send({
+        "type": "http.response.start",
+        "status": 413,
+        "headers": [(b"content-type", b"application/json"), (b"content-length", str(len(body)).encode())],
+    })
+    await send({"type": "http.response.body", "body": body})
+
+
+class UploadSizeLimitMiddleware:
+    """Limit the body size of POST requests to paths ending in path_suffix (see module docstring)."""
+
+    def __init__(self, app: Callable, path_suffix: str = "/upload") -> None:
+        self.app = app
+        self.path_suffix = path_suffix
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or scope["method"] != "POST" or not scope["path"].endswith(self.path_suffix):
+            await self.app(scope, receive, send)
+            return
+        limit = settings.max_upload_size_bytes + _MULTIPART_OVERHEAD
+        headers = dict(scope.get("headers") or [])
+        try:
+            declared = int(headers.get(b"content-length", b""))
+        except ValueError:
+            declared = None
+        if declared is not None and declared > limit:
+            await _send_413(send)
+            return
+
+        received = 0
+
+        async def limited_receive() -> Message:
+            nonlocal received
+            message = await receive()
+            if message["type"] == "http.request":
+                received += len(message.get("body", b""))
+                if received > limit:
+                    raise HTTPException(status_code=413, detail=upload_too_large_detail())
+            return message
+
+        await self.app(scope, limited_receive, send)
@@ -28,10 +28,38 @@ class Settings(BaseSettings):
     UPLOAD_DIR: str = "./uploads"
     OUTPUT_DIR: str = "./outputs"
 
+    # Validation worker pool: max concurrent LangGraph runs executed off the asyncio event loop
+    # (POST/GET /validate). Threads are used; Shapely/GEOS releases the GIL for heavy operations.
+    VALIDATION_MAX_WORKERS: int = 2
+
+    # Async validation jobs (POST /validate/async): SQLite queue + results under OUTPUT_DIR/jobs.
+    # Worker threads per process draining the queue, and how long finished jobs are kept.
+    VALIDATION_JOB_WORKERS: int = 2
+    VALIDATION_JOB_TTL_SECONDS: int = 24 * 60 * 60
+
+    # Streaming validation for very large layers (services.streaming_validation): datasets with
+    # at least VALIDATION_STREAMING_MIN_FEATURES features (0 = never) are read and checked in
+    # batches of VALIDATION_BATCH_SIZE features, which bounds peak memory. Topology then runs
+    # on the geometry store written during the pass (tiled engine, see TOPOLOGY_TILED_*).
+    VALIDATION_STREAMING_MIN_FEATURES: int = 1_000_000
+    VALIDATION_BATCH_SIZE: int = 50_000
+
     # Geometry validation (POST/GET /validate): all checks enabled by default
     # Checks: null/empty geometry, invalid geometry, self-intersection (see core.validation)
     GEOMETRY_VALIDATION_ENABLED: bool = True
 
+    # Topology validation: overlap area threshold / endpoint snapping distance (layer units)
+    TOPOLOGY_TOLERANCE: float = 0.0
+    # Gaps (holes in polygon coverage) smaller than this area are not reported (layer units²)
+    TOPOLOGY_MIN_GAP_AREA: float = 0.0
+
+    # Tiled topology (services.tiled_topology): layers with at least TOPOLOGY_TILED_MIN_FEATURES
+    # features (0 = never) are split into Hilbert-ordered tiles of ~TOPOLOGY_TILE_SIZE features
+    # and checked on a pool of TOPOLOGY_WORKERS processes (0 = one per CPU core).
+    TOPOLOGY_TILED_MIN_FEATURES: int = 200_000
+    TOPOLOGY_TILE_SIZE: int = 25_000
+    TOPOLOGY_WORKERS: int = 0
+
     # Attribute extraction for LLM (issue #74, #70): max rows sampled from dataset
     # Higher = better coverage, more tokens/cost. Default 500 balances both.
     ATTRIBUTE_SAMPLE_SIZE: int = 500
@@ -47,10 +75,36 @@ class Settings(BaseSettings):
             return None
         return v
 
-    # Max records embedded in the prompt (subset of sample). Lower = cheaper, less context.
-    ATTRIBUTE_MAX_RECORDS_IN_PROMPT: int = 10
-    # Max values per field in the per-field summary. Lower = smaller prompt.
-    ATTRIBUTE_MAX_VALUES_PER_FIELD: int = 15
+    # Input-token budget of the attribute prompt, counted with the model's tokenizer
+    # (services.attribute_llm_cost.count_tokens): records and per-field values are packed
+    # greedily up to it, low-information fields dropped first. 0 = no budget.
+    ATTRIBUTE_MAX_PROMPT_TOKENS: int = 6000
+    # Optional hard caps (0 = none, packing decides): max records embedded in the prompt
+    # and max values per field in the per-field summary.
+    ATTRIBUTE_MAX_RECORDS_IN_PROMPT: int = 0
+    ATTRIBUTE_MAX_VALUES_PER_FIELD: int = 0
+    # Offline tokenizer vocabulary: tiktoken BPE files in tiktoken's cache layout, written by
+    # scripts/fetch_tokenizer_vocab.py. Without them tokens are estimated as chars / 4.
+    TOKENIZER_VOCAB_DIR: str = "resources/tokenizers"
+
+    # Field profiling before the LLM (services.attribute_extractor.profile_attributes): missing
+    # values, outliers ("iqr" or "mad"), type mismatches and casing variants are reported from
+    # the full columns; only free-text fields are sent to the LLM. Per-feature issues per
+    # field and check are capped at ATTRIBUTE_PROFILE_MAX_ISSUES_PER_FIELD (rest summarized).
+    ATTRIBUTE_PROFILING_ENABLED: bool = True
+    ATTRIBUTE_OUTLIER_METHOD: str = "iqr"
+    ATTRIBUTE_PROFILE_MAX_ISSUES_PER_FIELD: int = 50
+    # Distinct text values that normalize to the same text (case, punctuation; in address
+    # fields also street abbreviations) are reported as spelling variants, and so are rare
+    # values within this many edits (at most 2) of a much more frequent value, in address
+    # fields only with the same street type; 0 only groups values that normalize to the same text.
+    ATTRIBUTE_NEAR_DUPLICATE_MAX_DISTANCE: int = 2
+    # Columns always treated as address fields (comma-separated); other columns are when most
+    # of their values look like street names ("Main St").
+    ATTRIBUTE_ADDRESS_FIELDS: str = ""
+    # Rows sent to the LLM: "stratified" picks and orders them to cover rare values, nulls
+    # and numeric extremes of every column first; "uniform" is a plain random sample.
+    ATTRIBUTE_SAMPLING_STRATEGY: str = "stratified"
 
     # LLM / GPT-4 configuration for attribute validation (issue #71)
     # API key is read from OPENAI_API_KEY env var by default; model can be overridden.
@@ -58,6 +112,18 @@ class Settings(BaseSettings):
     OPENAI_MODEL: str = "gpt-4o-mini"
     OPENAI_MAX_TOKENS: int = 2048
 
+    # Recommendation suggestions via LLM: issues are split into batches whose prompt fits
+    # RECOMMENDATION_MAX_PROMPT_TOKENS and whose answer fits OPENAI_MAX_TOKENS; up to
+    # RECOMMENDATION_MAX_CONCURRENCY batches are requested at once.
+    RECOMMENDATION_MAX_PROMPT_TOKENS: int = 8000
+    RECOMMENDATION_MAX_CONCURRENCY: int = 4
+
+    # LLM response cache (OUTPUT_DIR/llm_cache.sqlite3): identical prompts reuse the stored
+    # response instead of calling the API again. Max entries (LRU eviction) and entry lifetime.
+    LLM_CACHE_ENABLED: bool = True
+    LLM_CACHE_MAX_ENTRIES: int = 10_000
+    LLM_CACHE_TTL_SECONDS: int = 7 * 24 * 60 * 60
+
     # Allowed geospatial file extensions (lowercase)
     ALLOWED_EXTENSIONS: List[str] = [
         ".shp",
@@ -87,6 +153,11 @@ class Settings(BaseSettings):
         p.mkdir(parents=True, exist_ok=True)
         return p
 
+    @property
+    def attribute_address_fields_list(self) -> List[str]:
+        """ATTRIBUTE_ADDRESS_FIELDS as a list."""
+        return [f.strip() for f in self.ATTRIBUTE_ADDRESS_FIELDS.split(",") if f.strip()]
+
     @property
     def cors_origins_list(self) -> List[str]:
         """CORS origins as a list."""
@@ -9,19 +9,28 @@ Assumptions:
 - Geometries are in a projected or geographic CRS; operations use Shapely (planar).
 - Gaps/overlaps: intended for polygon layers; invalid or empty geometries are skipped.
 - Connectivity: intended for LineString layers; detects dangles (endpoints not touching another line).
+  Endpoints are matched with a bulk STRtree dwithin query rather than a distance to every line.
 
 Limitations:
-- Large datasets: pair-wise overlap check is O(n^2); consider spatial index and tolerance.
+- Overlaps use an STRtree bulk query for candidate pairs (~O(n log n) plus the number of
+  intersecting pairs) instead of testing every pair.
+- Gaps come from one union of all valid polygons: coverage_union_all when they form a valid
+  coverage (much cheaper), otherwise the cascaded union_all. Very large layers are tiled by
+  services.tiled_topology.
 - ArcGIS-specific rules are not implemented; can be added later via optional ArcGIS API.
 """
 from __future__ import annotations
 
-from typing import Any, Dict, List, Optional
+import logging
+from typing import Any, Dict, List, Optional, Tuple
 
 import geopandas as gpd
-from shapely.geometry import LineString, Point, Polygon
+import numpy as np
+import shapely
 from shapely.geometry.base import BaseGeometry
-from shapely.ops import unary_union
+
+
+logger = logging.getLogger(__name__)
 
 
 # Topology issue type constants (prefix topology_ for consistency with attribute_*)
@@ -36,6 +45,15 @@ class Severity:
     WARNING = "warning"
 
 
+# shapely.get_type_id codes. Polygon only: MultiPolygon has no .exterior and is skipped, as before.
+_POLYGON_TYPE_ID = 3
+_LINE_TYPE_IDS = (1, 2)  # LineString, LinearRing
+_COLLECTION_TYPE_IDS = (4, 5, 6, 7)  # Multi* and GeometryCollection
+
+# Bordering feature ids spelled out in a gap description (all are in "bordering_feature_ids").
+_GAP_DESCRIPTION_MAX_IDS = 10
+
+
 def _location(geom: BaseGeometry) -> Optional[List[float]]:
     """Return [x, y] for map display, or None."""
     if geom is None or getattr(geom, "is_empty", True):
@@ -55,81 +73,154 @@ def _location(geom: BaseGeometry) -> Optional[List[float]]:
     return None
 
 
-def _get_feature_id(gdf: gpd.GeoDataFrame, idx: Any) -> Any:
-    """Use 'id' column if present, else index (aligned with core.validation)."""
-    if "id" in gdf.columns:
+def _coverage_union(polygons: np.ndarray) -> BaseGeometry:
+    """
+    Union of valid polygons. A valid coverage (no overlaps, shared edges match, as in a parcel
+    layer) is merged with coverage_union_all, which only has to drop the shared edges; any
+    other input goes through the cascaded union_all.
+    """
+    if len(polygons) > 1:
         try:
-            return gdf.loc[idx, "id"]
-        except Exception:
+            if shapely.coverage_is_valid(polygons):
+                return shapely.coverage_union_all(polygons)
+        except shapely.errors.GEOSException:
             pass
-    return idx
+    return shapely.union_all(polygons)
 
 
-def _valid_polygons(gdf: gpd.GeoDataFrame):
-    """Yield (index, geometry) for valid non-empty polygon geometries."""
-    for idx, geom in gdf.geometry.items():
-        if geom is None or geom.is_empty:
-            continue
-        if not hasattr(geom, "exterior"):  # Polygon-like
-            continue
-        try:
-            if geom.is_valid and not geom.is_empty:
-                yield idx, geom
-        except Exception:
-            continue
+def _find_gaps(
+    union: Any,
+    polygons: Optional[np.ndarray] = None,
+    min_area: float = 0.0,
+) -> List[Tuple[List[float], float, List[int]]]:
+    """
+    Holes (interior rings) of a coverage union, or of an array of its polygon parts.
+
+    Returns (location, area, bordering) per hole with area >= min_area, where bordering lists
+    the positions in polygons of the features touching the hole's ring (empty if polygons is
+    None). Area filtering happens before any per-hole work, so slivers cost next to nothing.
+    """
+    holes = _holes(union)
+    areas = shapely.area(holes)
+    keep = areas >= min_area
+    holes, areas = holes[keep], areas[keep]
+    if not len(holes):
+        return []
+    bordering = _bordering(holes, polygons) if polygons is not None else [[] for _ in range(len(holes))]
+    return _gap_records(holes, areas, bordering)
+
+
+def _holes(union: Any) -> np.ndarray:
+    """Interior rings of a union (or of an array of polygons) as non-empty Polygons."""
+    if union is None:
+        return np.empty(0, dtype=object)
+    parts = shapely.get_parts(union)
+    parts = parts[~shapely.is_empty(parts)]
+    if not len(parts):
+        return np.empty(0, dtype=object)
+    rings, ring_part = shapely.get_rings(parts, return_index=True)
+    exterior = np.r_[True, ring_part[1:] != ring_part[:-1]]  # each part's first ring
+    holes = shapely.polygons(rings[~exterior])
+    return holes[~shapely.is_empty(holes)]
+
+
+def _bordering(holes: np.ndarray, polygons: np.ndarray) -> List[List[int]]:
+    """Per hole, the sorted positions in polygons of the features touching its ring."""
+    bordering: List[List[int]] = [[] for _ in range(len(holes))]
+    if len(holes) and len(polygons):
+        tree = shapely.STRtree(polygons)
+        hole_idx, poly_idx = tree.query(shapely.get_exterior_ring(holes), predicate="intersects")
+        for k in np.lexsort((poly_idx, hole_idx)):
+            bordering[hole_idx[k]].append(int(poly_idx[k]))
+    return bordering
 
 
-def _detect_gaps(gdf: gpd.GeoDataFrame) -> List[Dict[str, Any]]:
+def _gap_records(
+    holes: np.ndarray,
+    areas: np.ndarray,
+    bordering: List[List[int]],
+) -> List[Tuple[List[float], float, List[int]]]:
+    centroids = shapely.get_coordinates(shapely.centroid(holes)) if len(holes) else np.empty((0, 2))
+    return [
+        ([float(x), float(y)], float(area), border)
+        for (x, y), area, border in zip(centroids, areas, bordering)
+    ]
+
+
+def _gap_issue(location: List[float], area: float, bordering_ids: List[Any]) -> Dict[str, Any]:
+    """Gap issue dict; feature_id is None (the gap lies between features)."""
+    listed = ", ".join(str(fid) for fid in bordering_ids[:_GAP_DESCRIPTION_MAX_IDS])
+    if len(bordering_ids) > _GAP_DESCRIPTION_MAX_IDS:
+        listed += f" and {len(bordering_ids) - _GAP_DESCRIPTION_MAX_IDS} more"
+    description = f"Gap in polygon coverage (area {area:g})"
+    if listed:
+        description += f" bordered by features {listed}"
+    return {
+        "feature_id": None,
+        "other_feature_id": None,
+        "type": TopologyIssueType.GAP,
+        "severity": Severity.WARNING,
+        "location": location,
+        "area": area,
+        "bordering_feature_ids": list(bordering_ids),
+        "description": description,
+    }
+
+
+def _detect_gaps(gdf: gpd.GeoDataFrame, min_area: float = 0.0) -> List[Dict[str, Any]]:
     """
-    Detect gaps (holes in polygon coverage) using unary_union.
-    Each hole in the union is reported as a gap. feature_id is None (gap between features).
+    Detect gaps (holes in polygon coverage): one issue per hole in the union of the valid
+    polygons with area >= min_area, with its area and the ids of the bordering features.
+
+    A union that GEOS cannot compute is logged and reported as no gaps.
+    """
+    geoms = np.asarray(gdf.geometry.values, dtype=object)
+    positions = np.flatnonzero(_valid_polygon_mask(geoms))
+    if not len(positions):
+        return []
+    polygons = geoms[positions]
+    try:
+        union = _coverage_union(polygons)
+    except shapely.errors.GEOSException:
+        logger.warning("Gap detection failed: union of %d polygons could not be computed", len(polygons), exc_info=True)
+        return []
+    fids = _feature_ids(gdf)
+    return [
+        _gap_issue(location, area, [fids[positions[k]] for k in border])
+        for location, area, border in _find_gaps(union, polygons, min_area)
+    ]
+
+
+def _feature_ids(gdf: gpd.GeoDataFrame) -> List[Any]:
+    """Feature id per row position: 'id' column if present, else index (aligned with core.validation)."""
+    if "id" in gdf.columns:
+        return list(gdf["id"].to_numpy())
+    return list(gdf.index)
+
+
+def _valid_polygon_mask(geoms: np.ndarray) -> np.ndarray:
+    """Boolean mask of valid, non-empty Polygon geometries (the input of every polygon check)."""
+    is_polygon = shapely.get_type_id(geoms) == _POLYGON_TYPE_ID
+    mask = is_polygon.copy()
+    mask[is_polygon] = ~shapely.is_empty(geoms[is_polygon]) & shapely.is_valid(geoms[is_polygon])
+    return mask
+
+
+def _pairwise_intersection(left: np.ndarray, right: np.ndarray) -> np.ndarray:
+    """
+    Vectorized left[k].intersection(right[k]). If GEOS raises for the batch, fall back to
+    per-pair calls so one bad pair only drops itself (None) instead of the whole batch.
     """
-    issues: List[Dict[str, Any]] = []
-    geoms = [geom for _, geom in _valid_polygons(gdf)]
-    if len(geoms) < 1:
-        return issues
     try:
-        union = unary_union(geoms)
-        if union is None or union.is_empty:
-            return issues
-        # Collect interiors (holes) from the union
-        if hasattr(union, "interiors"):
-            for ring in union.interiors:
-                try:
-                    hole = Polygon(ring)
-                    if not hole.is_empty:
-                        loc = _location(hole)
-                        issues.append({
-                            "feature_id": None,
-                            "other_feature_id": None,
-                            "type": TopologyIssueType.GAP,
-                            "severity": Severity.WARNING,
-                            "location": loc,
-                            "description": "Gap in polygon coverage",
-                        })
-                except Exception:
-                    continue
-        elif hasattr(union, "geoms"):
-            for poly in union.geoms:
-                if hasattr(poly, "interiors"):
-                    for ring in poly.interiors:
-                        try:
-                            hole = Polygon(ring)
-                            if not hole.is_empty:
-                                loc = _location(hole)
-                                issues.append({
-                                    "feature_id": None,
-                                    "other_feature_id": None,
-                                    "type": TopologyIssueType.GAP,
-                                    "severity": Severity.WARNING,
-                                    "location": loc,
-                                    "description": "Gap in polygon coverage",
-                                })
-                        except Exception:
-                            continue
+        return shapely.intersection(left, right)
     except Exception:
-        pass
-    return issues
+        out = np.empty(len(left), dtype=object)
+        for k in range(len(left)):
+            try:
+                out[k] = left[k].intersection(right[k])
+            except Exception:
+                out[k] = None
+        return out
 
 
 def _detect_overlaps(
@@ -138,114 +229,119 @@ def _detect_overlaps(
 ) -> List[Dict[str, Any]]:
     """
     Detect overlapping polygon pairs. Reports one issue per pair (feature_id, other_feature_id).
+
+    Candidate pairs come from a bulk STRtree query (predicate="intersects"), so only pairs whose
+    geometries actually intersect are considered; intersection areas are then computed with
+    vectorized Shapely operations. Issues are ordered by (feature position, other position).
     """
-    issues: List[Dict[str, Any]] = []
-    indices = list(gdf.index)
-    geoms = gdf.geometry
-    for i in range(len(indices)):
-        idx_i = indices[i]
-        geom_i = geoms.loc[idx_i] if hasattr(geoms, "loc") else geoms.iloc[i]
-        if geom_i is None or geom_i.is_empty or not hasattr(geom_i, "exterior"):
-            continue
-        if not getattr(geom_i, "is_valid", True):
-            continue
-        for j in range(i + 1, len(indices)):
-            idx_j = indices[j]
-            geom_j = geoms.loc[idx_j] if hasattr(geoms, "loc") else geoms.iloc[j]
-            if geom_j is None or geom_j.is_empty or not hasattr(geom_j, "exterior"):
-                continue
-            if not getattr(geom_j, "is_valid", True):
-                continue
-            try:
-                inter = geom_i.intersection(geom_j)
-                if inter.is_empty:
-                    continue
-                area = getattr(inter, "area", None)
-                if area is None:
-                    area = 0.0
-                if area <= tolerance:
-                    continue
-                loc = _location(inter)
-                fid_i = _get_feature_id(gdf, idx_i)
-                fid_j = _get_feature_id(gdf, idx_j)
-                issues.append({
-                    "feature_id": fid_i,
-                    "other_feature_id": fid_j,
-                    "type": TopologyIssueType.OVERLAP,
-                    "severity": Severity.WARNING,
-                    "location": loc,
-                    "description": f"Overlap with feature {fid_j}",
-                })
-            except Exception:
-                continue
-    return issues
+    geoms = np.asarray(gdf.geometry.values, dtype=object)
+    candidates = np.flatnonzero(_valid_polygon_mask(geoms))
+    if len(candidates) < 2:
+        return []
 
+    polys = geoms[candidates]
+    tree = shapely.STRtree(polys)
+    left, right = tree.query(polys, predicate="intersects")
+    keep = left < right
+    pos_i = candidates[left[keep]]
+    pos_j = candidates[right[keep]]
+    order = np.lexsort((pos_j, pos_i))
+    pos_i, pos_j = pos_i[order], pos_j[order]
 
-def _line_endpoints(geom: BaseGeometry) -> List[Point]:
-    """Return list of (start, end) or flattened points for LineString/MultiLineString."""
-    points: List[Point] = []
-    if geom is None or geom.is_empty:
-        return points
-    if isinstance(geom, LineString):
-        if len(geom.coords) >= 2:
-            points.append(Point(geom.coords[0]))
-            points.append(Point(geom.coords[-1]))
-        return points
-    if hasattr(geom, "geoms"):
-        for g in geom.geoms:
-            points.extend(_line_endpoints(g))
-        return points
-    return points
-
-
-def _point_touches_line(pt: Point, line_geom: BaseGeometry, tolerance: float) -> bool:
-    """True if pt is within tolerance of line (boundary or interior)."""
-    if line_geom is None or line_geom.is_empty:
-        return False
-    try:
-        dist = line_geom.distance(pt)
-        return dist <= tolerance
-    except Exception:
-        return False
+    inter = _pairwise_intersection(geoms[pos_i], geoms[pos_j])
+    present = ~shapely.is_missing(inter)
+    hit = present.copy()
+    hit[present] = ~shapely.is_empty(inter[present]) & (shapely.area(inter[present]) > tolerance)
+    if not hit.any():
+        return []
+
+    fids = _feature_ids(gdf)
+    return [_overlap_issue(fids[i], fids[j], _location(geom)) for i, j, geom in zip(pos_i[hit], pos_j[hit], inter[hit])]
+
+
+def _overlap_issue(fid_i: Any, fid_j: Any, location: Optional[List[float]]) -> Dict[str, Any]:
+    return {
+        "feature_id": fid_i,
+        "other_feature_id": fid_j,
+        "type": TopologyIssueType.OVERLAP,
+        "severity": Severity.WARNING,
+        "location": location,
+        "description": f"Overlap with feature {fid_j}",
+    }
+
+
+def _line_parts(geoms: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Flatten geometries to their LineString/LinearRing parts.
+
+    Returns (parts, owner) where owner[k] is the row position of parts[k]. Multi-part and
+    collection geometries are exploded (nested collections too); order within a feature
+    is preserved, matching the old recursive walk over .geoms.
+    """
+    parts, owner = shapely.get_parts(geoms, return_index=True)
+    while len(parts):
+        nested = np.isin(shapely.get_type_id(parts), _COLLECTION_TYPE_IDS)
+        if not nested.any():
+            break
+        parts, idx = shapely.get_parts(parts, return_index=True)
+        owner = owner[idx]
+    if not len(parts):
+        return parts, owner
+    is_line = np.isin(shapely.get_type_id(parts), _LINE_TYPE_IDS)
+    is_line[is_line] = ~shapely.is_empty(parts[is_line]) & (shapely.get_num_points(parts[is_line]) >= 2)
+    return parts[is_line], owner[is_line]
+
+
+def _line_endpoints(geoms: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Return (coords, owner): an (m, 2) array of start/end coordinates for every line part, in
+    feature order (start, end per part), and the row position owning each endpoint.
+    """
+    parts, part_owner = _line_parts(geoms)
+    if not len(parts):
+        return np.empty((0, 2)), np.empty(0, dtype=np.intp)
+    coords, coord_part = shapely.get_coordinates(parts, return_index=True)
+    # Coordinates are grouped by part: first/last row of each group are the endpoints.
+    starts = np.flatnonzero(np.r_[True, coord_part[1:] != coord_part[:-1]])
+    ends = np.r_[starts[1:] - 1, len(coord_part) - 1]
+    endpoint_rows = np.column_stack((starts, ends)).ravel()
+    return coords[endpoint_rows], np.repeat(part_owner, 2)
 
 
 def _detect_dangles(gdf: gpd.GeoDataFrame, tolerance: float = 1e-9) -> List[Dict[str, Any]]:
     """
     Detect dangles: line endpoints that do not touch any other line (disconnected).
     Intended for LineString/MultiLineString layers.
+
+    All endpoints are extracted as one coordinate array and matched against an STRtree of the
+    layer with a bulk dwithin query, so each endpoint is only compared with nearby features.
+    An endpoint is connected if it lies within tolerance of any other feature (its end or
+    interior, e.g. a T-junction); matches against the endpoint's own feature are ignored.
     """
-    issues: List[Dict[str, Any]] = []
-    indices = list(gdf.index)
-    geoms = gdf.geometry
-    for i in range(len(indices)):
-        idx = indices[i]
-        geom = geoms.loc[idx] if hasattr(geoms, "loc") else geoms.iloc[i]
-        if geom is None or geom.is_empty:
-            continue
-        endpoints = _line_endpoints(geom)
-        for pt in endpoints:
-            if pt is None or pt.is_empty:
-                continue
-            touches_other = False
-            for j in range(len(indices)):
-                if j == i:
-                    continue
-                other = geoms.loc[indices[j]] if hasattr(geoms, "loc") else geoms.iloc[j]
-                if _point_touches_line(pt, other, tolerance):
-                    touches_other = True
-                    break
-            if not touches_other:
-                loc = _location(pt)
-                fid = _get_feature_id(gdf, idx)
-                issues.append({
-                    "feature_id": fid,
-                    "other_feature_id": None,
-                    "type": TopologyIssueType.DANGLE,
-                    "severity": Severity.WARNING,
-                    "location": loc,
-                    "description": "Disconnected line endpoint (dangle)",
-                })
-    return issues
+    geoms = np.asarray(gdf.geometry.values, dtype=object)
+    coords, owner = _line_endpoints(geoms)
+    if not len(coords):
+        return []
+
+    tree = shapely.STRtree(geoms)
+    pt_idx, geom_pos = tree.query(shapely.points(coords), predicate="dwithin", distance=tolerance)
+    other = geom_pos != owner[pt_idx]
+    connected = np.zeros(len(coords), dtype=bool)
+    connected[pt_idx[other]] = True
+
+    fids = _feature_ids(gdf)
+    return [_dangle_issue(fids[owner[k]], coords[k]) for k in np.flatnonzero(~connected)]
+
+
+def _dangle_issue(fid: Any, coord: np.ndarray) -> Dict[str, Any]:
+    return {
+        "feature_id": fid,
+        "other_feature_id": None,
+        "type": TopologyIssueType.DANGLE,
+        "severity": Severity.WARNING,
+        "location": [float(coord[0]), float(coord[1])],
+        "description": "Disconnected line endpoint (dangle)",
+    }
 
 
 def validate_topology(
@@ -255,6 +351,7 @@ def validate_topology(
     check_overlaps: bool = True,
     check_connectivity: bool = True,
     tolerance: float = 0.0,
+    min_gap_area: float = 0.0,
 ) -> List[Dict[str, Any]]:
     """
     Run topology validation on a GeoDataFrame (issue #80).
@@ -265,10 +362,12 @@ def validate_topology(
         check_overlaps: Report overlapping polygon pairs.
         check_connectivity: Report dangles (disconnected line endpoints).
         tolerance: Minimum area for overlap; distance for endpoint touch (default 0).
+        min_gap_area: Gaps smaller than this area are not reported (default 0: all).
 
     Returns:
         List of violation dicts with keys: feature_id, other_feature_id (optional),
         type (topology_gap, topology_overlap, topology_dangle), severity, location, description.
+        Gap dicts also carry area and bordering_feature_ids.
     """
     if gdf is None or gdf.empty or gdf.geometry is None:
         return []
@@ -276,7 +375,7 @@ def validate_topology(
     # Polygon-based checks
     if check_gaps or check_overlaps:
         if check_gaps:
-            issues.extend(_detect_gaps(gdf))
+            issues.extend(_detect_gaps(gdf, min_area=min_gap_area))
         if check_overlaps:
             issues.extend(_detect_overlaps(gdf, tolerance=tolerance))
     # Line-based check
@@ -2,6 +2,8 @@
 from typing import Any, List, Optional
 
 import geopandas as gpd
+import numpy as np
+import shapely
 from shapely import is_valid
 from shapely.geometry.base import BaseGeometry
 
@@ -49,6 +51,14 @@ def _get_location(geom: BaseGeometry) -> Optional[List[float]]:
     return None
 
 
+def _issue_type_for_reason(reason: str) -> str:
+    """Classify a GEOS validity reason as self_intersection or generic invalid_geometry."""
+    lowered = reason.lower()
+    if "self-intersection" in lowered or "self intersection" in lowered:
+        return IssueType.SELF_INTERSECTION
+    return IssueType.INVALID_GEOMETRY
+
+
 def _check_geometry(geom: Any, feature_id: Any) -> List[dict]:
     """
     Check a single geometry and return a list of issue dicts.
@@ -80,10 +90,9 @@ def _check_geometry(geom: Any, feature_id: Any) -> List[dict]:
             reason = str(is_valid_reason(geom))
         except Exception:
             reason = "Invalid geometry"
-        issue_type = IssueType.SELF_INTERSECTION if "self-intersection" in reason.lower() or "self intersection" in reason.lower() else IssueType.INVALID_GEOMETRY
         issues.append({
             "feature_id": feature_id,
-            "type": issue_type,
+            "type": _issue_type_for_reason(reason),
             "severity": Severity.CRITICAL,
             "location": _get_location(geom),
             "description": reason or "Invalid geometry",
@@ -92,21 +101,100 @@ def _check_geometry(geom: Any, feature_id: Any) -> List[dict]:
     return issues
 
 
+def _normalize_feature_id(feature_id: Any) -> Any:
+    """Python int for int/float ids (bools excluded), str for everything else."""
+    if isinstance(feature_id, (int, float)) and not isinstance(feature_id, bool):
+        return int(feature_id)
+    return str(feature_id)
+
+
+def _validity_reasons(geoms: np.ndarray) -> List[str]:
+    """is_valid_reason for each geometry; per-geometry fallback if the batch call fails."""
+    try:
+        return [str(r) for r in is_valid_reason(geoms)]
+    except Exception:
+        pass
+    reasons: List[str] = []
+    for geom in geoms:
+        try:
+            reasons.append(str(is_valid_reason(geom)))
+        except Exception:
+            reasons.append("Invalid geometry")
+    return reasons
+
+
+def _locations(geoms: np.ndarray) -> List[Optional[List[float]]]:
+    """Centroid [x, y] per geometry; falls back to _get_location where the centroid is unusable."""
+    try:
+        coords, owner = shapely.get_coordinates(shapely.centroid(geoms), return_index=True)
+    except Exception:
+        return [_get_location(g) for g in geoms]
+    out: List[Optional[List[float]]] = [None] * len(geoms)
+    found = np.zeros(len(geoms), dtype=bool)
+    for (x, y), k in zip(coords, owner):
+        out[k] = [float(x), float(y)]
+        found[k] = True
+    for k in np.flatnonzero(~found):
+        out[k] = _get_location(geoms[k])
+    return out
+
+
 def validate_geometries(gdf: gpd.GeoDataFrame) -> List[dict]:
     """
     Run geometry validation on a GeoDataFrame.
     Returns a list of issue dicts with feature_id, type, severity, location, description.
     Uses the GeoDataFrame index as feature_id unless an 'id' column exists.
+
+    Checks run column-wise over the whole GeometryArray (is_missing, is_empty, is_valid);
+    validity reasons and centroids are computed only for invalid rows. Produces the same
+    issues, in row order, as applying _check_geometry to each feature.
     """
     if gdf is None or gdf.empty or gdf.geometry is None:
         return []
 
+    geoms = np.asarray(gdf.geometry.values, dtype=object)
+    missing = shapely.is_missing(geoms)
+    empty = shapely.is_empty(geoms) & ~missing
+    checked = ~missing & ~empty
+    invalid = np.zeros(len(geoms), dtype=bool)
+    invalid[checked] = ~shapely.is_valid(geoms[checked])
+
+    invalid_pos = np.flatnonzero(invalid)
+    reasons = dict(zip(invalid_pos, _validity_reasons(geoms[invalid_pos])))
+    locations = dict(zip(invalid_pos, _locations(geoms[invalid_pos])))
+
+    flagged = np.flatnonzero(missing | empty | invalid)
+    if not len(flagged):
+        return []
+    labels = list(gdf.index)
+    ids = gdf["id"].to_numpy() if "id" in gdf.columns else None
+
     issues: List[dict] = []
-    for idx, geom in gdf.geometry.items():
-        try:
-            feature_id = gdf.loc[idx, "id"] if "id" in gdf.columns else idx
-        except Exception:
-            feature_id = idx
-        feature_id = int(feature_id) if isinstance(feature_id, (int, float)) and not isinstance(feature_id, bool) else str(feature_id)
-        issues.extend(_check_geometry(geom, feature_id))
+    for k in flagged:
+        feature_id = _normalize_feature_id(ids[k] if ids is not None else labels[k])
+        if missing[k]:
+            issues.append({
+                "feature_id": feature_id,
+                "type": IssueType.EMPTY_GEOMETRY,
+                "severity": Severity.CRITICAL,
+                "location": None,
+                "description": "Null geometry",
+            })
+        elif empty[k]:
+            issues.append({
+                "feature_id": feature_id,
+                "type": IssueType.EMPTY_GEOMETRY,
+                "severity": Severity.CRITICAL,
+                "location": None,
+                "description": "Empty geometry",
+            })
+        else:
+            reason = reasons[k]
+            issues.append({
+                "feature_id": feature_id,
+                "type": _issue_type_for_reason(reason),
+                "severity": Severity.CRITICAL,
+                "location": locations[k],
+                "description": reason or "Invalid geometry",
+            })
     return issues
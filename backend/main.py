@@ -1,14 +1,30 @@
 """FastAPI application entry point."""
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 
 from api.routes import router
+from api.upload_limit import UploadSizeLimitMiddleware
 from core.config import settings
+from services.tiled_topology import shutdown_topology_pool
+from services.validation_runner import resume_validation_jobs, shutdown_validation_executor
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Resume queued validation jobs on startup; release the worker pools on shutdown."""
+    resume_validation_jobs()
+    yield
+    shutdown_validation_executor(wait=False)
+    shutdown_topology_pool(wait=False)
+
 
 app = FastAPI(
     title="GeoSpatial Data Quality Agent API",
     description="API for uploading and validating geospatial datasets",
     version="0.1.0",
+    lifespan=lifespan,
 )
 
 app.add_middleware(
@@ -19,6 +35,8 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+app.add_middleware(UploadSizeLimitMiddleware)
+
 app.include_router(router, prefix="/api/v1")
 
 
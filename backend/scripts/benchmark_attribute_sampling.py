@@ -0,0 +1,101 @@
+"""
+A/B benchmark of attribute sampling strategies: seeded errors that reach the LLM prompt.
+
+Builds a synthetic layer with known errors (misspelled and invalid categories, missing
+values, numeric outliers), samples it with each strategy as the attribute agent does, and
+counts the distinct error values that appear in the data the prompt is packed with
+(services.llm_service.pack_attribute_data, same settings), next to its token count. No LLM
+is called.
+
+Run from backend directory:
+    python scripts/benchmark_attribute_sampling.py [--rows 20000] [--seeds 20]
+"""
+import argparse
+import sys
+from pathlib import Path
+from typing import Any, Dict, List, Set, Tuple
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from core.config import settings  # noqa: E402
+from services.attribute_extractor import sample_attributes  # noqa: E402
+from services.attribute_llm_cost import count_tokens, get_tokenizer  # noqa: E402
+from services.llm_service import build_attribute_validation_prompt, pack_attribute_data  # noqa: E402
+
+STRATEGIES = ("uniform", "stratified")
+ROWS_PER_ERROR = 3
+
+LANDUSE = {"residential": 0.6, "commercial": 0.15, "industrial": 0.1, "park": 0.1, "agricultural": 0.05}
+OWNER = {"private": 0.7, "public": 0.2, "municipal": 0.1}
+# field -> seeded error values (None: missing value)
+ERRORS: Dict[str, List[Any]] = {
+    "landuse": ["residental", "Comercial", "industrail", None],
+    "owner": ["privat", "N/A", None],
+    "height_m": [1250.0, -999.0, None],
+    "floors": [250, 0],
+}
+
+
+def make_layer(rows: int, seed: int = 0) -> pd.DataFrame:
+    """Synthetic attribute table with each ERRORS value written into ROWS_PER_ERROR rows."""
+    rng = np.random.default_rng(seed)
+    df = pd.DataFrame({
+        "id": np.arange(rows),
+        "landuse": rng.choice(list(LANDUSE), size=rows, p=list(LANDUSE.values())).astype(object),
+        "owner": rng.choice(list(OWNER), size=rows, p=list(OWNER.values())).astype(object),
+        "street": np.array([f"Street {k}" for k in range(300)], dtype=object)[rng.integers(0, 300, rows)],
+        "height_m": rng.normal(12.0, 4.0, rows).round(1),
+        "floors": rng.integers(1, 11, rows).astype(float),
+    })
+    targets = rng.choice(rows, size=ROWS_PER_ERROR * sum(map(len, ERRORS.values())), replace=False)
+    k = 0
+    for field, values in ERRORS.items():
+        for value in values:
+            df.loc[targets[k:k + ROWS_PER_ERROR], field] = value
+            k += ROWS_PER_ERROR
+    return df
+
+
+def visible_errors(data: Dict[str, Any]) -> Set[Tuple[str, Any]]:
+    """Seeded (field, value) errors shown in the packed prompt data."""
+    found = set()
+    for field, values in ERRORS.items():
+        shown = [r.get(field) for r in data["records"]] + list(data["per_field_values"].get(field, []))
+        for value in values:
+            if any(pd.isna(v) if value is None else v == value for v in shown):
+                found.add((field, value))
+    return found
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--rows", type=int, default=20_000)
+    parser.add_argument("--seeds", type=int, default=20)
+    args = parser.parse_args()
+
+    total = sum(map(len, ERRORS.values()))
+    print(f"{args.rows} rows, {total} seeded error values x {ROWS_PER_ERROR} rows, {args.seeds} seeds")
+    tokenizer = "tiktoken" if get_tokenizer() is not None else f"estimate (no vocab in {settings.TOKENIZER_VOCAB_DIR})"
+    print(f"prompt budget {settings.ATTRIBUTE_MAX_PROMPT_TOKENS or 'none'} tokens, counted by {tokenizer}")
+    print(f"{'strategy':<12}{'errors shown':>14}{'prompt tokens':>15}{'errors / 1k tokens':>20}")
+    for strategy in STRATEGIES:
+        shown, tokens = [], []
+        for seed in range(args.seeds):
+            df = make_layer(args.rows, seed)
+            records, per_field = sample_attributes(
+                df, sample_size=settings.ATTRIBUTE_SAMPLE_SIZE, random_state=seed, strategy=strategy
+            )
+            shown.append(len(visible_errors(pack_attribute_data(records, per_field))))
+            tokens.append(count_tokens(build_attribute_validation_prompt(records, per_field)))
+        mean_shown, mean_tokens = float(np.mean(shown)), float(np.mean(tokens))
+        print(
+            f"{strategy:<12}{mean_shown:>9.1f} / {total:<2}{mean_tokens:>15.0f}"
+            f"{1000 * mean_shown / mean_tokens:>20.2f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
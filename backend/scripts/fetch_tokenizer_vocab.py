@@ -0,0 +1,38 @@
+"""
+Download the tokenizer vocabulary for OPENAI_MODEL into TOKENIZER_VOCAB_DIR.
+
+services.attribute_llm_cost counts prompt tokens with tiktoken but never downloads at
+runtime; it loads the BPE file from TOKENIZER_VOCAB_DIR (tiktoken's cache layout). Run this
+once where the network is available (the Docker image runs it at build time), or copy the
+directory to offline machines.
+
+Run from backend directory:
+    python scripts/fetch_tokenizer_vocab.py [model ...]
+"""
+import os
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from core.config import settings  # noqa: E402
+from services.attribute_llm_cost import tokenizer_encoding_name, tokenizer_vocab_path  # noqa: E402
+
+try:
+    import tiktoken
+except ImportError as e:
+    print("Requires tiktoken. Install with: pip install tiktoken")
+    raise SystemExit(1) from e
+
+
+def main():
+    vocab_dir = Path(settings.TOKENIZER_VOCAB_DIR).resolve()
+    vocab_dir.mkdir(parents=True, exist_ok=True)
+    os.environ["TIKTOKEN_CACHE_DIR"] = str(vocab_dir)
+    for name in dict.fromkeys(tokenizer_encoding_name(m) for m in (sys.argv[1:] or [settings.OPENAI_MODEL])):
+        tiktoken.get_encoding(name)
+        print(f"{name}: {tokenizer_vocab_path(name, str(vocab_dir))}")
+
+
+if __name__ == "__main__":
+    main()
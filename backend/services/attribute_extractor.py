@@ -5,7 +5,18 @@ Provides two representations:
 - Per-feature records: list of dicts (feature_id + attribute columns), for cross-feature consistency.
 - Per-field value lists: dict of column name -> list of values, for outlier/typo analysis per field.
 
+sample_attributes returns both from one sample of the rows.
+
+Before sampling, profile_attributes profiles every attribute column over all rows (null rates,
+distinct counts, top values, quantiles) and reports what needs no judgement directly: missing
+values, numeric outliers (IQR fences or median absolute deviation), values that do not match
+a column's type, and spelling variants of the same value ("Main St" / "main street" /
+"Mian Street", services.near_duplicates). Only free-text fields, where other errors need the
+LLM, are left for it (ambiguous_fields).
+
 Sampling limits row count to control token usage and cost; geometry is never included in output.
+The default stratified strategy orders the sample so the rows the prompt keeps cover each
+column's rare values, nulls and extremes; "uniform" is a plain random sample.
 
 Trade-offs and defaults:
 - Default sample size is 500 (DEFAULT_ATTRIBUTE_SAMPLE_SIZE). Callers can pass sample_size or use
@@ -13,24 +24,160 @@ Trade-offs and defaults:
 - Larger sample_size improves coverage (more features seen by the LLM) but increases tokens and cost.
 - Use random_state for reproducible runs (e.g. in tests or repeat validations).
 """
-from typing import Any, Dict, List, Optional, Union
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Tuple, Union
 
 import geopandas as gpd
+import numpy as np
 import pandas as pd
 
+from core.config import settings
+from services.near_duplicates import cluster_values, looks_like_addresses, normalize_value
+
 
 # Default sample size when not specified (balance coverage vs token cost for GPT-4).
 DEFAULT_ATTRIBUTE_SAMPLE_SIZE = 500
 
+# Field profiling. Values per profile top list; outlier checks need at least
+# _MIN_VALUES_FOR_OUTLIERS values. IQR method: outside [q1 - 1.5 IQR, q3 + 1.5 IQR]. MAD
+# method: modified z-score 0.6745 * (x - median) / MAD above 3.5 (Iglewicz & Hoaglin).
+# A text column whose values are at least _NUMERIC_MAJORITY numbers is profiled as numeric.
+_TOP_K = 5
+_MIN_VALUES_FOR_OUTLIERS = 10
+_IQR_FENCE = 1.5
+_MAD_Z = 3.5
+_MAD_SCALE = 0.6745
+_NUMERIC_MAJORITY = 0.9
+# Spellings listed per variant issue.
+_VARIANTS_SHOWN = 10
+# Stratified sampling: lowest and highest values taken per numeric column.
+_EXTREMES_PER_SIDE = 3
+
+
+def _attribute_columns(gdf: gpd.GeoDataFrame, max_fields: Optional[int]) -> List[Any]:
+    """Attribute column names (geometry dropped), limited to the first max_fields (issue #70)."""
+    geom_col = gdf.geometry.name if hasattr(gdf, "geometry") and gdf.geometry is not None else None
+    cols = [c for c in gdf.columns if c != geom_col]
+    if max_fields is not None and max_fields > 0:
+        cols = cols[:max_fields]
+    return cols
+
+
+def _column_targets(column: pd.Series, perm: np.ndarray, cap: int) -> List[int]:
+    """
+    Row positions that show what is unusual in one column, most telling first (at most cap).
+
+    Numeric columns: the _EXTREMES_PER_SIDE lowest and highest values, alternating. Other
+    columns: one row per distinct value, rarest first (common values reach the sample
+    through the other columns' rows anyway). A null, if any, comes third. Ties go to the
+    earlier row in perm, so a seed picks among equally rare rows.
+    """
+    missing = column.isna().to_numpy()[perm]
+    targets: List[int] = []
+    if pd.api.types.is_numeric_dtype(column) and not pd.api.types.is_bool_dtype(column):
+        values = column.to_numpy(dtype="float64", na_value=np.nan)[perm]
+        present = np.flatnonzero(~missing)
+        k = min(_EXTREMES_PER_SIDE, len(present))
+        if k:
+            v = values[present]
+            low = present[np.argpartition(v, k - 1)[:k]] if k < len(v) else present
+            high = present[np.argpartition(-v, k - 1)[:k]] if k < len(v) else present
+            low = low[np.lexsort((low, values[low]))]
+            high = high[np.lexsort((high, -values[high]))]
+            targets = [int(p) for pair in zip(low, high) for p in pair]
+    else:
+        codes, uniques = _factorize_text(column)
+        codes = codes[perm]
+        present = np.flatnonzero(codes >= 0)
+        if len(present):
+            # First row of each value in perm order.
+            used, first_index = np.unique(codes[present], return_index=True)
+            first = present[first_index]
+            counts = np.bincount(codes[present], minlength=len(uniques))[used]
+            targets = first[np.lexsort((first, counts))][:cap].tolist()
+    if missing.any():
+        targets.insert(min(2, len(targets)), int(np.argmax(missing)))
+    return [int(perm[p]) for p in dict.fromkeys(targets)][:cap]
+
+
+def _stratified_positions(
+    df: pd.DataFrame,
+    cols: List[Any],
+    n: int,
+    random_state: Optional[int],
+) -> np.ndarray:
+    """
+    Positions of n rows of df, most informative first: round-robin over the columns'
+    _column_targets (rare values, nulls, extremes), then random rows to fill up. Every
+    column gets one row before any gets a second, so the first rows, which the prompt is
+    packed from (services.llm_service.pack_attribute_data), show each column's most unusual value.
+    """
+    perm = np.random.default_rng(random_state).permutation(len(df))
+    targets = [_column_targets(df[c], perm, n) for c in cols if c != "id"]
+    chosen: Dict[int, None] = {}
+    for rank in range(max((len(t) for t in targets), default=0)):
+        for t in targets:
+            if rank < len(t):
+                chosen.setdefault(t[rank])
+                if len(chosen) == n:
+                    return np.fromiter(chosen, dtype=np.int64, count=n)
+    taken = np.zeros(len(df), dtype=bool)
+    taken[list(chosen)] = True
+    rest = perm[~taken[perm]][: n - len(chosen)]
+    return np.r_[np.fromiter(chosen, dtype=np.int64, count=len(chosen)), rest]
+
+
+def sample_attributes(
+    gdf: gpd.GeoDataFrame,
+    sample_size: Optional[int] = None,
+    random_state: Optional[int] = None,
+    max_fields: Optional[int] = None,
+    strategy: Optional[str] = None,
+) -> Tuple[List[Dict[str, Any]], Dict[str, List[Any]]]:
+    """
+    Sample rows once and return both views of them: (records, per-field values).
 
-def _get_feature_id(row: pd.Series, idx: Any) -> Any:
-    """Use 'id' column if present, else index (aligned with core.validation)."""
-    if "id" in row.index:
-        try:
-            return row["id"]
-        except Exception:
-            pass
-    return idx
+    Rows are sampled before columns are selected, so only the sampled rows of a wide table
+    are copied; the sample is the same as get_attribute_records / get_attribute_columns with
+    the same arguments. Values become native Python types through DataFrame.to_dict (numpy
+    scalars are boxed column-wise, no per-value .item()).
+
+    Strategies:
+    - "stratified": rows are picked and ordered to cover each column's rare values, nulls,
+      numeric extremes and distinct categories first (_stratified_positions), so the
+      records and per-field values the prompt keeps are where errors are most likely.
+      Applied even when every row fits, since the prompt only keeps the first rows.
+    - "uniform": a uniform random sample (DataFrame.sample), rows in sample order.
+
+    Args:
+        gdf: GeoDataFrame (geometry column is dropped).
+        sample_size: Max number of rows. If None, uses DEFAULT_ATTRIBUTE_SAMPLE_SIZE.
+        random_state: Seed for reproducible sampling.
+        max_fields: If set, only the first N attribute columns are included (issue #70).
+        strategy: "stratified" or "uniform"; default settings.ATTRIBUTE_SAMPLING_STRATEGY.
+
+    Returns:
+        (records, per_field): records as in get_attribute_records, per_field as in
+        get_attribute_columns. ([], {}) if there are no rows or no attribute columns.
+    """
+    if gdf is None or gdf.empty:
+        return [], {}
+    cols = _attribute_columns(gdf, max_fields)
+    if not cols:
+        return [], {}
+
+    n = sample_size if sample_size is not None else DEFAULT_ATTRIBUTE_SAMPLE_SIZE
+    if (strategy or settings.ATTRIBUTE_SAMPLING_STRATEGY).lower() == "uniform":
+        rows = gdf.sample(n=n, random_state=random_state) if len(gdf) > n else gdf
+    else:
+        rows = gdf.iloc[_stratified_positions(gdf, cols, min(n, len(gdf)), random_state)]
+    df = rows[cols]
+
+    # feature_id: 'id' column if present, else index (aligned with core.validation).
+    feature_ids = rows["id"].tolist() if "id" in gdf.columns else df.index.tolist()
+    records = [{"feature_id": fid, **rec} for fid, rec in zip(feature_ids, df.to_dict(orient="records"))]
+    per_field = df.to_dict(orient="list")
+    return records, per_field
 
 
 def get_attribute_records(
@@ -38,47 +185,26 @@ def get_attribute_records(
     sample_size: Optional[int] = None,
     random_state: Optional[int] = None,
     max_fields: Optional[int] = None,
+    strategy: Optional[str] = None,
 ) -> List[Dict[str, Any]]:
     """
     Extract attribute data as a list of per-feature records (no geometry).
 
     Each record is a dict with "feature_id" and all attribute column names as keys.
     Use for LLM prompts that need row-level context (e.g. consistency across features).
+    Callers that also need per-field values should use sample_attributes (one pass).
 
     Args:
         gdf: GeoDataFrame (geometry column is dropped).
         sample_size: Max number of rows to return. If None, uses DEFAULT_ATTRIBUTE_SAMPLE_SIZE.
         random_state: Seed for reproducible sampling.
         max_fields: If set, only the first N attribute columns are included (issue #70).
+        strategy: "stratified" or "uniform" (see sample_attributes).
 
     Returns:
         List of dicts; each dict has feature_id and attribute key-value pairs.
     """
-    if gdf is None or gdf.empty:
-        return []
-
-    n = sample_size if sample_size is not None else DEFAULT_ATTRIBUTE_SAMPLE_SIZE
-    # Drop geometry so we don't send WKB/WKT to the LLM
-    geom_col = gdf.geometry.name if hasattr(gdf, "geometry") and gdf.geometry is not None else None
-    cols = [c for c in gdf.columns if c != geom_col]
-    if max_fields is not None and max_fields > 0:
-        cols = cols[:max_fields]
-    if not cols:
-        return []
-
-    df = gdf[cols].copy()
-    if len(df) > n:
-        df = df.sample(n=n, random_state=random_state)
-
-    records: List[Dict[str, Any]] = []
-    for idx, row in df.iterrows():
-        feature_id = _get_feature_id(row, idx)
-        rec: Dict[str, Any] = {"feature_id": feature_id}
-        for c in cols:
-            val = row[c]
-            rec[c] = val.item() if hasattr(val, "item") and callable(getattr(val, "item")) else val
-        records.append(rec)
-    return records
+    return sample_attributes(gdf, sample_size, random_state, max_fields, strategy)[0]
 
 
 def get_attribute_columns(
@@ -86,6 +212,7 @@ def get_attribute_columns(
     sample_size: Optional[int] = None,
     random_state: Optional[int] = None,
     max_fields: Optional[int] = None,
+    strategy: Optional[str] = None,
 ) -> Dict[str, List[Any]]:
     """
     Extract attribute data as per-field value lists (no geometry).
@@ -98,30 +225,295 @@ def get_attribute_columns(
         sample_size: Max number of rows per column. If None, uses DEFAULT_ATTRIBUTE_SAMPLE_SIZE.
         random_state: Seed for reproducible sampling.
         max_fields: If set, only the first N attribute columns (issue #70).
+        strategy: "stratified" or "uniform" (see sample_attributes).
 
     Returns:
         Dict mapping each attribute column name to a list of values (sampled).
     """
-    if gdf is None or gdf.empty:
-        return {}
+    return sample_attributes(gdf, sample_size, random_state, max_fields, strategy)[1]
+
+
+@dataclass
+class FieldProfile:
+    """Statistics of one attribute column over all rows (see profile_attributes)."""
+
+    name: str
+    kind: str  # numeric, text, boolean, datetime, empty or other
+    count: int
+    missing: int
+    distinct: int
+    top_values: List[Tuple[Any, int]] = field(default_factory=list)
+    quantiles: Optional[Dict[str, float]] = None  # min, q1, median, q3, max (numeric fields)
+    # True if distinct / top values / quantiles are estimates (services.streaming_profile).
+    estimated: bool = False
+
+    @property
+    def missing_rate(self) -> float:
+        return self.missing / self.count if self.count else 0.0
+
+
+@dataclass
+class AttributeProfile:
+    """Result of profile_attributes: per-field statistics, issues found, fields left for the LLM."""
+
+    fields: Dict[str, FieldProfile] = field(default_factory=dict)
+    issues: List[Dict[str, Any]] = field(default_factory=list)
+    ambiguous_fields: List[str] = field(default_factory=list)
+
+
+def _profile_issue(feature_id: Any, field_name: str, issue_type: str, suggestion: str) -> Dict[str, Any]:
+    """Issue dict in the services.llm_service.AttributeIssue shape."""
+    return {
+        "feature_id": feature_id,
+        "field": field_name,
+        "issue_type": issue_type,
+        "severity": "warning",
+        "suggestion": suggestion,
+    }
+
+
+def _capped_issues(
+    ids: np.ndarray,
+    positions: np.ndarray,
+    field_name: str,
+    issue_type: str,
+    suggestions: List[str],
+    summary: str,
+    cap: int,
+) -> List[Dict[str, Any]]:
+    """
+    Per-feature issues for the first cap positions (suggestions holds at least their texts),
+    plus one field-level summary for the rest.
+    """
+    issues = [
+        _profile_issue(fid, field_name, issue_type, text)
+        for fid, text in zip(ids[positions[:cap]].tolist(), suggestions[:cap])
+    ]
+    if len(positions) > cap:
+        issues.append(_profile_issue(None, field_name, issue_type, f"{len(positions) - cap} more {summary}"))
+    return issues
+
+
+def _sorted_quantiles(ordered: np.ndarray) -> Dict[str, float]:
+    """min, q1, median, q3, max of an ascending array (linear interpolation, as np.quantile)."""
+    pos = np.array([0.0, 0.25, 0.5, 0.75, 1.0]) * (len(ordered) - 1)
+    lo = np.floor(pos).astype(np.intp)
+    hi = np.minimum(lo + 1, len(ordered) - 1)
+    q = ordered[lo] + (ordered[hi] - ordered[lo]) * (pos - lo)
+    return dict(zip(("min", "q1", "median", "q3", "max"), (float(v) for v in q)))
+
+
+def _outlier_fences(quantiles: Dict[str, float], method: str, mad: float = 0.0) -> Tuple[float, float]:
+    """(low, high) fences of the IQR or MAD rule (mad: median absolute deviation); NaN if spread is 0."""
+    if method == "mad":
+        if mad == 0:
+            return np.nan, np.nan
+        half_width = _MAD_Z * mad / _MAD_SCALE
+        return quantiles["median"] - half_width, quantiles["median"] + half_width
+    iqr = quantiles["q3"] - quantiles["q1"]
+    if iqr == 0:
+        return np.nan, np.nan
+    return quantiles["q1"] - _IQR_FENCE * iqr, quantiles["q3"] + _IQR_FENCE * iqr
 
-    n = sample_size if sample_size is not None else DEFAULT_ATTRIBUTE_SAMPLE_SIZE
-    geom_col = gdf.geometry.name if hasattr(gdf, "geometry") and gdf.geometry is not None else None
-    cols = [c for c in gdf.columns if c != geom_col]
-    if max_fields is not None and max_fields > 0:
-        cols = cols[:max_fields]
-    if not cols:
-        return {}
 
-    df = gdf[cols].copy()
-    if len(df) > n:
-        df = df.sample(n=n, random_state=random_state)
+def _outliers(values: np.ndarray, quantiles: Dict[str, float], method: str) -> Tuple[np.ndarray, float, float]:
+    """(mask, low, high): values outside the fences of the IQR or MAD rule; none if spread is 0."""
+    none = np.zeros(len(values), dtype=bool)
+    if len(values) < _MIN_VALUES_FOR_OUTLIERS:
+        return none, np.nan, np.nan
+    mad = float(np.median(np.abs(values - quantiles["median"]))) if method == "mad" else 0.0
+    low, high = _outlier_fences(quantiles, method, mad)
+    if np.isnan(low):
+        return none, low, high
+    return (values < low) | (values > high), low, high
 
-    out: Dict[str, List[Any]] = {}
-    for c in cols:
-        vals = df[c].tolist()
-        out[c] = [v.item() if hasattr(v, "item") and callable(getattr(v, "item")) else v for v in vals]
-    return out
+
+def _is_text(column: pd.Series) -> bool:
+    return (
+        not pd.api.types.is_bool_dtype(column)
+        and not pd.api.types.is_numeric_dtype(column)
+        and not pd.api.types.is_datetime64_any_dtype(column)
+        and (pd.api.types.is_object_dtype(column) or pd.api.types.is_string_dtype(column))
+    )
+
+
+def _factorize_text(column: pd.Series) -> Tuple[np.ndarray, pd.Series]:
+    """(codes, distinct values as strings); code -1 marks a null. String work runs on the distinct values only."""
+    try:
+        codes, uniques = pd.factorize(column, use_na_sentinel=True)
+    except TypeError:  # unhashable values (e.g. lists): compare their text
+        codes, uniques = pd.factorize(column.astype("string"), use_na_sentinel=True)
+    return codes, pd.Series(uniques, dtype=object).astype("string")
+
+
+def _profile_field(
+    name: str,
+    column: pd.Series,
+    ids: np.ndarray,
+    method: str,
+    cap: int,
+) -> Tuple[FieldProfile, List[Dict[str, Any]]]:
+    """Profile one column and return it with the issues it shows."""
+    n = len(column)
+    profile = FieldProfile(name=name, kind="other", count=n, missing=0, distinct=0)
+    issues: List[Dict[str, Any]] = []
+    numbers: Optional[np.ndarray] = None
+
+    if _is_text(column):
+        codes, uniques = _factorize_text(column)
+        # Blank strings count as missing; they get code -1 like nulls.
+        blank = uniques.str.strip().eq("").fillna(True).to_numpy(dtype=bool)
+        codes = np.where(np.r_[blank, True][codes], -1, codes)  # code -1 indexes the appended True
+        present = np.flatnonzero(codes >= 0)
+        profile.missing = n - len(present)
+        counts = np.bincount(codes[present], minlength=len(uniques))
+        used = np.flatnonzero(counts)
+        top = used[np.argsort(-counts[used], kind="stable")[:_TOP_K]]
+        profile.distinct = int(len(used))
+        profile.top_values = [(uniques.iloc[k], int(counts[k])) for k in top]
+        coerced = pd.to_numeric(uniques.str.strip(), errors="coerce").to_numpy(dtype="float64", na_value=np.nan)
+        parsed = ~np.isnan(coerced[codes[present]])
+        if len(present) and parsed.mean() >= _NUMERIC_MAJORITY:
+            profile.kind = "numeric"
+            bad = present[~parsed]
+            if len(bad):
+                issues += _capped_issues(
+                    ids, bad, name, "type_mismatch",
+                    [f"Expected a number, got {uniques.iloc[c]!r}" for c in codes[bad[:cap]]],
+                    "values are not numbers", cap,
+                )
+            present = present[parsed]
+            numbers = coerced[codes[present]]
+        elif len(present):
+            profile.kind = "text"
+            issues += _variant_issues(name, uniques.iloc[used], counts[used], cap)
+    else:
+        present = np.flatnonzero(~column.isna().to_numpy())
+        profile.missing = n - len(present)
+        values = column.iloc[present]
+        if pd.api.types.is_numeric_dtype(column) and not pd.api.types.is_bool_dtype(column):
+            profile.kind = "numeric"
+            numbers = values.to_numpy(dtype="float64")
+        else:
+            counts = values.value_counts()
+            profile.distinct = int(len(counts))
+            profile.top_values = [
+                (k.item() if hasattr(k, "item") else k, int(v)) for k, v in counts.head(_TOP_K).items()
+            ]
+            if pd.api.types.is_bool_dtype(column):
+                profile.kind = "boolean"
+            elif pd.api.types.is_datetime64_any_dtype(column):
+                profile.kind = "datetime"
+
+    if profile.missing:
+        issues.insert(0, _profile_issue(
+            None, name, "missing_value", f"{profile.missing} of {n} values are missing ({profile.missing / n:.1%})"
+        ))
+    if profile.missing == n:
+        profile.kind = "empty"
+        return profile, issues
+
+    if numbers is not None and len(numbers):
+        # One sort gives the quantiles and, for numeric columns, the distinct and top values.
+        ordered = np.sort(numbers)
+        profile.quantiles = _sorted_quantiles(ordered)
+        if not profile.top_values:
+            starts = np.flatnonzero(np.r_[True, ordered[1:] != ordered[:-1]])
+            runs = np.diff(np.r_[starts, len(ordered)])
+            top = np.argsort(-runs, kind="stable")[:_TOP_K]
+            profile.distinct = int(len(starts))
+            native = int if pd.api.types.is_integer_dtype(column) else float
+            profile.top_values = [(native(ordered[starts[k]]), int(runs[k])) for k in top]
+        outside, low, high = _outliers(numbers, profile.quantiles, method)
+        if outside.any():
+            # Most extreme first: distance beyond the nearer fence.
+            distance = np.maximum(low - numbers, numbers - high)
+            order = np.flatnonzero(outside)[np.argsort(-distance[outside], kind="stable")]
+            issues += _capped_issues(
+                ids, present[order], name, "outlier",
+                [f"Value {v:g} is outside the expected range [{low:g}, {high:g}]" for v in numbers[order[:cap]]],
+                f"values are outside [{low:g}, {high:g}]", cap,
+            )
+    return profile, issues
+
+
+def _variant_issues(name: str, values: pd.Series, counts: np.ndarray, cap: int) -> List[Dict[str, Any]]:
+    """
+    One field-level issue per cluster of variants of the same value (services.near_duplicates).
+    values are the field's distinct strings and counts their frequencies. Clusters whose
+    values normalize identically (case, punctuation, abbreviations) are inconsistencies,
+    clusters joined by edit distance typos; both suggest the most frequent spelling. Street
+    abbreviations and types are only used for address fields: those in
+    settings.ATTRIBUTE_ADDRESS_FIELDS, or whose values mostly look like street names.
+    """
+    raw = values.to_list()
+    address = name in settings.attribute_address_fields_list or looks_like_addresses(raw, counts)
+    clusters = cluster_values(
+        raw, counts, max_distance=settings.ATTRIBUTE_NEAR_DUPLICATE_MAX_DISTANCE, address=address
+    )
+    issues: List[Dict[str, Any]] = []
+    for members in clusters[:cap]:
+        spellings = [raw[k] for k in members]
+        written = ", ".join(repr(v) for v in spellings[:_VARIANTS_SHOWN])
+        if len(spellings) > _VARIANTS_SHOWN:
+            written += f", +{len(spellings) - _VARIANTS_SHOWN} more"
+        if len({normalize_value(v, address) for v in spellings}) == 1:
+            issues.append(_profile_issue(
+                None, name, "inconsistency",
+                f"Same value written {len(spellings)} ways ({written}); use {spellings[0]!r}",
+            ))
+        else:
+            issues.append(_profile_issue(
+                None, name, "typo",
+                f"{len(spellings)} values look like variants of one name ({written}); use {spellings[0]!r}",
+            ))
+    if len(clusters) > cap:
+        issues.append(_profile_issue(
+            None, name, "inconsistency", f"{len(clusters) - cap} more groups of variant spellings"
+        ))
+    return issues
+
+
+def profile_attributes(
+    gdf: Union[gpd.GeoDataFrame, pd.DataFrame],
+    max_fields: Optional[int] = None,
+    *,
+    outlier_method: Optional[str] = None,
+    max_issues_per_field: Optional[int] = None,
+) -> AttributeProfile:
+    """
+    Profile every attribute column over all rows and report deterministic issues.
+
+    Issues use the AttributeIssue shape of services.llm_service (feature_id, field,
+    issue_type, severity, suggestion) with issue_type missing_value, outlier, type_mismatch,
+    inconsistency or typo. The "id" column identifies features and is not profiled.
+
+    Args:
+        gdf: (Geo)DataFrame; the geometry column is ignored.
+        max_fields: If set, only the first N attribute columns (issue #70).
+        outlier_method: "iqr" or "mad"; default settings.ATTRIBUTE_OUTLIER_METHOD.
+        max_issues_per_field: Per-feature issues per field and check; default
+            settings.ATTRIBUTE_PROFILE_MAX_ISSUES_PER_FIELD (the rest are summarized).
+
+    Returns:
+        AttributeProfile with per-field statistics, the issues, and ambiguous_fields: the
+        free-text fields whose values still need the LLM.
+    """
+    result = AttributeProfile()
+    if gdf is None or len(gdf.index) == 0:
+        return result
+    method = (outlier_method or settings.ATTRIBUTE_OUTLIER_METHOD).lower()
+    cap = max(0, max_issues_per_field if max_issues_per_field is not None else settings.ATTRIBUTE_PROFILE_MAX_ISSUES_PER_FIELD)
+    ids = gdf["id"].to_numpy() if "id" in gdf.columns else gdf.index.to_numpy()
+    for name in _attribute_columns(gdf, max_fields):
+        if name == "id":
+            continue
+        profile, issues = _profile_field(name, gdf[name], ids, method, cap)
+        result.fields[name] = profile
+        result.issues.extend(issues)
+        if profile.kind == "text":
+            result.ambiguous_fields.append(name)
+    return result
 
 
 def load_attributes_from_path(
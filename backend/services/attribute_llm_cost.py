@@ -1,59 +1,170 @@
 """
 Token and cost estimation for attribute validation LLM calls (issue #70).
 
-Provides rough input-token estimates for attribute prompts so callers can reason about
-cost and tune ATTRIBUTE_SAMPLE_SIZE / ATTRIBUTE_MAX_RECORDS_IN_PROMPT / etc.
+count_tokens counts tokens with the tokenizer of settings.OPENAI_MODEL (tiktoken), loaded
+offline from settings.TOKENIZER_VOCAB_DIR: the directory holds tiktoken's BPE files under
+tiktoken's cache names (sha1 of the download URL), as written by
+scripts/fetch_tokenizer_vocab.py. The file is read with tiktoken.load.load_tiktoken_bpe
+(checked against tiktoken's expected hash) and the Encoding is built from it directly, so
+nothing is downloaded and TIKTOKEN_CACHE_DIR is left alone. Without tiktoken or a valid vocab
+file, tokens are estimated as characters / CHARS_PER_TOKEN, and a warning is logged the first
+time that happens.
+
+estimate_attribute_prompt_tokens counts the attribute prompt as built and packed by
+services.llm_service, so callers can reason about cost and tune ATTRIBUTE_SAMPLE_SIZE /
+ATTRIBUTE_MAX_PROMPT_TOKENS / etc.
 """
 from __future__ import annotations
 
-import json
+import hashlib
+import logging
+import types
+from functools import lru_cache
+from pathlib import Path
 from typing import Any, Dict, List, Optional
 
+from core.config import settings
+
+try:
+    # In requirements.txt (o200k_base needs tiktoken 0.7); the estimate is used without it.
+    import tiktoken  # type: ignore[import]
+    import tiktoken.registry  # type: ignore[import]
+    from tiktoken.load import load_tiktoken_bpe  # type: ignore[import]
+except ImportError:  # pragma: no cover - handled at runtime
+    tiktoken = None  # type: ignore[assignment]
+
 
 # Approximate characters per token for English/JSON (OpenAI ~4, conservative).
 CHARS_PER_TOKEN = 4
+# Where tiktoken downloads an encoding's BPE file from (the key of its cache file).
+TIKTOKEN_URL = "https://openaipublic.blob.core.windows.net/encodings/{}.tiktoken"
+# Encoding for models tiktoken does not know.
+DEFAULT_ENCODING = "o200k_base"
+
+logger = logging.getLogger(__name__)
+
+_fallback_warned = False
+
+
+def tokenizer_encoding_name(model: Optional[str] = None) -> str:
+    """tiktoken encoding of model (default settings.OPENAI_MODEL)."""
+    model = model or settings.OPENAI_MODEL
+    if tiktoken is None:
+        return DEFAULT_ENCODING
+    try:
+        return tiktoken.encoding_name_for_model(model)
+    except KeyError:
+        return DEFAULT_ENCODING
+
+
+def tokenizer_vocab_path(encoding_name: str, vocab_dir: Optional[str] = None) -> Path:
+    """Path of an encoding's BPE file in the vocab dir (tiktoken cache layout)."""
+    key = hashlib.sha1(TIKTOKEN_URL.format(encoding_name).encode()).hexdigest()
+    return Path(vocab_dir or settings.TOKENIZER_VOCAB_DIR) / key
+
+
+def _encoding_spec(encoding_name: str, vocab_path: Path) -> Dict[str, Any]:
+    """
+    Constructor arguments of a tiktoken encoding, with its ranks read from vocab_path.
+
+    tiktoken's registered constructor holds the encoding's pattern and special tokens and
+    loads the ranks from its download URL; it is run with a load_tiktoken_bpe that reads the
+    local file instead (keeping the expected hash it passes). Encodings stored in another
+    format (gpt2's data gym files) raise instead of downloading.
+    """
+    if encoding_name not in tiktoken.registry.list_encoding_names():  # loads the constructors
+        raise ValueError(f"Unknown tiktoken encoding {encoding_name}")
+    constructor = tiktoken.registry.ENCODING_CONSTRUCTORS[encoding_name]
+
+    def load_local(_url: str, expected_hash: Optional[str] = None) -> Dict[bytes, int]:
+        return load_tiktoken_bpe(str(vocab_path), expected_hash=expected_hash)
+
+    def no_download(*_: Any, **__: Any) -> Dict[bytes, int]:
+        raise ValueError(f"{encoding_name} is not stored as a tiktoken BPE file")
+
+    local = types.FunctionType(
+        constructor.__code__,
+        {**constructor.__globals__, "load_tiktoken_bpe": load_local, "data_gym_to_mergeable_bpe_ranks": no_download},
+        constructor.__name__,
+        constructor.__defaults__,
+        constructor.__closure__,
+    )
+    return local()
+
+
+@lru_cache(maxsize=8)
+def _encoding(encoding_name: str, vocab_dir: str) -> Any:
+    """The tiktoken Encoding, or None if tiktoken or a valid vocab file is missing."""
+    vocab_path = tokenizer_vocab_path(encoding_name, vocab_dir)
+    if tiktoken is None or not vocab_path.is_file():
+        return None
+    try:
+        return tiktoken.Encoding(**_encoding_spec(encoding_name, vocab_path))
+    except Exception:
+        logger.warning("Could not load tokenizer %s from %s", encoding_name, vocab_path, exc_info=True)
+        return None
+
+
+def get_tokenizer(model: Optional[str] = None) -> Any:
+    """tiktoken Encoding for model (default settings.OPENAI_MODEL), or None (see module docstring)."""
+    vocab_dir = str(Path(settings.TOKENIZER_VOCAB_DIR).resolve())
+    return _encoding(tokenizer_encoding_name(model), vocab_dir)
+
+
+def count_tokens(text: str, model: Optional[str] = None) -> int:
+    """Tokens of text for model (default settings.OPENAI_MODEL); estimated without a tokenizer."""
+    global _fallback_warned
+    encoding = get_tokenizer(model)
+    if encoding is None:
+        if not _fallback_warned:
+            _fallback_warned = True
+            logger.warning(
+                "No tokenizer for %s in %s; estimating tokens as characters / %d",
+                tokenizer_encoding_name(model), settings.TOKENIZER_VOCAB_DIR, CHARS_PER_TOKEN,
+            )
+        return (len(text) + CHARS_PER_TOKEN - 1) // CHARS_PER_TOKEN
+    return len(encoding.encode(text, disallowed_special=()))
 
 
 def estimate_attribute_prompt_tokens(
     attribute_records: List[Dict[str, Any]],
     per_field_values: Optional[Dict[str, List[Any]]] = None,
     *,
-    max_records_in_prompt: int = 10,
-    max_values_per_field: int = 15,
+    max_records_in_prompt: Optional[int] = None,
+    max_values_per_field: Optional[int] = None,
     max_fields: Optional[int] = None,
+    max_prompt_tokens: Optional[int] = None,
 ) -> int:
     """
-    Estimate input token count for the attribute validation prompt.
+    Input token count of the attribute validation prompt for this data.
 
-    Uses the same slicing as build_attribute_validation_prompt (records and
-    per_field truncated) plus a fixed instruction size. Useful for comparing
-    naive (full dataset) vs optimized (sampled + truncated) usage.
+    Builds the prompt as build_attribute_validation_prompt does (same caps and token
+    packing) and counts it with count_tokens. Useful for comparing naive (full dataset) vs
+    optimized (sampled + packed) usage.
 
     Args:
-        attribute_records: Full or sampled records (only first max_records_in_prompt used).
-        per_field_values: Full or sampled per-field lists (sliced by max_*).
-        max_records_in_prompt: Same as ATTRIBUTE_MAX_RECORDS_IN_PROMPT.
-        max_values_per_field: Same as ATTRIBUTE_MAX_VALUES_PER_FIELD.
-        max_fields: Same as ATTRIBUTE_MAX_FIELDS (None = all fields).
+        attribute_records: Full or sampled records.
+        per_field_values: Full or sampled per-field lists.
+        max_records_in_prompt: Same as ATTRIBUTE_MAX_RECORDS_IN_PROMPT (default from settings).
+        max_values_per_field: Same as ATTRIBUTE_MAX_VALUES_PER_FIELD (default from settings).
+        max_fields: Same as ATTRIBUTE_MAX_FIELDS (default from settings).
+        max_prompt_tokens: Same as ATTRIBUTE_MAX_PROMPT_TOKENS (default from settings).
 
     Returns:
-        Approximate number of input tokens (instruction + ATTRIBUTE_DATA JSON).
+        Number of input tokens (instruction + ATTRIBUTE_DATA JSON).
     """
-    # Instruction block is ~600 chars in current prompt
-    instruction_chars = 600
-    pf = per_field_values or {}
-    if max_fields is not None and max_fields > 0:
-        keys = list(pf.keys())[:max_fields]
-        pf = {k: pf[k][:max_values_per_field] for k in keys if k in pf}
-    else:
-        pf = {k: v[:max_values_per_field] for k, v in pf.items()}
-    examples = {
-        "records": attribute_records[:max_records_in_prompt],
-        "per_field_values": pf,
-    }
-    data_str = json.dumps(examples, default=str)
-    total_chars = instruction_chars + len(data_str)
-    return max(0, (total_chars + CHARS_PER_TOKEN - 1) // CHARS_PER_TOKEN)
+    # Imported here: services.llm_service imports this module.
+    from services.llm_service import build_attribute_validation_prompt
+
+    prompt = build_attribute_validation_prompt(
+        attribute_records,
+        per_field_values,
+        max_records_in_prompt=max_records_in_prompt,
+        max_values_per_field=max_values_per_field,
+        max_fields=max_fields,
+        max_prompt_tokens=max_prompt_tokens,
+    )
+    return count_tokens(prompt)
 
 
 def estimate_naive_tokens(num_rows: int, num_fields: int, avg_chars_per_value: int = 15) -> int:
@@ -0,0 +1,109 @@
+"""
+Read a dataset in fixed-size row batches (streaming validation of layers larger than RAM).
+
+iter_dataset_batches yields GeoDataFrames of at most batch_size features, indexed by the
+feature's position in the whole layer (so batch issues carry the same feature ids as a full
+read). Only one batch is materialized at a time. Sources, fastest first:
+
+1. the GeoParquet working copy (pyarrow ParquetFile.iter_batches),
+2. the original through GDAL's Arrow stream (pyogrio.open_arrow),
+3. without pyarrow, pyogrio.read_dataframe with skip_features/max_features.
+"""
+from __future__ import annotations
+
+import json
+from pathlib import Path
+from typing import Iterator, Optional, Sequence
+
+import geopandas as gpd
+import numpy as np
+import pyogrio
+import shapely
+from pyproj import CRS
+
+from core.config import settings
+from services.working_copy import get_working_copy_path
+
+try:
+    import pyarrow.parquet as pq
+except ImportError:  # pragma: no cover - optional dependency
+    pq = None  # type: ignore[assignment]
+
+
+def count_features(vector_path: Path) -> int:
+    """Feature count from layer metadata (no geometries read); 0 if unreadable."""
+    copy_path = get_working_copy_path(vector_path)
+    try:
+        if copy_path is not None:
+            return int(pq.ParquetFile(copy_path).metadata.num_rows)
+        return max(0, int(pyogrio.read_info(vector_path, force_feature_count=True).get("features") or 0))
+    except Exception:
+        return 0
+
+
+def _to_geodataframe(batch, geom_col: str, crs, start: int) -> gpd.GeoDataFrame:
+    """Arrow record batch with a WKB column -> GeoDataFrame indexed from start."""
+    df = batch.to_pandas()
+    geoms = shapely.from_wkb(np.asarray(df.pop(geom_col).values, dtype=object))
+    df.index = range(start, start + len(df))
+    return gpd.GeoDataFrame(df, geometry=gpd.GeoSeries(geoms, index=df.index, crs=crs), crs=crs)
+
+
+def _iter_parquet(copy_path: Path, batch_size: int, columns: Optional[Sequence[str]]) -> Iterator[gpd.GeoDataFrame]:
+    parquet = pq.ParquetFile(copy_path)
+    geo = json.loads(parquet.schema_arrow.metadata[b"geo"])
+    geom_col = geo["primary_column"]
+    column_meta = geo["columns"][geom_col]
+    # GeoParquet: an absent "crs" means OGC:CRS84, an explicit null means unknown.
+    crs = CRS.from_json_dict(column_meta["crs"]) if column_meta.get("crs") else None
+    if "crs" not in column_meta:
+        crs = "OGC:CRS84"
+    names = [n for n in parquet.schema_arrow.names if n != geom_col and not n.startswith("__index_level_")]
+    selected = names if columns is None else [c for c in columns if c in names]
+    start = 0
+    for batch in parquet.iter_batches(batch_size=batch_size, columns=[*selected, geom_col]):
+        yield _to_geodataframe(batch, geom_col, crs, start)
+        start += batch.num_rows
+
+
+def _iter_arrow_stream(vector_path: Path, batch_size: int, columns: Optional[Sequence[str]]) -> Iterator[gpd.GeoDataFrame]:
+    with pyogrio.open_arrow(vector_path, batch_size=batch_size, columns=columns, use_pyarrow=True) as (meta, reader):
+        geom_col = meta.get("geometry_name") or "wkb_geometry"
+        start = 0
+        for batch in reader:
+            if batch.num_rows == 0:
+                continue
+            gdf = _to_geodataframe(batch, geom_col, meta.get("crs"), start)
+            start += len(gdf)
+            yield gdf
+
+
+def _iter_skip_features(vector_path: Path, batch_size: int, columns: Optional[Sequence[str]]) -> Iterator[gpd.GeoDataFrame]:
+    total = count_features(vector_path)
+    for start in range(0, total, batch_size):
+        gdf = pyogrio.read_dataframe(vector_path, columns=columns, skip_features=start, max_features=batch_size)
+        gdf.index = range(start, start + len(gdf))
+        yield gdf
+
+
+def iter_dataset_batches(
+    vector_path: Path,
+    *,
+    batch_size: Optional[int] = None,
+    columns: Optional[Sequence[str]] = None,
+) -> Iterator[gpd.GeoDataFrame]:
+    """
+    Yield the dataset as GeoDataFrames of at most batch_size rows (default VALIDATION_BATCH_SIZE).
+
+    columns limits the attribute columns read (geometry is always included).
+    """
+    vector_path = Path(vector_path)
+    size = max(1, batch_size if batch_size is not None else settings.VALIDATION_BATCH_SIZE)
+    cols = list(columns) if columns is not None else None
+    copy_path = get_working_copy_path(vector_path)
+    if copy_path is not None:
+        yield from _iter_parquet(copy_path, size, cols)
+    elif pq is not None:
+        yield from _iter_arrow_stream(vector_path, size, cols)
+    else:
+        yield from _iter_skip_features(vector_path, size, cols)
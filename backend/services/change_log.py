@@ -0,0 +1,64 @@
+"""
+Features changed by apply_correction_overrides since the dataset was last validated in full.
+
+    .derived/changes.json   {"base_key", "config", "source", "changes": [...]}
+
+base_key is the result-cache key (services.result_cache) of the dataset as it was before the
+first recorded edit, config the validation settings at that time, and source the dataset
+file stamps after the last recorded edit. Each change is
+{"position", "feature_id", "old_bounds", "attributes_changed"}: the row position of the
+edited feature, its id and geometry bounds before the edit (None if it had no geometry),
+and whether attributes were overridden.
+
+Edits append to the log while it is current, so several apply calls between two
+validations accumulate. Any other change to the file (new stamps) makes the log stale and
+incremental re-validation (services.incremental_validation) falls back to a full run.
+"""
+from __future__ import annotations
+
+import json
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from services.file_handler import DERIVED_DIR_NAME, get_dataset_stamps, get_derived_path
+from services.result_cache import validation_cache_config, validation_cache_key
+
+
+CHANGE_LOG_NAME = "changes.json"
+
+
+def read_change_log(vector_path: Path) -> Optional[Dict[str, Any]]:
+    """The change log of vector_path, or None if missing, unreadable or stale."""
+    path = Path(vector_path).parent / DERIVED_DIR_NAME / CHANGE_LOG_NAME
+    try:
+        log = json.loads(path.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return None
+    if not isinstance(log, dict) or log.get("source") != get_dataset_stamps(vector_path):
+        return None
+    return log
+
+
+def pending_change_log(vector_path: Path) -> Dict[str, Any]:
+    """
+    The log the next edit extends: the current one, or a new one based on the dataset as it is
+    now. Call before rewriting the file.
+    """
+    log = read_change_log(vector_path)
+    if log is None:
+        log = {"base_key": validation_cache_key(vector_path), "config": validation_cache_config(), "changes": []}
+    return log
+
+
+def write_change_log(vector_path: Path, log: Dict[str, Any]) -> None:
+    """Store log for the dataset's current content (atomic replace)."""
+    log = dict(log, source=get_dataset_stamps(vector_path))
+    path = get_derived_path(vector_path) / CHANGE_LOG_NAME
+    tmp = path.with_suffix(".json.tmp")
+    tmp.write_text(json.dumps(log, default=str), encoding="utf-8")
+    tmp.replace(path)
+
+
+def record_changes(vector_path: Path, log: Dict[str, Any], changes: List[Dict[str, Any]]) -> None:
+    """Append changes to log (from pending_change_log) after the file was rewritten."""
+    write_change_log(vector_path, dict(log, changes=[*log.get("changes", []), *changes]))
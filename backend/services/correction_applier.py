@@ -5,6 +5,12 @@ from typing import Any, Dict, List, Optional
 import geopandas as gpd
 from shapely import wkt as shapely_wkt
 
+from api.models import _to_native
+from services.change_log import pending_change_log, record_changes
+from services.file_handler import forget_dataset_fingerprint
+from services.spatial_index import invalidate_spatial_index
+from services.working_copy import read_dataset
+
 
 def _resolve_feature_index(gdf: gpd.GeoDataFrame, feature_id: Any) -> Optional[Any]:
     """Return GeoDataFrame index for feature_id (matches validation feature_id rules)."""
@@ -24,6 +30,13 @@ def _resolve_feature_index(gdf: gpd.GeoDataFrame, feature_id: Any) -> Optional[A
     return None
 
 
+def _old_bounds(geom: Any) -> Optional[List[float]]:
+    """Bounds of a feature's geometry before an edit; None if it had none."""
+    if geom is None or geom.is_empty:
+        return None
+    return [float(v) for v in geom.bounds]
+
+
 def apply_correction_overrides(
     vector_path: Path,
     corrections: List[Dict[str, Any]],
@@ -31,7 +44,9 @@ def apply_correction_overrides(
     """
     Apply approved corrections that include geometry_wkt and/or attributes.
 
-    Writes updated GeoJSON back to vector_path. Returns the number of features mutated.
+    Writes updated GeoJSON back to vector_path, drops its spatial index and records the
+    changed features in the dataset's change log (services.change_log) for incremental
+    re-validation. Returns the number of features mutated.
     """
     overrides = [
         c
@@ -41,10 +56,16 @@ def apply_correction_overrides(
     if not overrides:
         return 0
 
-    gdf = gpd.read_file(vector_path)
+    # Working copy when current (services.working_copy); the original otherwise. Rewriting
+    # the original below makes the copy stale, so the next read rebuilds it.
+    gdf = read_dataset(vector_path)
+    if gdf is None:
+        gdf = gpd.read_file(vector_path)
     if gdf.empty:
         return 0
 
+    log = pending_change_log(vector_path)
+    changes: Dict[Any, Dict[str, Any]] = {}
     mutated = 0
     for item in overrides:
         feature_id = item.get("feature_id")
@@ -54,6 +75,13 @@ def apply_correction_overrides(
         if row_idx is None:
             continue
 
+        position = gdf.index.get_loc(row_idx)
+        change = changes.get(position) or {
+            "position": int(position),
+            "feature_id": _to_native(gdf.at[row_idx, "id"] if "id" in gdf.columns else row_idx),
+            "old_bounds": _old_bounds(gdf.geometry.iloc[position]),
+            "attributes_changed": False,
+        }
         changed = False
         wkt_text = item.get("geometry_wkt")
         if wkt_text and str(wkt_text).strip():
@@ -68,11 +96,16 @@ def apply_correction_overrides(
         if attrs:
             for key, value in attrs.items():
                 gdf.at[row_idx, key] = value
+            change["attributes_changed"] = True
             changed = True
 
         if changed:
+            changes[position] = change
             mutated += 1
 
     if mutated:
         gdf.to_file(vector_path, driver="GeoJSON")
+        invalidate_spatial_index(vector_path)
+        forget_dataset_fingerprint(vector_path)
+        record_changes(vector_path, log, list(changes.values()))
     return mutated
@@ -0,0 +1,87 @@
+"""
+Per-run dataset handle shared by the validation agents.
+
+One validation run used to parse the same vector file once per agent (geometry, attribute,
+topology). DatasetHandle reads the file lazily on first access and keeps the GeoDataFrame
+for the rest of the run, so every LangGraph node works on the same in-memory frame.
+
+The handle is carried in ValidationState["dataset"] (see agents.state.empty_state). Agents
+must treat the loaded frame as read-only: it is shared, not copied.
+
+Reads go through services.working_copy, so a dataset with a current GeoParquet working copy
+is loaded from it. In that case agents may ask for a projection (load(columns=..., geometry=...))
+and only those columns are read; without a working copy the full frame is read once and
+returned for every projection, since the text original has to be parsed in full anyway.
+"""
+from __future__ import annotations
+
+import threading
+from pathlib import Path
+from typing import Dict, Optional, Sequence, Tuple, Union
+
+import geopandas as gpd
+
+from services.working_copy import Frame, get_working_copy_path, read_dataset
+
+
+class DatasetHandle:
+    """Lazily loaded, cached GeoDataFrame for one dataset path."""
+
+    def __init__(self, path: Union[str, Path], gdf: Optional[gpd.GeoDataFrame] = None) -> None:
+        self._path = Path(path)
+        self._gdf = gdf
+        self._loaded = gdf is not None
+        self._views: Dict[Tuple[Optional[Tuple[str, ...]], bool], Optional[Frame]] = {}
+        self._lock = threading.Lock()
+
+    @property
+    def path(self) -> Path:
+        """Path of the vector file backing this handle."""
+        return self._path
+
+    @property
+    def is_loaded(self) -> bool:
+        """True once load() has been attempted (successfully or not)."""
+        return self._loaded
+
+    def load(
+        self,
+        columns: Optional[Sequence[str]] = None,
+        geometry: bool = True,
+    ) -> Optional[Frame]:
+        """
+        Return the dataset as a GeoDataFrame, reading the file on first call only.
+
+        Args:
+            columns: Attribute columns needed (None = all). Honoured only when reading from
+                the working copy; otherwise the full frame is returned.
+            geometry: False to request attributes only (a DataFrame when projected).
+
+        Returns None if the file does not exist or cannot be read; the failure is cached
+        too, so an unreadable file is not re-parsed by every agent.
+        """
+        if columns is None and geometry:
+            return self._load_full()
+        if self._loaded or get_working_copy_path(self._path) is None:
+            return self._load_full()
+        key = (tuple(columns) if columns is not None else None, geometry)
+        if key in self._views:
+            return self._views[key]
+        with self._lock:
+            if key not in self._views:
+                self._views[key] = read_dataset(self._path, columns=columns, geometry=geometry)
+        return self._views[key]
+
+    def _load_full(self) -> Optional[gpd.GeoDataFrame]:
+        if self._loaded:
+            return self._gdf
+        with self._lock:
+            if not self._loaded:
+                self._gdf = _read_vector(self._path)
+                self._loaded = True
+        return self._gdf
+
+
+def _read_vector(path: Path) -> Optional[gpd.GeoDataFrame]:
+    """Read the full dataset (working copy or original); None if missing or unreadable."""
+    return read_dataset(path)
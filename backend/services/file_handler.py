@@ -1,13 +1,41 @@
 """File I/O operations for uploads and outputs."""
+import asyncio
+import hashlib
+import json
 import shutil
 import uuid
 import zipfile
 from pathlib import Path
-from typing import BinaryIO, Optional
+from typing import Any, BinaryIO, Dict, List, Optional
 
 from core.config import settings
 
 
+# Per-dataset directory for derived artifacts (fingerprint, caches). Not matched by the
+# non-recursive globs in get_primary_vector_path.
+DERIVED_DIR_NAME = ".derived"
+
+# Shapefile sidecars that belong to the same dataset as the .shp (same stem).
+_SHAPEFILE_SIDECARS = (".shx", ".dbf", ".prj", ".cpg")
+
+_HASH_CHUNK_SIZE = 1024 * 1024
+
+# Upload streaming: bytes read from the request per chunk (memory per upload stays ~constant).
+_UPLOAD_CHUNK_SIZE = 1024 * 1024
+
+# Extensions of files that are themselves the dataset's primary vector file, so the hash
+# computed while streaming the upload can seed the fingerprint memo.
+_VECTOR_EXTENSIONS = (".geojson", ".json", ".shp")
+
+
+class UploadTooLargeError(Exception):
+    """Raised by save_upload_stream when the upload exceeds the size limit."""
+
+    def __init__(self, max_bytes: int) -> None:
+        super().__init__(f"Upload exceeds {max_bytes} bytes")
+        self.max_bytes = max_bytes
+
+
 def save_upload(file: BinaryIO, filename: str) -> str:
     """
     Save an uploaded file to UPLOAD_DIR under a new dataset_id.
@@ -22,6 +50,46 @@ def save_upload(file: BinaryIO, filename: str) -> str:
     return dataset_id
 
 
+async def save_upload_stream(file: Any, filename: str, *, max_bytes: Optional[int] = None) -> str:
+    """
+    Stream an upload (anything with an async read(size), e.g. UploadFile) to UPLOAD_DIR.
+
+    The file is written in chunks, so memory use does not grow with upload size. The size
+    limit (default settings.max_upload_size_bytes) is checked as chunks are read: once it is
+    exceeded the partial dataset directory is removed and UploadTooLargeError is raised.
+    For an UploadFile the body has already been received and spooled by the framework by
+    then; the request itself is limited by api.upload_limit.UploadSizeLimitMiddleware.
+    The SHA-256 computed along the way seeds the fingerprint memo for GeoJSON/.shp uploads,
+    so the first validation does not re-read the file to hash it.
+
+    Returns the dataset_id (UUID string).
+    """
+    limit = settings.max_upload_size_bytes if max_bytes is None else max_bytes
+    dataset_id = str(uuid.uuid4())
+    dest_dir = settings.upload_path / dataset_id
+    dest_dir.mkdir(parents=True, exist_ok=True)
+    dest_path = dest_dir / _sanitize_filename(filename)
+    digest = hashlib.sha256()
+    size = 0
+    try:
+        with open(dest_path, "wb") as f:
+            while True:
+                chunk = await file.read(_UPLOAD_CHUNK_SIZE)
+                if not chunk:
+                    break
+                size += len(chunk)
+                if size > limit:
+                    raise UploadTooLargeError(limit)
+                digest.update(chunk)
+                await asyncio.to_thread(f.write, chunk)
+    except BaseException:
+        shutil.rmtree(dest_dir, ignore_errors=True)
+        raise
+    if dest_path.suffix.lower() in _VECTOR_EXTENSIONS:
+        _remember_file_hash(dest_path, digest.hexdigest())
+    return dataset_id
+
+
 def get_upload_path(dataset_id: str) -> Path:
     """Return the directory path for a given dataset_id."""
     return settings.upload_path / dataset_id
@@ -49,6 +117,94 @@ def get_primary_vector_path(dataset_id: str) -> Optional[Path]:
     return None
 
 
+def get_derived_path(vector_path: Path) -> Path:
+    """Return (and create) the derived-artifacts directory next to a dataset's vector file."""
+    path = Path(vector_path).parent / DERIVED_DIR_NAME
+    path.mkdir(parents=True, exist_ok=True)
+    return path
+
+
+def _dataset_files(vector_path: Path) -> List[Path]:
+    """Files whose content defines the dataset: the vector file plus shapefile sidecars."""
+    vector_path = Path(vector_path)
+    files = [vector_path]
+    if vector_path.suffix.lower() == ".shp":
+        for ext in _SHAPEFILE_SIDECARS:
+            for candidate in (vector_path.with_suffix(ext), vector_path.with_suffix(ext.upper())):
+                if candidate.is_file():
+                    files.append(candidate)
+                    break
+    return files
+
+
+def _file_stamp(path: Path) -> List[int]:
+    st = path.stat()
+    return [st.st_size, st.st_mtime_ns]
+
+
+def get_dataset_stamps(vector_path: Path) -> Dict[str, List[int]]:
+    """[size, mtime_ns] per dataset file (vector file + shapefile sidecars), keyed by file name."""
+    return {path.name: _file_stamp(path) for path in _dataset_files(vector_path)}
+
+
+def _sha256_file(path: Path) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(_HASH_CHUNK_SIZE), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def _remember_file_hash(path: Path, sha256: str) -> None:
+    """Record an already computed file hash in the fingerprint memo (see get_dataset_fingerprint)."""
+    memo_path = get_derived_path(path) / "fingerprint"
+    try:
+        memo = json.loads(memo_path.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        memo = {}
+    memo[path.name] = {"stamp": _file_stamp(path), "sha256": sha256}
+    memo_path.write_text(json.dumps(memo), encoding="utf-8")
+
+
+def get_dataset_fingerprint(vector_path: Path) -> str:
+    """
+    Return a SHA-256 content fingerprint for a dataset (vector file + shapefile sidecars).
+
+    File hashes are memoized in the derived directory keyed by (size, mtime), so repeated
+    calls only stat the files; any rewrite re-hashes. apply_correction_overrides also drops
+    the memo (forget_dataset_fingerprint), so a rewrite that keeps the size and lands within
+    the filesystem's mtime granularity is not mistaken for the old content.
+    """
+    vector_path = Path(vector_path)
+    memo_path = get_derived_path(vector_path) / "fingerprint"
+    try:
+        memo = json.loads(memo_path.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        memo = {}
+
+    parts = []
+    changed = False
+    for path in _dataset_files(vector_path):
+        stamp = _file_stamp(path)
+        entry = memo.get(path.name)
+        if not entry or entry.get("stamp") != stamp:
+            entry = {"stamp": stamp, "sha256": _sha256_file(path)}
+            memo[path.name] = entry
+            changed = True
+        parts.append(f"{path.name.lower()}:{entry['sha256']}")
+
+    if changed:
+        memo_path.write_text(json.dumps(memo), encoding="utf-8")
+    if len(parts) == 1:
+        return parts[0].split(":", 1)[1]
+    return hashlib.sha256("\n".join(parts).encode("utf-8")).hexdigest()
+
+
+def forget_dataset_fingerprint(vector_path: Path) -> None:
+    """Drop memoized file hashes so the next fingerprint re-hashes the dataset."""
+    (Path(vector_path).parent / DERIVED_DIR_NAME / "fingerprint").unlink(missing_ok=True)
+
+
 def extract_zip_in_upload_dir(dataset_id: str) -> bool:
     """
     If the dataset directory contains a single .zip file, extract it in place.
@@ -0,0 +1,234 @@
+"""
+Memory-mapped WKB geometry store shared by validation worker processes.
+
+Sending a GeoDataFrame to a process pool pickles every geometry into every worker. Instead,
+a dataset's geometries are written once as flat buffers in its derived directory:
+
+    .derived/geometry/current.json        {"dir": <build>, "source": source file stamps}
+    .derived/geometry/<build>/meta.json    {"count", "crs"}
+    .derived/geometry/<build>/wkb.bin      concatenated WKB, one record per feature
+    .derived/geometry/<build>/offsets.npy  int64[count + 1]; feature i is wkb[off[i]:off[i+1]]
+    .derived/geometry/<build>/bounds.npy   float64[count, 4] (minx, miny, maxx, maxy), NaN if null/empty
+
+Workers open the files with numpy memory maps (attach_geometry_store), so every process on
+the box reads the same page-cache pages instead of holding its own copy; only the features a
+task actually decodes become Shapely objects. Bounds are available without decoding, which
+is what spatial partitioning needs.
+
+Like the working copy, the store records the [size, mtime_ns] of the source files and is
+ignored once the original changes. Each build goes to a fresh subdirectory and current.json
+is switched atomically, so readers never see a half-written store.
+"""
+from __future__ import annotations
+
+import json
+import shutil
+import threading
+import uuid
+from collections import OrderedDict
+from pathlib import Path
+from typing import Dict, Optional, Sequence, Union
+
+import geopandas as gpd
+import numpy as np
+import shapely
+
+from services.file_handler import DERIVED_DIR_NAME, get_dataset_stamps, get_derived_path
+from services.working_copy import read_dataset
+
+
+GEOMETRY_STORE_DIR = "geometry"
+_CURRENT = "current.json"
+
+
+class GeometryStore:
+    """Read-only, memory-mapped view of a dataset's geometries (see module docstring)."""
+
+    def __init__(self, directory: Union[str, Path]) -> None:
+        self.directory = Path(directory)
+        meta = json.loads((self.directory / "meta.json").read_text(encoding="utf-8"))
+        self.count = int(meta["count"])
+        self.crs = meta.get("crs")
+        self._wkb = (
+            np.memmap(self.directory / "wkb.bin", dtype=np.uint8, mode="r")
+            if (self.directory / "wkb.bin").stat().st_size
+            else np.zeros(0, dtype=np.uint8)
+        )
+        self.offsets = np.load(self.directory / "offsets.npy", mmap_mode="r")
+        self.bounds = np.load(self.directory / "bounds.npy", mmap_mode="r")
+
+    def __len__(self) -> int:
+        return self.count
+
+    def wkb(self, i: int) -> Optional[bytes]:
+        """WKB of feature i, or None for a null geometry."""
+        start, stop = int(self.offsets[i]), int(self.offsets[i + 1])
+        return bytes(self._wkb[start:stop]) if stop > start else None
+
+    def geometries(self, indices: Optional[Union[Sequence[int], np.ndarray]] = None) -> np.ndarray:
+        """Decode features (all, or the given positions) into a Shapely object array."""
+        if indices is None:
+            indices = np.arange(self.count)
+        records = np.array([self.wkb(int(i)) for i in indices], dtype=object)
+        if len(records) == 0:
+            return np.empty(0, dtype=object)
+        return shapely.from_wkb(records)
+
+    def geoseries(self, indices: Optional[Union[Sequence[int], np.ndarray]] = None) -> gpd.GeoSeries:
+        """Decoded features as a GeoSeries indexed by position in the dataset."""
+        index = np.arange(self.count) if indices is None else np.asarray(indices, dtype=np.int64)
+        return gpd.GeoSeries(self.geometries(index), index=index, crs=self.crs)
+
+
+def _store_root(vector_path: Path) -> Path:
+    return Path(vector_path).parent / DERIVED_DIR_NAME / GEOMETRY_STORE_DIR
+
+
+def _read_current(root: Path) -> Optional[Dict]:
+    try:
+        return json.loads((root / _CURRENT).read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return None
+
+
+def open_geometry_store(vector_path: Path) -> Optional[GeometryStore]:
+    """Open the current store for vector_path, or None if missing or stale."""
+    root = _store_root(vector_path)
+    meta = _read_current(root)
+    if meta is None:
+        return None
+    try:
+        if meta.get("source") != get_dataset_stamps(vector_path):
+            return None
+        return GeometryStore(root / meta["dir"])
+    except (OSError, ValueError, KeyError):
+        return None
+
+
+class GeometryStoreWriter:
+    """
+    Builds the store for vector_path from geometries appended in feature order, so a layer
+    read in batches (services.batch_reader) never has to be in memory at once.
+
+    Nothing is visible to readers until close() publishes the build; abort() discards it.
+    """
+
+    def __init__(self, vector_path: Path, crs=None) -> None:
+        self.vector_path = Path(vector_path)
+        self.crs = crs
+        self.count = 0
+        self._stamps = get_dataset_stamps(self.vector_path)
+        self._root = get_derived_path(self.vector_path) / GEOMETRY_STORE_DIR
+        self._build = uuid.uuid4().hex
+        self._dir = self._root / self._build
+        self._dir.mkdir(parents=True, exist_ok=True)
+        self._wkb = open(self._dir / "wkb.bin", "wb")
+        self._end = 0
+        self._offsets = [np.zeros(1, dtype=np.int64)]
+        self._bounds = [np.empty((0, 4), dtype=np.float64)]
+
+    def append(self, geometry: Union[gpd.GeoSeries, np.ndarray]) -> None:
+        """Add the next features' geometries."""
+        if isinstance(geometry, gpd.GeoSeries):
+            if self.crs is None:
+                self.crs = geometry.crs
+            geoms = np.asarray(geometry.values, dtype=object)
+        else:
+            geoms = np.asarray(geometry, dtype=object)
+        if not len(geoms):
+            return
+        records = shapely.to_wkb(geoms)
+        lengths = np.fromiter((len(r) if r is not None else 0 for r in records), dtype=np.int64, count=len(records))
+        for r in records:
+            if r is not None:
+                self._wkb.write(r)
+        self._offsets.append(self._end + np.cumsum(lengths))
+        self._end += int(lengths.sum())
+        self._bounds.append(np.asarray(shapely.bounds(geoms), dtype=np.float64))
+        self.count += len(geoms)
+
+    def close(self) -> GeometryStore:
+        """
+        Publish the build as the current store and return it opened. Older builds are
+        removed; processes that still map them keep their pages until they close (POSIX
+        unlink semantics).
+        """
+        self._wkb.close()
+        np.save(self._dir / "offsets.npy", np.concatenate(self._offsets))
+        np.save(self._dir / "bounds.npy", np.concatenate(self._bounds))
+        crs = self.crs
+        crs_text = crs.to_wkt() if hasattr(crs, "to_wkt") else (str(crs) if crs is not None else None)
+        (self._dir / "meta.json").write_text(json.dumps({"count": self.count, "crs": crs_text}), encoding="utf-8")
+        tmp = self._root / f"{_CURRENT}.{self._build}.tmp"
+        tmp.write_text(json.dumps({"dir": self._build, "source": self._stamps}), encoding="utf-8")
+        tmp.replace(self._root / _CURRENT)
+
+        for old in self._root.iterdir():
+            if old.is_dir() and old.name != self._build:
+                shutil.rmtree(old, ignore_errors=True)
+        return GeometryStore(self._dir)
+
+    def abort(self) -> None:
+        """Discard the unpublished build."""
+        self._wkb.close()
+        shutil.rmtree(self._dir, ignore_errors=True)
+
+
+def write_geometry_store(vector_path: Path, geometry: Union[gpd.GeoSeries, np.ndarray], crs=None) -> GeometryStore:
+    """
+    Write geometry (the dataset's current geometries, in feature order) as the store for vector_path.
+
+    Returns the opened store (see GeometryStoreWriter.close).
+    """
+    writer = GeometryStoreWriter(vector_path, crs)
+    try:
+        writer.append(geometry)
+    except BaseException:
+        writer.abort()
+        raise
+    return writer.close()
+
+
+def get_geometry_store(vector_path: Path, gdf: Optional[gpd.GeoDataFrame] = None) -> Optional[GeometryStore]:
+    """
+    Return the current store for vector_path, building it if needed.
+
+    gdf, when given, must be the dataset's current content and is used instead of reading
+    the file. Returns None if the dataset cannot be read.
+    """
+    store = open_geometry_store(vector_path)
+    if store is not None:
+        return store
+    if gdf is None:
+        gdf = read_dataset(vector_path, columns=[])
+        if gdf is None:
+            return None
+    return write_geometry_store(vector_path, gdf.geometry)
+
+
+# Per-process cache of attached stores, so repeated tasks in one worker map the files once.
+# One entry per dataset (its current build), at most _MAX_ATTACHED datasets, least recently
+# used dropped first, so a long-lived worker does not keep every old build mapped.
+_MAX_ATTACHED = 8
+_attached: OrderedDict[str, GeometryStore] = OrderedDict()
+_attached_lock = threading.Lock()
+
+
+def attach_geometry_store(directory: Union[str, Path]) -> GeometryStore:
+    """
+    Attach to a store build directory (GeometryStore.directory) from a worker process.
+
+    Pass the directory (a plain string) to the worker rather than the store or the frame;
+    the mapping is cached per process. Attaching to a new build of a dataset releases the
+    mapping of its previous build.
+    """
+    directory = Path(directory)
+    key = str(directory.parent)
+    with _attached_lock:
+        store = _attached.get(key)
+        if store is None or store.directory != directory:
+            store = _attached[key] = GeometryStore(directory)
+        _attached.move_to_end(key)
+        while len(_attached) > _MAX_ATTACHED:
+            _attached.popitem(last=False)
+    return store
@@ -0,0 +1,266 @@
+"""
+Incremental re-validation after apply_correction_overrides edits a few features.
+
+A full run re-checks every feature; after an edit only the issues that involve the edited
+features, or the area around them, can differ. When the dataset has a current change log
+(services.change_log) and the result of the dataset before the first logged edit is in the
+result cache, run_incremental_validation starts from that result and:
+
+- geometry: drops the issues of the changed features and re-checks those features only;
+- attributes: if any edit changed attributes, re-runs the attribute agent on the whole
+  layer and replaces every attribute issue. Profile issues such as missing-value counts and
+  variant groups describe a column, not a feature, so no per-feature subset is exact;
+  geometry-only edits keep the attribute issues as they were;
+- overlaps: drops the pairs involving a changed feature and re-checks the changed features
+  against their spatial neighbours;
+- dangles: drops and re-checks the lines near a changed feature's old or new position;
+- gaps: drops the gaps bordered by a changed feature or a neighbour of one, and recomputes
+  the holes bordered by those features in a window around the edits (widened until no such
+  hole reaches its edge).
+
+Neighbours come from the persisted spatial index (services.spatial_index). The merged issue
+list is ordered like the workflow's (geometry, attribute, topology gaps, overlaps, dangles),
+kept issues first; corrections are regenerated for the whole list. Streaming-sized layers
+and any missing input fall back to a full run (None).
+"""
+from __future__ import annotations
+
+import logging
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence
+
+import geopandas as gpd
+import numpy as np
+import shapely
+
+from api.models import GeometryIssue, ValidationResult
+from agents.attribute_agent import run as attribute_validation
+from agents.geometry_agent import validate_geodataframe
+from agents.orchestrator import _dict_to_geometry_issue
+from agents.recommendation_agent import run as generate_recommendations
+from agents.topology_agent import _violation_to_geometry_issue
+from core.config import settings
+from core.topology import (
+    TopologyIssueType,
+    _bordering,
+    _coverage_union,
+    _detect_dangles,
+    _detect_overlaps,
+    _feature_ids,
+    _gap_issue,
+    _gap_records,
+    _holes,
+    _valid_polygon_mask,
+)
+from core.validation import IssueType
+from services.change_log import read_change_log, write_change_log
+from services.dataset_loader import DatasetHandle
+from services.result_cache import get_result_cache, validation_cache_config, validation_cache_key
+from services.spatial_index import SpatialIndex, get_spatial_index
+from services.working_copy import read_dataset
+
+
+logger = logging.getLogger(__name__)
+
+_GEOMETRY_TYPES = {IssueType.EMPTY_GEOMETRY, IssueType.INVALID_GEOMETRY, IssueType.SELF_INTERSECTION}
+
+
+def _key(fid: Any) -> str:
+    """Feature ids compare as strings (issues from JSON, ids from the frame)."""
+    return str(fid)
+
+
+def _neighbours(index: SpatialIndex, boxes: Iterable[Sequence[float]], pad: float = 0.0) -> np.ndarray:
+    """Sorted positions of the features whose bounds intersect any of boxes (expanded by pad)."""
+    hits = [index.query((b[0] - pad, b[1] - pad, b[2] + pad, b[3] + pad)) for b in boxes]
+    return np.unique(np.concatenate(hits)) if hits else np.empty(0, dtype=np.int64)
+
+
+def _present_bounds(bounds: np.ndarray) -> List[np.ndarray]:
+    return [b for b in bounds if not np.isnan(b).any()]
+
+
+def _local(gdf: gpd.GeoDataFrame, positions: np.ndarray) -> gpd.GeoDataFrame:
+    """Rows at positions (sorted), keeping their labels so issues carry the same ids."""
+    return gdf.iloc[np.unique(positions)]
+
+
+def _window_gaps(
+    gdf: gpd.GeoDataFrame,
+    index: SpatialIndex,
+    affected: np.ndarray,
+    min_area: float,
+) -> Optional[List[Dict[str, Any]]]:
+    """
+    Gap issues for the holes in the layer's coverage bordered by a feature in affected.
+
+    Polygons whose bounds intersect a window W are unioned together with a frame covering
+    everything outside W, so every hole of the result lies inside W; a hole bordered by an
+    affected feature that touches the frame may continue outside W, and W is doubled until
+    none does (or W covers the layer). Returns None if GEOS cannot compute a union.
+    """
+    bounds = gdf.geometry.bounds.to_numpy()
+    geoms = np.asarray(gdf.geometry.values, dtype=object)
+    polygon = _valid_polygon_mask(geoms)
+    affected = affected[polygon[affected]]
+    if not len(affected):
+        return []
+    extent = np.array([
+        np.nanmin(bounds[:, 0]), np.nanmin(bounds[:, 1]), np.nanmax(bounds[:, 2]), np.nanmax(bounds[:, 3])
+    ])
+    b = bounds[affected]
+    window = np.array([b[:, 0].min(), b[:, 1].min(), b[:, 2].max(), b[:, 3].max()])
+    margin = float((extent[2:] - extent[:2]).max()) + 1.0
+    fids = _feature_ids(gdf)
+    is_affected = np.zeros(len(gdf), dtype=bool)
+    is_affected[affected] = True
+
+    while True:
+        covers_layer = bool((window[:2] <= extent[:2]).all() and (window[2:] >= extent[2:]).all())
+        candidates = index.query(window)
+        candidates = candidates[polygon[candidates]]
+        polys = geoms[candidates]
+        frame = shapely.difference(shapely.box(*(extent[:2] - margin), *(extent[2:] + margin)), shapely.box(*window))
+        try:
+            union = shapely.union(_coverage_union(polys), frame)
+        except shapely.errors.GEOSException:
+            logger.warning("Incremental gap detection failed: union of %d polygons", len(polys), exc_info=True)
+            return None
+        holes = _holes(union)
+        bordering = _bordering(holes, polys)
+        relevant = np.array([bool(is_affected[candidates[border]].any()) for border in bordering], dtype=bool)
+        at_edge = shapely.intersects(holes, frame) if len(holes) else np.zeros(0, dtype=bool)
+        if not (relevant & at_edge).any() or covers_layer:
+            break
+        centre, half = (window[:2] + window[2:]) / 2, (window[2:] - window[:2]).max()
+        window = np.r_[np.maximum(centre - half, extent[:2]), np.minimum(centre + half, extent[2:])]
+
+    keep = relevant & ~at_edge
+    areas = shapely.area(holes)
+    keep &= areas >= min_area
+    return [
+        _gap_issue(location, area, [fids[candidates[k]] for k in border])
+        for location, area, border in _gap_records(
+            holes[keep], areas[keep], [b for b, k in zip(bordering, keep) if k]
+        )
+    ]
+
+
+def _replace(
+    issues: List[GeometryIssue],
+    belongs: Callable[[GeometryIssue], bool],
+    dropped: Callable[[GeometryIssue], bool],
+    added: List[GeometryIssue],
+) -> List[GeometryIssue]:
+    """Issues of one category: those not dropped, in their old order, then the new ones."""
+    return [i for i in issues if belongs(i) and not dropped(i)] + added
+
+
+def run_incremental_validation(dataset_id: str, dataset_path: str) -> Optional[ValidationResult]:
+    """
+    Re-validate a dataset from its change log and the cached result before the edits.
+
+    Returns None when that is not possible (no current change log, base result not cached,
+    validation settings changed since, dataset unreadable); the caller then runs in full.
+    The result is cached under the dataset's current key and the change log is rebased on it.
+    """
+    path = Path(dataset_path)
+    log = read_change_log(path)
+    if log is None or log.get("config") != validation_cache_config():
+        return None
+    cache = get_result_cache()
+    key = validation_cache_key(path)
+    base = cache.get(dataset_id, log["base_key"])
+    if base is None:
+        return None
+    changes = log.get("changes") or []
+    if not changes:
+        result = ValidationResult(dataset_id=dataset_id, issues=base.issues, corrections=base.corrections)
+        cache.put(dataset_id, key, result)
+        return result
+
+    gdf = read_dataset(path, columns=["id"])
+    if gdf is None:
+        return None
+    index = get_spatial_index(path, gdf=gdf)
+    if index is None or index.count != len(gdf):
+        return None
+    changed = np.unique([int(c["position"]) for c in changes if 0 <= int(c["position"]) < len(gdf)])
+    fids = _feature_ids(gdf)
+    bounds = gdf.geometry.bounds.to_numpy()
+    old_boxes = [c["old_bounds"] for c in changes if c.get("old_bounds")]
+    new_boxes = _present_bounds(bounds[changed])
+    changed_ids = {_key(fids[p]) for p in changed} | {_key(c["feature_id"]) for c in changes}
+    attributes_changed = any(c.get("attributes_changed") for c in changes)
+
+    tolerance = settings.TOPOLOGY_TOLERANCE
+    dangle_tolerance = tolerance if tolerance > 0 else 1e-9
+
+    # Geometry: only the changed rows.
+    geometry_new: List[GeometryIssue] = []
+    if settings.GEOMETRY_VALIDATION_ENABLED:
+        geometry_new = [_dict_to_geometry_issue(d) for d in validate_geodataframe(_local(gdf, changed))]
+
+    # Attributes: the whole layer again, if any attribute was edited.
+    attribute_new: Optional[List[GeometryIssue]] = None
+    if attributes_changed:
+        state = {"dataset": DatasetHandle(path), "dataset_path": str(path)}
+        attribute_new = list(attribute_validation(state)["issues"])
+
+    # Overlaps: changed features against the features their new bounds touch.
+    local = _local(gdf, np.r_[changed, _neighbours(index, new_boxes)])
+    overlap_new = [
+        v for v in _detect_overlaps(local, tolerance=tolerance)
+        if _key(v["feature_id"]) in changed_ids or _key(v["other_feature_id"]) in changed_ids
+    ]
+
+    # Dangles: lines near an old or new position may have lost or gained a connection.
+    near = np.unique(np.r_[changed, _neighbours(index, old_boxes + new_boxes, dangle_tolerance)]).astype(np.int64)
+    near_ids = {_key(fids[p]) for p in near} | changed_ids
+    local = _local(gdf, np.r_[near, _neighbours(index, _present_bounds(bounds[near]), dangle_tolerance)])
+    dangle_new = [v for v in _detect_dangles(local, tolerance=dangle_tolerance) if _key(v["feature_id"]) in near_ids]
+
+    # Gaps: every gap bordered by a feature touching an old or new position.
+    affected = np.unique(np.r_[changed, _neighbours(index, old_boxes + new_boxes)]).astype(np.int64)
+    affected_ids = {_key(fids[p]) for p in affected} | changed_ids
+    gap_new = _window_gaps(gdf, index, affected, settings.TOPOLOGY_MIN_GAP_AREA)
+    if gap_new is None:
+        return None
+
+    def is_type(issue_type: str) -> Callable[[GeometryIssue], bool]:
+        return lambda i: i.type == issue_type
+
+    old = base.issues
+    issues = (
+        _replace(old, lambda i: i.type in _GEOMETRY_TYPES, lambda i: _key(i.feature_id) in changed_ids, geometry_new)
+        + _replace(
+            old, lambda i: i.type.startswith("attribute_"), lambda i: attribute_new is not None, attribute_new or []
+        )
+        + _replace(
+            old,
+            is_type(TopologyIssueType.GAP),
+            lambda i: bool({_key(f) for f in i.bordering_feature_ids or []} & affected_ids),
+            [_violation_to_geometry_issue(v) for v in gap_new],
+        )
+        + _replace(
+            old,
+            is_type(TopologyIssueType.OVERLAP),
+            lambda i: _key(i.feature_id) in changed_ids or _key(i.other_feature_id) in changed_ids,
+            [_violation_to_geometry_issue(v) for v in overlap_new],
+        )
+        + _replace(
+            old,
+            is_type(TopologyIssueType.DANGLE),
+            lambda i: _key(i.feature_id) in near_ids,
+            [_violation_to_geometry_issue(v) for v in dangle_new],
+        )
+    )
+    # Anything else (unknown types) is kept as it was.
+    known = _GEOMETRY_TYPES | {TopologyIssueType.GAP, TopologyIssueType.OVERLAP, TopologyIssueType.DANGLE}
+    issues += [i for i in old if i.type not in known and not i.type.startswith("attribute_")]
+
+    corrections = generate_recommendations({"issues": issues})["corrections"]
+    result = ValidationResult(dataset_id=dataset_id, issues=issues, corrections=corrections or None)
+    cache.put(dataset_id, key, result)
+    write_change_log(path, {"base_key": key, "config": log["config"], "changes": []})
+    return result
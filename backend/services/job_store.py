@@ -0,0 +1,243 @@
+"""
+Persistent store for asynchronous validation jobs (POST /validate/async, issue #64).
+
+Jobs live in a SQLite database under OUTPUT_DIR/jobs and completed results are written as
+JSON files next to it, so job state survives restarts and is shared by every uvicorn worker
+on the host (a poll can land on any worker). The table doubles as the work queue: workers
+claim pending jobs with an atomic UPDATE, so a job runs exactly once even when several
+processes drain the queue.
+
+Job lifecycle: pending -> running -> completed | failed. Running jobs whose owning process
+has died (e.g. after a restart) are put back to pending by requeue_orphaned_jobs(). An owner
+is "host:pid:boot", boot being random per process: after a container restart the server is
+PID 1 again on the same host, and only the boot id tells the new process from the old one. Finished
+jobs older than the TTL are removed, with their result files, by purge_expired().
+"""
+from __future__ import annotations
+
+import os
+import socket
+import sqlite3
+import time
+import uuid
+from contextlib import closing
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+from api.models import ValidationResult
+
+
+class JobStatus:
+    """Validation job states (ValidationJobStatus.status)."""
+
+    PENDING = "pending"
+    RUNNING = "running"
+    COMPLETED = "completed"
+    FAILED = "failed"
+
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS validation_jobs (
+    job_id TEXT PRIMARY KEY,
+    dataset_id TEXT NOT NULL,
+    dataset_path TEXT NOT NULL,
+    status TEXT NOT NULL,
+    error TEXT,
+    owner TEXT,
+    created_at REAL NOT NULL,
+    updated_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_validation_jobs_status ON validation_jobs (status, created_at);
+"""
+
+
+# Random per process, so a restarted process that got the same PID is not taken for the old one.
+_BOOT_ID = uuid.uuid4().hex
+
+
+def current_owner() -> str:
+    """Identifier of this worker process ("host:pid:boot"), recorded on claimed jobs."""
+    return f"{socket.gethostname()}:{os.getpid()}:{_BOOT_ID}"
+
+
+def _process_start_time(pid: int) -> Optional[float]:
+    """Start time (epoch seconds) of a local process from /proc, or None where unavailable."""
+    try:
+        stat = Path(f"/proc/{pid}/stat").read_text()
+        btime = next(
+            float(line.split()[1]) for line in Path("/proc/stat").read_text().splitlines() if line.startswith("btime ")
+        )
+        # Fields after the parenthesized command name; starttime is field 22 of the whole line.
+        ticks = float(stat.rpartition(")")[2].split()[19])
+        return btime + ticks / os.sysconf("SC_CLK_TCK")
+    except (OSError, ValueError, IndexError, StopIteration):
+        return None
+
+
+def _owner_is_alive(owner: Optional[str], claimed_at: Optional[float] = None) -> bool:
+    """
+    True if owner is a live process on this host; owners on other hosts are assumed alive.
+
+    This process owns the job only if the boot id matches. Another local PID is alive unless
+    no such process exists or it started after the job was claimed (claimed_at), i.e. the PID
+    was reused.
+    """
+    parts = (owner or "").split(":")
+    if len(parts) not in (2, 3):
+        return False
+    host, pid_text = parts[0], parts[1]
+    boot = parts[2] if len(parts) == 3 else None
+    if host != socket.gethostname():
+        return True
+    try:
+        pid = int(pid_text)
+    except ValueError:
+        return False
+    if pid == os.getpid():
+        return boot == _BOOT_ID
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        pass
+    started = _process_start_time(pid)
+    # /proc/stat btime has one-second resolution.
+    return started is None or claimed_at is None or started <= claimed_at + 1.0
+
+
+class ValidationJobStore:
+    """SQLite job table plus on-disk result files for async validation jobs."""
+
+    def __init__(self, directory: Path) -> None:
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.db_path = self.directory / "jobs.sqlite3"
+        with closing(self._connect()) as conn, conn:
+            conn.executescript(_SCHEMA)
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(self.db_path, timeout=30, isolation_level=None)
+        conn.row_factory = sqlite3.Row
+        conn.execute("PRAGMA journal_mode=WAL")
+        return conn
+
+    def result_path(self, job_id: str) -> Path:
+        """Path of the JSON result file for a job."""
+        return self.directory / f"{job_id}.json"
+
+    def create(self, dataset_id: str, dataset_path: str) -> Dict[str, Any]:
+        """Insert a new pending job and return its status dict."""
+        job_id = str(uuid.uuid4())
+        now = time.time()
+        with closing(self._connect()) as conn:
+            conn.execute(
+                "INSERT INTO validation_jobs (job_id, dataset_id, dataset_path, status, created_at, updated_at) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                (job_id, dataset_id, dataset_path, JobStatus.PENDING, now, now),
+            )
+        return {"job_id": job_id, "dataset_id": dataset_id, "status": JobStatus.PENDING, "error": None, "result": None}
+
+    def claim_next(self, owner: str) -> Optional[Dict[str, Any]]:
+        """
+        Atomically move the oldest pending job to running for owner.
+
+        Returns the claimed row (job_id, dataset_id, dataset_path) or None if the queue is empty.
+        """
+        with closing(self._connect()) as conn:
+            while True:
+                row = conn.execute(
+                    "SELECT job_id, dataset_id, dataset_path FROM validation_jobs "
+                    "WHERE status = ? ORDER BY created_at LIMIT 1",
+                    (JobStatus.PENDING,),
+                ).fetchone()
+                if row is None:
+                    return None
+                cur = conn.execute(
+                    "UPDATE validation_jobs SET status = ?, owner = ?, updated_at = ? "
+                    "WHERE job_id = ? AND status = ?",
+                    (JobStatus.RUNNING, owner, time.time(), row["job_id"], JobStatus.PENDING),
+                )
+                if cur.rowcount == 1:
+                    return dict(row)
+                # Another worker claimed it first; try the next one.
+
+    def complete(self, job_id: str, result: ValidationResult) -> None:
+        """Write the result file and mark the job completed."""
+        path = self.result_path(job_id)
+        tmp = path.with_suffix(".json.tmp")
+        tmp.write_text(result.model_dump_json(), encoding="utf-8")
+        tmp.replace(path)
+        self._set_status(job_id, JobStatus.COMPLETED, None)
+
+    def fail(self, job_id: str, error: str) -> None:
+        """Mark the job failed with an error message."""
+        self._set_status(job_id, JobStatus.FAILED, error)
+
+    def _set_status(self, job_id: str, status: str, error: Optional[str]) -> None:
+        with closing(self._connect()) as conn:
+            conn.execute(
+                "UPDATE validation_jobs SET status = ?, error = ?, updated_at = ? WHERE job_id = ?",
+                (status, error, time.time(), job_id),
+            )
+
+    def get(self, job_id: str) -> Optional[Dict[str, Any]]:
+        """
+        Return the job as a ValidationJobStatus-compatible dict, or None if unknown.
+
+        For completed jobs the ValidationResult is loaded from its result file.
+        """
+        with closing(self._connect()) as conn:
+            row = conn.execute(
+                "SELECT job_id, dataset_id, status, error FROM validation_jobs WHERE job_id = ?",
+                (job_id,),
+            ).fetchone()
+        if row is None:
+            return None
+        job = dict(row)
+        job["result"] = None
+        if job["status"] == JobStatus.COMPLETED:
+            path = self.result_path(job_id)
+            if path.is_file():
+                job["result"] = ValidationResult.model_validate_json(path.read_text(encoding="utf-8"))
+        return job
+
+    def requeue_orphaned_jobs(self) -> int:
+        """Reset running jobs whose owner process is gone back to pending. Returns the count."""
+        with closing(self._connect()) as conn:
+            rows = conn.execute(
+                "SELECT job_id, owner, updated_at FROM validation_jobs WHERE status = ?",
+                (JobStatus.RUNNING,),
+            ).fetchall()
+            requeued = 0
+            for row in rows:
+                if _owner_is_alive(row["owner"], row["updated_at"]):
+                    continue
+                cur = conn.execute(
+                    "UPDATE validation_jobs SET status = ?, owner = NULL, updated_at = ? "
+                    "WHERE job_id = ? AND status = ? AND owner IS ?",
+                    (JobStatus.PENDING, time.time(), row["job_id"], JobStatus.RUNNING, row["owner"]),
+                )
+                requeued += cur.rowcount
+        return requeued
+
+    def has_pending(self) -> bool:
+        """True if at least one job is waiting to be claimed."""
+        with closing(self._connect()) as conn:
+            row = conn.execute(
+                "SELECT 1 FROM validation_jobs WHERE status = ? LIMIT 1", (JobStatus.PENDING,)
+            ).fetchone()
+        return row is not None
+
+    def purge_expired(self, ttl_seconds: float) -> int:
+        """Delete completed/failed jobs (and result files) not updated within ttl_seconds."""
+        cutoff = time.time() - ttl_seconds
+        with closing(self._connect()) as conn:
+            rows = conn.execute(
+                "SELECT job_id FROM validation_jobs WHERE status IN (?, ?) AND updated_at < ?",
+                (JobStatus.COMPLETED, JobStatus.FAILED, cutoff),
+            ).fetchall()
+            for row in rows:
+                self.result_path(row["job_id"]).unlink(missing_ok=True)
+                conn.execute("DELETE FROM validation_jobs WHERE job_id = ?", (row["job_id"],))
+        return len(rows)
@@ -0,0 +1,139 @@
+"""
+Disk-backed cache of LLM responses keyed by prompt (issue #70: token/cost optimization).
+
+Attribute sampling is deterministic (fixed random_state), so re-validating a dataset builds
+byte-identical prompts. LLMResponseCache stores the raw response text in a local SQLite
+database keyed by SHA-256 of (model, max_tokens, prompt), so a repeat prompt costs nothing
+and returns immediately.
+
+- TTL: entries older than ttl_seconds are treated as misses and removed.
+- Size cap: at most max_entries rows; least-recently-used rows are evicted on insert.
+- hits / misses counters are kept per cache instance (see stats()).
+"""
+from __future__ import annotations
+
+import hashlib
+import sqlite3
+import threading
+import time
+from contextlib import closing
+from pathlib import Path
+from typing import Dict, Optional
+
+from core.config import settings
+
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS llm_responses (
+    key TEXT PRIMARY KEY,
+    content TEXT NOT NULL,
+    created_at REAL NOT NULL,
+    accessed_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_llm_responses_accessed ON llm_responses (accessed_at);
+"""
+
+
+class LLMResponseCache:
+    """SQLite LRU + TTL cache mapping prompt keys to LLM response text."""
+
+    def __init__(self, db_path: Path, *, max_entries: int = 10_000, ttl_seconds: float = 7 * 24 * 3600) -> None:
+        self.db_path = Path(db_path)
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        with closing(self._connect()) as conn:
+            conn.executescript(_SCHEMA)
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(self.db_path, timeout=30, isolation_level=None)
+        conn.execute("PRAGMA journal_mode=WAL")
+        return conn
+
+    @staticmethod
+    def make_key(prompt: str, model: str, max_tokens: int) -> str:
+        """Cache key for a prompt sent to model with max_tokens."""
+        digest = hashlib.sha256()
+        digest.update(f"{model}\0{max_tokens}\0".encode("utf-8"))
+        digest.update(prompt.encode("utf-8"))
+        return digest.hexdigest()
+
+    def _count(self, hit: bool) -> None:
+        with self._lock:
+            if hit:
+                self.hits += 1
+            else:
+                self.misses += 1
+
+    def get(self, key: str) -> Optional[str]:
+        """Return cached response text, or None on miss/expiry (counted as a miss)."""
+        now = time.time()
+        with closing(self._connect()) as conn:
+            row = conn.execute(
+                "SELECT content, created_at FROM llm_responses WHERE key = ?", (key,)
+            ).fetchone()
+            if row is not None and now - row[1] > self.ttl_seconds:
+                conn.execute("DELETE FROM llm_responses WHERE key = ?", (key,))
+                row = None
+            if row is not None:
+                conn.execute("UPDATE llm_responses SET accessed_at = ? WHERE key = ?", (now, key))
+        self._count(row is not None)
+        return row[0] if row is not None else None
+
+    def put(self, key: str, content: str) -> None:
+        """Store response text, then drop expired rows and evict LRU rows beyond max_entries."""
+        now = time.time()
+        with closing(self._connect()) as conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO llm_responses (key, content, created_at, accessed_at) VALUES (?, ?, ?, ?)",
+                (key, content, now, now),
+            )
+            conn.execute("DELETE FROM llm_responses WHERE created_at < ?", (now - self.ttl_seconds,))
+            conn.execute(
+                "DELETE FROM llm_responses WHERE key IN ("
+                "SELECT key FROM llm_responses ORDER BY accessed_at DESC LIMIT -1 OFFSET ?)",
+                (max(0, self.max_entries),),
+            )
+
+    def __len__(self) -> int:
+        with closing(self._connect()) as conn:
+            return conn.execute("SELECT COUNT(*) FROM llm_responses").fetchone()[0]
+
+    def stats(self) -> Dict[str, int]:
+        """Hit/miss counters for this instance and the current entry count."""
+        return {"hits": self.hits, "misses": self.misses, "entries": len(self)}
+
+    def clear(self) -> None:
+        """Remove all entries and reset counters."""
+        with closing(self._connect()) as conn:
+            conn.execute("DELETE FROM llm_responses")
+        with self._lock:
+            self.hits = 0
+            self.misses = 0
+
+
+_default_caches: Dict[str, LLMResponseCache] = {}
+_default_lock = threading.Lock()
+
+
+def get_llm_cache() -> Optional[LLMResponseCache]:
+    """
+    Shared cache at OUTPUT_DIR/llm_cache.sqlite3, or None when LLM_CACHE_ENABLED is false.
+
+    One instance per resolved path, so hit/miss counters accumulate across calls.
+    """
+    if not settings.LLM_CACHE_ENABLED:
+        return None
+    db_path = settings.output_path / "llm_cache.sqlite3"
+    with _default_lock:
+        cache = _default_caches.get(str(db_path))
+        if cache is None:
+            cache = _default_caches[str(db_path)] = LLMResponseCache(
+                db_path,
+                max_entries=settings.LLM_CACHE_MAX_ENTRIES,
+                ttl_seconds=settings.LLM_CACHE_TTL_SECONDS,
+            )
+    return cache
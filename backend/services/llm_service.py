@@ -10,15 +10,23 @@ This module focuses on:
 
 The public entry point `validate_attributes_with_llm` is intentionally simple and accepts
 pre-sampled attribute data (e.g. from services.attribute_extractor).
+
+Responses are cached by prompt, model and max_tokens (services.llm_cache), so re-validating
+an unchanged dataset does not call the API again.
 """
 from __future__ import annotations
 
+from collections import Counter
 from dataclasses import dataclass
-from typing import Any, Dict, List, Optional, Protocol
+from typing import Any, Dict, List, Optional, Protocol, Tuple
 
 import json
+import math
+import sqlite3
 
 from core.config import settings
+from services.attribute_llm_cost import count_tokens
+from services.llm_cache import LLMResponseCache, get_llm_cache
 
 try:
     # Optional dependency; tests inject a fake LLM so this import is not required there.
@@ -84,6 +92,207 @@ def _default_llm(config: Optional[AttributeValidationConfig] = None) -> Supports
     )
 
 
+def _response_content(response: Any) -> Optional[str]:
+    """Text content of an LLM response (plain string or LangChain message)."""
+    content = response if isinstance(response, str) else getattr(response, "content", None)
+    return content if isinstance(content, str) else None
+
+
+def _is_json(content: str) -> bool:
+    try:
+        json.loads(content)
+    except json.JSONDecodeError:
+        return False
+    return True
+
+
+def _invoke_with_cache(
+    prompt: str,
+    *,
+    llm: Optional[SupportsInvoke],
+    config: Optional[AttributeValidationConfig],
+    cache: Optional[LLMResponseCache],
+) -> Any:
+    """
+    Send prompt to the LLM, serving identical prompts from the response cache.
+
+    The shared cache (get_llm_cache) is used when no llm is injected; pass `cache`
+    explicitly to cache responses from an injected llm. Only JSON responses are stored,
+    so a malformed answer is retried on the next call. Cache I/O errors fall back to
+    calling the model directly.
+    """
+    if cache is None and llm is None:
+        try:
+            cache = get_llm_cache()
+        except (OSError, sqlite3.Error):
+            cache = None
+    cfg = config or AttributeValidationConfig()
+    key = LLMResponseCache.make_key(prompt, cfg.model, cfg.max_tokens)
+    if cache is not None:
+        try:
+            cached = cache.get(key)
+        except sqlite3.Error:
+            cached = None
+        if cached is not None:
+            return cached
+    client = llm or _default_llm(config)
+    response = client.invoke(prompt)
+    content = _response_content(response)
+    if cache is not None and content is not None and _is_json(content):
+        try:
+            cache.put(key, content)
+        except sqlite3.Error:
+            pass
+    return response
+
+
+_ATTRIBUTE_INSTRUCTIONS = (
+    "You are a geospatial data quality assistant. "
+    "Analyze attribute data for inconsistencies, typos, naming variations, "
+    "missing values, and outliers.\n\n"
+    "Return ONLY valid JSON with the following structure:\n"
+    "{\n"
+    '  "issues": [\n'
+    "    {\n"
+    '      "feature_id": "<string or number or null>",\n'
+    '      "field": "<attribute field name>",\n'
+    '      "issue_type": "inconsistency|typo|missing_value|outlier|other",\n'
+    '      "severity": "critical|warning|info",\n'
+    '      "suggestion": "<short suggestion or normalized value>"\n'
+    "    },\n"
+    "    ...\n"
+    "  ]\n"
+    "}\n\n"
+    "Do not include explanations outside the JSON.\n"
+    "Focus on patterns that indicate data quality problems, not domain semantics.\n"
+    "\n\nATTRIBUTE_DATA=\n"
+)
+
+# Token packing drops the least informative field while fewer records than this fit.
+_MIN_PACKED_RECORDS = 5
+
+
+def _json(value: Any) -> str:
+    return json.dumps(value, default=str)
+
+
+def _field_information(records: List[Dict[str, Any]], values: List[Any], field: str) -> float:
+    """
+    Shannon entropy (bits) of a field's values, counting repeats (values must not be
+    deduplicated first); 0 for a constant field and for one that repeats feature_id in every
+    record (e.g. the "id" column).
+    """
+    if records and all(field in r and r[field] == r.get("feature_id") for r in records):
+        return 0.0
+    counts = Counter(_json(v) for v in values)
+    total = sum(counts.values())
+    return -sum(c / total * math.log2(c / total) for c in counts.values()) if total else 0.0
+
+
+def _fill_attribute_data(
+    records: List[Dict[str, Any]],
+    per_field: Dict[str, List[Any]],
+    dropped: set,
+    budget: int,
+) -> Tuple[Dict[str, Any], List[Tuple[str, Any]]]:
+    """
+    Greedy fill up to budget tokens (data only): one record, then one value of each field,
+    per round, in their given order. A list stops growing at its first item that does not
+    fit. Returns the data and the added items in order ("records" or the field name).
+    """
+    kept = [f for f in per_field if f not in dropped]
+    data: Dict[str, Any] = {"records": [], "per_field_values": {f: [] for f in kept}}
+    used = count_tokens(_json(data))
+    open_lists = {"records": bool(records), **{f: bool(per_field[f]) for f in kept}}
+    added: List[Tuple[str, Any]] = []
+    rank = 0
+    while any(open_lists.values()):
+        for name in open_lists:
+            if not open_lists[name]:
+                continue
+            source = records if name == "records" else per_field[name]
+            if rank >= len(source):
+                open_lists[name] = False
+                continue
+            item = source[rank]
+            if name == "records":
+                item = {k: v for k, v in item.items() if k not in dropped}
+            cost = count_tokens(_json(item)) + 1  # ", " separator
+            if used + cost > budget:
+                open_lists[name] = False
+                continue
+            used += cost
+            (data["records"] if name == "records" else data["per_field_values"][name]).append(item)
+            added.append((name, item))
+        rank += 1
+    return data, added
+
+
+def pack_attribute_data(
+    attribute_records: List[Dict[str, Any]],
+    per_field_values: Optional[Dict[str, List[Any]]] = None,
+    *,
+    max_records_in_prompt: Optional[int] = None,
+    max_values_per_field: Optional[int] = None,
+    max_fields: Optional[int] = None,
+    max_prompt_tokens: Optional[int] = None,
+) -> Dict[str, Any]:
+    """
+    The ATTRIBUTE_DATA embedded in the attribute prompt: {"records", "per_field_values"}.
+
+    Records and per-field values are first cut to the count caps (0 = no cap) and the
+    per-field lists to the first max_fields fields. With a token budget (max_prompt_tokens,
+    default settings.ATTRIBUTE_MAX_PROMPT_TOKENS; 0 = none) the whole prompt, instructions
+    included, is then packed to fit it as counted by count_tokens:
+
+    - per-field lists keep each distinct value once (records already show the rows);
+    - fields that carry no information (constant, or repeating feature_id) are dropped;
+    - records and values are added greedily in sample order, so the sample's first rows
+      (stratified sampling puts rare values there) are kept first;
+    - while fewer than _MIN_PACKED_RECORDS records fit, the field with the lowest entropy
+      is dropped and the data repacked.
+    """
+    n_rec = max_records_in_prompt if max_records_in_prompt is not None else getattr(
+        settings, "ATTRIBUTE_MAX_RECORDS_IN_PROMPT", 0
+    )
+    n_val = max_values_per_field if max_values_per_field is not None else getattr(
+        settings, "ATTRIBUTE_MAX_VALUES_PER_FIELD", 0
+    )
+    n_fld = max_fields if max_fields is not None else getattr(settings, "ATTRIBUTE_MAX_FIELDS", None)
+    budget = max_prompt_tokens if max_prompt_tokens is not None else getattr(
+        settings, "ATTRIBUTE_MAX_PROMPT_TOKENS", 0
+    )
+    pf = per_field_values or {}
+    if n_fld is not None and n_fld > 0:
+        keys = list(pf.keys())[:n_fld]
+        pf = {k: pf[k] for k in keys if k in pf}
+    records = attribute_records[:n_rec] if n_rec and n_rec > 0 else list(attribute_records)
+    pf = {k: (v[:n_val] if n_val and n_val > 0 else list(v)) for k, v in pf.items()}
+    if not budget or budget <= 0:
+        return {"records": records, "per_field_values": pf}
+
+    record_fields = list(dict.fromkeys(k for r in records for k in r if k != "feature_id"))
+    fields = list(dict.fromkeys([*pf, *record_fields]))
+    # Entropy of the value counts, so measured before per-field lists are deduplicated.
+    information = {
+        f: _field_information(records, pf[f] if f in pf else [r.get(f) for r in records], f) for f in fields
+    }
+    pf = {k: list({_json(x): x for x in v}.values()) for k, v in pf.items()}
+    dropped = {f for f in fields if information[f] == 0.0}
+    droppable = sorted((f for f in fields if f not in dropped), key=lambda f: information[f])
+    data_budget = budget - count_tokens(_ATTRIBUTE_INSTRUCTIONS)
+    while True:
+        data, added = _fill_attribute_data(records, pf, dropped, data_budget)
+        if len(data["records"]) >= min(_MIN_PACKED_RECORDS, len(records)) or len(droppable) <= 1:
+            break
+        dropped.add(droppable.pop(0))
+    # Items were counted one by one; drop the last ones if the joined prompt is longer.
+    while added and count_tokens(_ATTRIBUTE_INSTRUCTIONS + _json(data)) > budget:
+        name, _ = added.pop()
+        (data["records"] if name == "records" else data["per_field_values"][name]).pop()
+    return data
+
+
 def build_attribute_validation_prompt(
     attribute_records: List[Dict[str, Any]],
     per_field_values: Optional[Dict[str, List[Any]]] = None,
@@ -91,61 +300,37 @@ def build_attribute_validation_prompt(
     max_records_in_prompt: Optional[int] = None,
     max_values_per_field: Optional[int] = None,
     max_fields: Optional[int] = None,
+    max_prompt_tokens: Optional[int] = None,
 ) -> str:
     """
     Build a prompt for GPT-4 to detect attribute issues (issue #70: token limits).
 
-    Uses settings.ATTRIBUTE_MAX_RECORDS_IN_PROMPT and ATTRIBUTE_MAX_VALUES_PER_FIELD
-    when the optional limits are not provided, to keep prompt size and cost manageable.
+    The data is packed by pack_attribute_data: cut to ATTRIBUTE_MAX_RECORDS_IN_PROMPT /
+    ATTRIBUTE_MAX_VALUES_PER_FIELD / ATTRIBUTE_MAX_FIELDS when set, then filled up to the
+    ATTRIBUTE_MAX_PROMPT_TOKENS input-token budget, counted with the model's tokenizer.
 
     Args:
         attribute_records: List of per-feature dicts, usually including \"feature_id\" and
             attribute columns (from services.attribute_extractor.get_attribute_records).
         per_field_values: Optional mapping of field -> list of values across features
             (from get_attribute_columns), useful for outlier / distribution analysis.
-        max_records_in_prompt: Cap on records embedded in prompt; default from settings.
-        max_values_per_field: Cap on values per field in prompt; default from settings.
+        max_records_in_prompt: Cap on records embedded in prompt (0 = none); default from settings.
+        max_values_per_field: Cap on values per field in prompt (0 = none); default from settings.
         max_fields: If set, only first N fields in per_field_values; default from settings.
+        max_prompt_tokens: Input-token budget of the whole prompt (0 = none); default from settings.
 
     Returns:
         A string prompt instructing the model to return JSON with an \"issues\" list.
     """
-    n_rec = max_records_in_prompt if max_records_in_prompt is not None else getattr(
-        settings, "ATTRIBUTE_MAX_RECORDS_IN_PROMPT", 10
-    )
-    n_val = max_values_per_field if max_values_per_field is not None else getattr(
-        settings, "ATTRIBUTE_MAX_VALUES_PER_FIELD", 15
+    data = pack_attribute_data(
+        attribute_records,
+        per_field_values,
+        max_records_in_prompt=max_records_in_prompt,
+        max_values_per_field=max_values_per_field,
+        max_fields=max_fields,
+        max_prompt_tokens=max_prompt_tokens,
     )
-    n_fld = max_fields if max_fields is not None else getattr(settings, "ATTRIBUTE_MAX_FIELDS", None)
-    pf = per_field_values or {}
-    if n_fld is not None and n_fld > 0:
-        keys = list(pf.keys())[:n_fld]
-        pf = {k: pf[k] for k in keys if k in pf}
-    examples = {
-        "records": attribute_records[:n_rec],
-        "per_field_values": {k: v[:n_val] for k, v in pf.items()},
-    }
-    instructions = (
-        "You are a geospatial data quality assistant. "
-        "Analyze attribute data for inconsistencies, typos, naming variations, "
-        "missing values, and outliers.\n\n"
-        "Return ONLY valid JSON with the following structure:\n"
-        "{\n"
-        '  "issues": [\n'
-        "    {\n"
-        '      "feature_id": "<string or number or null>",\n'
-        '      "field": "<attribute field name>",\n'
-        '      "issue_type": "inconsistency|typo|missing_value|outlier|other",\n'
-        '      "severity": "critical|warning|info",\n'
-        '      "suggestion": "<short suggestion or normalized value>"\n'
-        "    },\n"
-        "    ...\n"
-        "  ]\n"
-        "}\n\n"
-        "Do not include explanations outside the JSON.\n"
-        "Focus on patterns that indicate data quality problems, not domain semantics.\n"
-    )
-    return instructions + "\n\nATTRIBUTE_DATA=\n" + json.dumps(examples, default=str)
+    return _ATTRIBUTE_INSTRUCTIONS + _json(data)
 
 
 def parse_llm_attribute_issues(raw: Any) -> List[AttributeIssue]:
@@ -210,6 +395,7 @@ def validate_attributes_with_llm(
     *,
     llm: Optional[SupportsInvoke] = None,
     config: Optional[AttributeValidationConfig] = None,
+    cache: Optional[LLMResponseCache] = None,
 ) -> List[AttributeIssue]:
     """
     Validate attributes with GPT-4 via LangChain and return structured issues.
@@ -220,6 +406,7 @@ def validate_attributes_with_llm(
         llm: Optional LangChain-compatible LLM with `.invoke(str)`; if None, a default
              ChatOpenAI client is created from settings.
         config: Optional AttributeValidationConfig (model, max_tokens).
+        cache: Optional LLMResponseCache; defaults to the shared cache when llm is None.
 
     Returns:
         List of AttributeIssue dicts. Empty list on error or if no issues found.
@@ -229,8 +416,7 @@ def validate_attributes_with_llm(
 
     prompt = build_attribute_validation_prompt(attribute_records, per_field_values)
     try:
-        client = llm or _default_llm(config)
-        response = client.invoke(prompt)
+        response = _invoke_with_cache(prompt, llm=llm, config=config, cache=cache)
     except Exception:
         # Fail-safe: missing/invalid credentials or API errors yield no issues
         # rather than failing the whole validation pipeline.
@@ -242,6 +428,77 @@ def validate_attributes_with_llm(
 # --- Recommendation suggestions (issue #87) ---
 
 
+# Rough output size of one {"method", "confidence", "explanation"} suggestion, in tokens.
+RECOMMENDATION_TOKENS_PER_SUGGESTION = 60
+# Instruction block of build_recommendation_prompt; the JSON list of issues follows.
+_RECOMMENDATION_INSTRUCTIONS = (
+    "You are a geospatial data quality assistant. For each validation issue below, "
+    "suggest a correction: a short method name (e.g. buffer(0), rename field, snap to grid), "
+    "a confidence score from 0 to 1, and a brief natural-language explanation.\n\n"
+    "Return ONLY valid JSON with this structure (one suggestion per issue, same order as input):\n"
+    "{\n  \"suggestions\": [\n"
+    "    { \"method\": \"...\", \"confidence\": 0.9, \"explanation\": \"...\" },\n"
+    "    ...\n  ]\n}\n\n"
+    "Keep method names short and actionable. Confidence should reflect how likely the fix is to resolve the issue.\n"
+    "\nISSUES=\n"
+)
+
+
+def _compact_recommendation_issue(index: int, iss: Any) -> Dict[str, Any]:
+    """Prompt row for one issue: index, type, severity, truncated description."""
+    if isinstance(iss, dict):
+        row = iss
+    else:
+        row = {"type": getattr(iss, "type", ""), "severity": getattr(iss, "severity", ""), "description": getattr(iss, "description") or ""}
+    return {"index": index, "type": row.get("type", ""), "severity": row.get("severity", ""), "description": (row.get("description") or "")[:200]}
+
+
+def chunk_recommendation_issues(
+    issues: List[Dict[str, Any]],
+    *,
+    max_output_tokens: Optional[int] = None,
+    max_prompt_tokens: Optional[int] = None,
+) -> List[List[int]]:
+    """
+    Split issues into batches whose recommendation request fits the token limits (issue #70).
+
+    A single prompt for thousands of issues asks for more suggestions than OPENAI_MAX_TOKENS
+    allows in the response, so the answer comes back truncated. Each batch is sized so that
+    its expected response (RECOMMENDATION_TOKENS_PER_SUGGESTION per issue) fits in
+    max_output_tokens and its prompt, counted with count_tokens (the model's tokenizer, or
+    its estimate without one), fits in max_prompt_tokens.
+
+    Args:
+        issues: Issue dicts (type, severity, description), as passed to
+                get_recommendation_suggestions_from_llm.
+        max_output_tokens: Response budget per request; default settings.OPENAI_MAX_TOKENS.
+        max_prompt_tokens: Prompt budget per request; default settings.RECOMMENDATION_MAX_PROMPT_TOKENS.
+
+    Returns:
+        Lists of indices into issues, in order; every batch holds at least one issue.
+    """
+    out_budget = max_output_tokens if max_output_tokens is not None else settings.OPENAI_MAX_TOKENS
+    in_budget = max_prompt_tokens if max_prompt_tokens is not None else settings.RECOMMENDATION_MAX_PROMPT_TOKENS
+    # Leave room for the JSON wrapper around the suggestions list.
+    max_per_batch = max(1, (out_budget - 20) // RECOMMENDATION_TOKENS_PER_SUGGESTION)
+    in_budget = max(0, in_budget - count_tokens(_RECOMMENDATION_INSTRUCTIONS + "[]"))
+
+    batches: List[List[int]] = []
+    current: List[int] = []
+    current_tokens = 0
+    for i, iss in enumerate(issues):
+        row = _compact_recommendation_issue(len(current), iss)
+        tokens = count_tokens(_json(row)) + 1  # ", " separator
+        if current and (len(current) >= max_per_batch or current_tokens + tokens > in_budget):
+            batches.append(current)
+            current, current_tokens = [], 0
+        current.append(i)
+        current_tokens += tokens
+    if current:
+        batches.append(current)
+    return batches
+
+
 def build_recommendation_prompt(issues: List[Dict[str, Any]]) -> str:
     """
     Build a prompt for GPT-4 to suggest a fix (method, confidence, explanation) per issue.
@@ -257,24 +514,8 @@ def build_recommendation_prompt(issues: List[Dict[str, Any]]) -> str:
     if not issues:
         return ""
     # Compact representation for the prompt
-    compact = []
-    for i, iss in enumerate(issues):
-        if isinstance(iss, dict):
-            row = iss
-        else:
-            row = {"type": getattr(iss, "type", ""), "severity": getattr(iss, "severity", ""), "description": getattr(iss, "description") or ""}
-        compact.append({"index": i, "type": row.get("type", ""), "severity": row.get("severity", ""), "description": (row.get("description") or "")[:200]})
-    instructions = (
-        "You are a geospatial data quality assistant. For each validation issue below, "
-        "suggest a correction: a short method name (e.g. buffer(0), rename field, snap to grid), "
-        "a confidence score from 0 to 1, and a brief natural-language explanation.\n\n"
-        "Return ONLY valid JSON with this structure (one suggestion per issue, same order as input):\n"
-        "{\n  \"suggestions\": [\n"
-        "    { \"method\": \"...\", \"confidence\": 0.9, \"explanation\": \"...\" },\n"
-        "    ...\n  ]\n}\n\n"
-        "Keep method names short and actionable. Confidence should reflect how likely the fix is to resolve the issue.\n"
-    )
-    return instructions + "\nISSUES=\n" + json.dumps(compact, default=str)
+    compact = [_compact_recommendation_issue(i, iss) for i, iss in enumerate(issues)]
+    return _RECOMMENDATION_INSTRUCTIONS + _json(compact)
 
 
 def parse_recommendation_suggestions(raw: Any) -> List[Dict[str, Any]]:
@@ -319,6 +560,8 @@ def get_recommendation_suggestions_from_llm(
     issues: List[Dict[str, Any]],
     *,
     llm: Optional[SupportsInvoke] = None,
+    cache: Optional[LLMResponseCache] = None,
+    pad_missing: bool = True,
 ) -> List[Dict[str, Any]]:
     """
     Call GPT-4 to get correction suggestions (method, confidence, explanation) for each issue.
@@ -326,6 +569,10 @@ def get_recommendation_suggestions_from_llm(
     Args:
         issues: List of issue dicts (type, severity, description, ...).
         llm: Optional LangChain-compatible LLM; if None, uses default ChatOpenAI.
+        cache: Optional LLMResponseCache; defaults to the shared cache when llm is None.
+        pad_missing: If True (default), fill missing trailing suggestions with a
+                     "manual review" default. If False, a short response is returned as is,
+                     so callers can detect it (see chunk_recommendation_issues).
 
     Returns:
         List of dicts with keys method, confidence, explanation (same order as issues).
@@ -337,13 +584,14 @@ def get_recommendation_suggestions_from_llm(
     if not prompt:
         return []
     try:
-        client = llm or _default_llm()
-        response = client.invoke(prompt)
+        response = _invoke_with_cache(prompt, llm=llm, config=None, cache=cache)
     except Exception:
         # Fail-safe: fall back to rule-based suggestions (caller pads with defaults)
         # when credentials are missing or the API call fails.
         return []
     parsed = parse_recommendation_suggestions(response)
+    if not pad_missing:
+        return parsed[: len(issues)]
     # Pad to match issue count if LLM returned fewer
     while len(parsed) < len(issues):
         parsed.append({"method": "manual review", "confidence": 0.5, "explanation": "No suggestion generated."})
@@ -354,8 +602,10 @@ __all__ = [
     "AttributeIssue",
     "AttributeValidationConfig",
     "build_attribute_validation_prompt",
+    "pack_attribute_data",
     "parse_llm_attribute_issues",
     "validate_attributes_with_llm",
+    "chunk_recommendation_issues",
     "build_recommendation_prompt",
     "parse_recommendation_suggestions",
     "get_recommendation_suggestions_from_llm",
@@ -0,0 +1,357 @@
+"""
+Near-duplicate clustering of categorical values ("Main St" / "Main Street" / "Mian Street").
+
+Used by services.attribute_extractor.profile_attributes on the distinct values of each text
+field, locally and without any network call:
+
+1. Every value is reduced to a key: case-folded, punctuation dropped, whitespace collapsed.
+   In address fields common street abbreviations are expanded too (_ABBREVIATIONS: "St" /
+   "Street", "N" / "North"); elsewhere "S" and "South" may well be different values (a
+   size, a unit), so they are left alone. Values with the same key are variants.
+2. A key is a misspelling of another if their names are within max_distance edits
+   (Levenshtein plus adjacent transpositions, one allowed edit per _CHARS_PER_EDIT
+   characters of the name) and the other key is at least _DOMINANCE times as frequent.
+   Names whose digits differ ("Lot 1" / "Lot 2") never match. In address fields a key
+   ending in a street type ("road", "street", ... after expansion, _STREET_TYPES) is split
+   into its name and that type, and only keys of the same type match: "Hill Road" /
+   "Mill Road" or "Oak Drive" / "Oak Grove", distinct streets of similar frequency, stay
+   apart.
+
+A field counts as an address field when the caller says so (cluster_values(address=True))
+or, by default, when most of its values (by count) are names of two or more words ending in
+a street type (looks_like_addresses).
+
+Candidates for step 2 come from a deletion-neighbourhood index: two names within d edits can
+both be turned into the same string by deleting at most d characters from each. The strings
+every name reaches with up to d deletions are hashed with numpy (polynomial hashes from
+prefix sums, one column per deletion set, the street type mixed in) and sorted; keys sharing
+a hash are candidates and are checked with a banded edit distance. Names longer than
+_MAX_INDEXED_LENGTH (free text rather than categories) are only grouped by step 1.
+
+Clusters are stars, not connected components: keys are visited from the most frequent down,
+and each key joins the most frequent dominant key it is linked to, provided that key is
+itself a cluster centre. A misspelling is never the centre of further misspellings, so
+links do not chain across a long list of similar names. The canonical value of a cluster
+is its most frequent spelling.
+"""
+from __future__ import annotations
+
+import re
+from collections import defaultdict
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+
+# Token -> expansion, applied to whole words of the case-folded value.
+_ABBREVIATIONS: Dict[str, str] = {
+    "st": "street",
+    "str": "street",
+    "ave": "avenue",
+    "av": "avenue",
+    "rd": "road",
+    "dr": "drive",
+    "blvd": "boulevard",
+    "ln": "lane",
+    "ct": "court",
+    "pl": "place",
+    "sq": "square",
+    "hwy": "highway",
+    "pkwy": "parkway",
+    "cres": "crescent",
+    "ter": "terrace",
+    "mt": "mount",
+    "ft": "fort",
+    "n": "north",
+    "s": "south",
+    "e": "east",
+    "w": "west",
+    "ne": "northeast",
+    "nw": "northwest",
+    "se": "southeast",
+    "sw": "southwest",
+}
+
+# Last words of a key (after expansion) that name the kind of street rather than the street.
+# Address fields only, like _ABBREVIATIONS.
+_STREET_TYPES = frozenset({
+    "street", "avenue", "road", "drive", "boulevard", "lane", "court", "place", "square",
+    "highway", "parkway", "crescent", "terrace", "way", "close", "grove", "row", "walk",
+    "circle", "trail", "alley", "path", "gardens", "hill", "park", "view", "mews", "green",
+})
+
+_PUNCTUATION = re.compile(r"[^\w\s]+")
+_WHITESPACE = re.compile(r"\s+")
+_DIGITS = re.compile(r"\d+")
+
+# Allowed edits grow with name length: one per _CHARS_PER_EDIT characters, up to max_distance.
+_CHARS_PER_EDIT = 4
+# A key is only a misspelling of a key at least this many times more frequent.
+_DOMINANCE = 5
+_MAX_INDEXED_LENGTH = 64
+_MAX_DISTANCE = 2
+# Share of a field's values (by count) ending in a street type for it to count as addresses.
+_ADDRESS_SHARE = 0.5
+# Deletion hashes kept in memory at once; larger neighbourhoods are processed in hash partitions.
+_HASHES_PER_PASS = 16_000_000
+_HASH_BASE = np.uint64(0x100000001B3)
+# Spreads street type codes over the high hash bits, which survive the owner packing.
+_TYPE_MIX = np.uint64(0x9E3779B97F4A7C15)
+
+
+def _words(value: str) -> List[str]:
+    return [w for w in _WHITESPACE.split(_PUNCTUATION.sub(" ", value.casefold()).strip()) if w]
+
+
+def normalize_value(value: str, address: bool = False) -> str:
+    """
+    Comparison key of a value: case-folded, no punctuation, single spaces; with address,
+    street abbreviations expanded as well.
+    """
+    words = _words(value)
+    if address:
+        words = [_ABBREVIATIONS.get(w, w) for w in words]
+    return " ".join(words)
+
+
+def split_street_type(key: str) -> Tuple[str, str]:
+    """(name, street type) of a normalized address key; the type is "" if the key does not end in one."""
+    name, _, last = key.rpartition(" ")
+    if name and last in _STREET_TYPES:
+        return name, last
+    return key, ""
+
+
+def looks_like_addresses(values: Sequence[str], counts: Optional[Sequence[int]] = None) -> bool:
+    """True if at least _ADDRESS_SHARE of the values (by count) are street names ("Main St")."""
+    weights = np.asarray(counts if counts is not None else np.ones(len(values)), dtype=np.int64)
+    total = int(weights.sum())
+    if not total:
+        return False
+    streets = 0
+    for value, weight in zip(values, weights.tolist()):
+        words = _words(str(value))
+        if len(words) >= 2 and _ABBREVIATIONS.get(words[-1], words[-1]) in _STREET_TYPES:
+            streets += weight
+    return streets >= _ADDRESS_SHARE * total
+
+
+def bounded_edit_distance(a: str, b: str, limit: int) -> Optional[int]:
+    """
+    Edit distance of a and b if it is at most limit, else None (banded DP, early exit).
+    Insertions, deletions, substitutions and swaps of adjacent characters cost one edit
+    (optimal string alignment distance).
+    """
+    if abs(len(a) - len(b)) > limit:
+        return None
+    if len(a) > len(b):
+        a, b = b, a
+    before: List[int] = []
+    previous = list(range(len(b) + 1))
+    for i, ca in enumerate(a, 1):
+        lo, hi = max(1, i - limit), min(len(b), i + limit)
+        current = [limit + 1] * (len(b) + 1)
+        current[0] = i if i <= limit else limit + 1
+        for j in range(lo, hi + 1):
+            cost = previous[j - 1] + (ca != b[j - 1])
+            if previous[j] + 1 < cost:
+                cost = previous[j] + 1
+            if current[j - 1] + 1 < cost:
+                cost = current[j - 1] + 1
+            if i > 1 and j > 1 and ca == b[j - 2] and a[i - 2] == b[j - 1] and before[j - 2] + 1 < cost:
+                cost = before[j - 2] + 1
+            current[j] = cost
+        if min(current[lo - 1:hi + 1]) > limit:
+            return None
+        before, previous = previous, current
+    return previous[len(b)] if previous[len(b)] <= limit else None
+
+
+def _allowed_edits(name: str, max_distance: int) -> int:
+    return min(max_distance, len(name) // _CHARS_PER_EDIT)
+
+
+def _neighbourhood_size(length: int, d: int) -> int:
+    """Strings reached from a key of length by up to d (<= 2) deletions, with repeats."""
+    return 1 + (length if d >= 1 else 0) + (length * (length - 1) // 2 if d >= 2 else 0)
+
+
+def _deletion_hashes(codes: np.ndarray, d: int) -> np.ndarray:
+    """
+    Hashes of the strings obtained from each row of codes (uint64 [n, L], no zeros) by
+    deleting up to d (<= 2) characters: uint64 [n, _neighbourhood_size(L, d)]. Arithmetic
+    wraps modulo 2**64.
+    """
+    n, length = codes.shape
+    prefix = np.zeros((n, length + 1), dtype=np.uint64)
+    for k in range(length):
+        prefix[:, k + 1] = prefix[:, k] * _HASH_BASE + codes[:, k]
+    power = np.ones(length + 1, dtype=np.uint64)
+    for k in range(length):
+        power[k + 1] = power[k] * _HASH_BASE
+    full = prefix[:, length:]
+    out = [full]
+    if d >= 1:
+        i = np.arange(length)
+        suffix = full - prefix[:, i + 1] * power[length - 1 - i]
+        out.append(prefix[:, i] * power[length - 1 - i] + suffix)
+    if d >= 2:
+        i, j = np.triu_indices(length, 1)
+        middle = prefix[:, j] - prefix[:, i + 1] * power[j - i - 1]
+        suffix = full - prefix[:, j + 1] * power[length - 1 - j]
+        out.append(prefix[:, i] * power[length - 2 - i] + middle * power[length - 1 - j] + suffix)
+    return np.concatenate(out, axis=1)
+
+
+def _candidate_pairs(
+    names: Sequence[str], types: np.ndarray, max_distance: int
+) -> Iterable[Tuple[int, int]]:
+    """
+    Pairs (i, j), i < j, of names of the same type (int codes) sharing a deletion hash (see
+    module docstring); may repeat.
+
+    Each entry packs the key's position into the low bits of its hash, so one sort groups
+    the entries by hash and drops a key's repeats ("aab" reaches "ab" twice). Collisions
+    of the shortened hash only add candidates, which the caller verifies.
+    """
+    lengths = np.fromiter((len(k) for k in names), dtype=np.int64, count=len(names))
+    groups = []
+    for length in np.unique(lengths):
+        d = min(max_distance, int(length) // _CHARS_PER_EDIT)
+        if d > 0 and length <= _MAX_INDEXED_LENGTH:
+            groups.append((int(length), d, np.flatnonzero(lengths == length)))
+    total = sum(len(rows) * _neighbourhood_size(length, d) for length, d, rows in groups)
+    if not total:
+        return
+    owner_bits = np.uint64(max(1, int(len(names) - 1).bit_length()))
+    # Partition by the top hash bits into a power of two of passes.
+    part_bits = max(0, (-(-total // _HASHES_PER_PASS) - 1).bit_length())
+
+    with np.errstate(over="ignore"):
+        for part in range(1 << part_bits):
+            entries = []
+            for length, d, rows in groups:
+                text = "".join(names[r] for r in rows).encode("utf-32-le")
+                codes = np.frombuffer(text, dtype=np.uint32).reshape(len(rows), length).astype(np.uint64) + 1
+                h = _deletion_hashes(codes, d) ^ (types[rows, None].astype(np.uint64) * _TYPE_MIX)
+                if part_bits:
+                    row, column = np.nonzero((h >> np.uint64(64 - part_bits)) == part)
+                    h = h[row, column]
+                else:
+                    row = np.repeat(np.arange(len(rows)), h.shape[1])
+                    h = h.ravel()
+                entries.append((h >> owner_bits << owner_bits) | rows[row].astype(np.uint64))
+            packed = np.concatenate(entries)
+            packed.sort()
+            packed = packed[np.r_[True, packed[1:] != packed[:-1]]]
+            h = packed >> owner_bits
+            shared = np.r_[False, h[1:] == h[:-1]]
+            shared |= np.r_[shared[1:], False]
+            packed, h = packed[shared], h[shared]
+            owner = (packed - (h << owner_bits)).astype(np.int64)
+            starts = np.flatnonzero(np.r_[True, h[1:] != h[:-1]])
+            ends = np.r_[starts[1:], len(h)]
+            for a, b in zip(starts.tolist(), ends.tolist()):
+                members = owner[a:b].tolist()
+                for x in range(len(members)):
+                    for y in members[x + 1:]:
+                        yield members[x], y
+
+
+def _distance_links(
+    keys: Sequence[str], max_distance: int, weights: Optional[np.ndarray] = None, address: bool = True
+) -> Iterable[Tuple[int, int]]:
+    """
+    Pairs (i, j) of keys whose names are within their allowed edit distance and, with
+    address, of the same street type (see module docstring). With weights, only pairs where
+    one key is at least _DOMINANCE times as frequent as the other.
+    """
+    split = [split_street_type(k) if address else (k, "") for k in keys]
+    names = [name for name, _ in split]
+    type_codes: Dict[str, int] = {}
+    types = np.fromiter((type_codes.setdefault(t, len(type_codes)) for _, t in split), dtype=np.int64, count=len(keys))
+    digits: Dict[int, Tuple[str, ...]] = {}
+    seen = set()
+    for i, j in _candidate_pairs(names, types, max_distance):
+        if (i, j) in seen:
+            continue
+        seen.add((i, j))
+        if types[i] != types[j]:  # shortened hashes can collide
+            continue
+        if weights is not None and _DOMINANCE * min(weights[i], weights[j]) > max(weights[i], weights[j]):
+            continue
+        for k in (i, j):
+            if k not in digits:
+                digits[k] = tuple(_DIGITS.findall(names[k]))
+        if digits[i] != digits[j]:
+            continue
+        limit = min(_allowed_edits(names[i], max_distance), _allowed_edits(names[j], max_distance))
+        if limit and bounded_edit_distance(names[i], names[j], limit) is not None:
+            yield i, j
+
+
+def cluster_values(
+    values: Sequence[str],
+    counts: Optional[Sequence[int]] = None,
+    max_distance: int = 2,
+    address: Optional[bool] = None,
+) -> List[List[int]]:
+    """
+    Group distinct values that are variants of each other.
+
+    Args:
+        values: Distinct values of one field.
+        counts: Occurrences of each value (default 1 each, which links values by key only,
+            as no key dominates another); the most frequent spelling of a cluster is its
+            canonical value.
+        max_distance: Most edits between the names of two keys still considered variants,
+            at most 2 (0: only values with the same key).
+        address: Whether values are street addresses (abbreviations and street types, see
+            module docstring); default looks_like_addresses(values, counts).
+
+    Returns:
+        Clusters of at least two values, as positions into values; each cluster starts with
+        its canonical value, the rest follow by decreasing count. Clusters are ordered by
+        total count, largest first.
+    """
+    n = len(values)
+    max_distance = max(0, min(max_distance, _MAX_DISTANCE))
+    weights = np.asarray(counts if counts is not None else np.ones(n), dtype=np.int64)
+    if address is None:
+        address = looks_like_addresses(values, weights)
+
+    by_key: Dict[str, int] = {}
+    members: List[List[int]] = []  # positions in values of each distinct key's values
+    keys: List[str] = []
+    for i, value in enumerate(values):
+        key = normalize_value(str(value), address)
+        k = by_key.setdefault(key, len(keys))
+        if k == len(keys):
+            keys.append(key)
+            members.append([])
+        members[k].append(i)
+    key_weights = np.array([int(weights[m].sum()) for m in members], dtype=np.int64)
+
+    neighbours: Dict[int, List[int]] = defaultdict(list)
+    if max_distance > 0:
+        for a, b in _distance_links(keys, max_distance, key_weights, address):
+            neighbours[a].append(b)
+            neighbours[b].append(a)
+    # Star clustering: heaviest keys first; a key joins the heaviest dominant centre it is linked to.
+    centre = list(range(len(keys)))
+    for k in sorted(neighbours, key=lambda k: (-key_weights[k], k)):
+        dominant = [
+            c for c in neighbours[k]
+            if centre[c] == c and key_weights[c] >= _DOMINANCE * key_weights[k] and c != k
+        ]
+        if dominant:
+            centre[k] = max(dominant, key=lambda c: (key_weights[c], -c))
+
+    groups: Dict[int, List[int]] = defaultdict(list)
+    for k in range(len(keys)):
+        groups[centre[k]].extend(members[k])
+    clusters = [
+        sorted(group, key=lambda i: (-weights[i], i)) for group in groups.values() if len(group) > 1
+    ]
+    clusters.sort(key=lambda group: (-int(weights[group].sum()), group[0]))
+    return clusters
@@ -17,6 +17,7 @@ def get_validation_config() -> Dict[str, Any]:
         "geometry_validation_enabled": settings.GEOMETRY_VALIDATION_ENABLED,
         "attribute_sample_size": settings.ATTRIBUTE_SAMPLE_SIZE,
         "attribute_max_records_in_prompt": settings.ATTRIBUTE_MAX_RECORDS_IN_PROMPT,
+        "attribute_max_prompt_tokens": settings.ATTRIBUTE_MAX_PROMPT_TOKENS,
         "openai_model": settings.OPENAI_MODEL,
         "topology_checks": {
             "gaps": True,
@@ -71,7 +72,10 @@ def render_report_markdown(payload: Dict[str, Any]) -> str:
         )
         lines.append(f"| Attribute sample size | {validation_config.get('attribute_sample_size', '—')} |")
         lines.append(
-            f"| Records in LLM prompt | {validation_config.get('attribute_max_records_in_prompt', '—')} |"
+            f"| Records in LLM prompt | {validation_config.get('attribute_max_records_in_prompt') or 'no cap'} |"
+        )
+        lines.append(
+            f"| LLM prompt token budget | {validation_config.get('attribute_max_prompt_tokens') or 'none'} |"
         )
         lines.append(f"| LLM model | {validation_config.get('openai_model', '—')} |")
         tc = validation_config.get("topology_checks") or {}
@@ -0,0 +1,113 @@
+"""
+Content-addressed cache of validation results (GET /validate/{dataset_id}).
+
+A result is keyed by the dataset's content fingerprint (services.file_handler) plus every
+setting that changes what the pipeline produces (sample size, model, prompt limits and the
+tokenizer that enforces them, topology toggles, tolerance and tiling). Re-running the workflow with the same content and configuration
+would repeat the same work, including paid LLM calls, so GET serves the stored result.
+
+Entries live under OUTPUT_DIR/validation_cache/<dataset_id>/<key>.json. A changed file gets
+a new fingerprint and therefore a new key; invalidate() also drops a dataset's stale entries
+when apply_correction_overrides rewrites it, keeping the pre-edit result that incremental
+re-validation (services.incremental_validation) builds on.
+"""
+from __future__ import annotations
+
+import hashlib
+import json
+import shutil
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+from api.models import ValidationResult
+from core.config import settings
+from services.attribute_llm_cost import get_tokenizer, tokenizer_encoding_name
+from services.file_handler import get_dataset_fingerprint
+from services.report_builder import get_validation_config
+
+
+# Bump when the pipeline changes what it returns for the same input and settings.
+CACHE_VERSION = 2
+
+
+def validation_cache_config() -> Dict[str, Any]:
+    """Settings that affect validation output, as a JSON-serializable dict."""
+    config = get_validation_config()
+    config.update({
+        "attribute_max_fields": settings.ATTRIBUTE_MAX_FIELDS,
+        "attribute_max_values_per_field": settings.ATTRIBUTE_MAX_VALUES_PER_FIELD,
+        "attribute_profiling_enabled": settings.ATTRIBUTE_PROFILING_ENABLED,
+        "attribute_outlier_method": settings.ATTRIBUTE_OUTLIER_METHOD,
+        "attribute_profile_max_issues_per_field": settings.ATTRIBUTE_PROFILE_MAX_ISSUES_PER_FIELD,
+        "attribute_near_duplicate_max_distance": settings.ATTRIBUTE_NEAR_DUPLICATE_MAX_DISTANCE,
+        "attribute_address_fields": settings.attribute_address_fields_list,
+        "attribute_sampling_strategy": settings.ATTRIBUTE_SAMPLING_STRATEGY,
+        "openai_max_tokens": settings.OPENAI_MAX_TOKENS,
+        "recommendation_max_prompt_tokens": settings.RECOMMENDATION_MAX_PROMPT_TOKENS,
+        # Prompts are packed by counted tokens; without the vocab they are estimated (chars / 4).
+        "tokenizer": tokenizer_encoding_name() if get_tokenizer() is not None else None,
+        "topology_tolerance": settings.TOPOLOGY_TOLERANCE,
+        "topology_min_gap_area": settings.TOPOLOGY_MIN_GAP_AREA,
+        "topology_tiled_min_features": settings.TOPOLOGY_TILED_MIN_FEATURES,
+        "topology_tile_size": settings.TOPOLOGY_TILE_SIZE,
+        "streaming_min_features": settings.VALIDATION_STREAMING_MIN_FEATURES,
+        "batch_size": settings.VALIDATION_BATCH_SIZE,
+    })
+    return config
+
+
+def validation_cache_key(vector_path: Path) -> str:
+    """Cache key for validating the dataset at vector_path with the current settings."""
+    payload = {
+        "version": CACHE_VERSION,
+        "dataset": get_dataset_fingerprint(vector_path),
+        "config": validation_cache_config(),
+    }
+    return hashlib.sha256(json.dumps(payload, sort_keys=True, default=str).encode("utf-8")).hexdigest()
+
+
+class ValidationResultCache:
+    """On-disk ValidationResult store namespaced by dataset_id."""
+
+    def __init__(self, directory: Path) -> None:
+        self.directory = Path(directory)
+
+    def _dataset_dir(self, dataset_id: str) -> Path:
+        if not dataset_id or dataset_id in (".", "..") or Path(dataset_id).name != dataset_id:
+            raise ValueError(f"Invalid dataset_id for result cache: {dataset_id!r}")
+        return self.directory / dataset_id
+
+    def _entry_path(self, dataset_id: str, key: str) -> Path:
+        return self._dataset_dir(dataset_id) / f"{key}.json"
+
+    def get(self, dataset_id: str, key: str) -> Optional[ValidationResult]:
+        """Return the cached result, or None on miss or unreadable entry."""
+        path = self._entry_path(dataset_id, key)
+        try:
+            return ValidationResult.model_validate_json(path.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return None
+
+    def put(self, dataset_id: str, key: str, result: ValidationResult) -> None:
+        """Store a result (atomic replace, so concurrent readers never see a partial file)."""
+        path = self._entry_path(dataset_id, key)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_suffix(".json.tmp")
+        tmp.write_text(result.model_dump_json(), encoding="utf-8")
+        tmp.replace(path)
+
+    def invalidate(self, dataset_id: str, keep: Optional[str] = None) -> None:
+        """Remove every cached result for a dataset, except the entry for key keep if given."""
+        directory = self._dataset_dir(dataset_id)
+        if keep is None:
+            shutil.rmtree(directory, ignore_errors=True)
+            return
+        kept = self._entry_path(dataset_id, keep).name
+        for path in directory.glob("*.json*"):
+            if path.name != kept:
+                path.unlink(missing_ok=True)
+
+
+def get_result_cache() -> ValidationResultCache:
+    """Result cache under OUTPUT_DIR/validation_cache."""
+    return ValidationResultCache(settings.output_path / "validation_cache")
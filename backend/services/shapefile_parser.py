@@ -1,8 +1,8 @@
-"""Shapefile parsing and metadata extraction using GeoPandas."""
+"""Shapefile metadata extraction (header-only, see services.vector_metadata)."""
 from pathlib import Path
 from typing import Optional
 
-import geopandas as gpd
+from services.vector_metadata import read_vector_metadata
 
 
 def parse_shapefile_metadata(directory: Path) -> Optional[dict]:
@@ -11,6 +11,8 @@ def parse_shapefile_metadata(directory: Path) -> Optional[dict]:
 
     Expects at least one .shp file in the directory, with .shx and .dbf
     sidecar files in the same folder (standard shapefile requirement).
+    Feature count, shape type and bounds come from the .shp/.shx headers and the CRS
+    from the .prj (services.vector_metadata); geometries are not read.
 
     Returns:
         Dict with keys: feature_count, geometry_type, crs, bounds.
@@ -25,43 +27,5 @@ def parse_shapefile_metadata(directory: Path) -> Optional[dict]:
     if not shp_files:
         return None
 
-    shp_path = shp_files[0]
-    try:
-        gdf = gpd.read_file(shp_path)
-    except Exception:
-        return None
-
-    feature_count = len(gdf)
-    if gdf.empty or gdf.geometry is None:
-        return {
-            "feature_count": 0,
-            "geometry_type": None,
-            "crs": _crs_to_string(gdf.crs) if gdf.crs is not None else None,
-            "bounds": None,
-        }
-
-    geom_types = gdf.geometry.geom_type.dropna().unique()
-    geometry_type = geom_types[0] if len(geom_types) == 1 else ",".join(sorted(geom_types))
-    crs = _crs_to_string(gdf.crs)
-    try:
-        tb = gdf.total_bounds
-        bounds = tb.tolist() if tb is not None and len(tb) == 4 else None
-    except Exception:
-        bounds = None
+    return read_vector_metadata(shp_files[0])
 
-    return {
-        "feature_count": feature_count,
-        "geometry_type": geometry_type,
-        "crs": crs,
-        "bounds": bounds,
-    }
-
-
-def _crs_to_string(crs) -> Optional[str]:
-    """Convert a pyproj/CRS object to a string (e.g. EPSG:4326)."""
-    if crs is None:
-        return None
-    try:
-        return crs.to_string() if hasattr(crs, "to_string") else str(crs)
-    except Exception:
-        return str(crs)
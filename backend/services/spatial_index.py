@@ -0,0 +1,257 @@
+"""
+Persisted per-dataset spatial index (packed Hilbert R-tree over feature bounds).
+
+Topology runs and bbox queries need "which features have bounds touching this box". Instead of
+building a tree per run, the index is built once per dataset version and stored next to the
+geometry store:
+
+    .derived/spatial_index/current.json        {"dir": <build>, "source": source file stamps}
+    .derived/spatial_index/<build>/meta.json    {"count", "node_size", "levels"}
+    .derived/spatial_index/<build>/order.npy    int64[m]: feature positions in Hilbert order
+    .derived/spatial_index/<build>/level_<k>.npy float64[nodes_k, 4] node bounds, k = 0 (leaves)
+
+Level 0 holds the bounds of the m features with non-empty geometry, sorted by the Hilbert index
+of their bounds centre; node j of level k + 1 covers nodes [j * node_size, (j + 1) * node_size)
+of level k. All arrays are memory-mapped, so worker processes share them through the page
+cache (attach_spatial_index). Bounds come from the geometry store, nothing is decoded.
+
+The index records the source file stamps like the working copy and geometry store, so it is
+ignored once the file changes; services.correction_applier also removes it when it rewrites
+the dataset (invalidate_spatial_index).
+"""
+from __future__ import annotations
+
+import json
+import shutil
+import threading
+import uuid
+from collections import OrderedDict
+from pathlib import Path
+from typing import List, Optional, Sequence, Union
+
+import geopandas as gpd
+import numpy as np
+import shapely
+
+from services.file_handler import DERIVED_DIR_NAME, get_dataset_stamps, get_derived_path
+from services.geometry_store import GeometryStore, get_geometry_store, open_geometry_store
+from services.working_copy import read_dataset_rows
+
+
+SPATIAL_INDEX_DIR = "spatial_index"
+NODE_SIZE = 16
+_CURRENT = "current.json"
+_HILBERT_BITS = 16
+
+
+def _hilbert_codes(x: np.ndarray, y: np.ndarray, bits: int = _HILBERT_BITS) -> np.ndarray:
+    """Hilbert curve index of integer grid cells (x, y) in [0, 2**bits)."""
+    n = 1 << bits
+    x = x.astype(np.int64)
+    y = y.astype(np.int64)
+    d = np.zeros(len(x), dtype=np.int64)
+    s = n >> 1
+    while s > 0:
+        rx = (x & s) > 0
+        ry = (y & s) > 0
+        d += s * s * ((3 * rx.astype(np.int64)) ^ ry.astype(np.int64))
+        # Rotate the quadrant so the curve stays continuous.
+        flip = ~ry & rx
+        x = np.where(flip, n - 1 - x, x)
+        y = np.where(flip, n - 1 - y, y)
+        swap = ~ry
+        x, y = np.where(swap, y, x), np.where(swap, x, y)
+        s >>= 1
+    return d
+
+
+def hilbert_order(bounds: np.ndarray) -> np.ndarray:
+    """
+    Positions of the features with finite bounds, sorted by the Hilbert index of their bounds
+    centre (features with NaN bounds, i.e. null or empty geometry, are left out).
+    """
+    bounds = np.asarray(bounds, dtype=np.float64)
+    present = np.flatnonzero(~np.isnan(bounds).any(axis=1))
+    if not len(present):
+        return present.astype(np.int64)
+    b = bounds[present]
+    cx = (b[:, 0] + b[:, 2]) / 2
+    cy = (b[:, 1] + b[:, 3]) / 2
+    cells = (1 << _HILBERT_BITS) - 1
+    span_x = max(float(cx.max() - cx.min()), 1e-300)
+    span_y = max(float(cy.max() - cy.min()), 1e-300)
+    gx = np.floor((cx - cx.min()) / span_x * cells)
+    gy = np.floor((cy - cy.min()) / span_y * cells)
+    return present[np.argsort(_hilbert_codes(gx, gy), kind="stable")].astype(np.int64)
+
+
+def _pack_levels(leaf_bounds: np.ndarray, node_size: int) -> List[np.ndarray]:
+    """Node bounds per level, leaves first, up to a root level of at most node_size nodes."""
+    levels = [leaf_bounds]
+    while len(levels[-1]) > node_size:
+        below = levels[-1]
+        starts = np.arange(0, len(below), node_size)
+        levels.append(np.column_stack((
+            np.minimum.reduceat(below[:, 0], starts),
+            np.minimum.reduceat(below[:, 1], starts),
+            np.maximum.reduceat(below[:, 2], starts),
+            np.maximum.reduceat(below[:, 3], starts),
+        )))
+    return levels
+
+
+def _intersecting(bounds: np.ndarray, bbox: Sequence[float]) -> np.ndarray:
+    minx, miny, maxx, maxy = bbox
+    return (bounds[:, 0] <= maxx) & (bounds[:, 2] >= minx) & (bounds[:, 1] <= maxy) & (bounds[:, 3] >= miny)
+
+
+class SpatialIndex:
+    """Read-only, memory-mapped packed Hilbert R-tree (see module docstring)."""
+
+    def __init__(self, directory: Union[str, Path]) -> None:
+        self.directory = Path(directory)
+        meta = json.loads((self.directory / "meta.json").read_text(encoding="utf-8"))
+        self.count = int(meta["count"])
+        self.node_size = int(meta["node_size"])
+        self.order = np.load(self.directory / "order.npy", mmap_mode="r")
+        self.levels = [
+            np.load(self.directory / f"level_{k}.npy", mmap_mode="r") for k in range(int(meta["levels"]))
+        ]
+
+    def __len__(self) -> int:
+        return self.count
+
+    def query(self, bbox: Sequence[float]) -> np.ndarray:
+        """Sorted positions of the features whose bounds intersect bbox (minx, miny, maxx, maxy)."""
+        if not len(self.order):
+            return np.empty(0, dtype=np.int64)
+        top = len(self.levels) - 1
+        nodes = np.arange(len(self.levels[top]))
+        for k in range(top, 0, -1):
+            hit = nodes[_intersecting(self.levels[k][nodes], bbox)]
+            if not len(hit):
+                return np.empty(0, dtype=np.int64)
+            children = (hit[:, None] * self.node_size + np.arange(self.node_size)).ravel()
+            nodes = children[children < len(self.levels[k - 1])]
+        leaves = nodes[_intersecting(self.levels[0][nodes], bbox)]
+        return np.sort(self.order[leaves])
+
+
+def _index_root(vector_path: Path) -> Path:
+    return Path(vector_path).parent / DERIVED_DIR_NAME / SPATIAL_INDEX_DIR
+
+
+def open_spatial_index(vector_path: Path) -> Optional[SpatialIndex]:
+    """Open the current index for vector_path, or None if missing or stale."""
+    root = _index_root(vector_path)
+    try:
+        meta = json.loads((root / _CURRENT).read_text(encoding="utf-8"))
+        if meta.get("source") != get_dataset_stamps(vector_path):
+            return None
+        return SpatialIndex(root / meta["dir"])
+    except (OSError, ValueError, KeyError):
+        return None
+
+
+def write_spatial_index(vector_path: Path, store: GeometryStore, node_size: int = NODE_SIZE) -> SpatialIndex:
+    """Build the index for vector_path from its geometry store's bounds and make it current."""
+    stamps = get_dataset_stamps(vector_path)
+    bounds = np.asarray(store.bounds, dtype=np.float64)
+    order = hilbert_order(bounds)
+    levels = _pack_levels(bounds[order], node_size)
+
+    root = get_derived_path(vector_path) / SPATIAL_INDEX_DIR
+    build = uuid.uuid4().hex
+    build_dir = root / build
+    build_dir.mkdir(parents=True, exist_ok=True)
+    np.save(build_dir / "order.npy", order)
+    for k, level in enumerate(levels):
+        np.save(build_dir / f"level_{k}.npy", level)
+    (build_dir / "meta.json").write_text(
+        json.dumps({"count": store.count, "node_size": node_size, "levels": len(levels)}), encoding="utf-8"
+    )
+    tmp = root / f"{_CURRENT}.{build}.tmp"
+    tmp.write_text(json.dumps({"dir": build, "source": stamps}), encoding="utf-8")
+    tmp.replace(root / _CURRENT)
+
+    for old in root.iterdir():
+        if old.is_dir() and old.name != build:
+            shutil.rmtree(old, ignore_errors=True)
+    return SpatialIndex(build_dir)
+
+
+def get_spatial_index(
+    vector_path: Path,
+    gdf: Optional[gpd.GeoDataFrame] = None,
+    store: Optional[GeometryStore] = None,
+) -> Optional[SpatialIndex]:
+    """
+    Return the current index for vector_path, building it (and the geometry store) if needed.
+
+    gdf / store, when given, must reflect the dataset's current content. Returns None if the
+    dataset cannot be read.
+    """
+    index = open_spatial_index(vector_path)
+    if index is not None:
+        return index
+    if store is None:
+        store = get_geometry_store(vector_path, gdf)
+        if store is None:
+            return None
+    return write_spatial_index(vector_path, store)
+
+
+def features_in_bbox(vector_path: Path, bbox: Sequence[float]) -> Optional[gpd.GeoDataFrame]:
+    """
+    Features of the dataset whose geometry intersects bbox (minx, miny, maxx, maxy), in file
+    order and indexed by position. Candidates come from the index; only they are decoded and
+    tested exactly, and only the matching rows' attributes are read
+    (working_copy.read_dataset_rows). Returns None if the dataset cannot be read.
+    """
+    index = get_spatial_index(vector_path)
+    store = open_geometry_store(vector_path) if index is not None else None
+    if store is None:
+        return None
+    positions = index.query(bbox)
+    geoms = store.geometries(positions)
+    hit = shapely.intersects(geoms, shapely.box(*bbox)) if len(geoms) else np.zeros(0, dtype=bool)
+    positions = positions[hit]
+
+    rows = read_dataset_rows(vector_path, positions)
+    if rows is None:
+        return None
+    return gpd.GeoDataFrame(rows, geometry=gpd.GeoSeries(geoms[hit], index=positions), crs=store.crs)
+
+
+def build_spatial_index(vector_path: Path) -> None:
+    """Background task (upload): build the index unless a current one exists; never raises."""
+    try:
+        get_spatial_index(vector_path)
+    except Exception:
+        pass
+
+
+def invalidate_spatial_index(vector_path: Path) -> None:
+    """Drop the index for vector_path (the dataset was rewritten); the next use rebuilds it."""
+    shutil.rmtree(_index_root(vector_path), ignore_errors=True)
+
+
+# Per-process cache of attached indexes (worker processes), like geometry_store.attach_geometry_store:
+# the current build of at most _MAX_ATTACHED datasets.
+_MAX_ATTACHED = 8
+_attached: OrderedDict[str, SpatialIndex] = OrderedDict()
+_attached_lock = threading.Lock()
+
+
+def attach_spatial_index(directory: Union[str, Path]) -> SpatialIndex:
+    """Attach to an index build directory (SpatialIndex.directory) from a worker process."""
+    directory = Path(directory)
+    key = str(directory.parent)
+    with _attached_lock:
+        index = _attached.get(key)
+        if index is None or index.directory != directory:
+            index = _attached[key] = SpatialIndex(directory)
+        _attached.move_to_end(key)
+        while len(_attached) > _MAX_ATTACHED:
+            _attached.popitem(last=False)
+    return index
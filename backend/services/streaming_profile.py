@@ -0,0 +1,369 @@
+"""
+Attribute profiling over a stream of row batches (streaming validation of very large layers).
+
+services.attribute_extractor.profile_attributes needs every column in memory. StreamingProfiler
+takes the layer batch by batch (services.streaming_validation) and builds the same
+AttributeProfile over all rows from statistics that merge across batches:
+
+- row, null and blank counts, and the first cap non-numeric values of mostly numeric text
+  columns, exactly;
+- distinct values with their counts, exactly up to _MAX_DISTINCT per field. Past that the
+  rarest are dropped (the _MAX_DISTINCT // 2 most frequent are kept), so frequent values
+  keep about their counts but the distinct count and variant groups are estimates;
+- quantiles from a mergeable QuantileSketch, exact up to _SKETCH_CAPACITY values;
+- the cap lowest and highest values of each numeric field with their feature ids. Per-feature
+  outlier issues are the cap most extreme outliers, which are always among those; the number
+  of further outliers is read from the sketch.
+
+While nothing was pruned or compacted, the result equals profile_attributes on the whole
+layer. Otherwise the field is marked FieldProfile.estimated and estimated counts in issue
+texts read "about N".
+"""
+from __future__ import annotations
+
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from core.config import settings
+from services.attribute_extractor import (
+    _MIN_VALUES_FOR_OUTLIERS,
+    _NUMERIC_MAJORITY,
+    _TOP_K,
+    AttributeProfile,
+    FieldProfile,
+    _attribute_columns,
+    _factorize_text,
+    _is_text,
+    _outlier_fences,
+    _profile_issue,
+    _sorted_quantiles,
+    _variant_issues,
+)
+
+
+# Distinct values counted exactly per field before the rarest are pruned.
+_MAX_DISTINCT = 200_000
+# Values a QuantileSketch level holds before it is compacted (exact below this count).
+_SKETCH_CAPACITY = 100_000
+
+
+class QuantileSketch:
+    """
+    Mergeable quantile sketch (KLL-style compactors) over a stream of numbers.
+
+    Values go to level 0; a level holding more than capacity values is sorted and every
+    other value (random offset) moves up one level, where it stands for twice as many
+    values. Rank error is about count / capacity per compaction level; with no compaction
+    (count <= capacity) all answers are exact.
+    """
+
+    def __init__(self, capacity: int = _SKETCH_CAPACITY, seed: int = 0) -> None:
+        self.capacity = max(2, capacity)
+        self.count = 0
+        self.min = np.inf
+        self.max = -np.inf
+        self._levels: List[np.ndarray] = [np.empty(0, dtype=np.float64)]
+        self._rng = np.random.default_rng(seed)
+
+    @property
+    def exact(self) -> bool:
+        return len(self._levels) == 1
+
+    def add(self, values: np.ndarray) -> None:
+        values = np.asarray(values, dtype=np.float64)
+        values = values[~np.isnan(values)]
+        if not len(values):
+            return
+        self.count += len(values)
+        self.min = min(self.min, float(values.min()))
+        self.max = max(self.max, float(values.max()))
+        self._levels[0] = np.concatenate([self._levels[0], values])
+        level = 0
+        while len(self._levels[level]) > self.capacity:
+            items = np.sort(self._levels[level])
+            paired = len(items) - len(items) % 2
+            self._levels[level] = items[paired:]  # an odd value out stays
+            if level + 1 == len(self._levels):
+                self._levels.append(np.empty(0, dtype=np.float64))
+            promoted = items[:paired][int(self._rng.integers(2))::2]
+            self._levels[level + 1] = np.concatenate([self._levels[level + 1], promoted])
+            level += 1
+
+    def _items(self) -> Tuple[np.ndarray, np.ndarray]:
+        """(values, weights) of all levels."""
+        values = np.concatenate(self._levels)
+        weights = np.concatenate([np.full(len(v), 2 ** k, dtype=np.int64) for k, v in enumerate(self._levels)])
+        return values, weights
+
+    def quantiles(self) -> Dict[str, float]:
+        """min, q1, median, q3, max (as attribute_extractor._sorted_quantiles when exact)."""
+        if self.exact:
+            return _sorted_quantiles(np.sort(self._levels[0]))
+        values, weights = self._items()
+        order = np.argsort(values, kind="stable")
+        cumulative = np.cumsum(weights[order])
+        ranks = np.array([0.25, 0.5, 0.75]) * cumulative[-1]
+        q1, median, q3 = values[order][np.minimum(np.searchsorted(cumulative, ranks), len(values) - 1)]
+        return {"min": self.min, "q1": float(q1), "median": float(median), "q3": float(q3), "max": self.max}
+
+    def median_abs_deviation(self, median: float) -> float:
+        """Median of |value - median|."""
+        if self.exact:
+            return float(np.median(np.abs(self._levels[0] - median)))
+        values, weights = self._items()
+        deviation = np.abs(values - median)
+        order = np.argsort(deviation, kind="stable")
+        cumulative = np.cumsum(weights[order])
+        return float(deviation[order][min(np.searchsorted(cumulative, cumulative[-1] / 2), len(order) - 1)])
+
+    def count_outside(self, low: float, high: float) -> int:
+        """Number of values below low or above high."""
+        values, weights = self._items()
+        return int(weights[(values < low) | (values > high)].sum())
+
+
+class _Extremes:
+    """The cap lowest and highest values seen, with feature ids and layer positions."""
+
+    def __init__(self, cap: int) -> None:
+        self.cap = cap
+        self.values = np.empty(0, dtype=np.float64)
+        self.ids = np.empty(0, dtype=object)
+        self.positions = np.empty(0, dtype=np.int64)
+
+    def add(self, values: np.ndarray, ids: np.ndarray, positions: np.ndarray) -> None:
+        if not len(values) or not self.cap:
+            return
+        values = np.concatenate([self.values, values])
+        ids = np.concatenate([self.ids, np.asarray(ids, dtype=object)])
+        positions = np.concatenate([self.positions, positions])
+        low = np.lexsort((positions, values))[:self.cap]
+        high = np.lexsort((positions, -values))[:self.cap]
+        keep = np.unique(np.concatenate([low, high]))
+        self.values, self.ids, self.positions = values[keep], ids[keep], positions[keep]
+
+
+class _FieldStream:
+    """Mergeable statistics of one attribute column (see module docstring)."""
+
+    def __init__(self, name: Any, cap: int) -> None:
+        self.name = name
+        self.cap = cap
+        self.path: Optional[str] = None  # text, numeric or other, from the first non-null batch
+        self.dtype_kind = "other"
+        self.integer = True
+        self.count = 0
+        self.missing = 0
+        self.counts: Dict[Any, int] = {}
+        self.pruned = False
+        self.parsed = 0
+        self.not_numbers = 0
+        self.first_not_numbers: List[Tuple[Any, str]] = []
+        self.sketch = QuantileSketch()
+        self.extremes = _Extremes(cap)
+
+    def add(self, column: pd.Series, ids: np.ndarray, start: int) -> None:
+        n = len(column)
+        if self.path is None:
+            if not column.notna().any():
+                self.count += n
+                self.missing += n
+                return
+            if _is_text(column):
+                self.path = "text"
+            elif pd.api.types.is_numeric_dtype(column) and not pd.api.types.is_bool_dtype(column):
+                self.path = "numeric"
+            else:
+                self.path = "other"
+                if pd.api.types.is_bool_dtype(column):
+                    self.dtype_kind = "boolean"
+                elif pd.api.types.is_datetime64_any_dtype(column):
+                    self.dtype_kind = "datetime"
+        if self.path == "text":
+            self._add_text(column, ids, start)
+        elif self.path == "numeric":
+            self._add_numeric(column, ids, start)
+        else:
+            present = column.dropna()
+            self.missing += n - len(present)
+            self._count(
+                (k.item() if hasattr(k, "item") else k, int(v)) for k, v in present.value_counts(sort=False).items()
+            )
+        self.count += n
+
+    def _count(self, pairs) -> None:
+        counts = self.counts
+        for value, c in pairs:
+            counts[value] = counts.get(value, 0) + c
+        if len(counts) > _MAX_DISTINCT:
+            kept = sorted(counts.items(), key=lambda kv: -kv[1])[:_MAX_DISTINCT // 2]
+            # Keep first-seen order among the survivors (ties in top values go to the earlier one).
+            survivors = {k for k, _ in kept}
+            self.counts = {k: v for k, v in counts.items() if k in survivors}
+            self.pruned = True
+
+    def _add_numbers(self, numbers: np.ndarray, ids: np.ndarray, positions: np.ndarray) -> None:
+        self.sketch.add(numbers)
+        self.extremes.add(numbers, ids, positions)
+
+    def _add_text(self, column: pd.Series, ids: np.ndarray, start: int) -> None:
+        # Same steps as attribute_extractor._profile_field, on one batch.
+        codes, uniques = _factorize_text(column)
+        blank = uniques.str.strip().eq("").fillna(True).to_numpy(dtype=bool)
+        codes = np.where(np.r_[blank, True][codes], -1, codes)  # code -1 indexes the appended True
+        present = np.flatnonzero(codes >= 0)
+        self.missing += len(column) - len(present)
+        counts = np.bincount(codes[present], minlength=len(uniques))
+        # Distinct values in order of first appearance, as in a full-column factorize.
+        _, first = np.unique(codes[present], return_index=True)
+        used = codes[present][np.sort(first)]
+        self._count(zip(uniques.iloc[used].tolist(), counts[used].tolist()))
+        coerced = pd.to_numeric(uniques.str.strip(), errors="coerce").to_numpy(dtype="float64", na_value=np.nan)
+        parsed = ~np.isnan(coerced[codes[present]])
+        self.parsed += int(parsed.sum())
+        bad = present[~parsed]
+        self.not_numbers += len(bad)
+        room = self.cap - len(self.first_not_numbers)
+        if room > 0:
+            self.first_not_numbers += list(zip(ids[bad[:room]].tolist(), uniques.iloc[codes[bad[:room]]].tolist()))
+        good = present[parsed]
+        self._add_numbers(coerced[codes[good]], ids[good], start + good)
+
+    def _add_numeric(self, column: pd.Series, ids: np.ndarray, start: int) -> None:
+        self.integer = self.integer and pd.api.types.is_integer_dtype(column)
+        values = pd.to_numeric(column, errors="coerce").to_numpy(dtype="float64", na_value=np.nan)
+        present = np.flatnonzero(~np.isnan(values))
+        self.missing += len(column) - len(present)
+        numbers = values[present]
+        distinct, counts = np.unique(numbers, return_counts=True)
+        self._count(zip(distinct.tolist(), counts.tolist()))
+        self._add_numbers(numbers, ids[present], start + present)
+
+    def result(self, method: str) -> Tuple[FieldProfile, List[Dict[str, Any]]]:
+        """The field's profile and issues, as attribute_extractor._profile_field reports them."""
+        name, n, cap = self.name, self.count, self.cap
+        profile = FieldProfile(name=name, kind="other", count=n, missing=self.missing, distinct=len(self.counts))
+        profile.estimated = self.pruned or not self.sketch.exact
+        issues: List[Dict[str, Any]] = []
+        numeric = self.path == "numeric"
+        if self.path == "text":
+            profile.top_values = sorted(self.counts.items(), key=lambda kv: -kv[1])[:_TOP_K]
+            present = n - self.missing
+            if present and self.parsed / present >= _NUMERIC_MAJORITY:
+                numeric = True
+                issues += [
+                    _profile_issue(fid, name, "type_mismatch", f"Expected a number, got {value!r}")
+                    for fid, value in self.first_not_numbers
+                ]
+                if self.not_numbers > cap:
+                    issues.append(_profile_issue(
+                        None, name, "type_mismatch", f"{self.not_numbers - cap} more values are not numbers"
+                    ))
+            elif present:
+                profile.kind = "text"
+                values = pd.Series(list(self.counts), dtype=object)
+                issues += _variant_issues(name, values, np.fromiter(self.counts.values(), dtype=np.int64), cap)
+        elif self.path == "other":
+            profile.kind = self.dtype_kind
+            profile.top_values = sorted(self.counts.items(), key=lambda kv: -kv[1])[:_TOP_K]
+
+        if profile.missing:
+            issues.insert(0, _profile_issue(
+                None, name, "missing_value", f"{profile.missing} of {n} values are missing ({profile.missing / n:.1%})"
+            ))
+        if profile.missing == n:
+            profile.kind = "empty"
+            return profile, issues
+        if not numeric or not self.sketch.count:
+            return profile, issues
+
+        profile.kind = "numeric"
+        profile.quantiles = self.sketch.quantiles()
+        if not profile.top_values:
+            native = int if self.integer else float
+            top = sorted(self.counts.items(), key=lambda kv: (-kv[1], kv[0]))[:_TOP_K]
+            profile.top_values = [(native(v), c) for v, c in top]
+        issues += self._outlier_issues(profile.quantiles, method)
+        return profile, issues
+
+    def _outlier_issues(self, quantiles: Dict[str, float], method: str) -> List[Dict[str, Any]]:
+        if self.sketch.count < _MIN_VALUES_FOR_OUTLIERS:
+            return []
+        mad = self.sketch.median_abs_deviation(quantiles["median"]) if method == "mad" else 0.0
+        low, high = _outlier_fences(quantiles, method, mad)
+        if np.isnan(low):
+            return []
+        total = self.sketch.count_outside(low, high)
+        if not total:
+            return []
+        ext = self.extremes
+        outside = np.flatnonzero((ext.values < low) | (ext.values > high))
+        # Most extreme first: distance beyond the nearer fence; ties in layer order.
+        distance = np.maximum(low - ext.values[outside], ext.values[outside] - high)
+        order = outside[np.lexsort((ext.positions[outside], -distance))][:self.cap]
+        issues = [
+            _profile_issue(
+                fid, self.name, "outlier", f"Value {v:g} is outside the expected range [{low:g}, {high:g}]"
+            )
+            for fid, v in zip(ext.ids[order].tolist(), ext.values[order].tolist())
+        ]
+        total = max(total, len(outside))
+        if total > self.cap:
+            about = "" if self.sketch.exact else "about "
+            issues.append(_profile_issue(
+                None, self.name, "outlier", f"{about}{total - self.cap} more values are outside [{low:g}, {high:g}]"
+            ))
+        return issues
+
+
+class StreamingProfiler:
+    """
+    profile_attributes over a layer read in batches: add() every batch in layer order, then
+    result(). Arguments as profile_attributes.
+    """
+
+    def __init__(
+        self,
+        max_fields: Optional[int] = None,
+        *,
+        outlier_method: Optional[str] = None,
+        max_issues_per_field: Optional[int] = None,
+    ) -> None:
+        self.max_fields = max_fields
+        self.method = (outlier_method or settings.ATTRIBUTE_OUTLIER_METHOD).lower()
+        self.cap = max(
+            0,
+            max_issues_per_field if max_issues_per_field is not None else settings.ATTRIBUTE_PROFILE_MAX_ISSUES_PER_FIELD,
+        )
+        self.rows = 0
+        self._fields: Optional[List[_FieldStream]] = None
+
+    def add(self, frame: pd.DataFrame) -> None:
+        """Profile the next batch of rows (attribute columns; geometry is ignored)."""
+        if not len(frame.index):
+            return
+        if self._fields is None:
+            self._fields = [
+                _FieldStream(name, self.cap) for name in _attribute_columns(frame, self.max_fields) if name != "id"
+            ]
+        ids = frame["id"].to_numpy() if "id" in frame.columns else frame.index.to_numpy()
+        for stream in self._fields:
+            if stream.name in frame.columns:
+                stream.add(frame[stream.name], ids, self.rows)
+            else:
+                stream.count += len(frame)
+                stream.missing += len(frame)
+        self.rows += len(frame)
+
+    def result(self) -> AttributeProfile:
+        """AttributeProfile of every row added so far (see module docstring)."""
+        result = AttributeProfile()
+        for stream in self._fields or []:
+            profile, issues = stream.result(self.method)
+            result.fields[stream.name] = profile
+            result.issues.extend(issues)
+            if profile.kind == "text":
+                result.ambiguous_fields.append(stream.name)
+        return result
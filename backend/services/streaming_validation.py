@@ -0,0 +1,180 @@
+"""
+Streaming validation for layers too large to load as one GeoDataFrame.
+
+The LangGraph workflow needs the whole layer in memory. For datasets with at least
+settings.VALIDATION_STREAMING_MIN_FEATURES features, services.validation_runner uses this
+module instead: the layer is read in VALIDATION_BATCH_SIZE row batches
+(services.batch_reader), so peak memory is bounded by one batch plus the issues found.
+
+Per batch:
+- geometry checks (core.validation via agents.geometry_agent) run and their issues are
+  yielded immediately;
+- geometries are appended to the dataset's geometry store (services.geometry_store), unless
+  a current one exists, and the feature ids to a typed (e.g. int64) array per batch;
+- attribute rows feed a fixed-size reservoir sample (deterministic seed) and the attribute
+  profiler (services.streaming_profile). After the last batch the attribute agent reports
+  the profile's issues, which cover every row, and sends the sample's free-text fields to
+  the LLM like a sampled in-memory layer.
+
+Topology checks relate features across the whole layer, so they run after the last batch
+(and after the attribute issues, in the workflow's geometry -> attribute -> topology order,
+see agents.state.merge_issues) on that store: with the tiled engine (services.tiled_topology) when the layer has at least
+TOPOLOGY_TILED_MIN_FEATURES features, whose workers decode one tile and its halo at a time.
+Below that threshold (or with tiling disabled) the store is decoded whole and checked by
+core.topology.validate_topology, as the in-memory workflow does.
+"""
+from __future__ import annotations
+
+from pathlib import Path
+from typing import Iterator, List, Optional
+
+import geopandas as gpd
+import numpy as np
+import pandas as pd
+
+from api.models import GeometryIssue, ValidationResult
+from agents.attribute_agent import _ATTRIBUTE_SAMPLE_RANDOM_STATE
+from agents.attribute_agent import run as attribute_validation
+from agents.geometry_agent import validate_geodataframe
+from agents.orchestrator import _dict_to_geometry_issue
+from agents.recommendation_agent import run as generate_recommendations
+from agents.topology_agent import _violation_to_geometry_issue
+from core.config import settings
+from core.topology import validate_topology
+from services.batch_reader import iter_dataset_batches
+from services.dataset_loader import DatasetHandle
+from services.geometry_store import GeometryStore, GeometryStoreWriter, open_geometry_store
+from services.llm_service import SupportsInvoke
+from services.streaming_profile import StreamingProfiler
+from services.spatial_index import get_spatial_index
+from services.tiled_topology import validate_topology_tiled
+
+
+class AttributeReservoir:
+    """
+    Uniform fixed-size sample of attribute rows over a stream of batches (Algorithm R).
+
+    Rows keep their layer-wide index, so sampled records carry the same feature ids as in a
+    full read. Deterministic for a given seed, whatever the batch sizes.
+    """
+
+    def __init__(self, size: int, seed: int = _ATTRIBUTE_SAMPLE_RANDOM_STATE) -> None:
+        self.size = max(0, size)
+        self.seen = 0
+        self._rng = np.random.default_rng(seed)
+        self._slots = np.empty(0, dtype=np.int64)  # index label held by each reservoir slot
+        self._rows: Optional[pd.DataFrame] = None
+
+    def add(self, frame: pd.DataFrame) -> None:
+        """Offer every row of frame to the sample (frame.index must be layer positions)."""
+        n = len(frame)
+        if n == 0 or self.size == 0:
+            self.seen += n
+            return
+        labels = frame.index.to_numpy()
+        slots = self._slots
+        fill = min(n, self.size - len(slots))
+        if fill:
+            slots = np.concatenate([slots, labels[:fill]])
+        if fill < n:
+            # Row at stream position p replaces a random slot with probability size / (p + 1).
+            # Uniform draws scaled per position, so the sample does not depend on batch size.
+            positions = np.arange(self.seen + fill, self.seen + n)
+            drawn = np.floor(self._rng.random(len(positions)) * (positions + 1)).astype(np.int64)
+            slots = slots.copy()
+            for row in np.flatnonzero(drawn < self.size):
+                slots[drawn[row]] = labels[fill + row]  # in stream order, as sequential Algorithm R
+        new_rows = frame[frame.index.isin(slots)]
+        if self._rows is not None:
+            new_rows = pd.concat([self._rows[self._rows.index.isin(slots)], new_rows])
+        # copy(): a slice would keep the whole batch alive through the sample.
+        self._rows = new_rows.copy()
+        self._slots = slots
+        self.seen += n
+
+    def frame(self) -> pd.DataFrame:
+        """Sampled rows so far, ordered by layer position."""
+        if self._rows is None:
+            return pd.DataFrame()
+        return self._rows.sort_index()
+
+
+def _topology_issues(path: Path, store: GeometryStore, feature_ids: np.ndarray) -> List[GeometryIssue]:
+    """Topology issues of the whole layer from its geometry store (see module docstring)."""
+    ids = pd.DataFrame({"id": feature_ids})
+    if ids.empty or store.count != len(ids):
+        return []
+    options = dict(tolerance=settings.TOPOLOGY_TOLERANCE, min_gap_area=settings.TOPOLOGY_MIN_GAP_AREA)
+    threshold = settings.TOPOLOGY_TILED_MIN_FEATURES
+    index = get_spatial_index(path, store=store) if 0 < threshold <= len(ids) else None
+    if index is not None and index.count == store.count:
+        raw = validate_topology_tiled(ids, store, index, **options)
+    else:
+        raw = validate_topology(gpd.GeoDataFrame(ids, geometry=store.geoseries()), **options)
+    return [_violation_to_geometry_issue(v) for v in raw]
+
+
+def iter_streaming_issues(
+    dataset_path: str,
+    *,
+    batch_size: Optional[int] = None,
+    sample_size: Optional[int] = None,
+    llm: Optional[SupportsInvoke] = None,
+) -> Iterator[List[GeometryIssue]]:
+    """
+    Validate a dataset batch by batch, yielding each batch's issues as soon as they are found.
+
+    Geometry issues are yielded per batch; attribute issues (profile of the whole layer, LLM on
+    the reservoir sample) and then topology issues (whole layer) are yielded once each at the
+    end, in the order of agents.state.merge_issues.
+    """
+    n = sample_size if sample_size is not None else settings.ATTRIBUTE_SAMPLE_SIZE
+    reservoir = AttributeReservoir(n)
+    profiler = StreamingProfiler(settings.ATTRIBUTE_MAX_FIELDS) if settings.ATTRIBUTE_PROFILING_ENABLED else None
+    path = Path(dataset_path)
+    store = open_geometry_store(path)
+    writer = GeometryStoreWriter(path) if store is None else None
+    feature_ids: List[np.ndarray] = []
+    try:
+        for batch in iter_dataset_batches(path, batch_size=batch_size):
+            if settings.GEOMETRY_VALIDATION_ENABLED:
+                yield [_dict_to_geometry_issue(d) for d in validate_geodataframe(batch)]
+            if writer is not None:
+                writer.append(batch.geometry)
+            # Ids as in core.topology._feature_ids, kept typed (not one object per feature).
+            feature_ids.append((batch["id"] if "id" in batch.columns else batch.index).to_numpy())
+            attributes = pd.DataFrame(batch.drop(columns=batch.geometry.name))
+            reservoir.add(attributes)
+            if profiler is not None:
+                profiler.add(attributes)
+            del attributes
+            del batch
+    except BaseException:
+        if writer is not None:
+            writer.abort()
+        raise
+    if writer is not None:
+        store = writer.close()
+
+    sample = reservoir.frame()
+    if len(sample.index):
+        state = {"dataset": DatasetHandle(path, gdf=sample), "dataset_path": str(path)}
+        profile = profiler.result() if profiler is not None else None
+        yield list(attribute_validation(state, sample_size=n, llm=llm, profile=profile)["issues"])
+
+    ids = np.concatenate(feature_ids) if feature_ids else np.empty(0, dtype=np.int64)
+    yield _topology_issues(path, store, ids)
+
+
+def run_streaming_validation(
+    dataset_id: str,
+    dataset_path: str,
+    *,
+    batch_size: Optional[int] = None,
+) -> ValidationResult:
+    """Validate a large dataset in batches and build the API result (issues + corrections)."""
+    issues: List[GeometryIssue] = []
+    for batch_issues in iter_streaming_issues(dataset_path, batch_size=batch_size):
+        issues.extend(batch_issues)
+    corrections = generate_recommendations({"issues": issues})["corrections"]
+    return ValidationResult(dataset_id=dataset_id, issues=issues, corrections=corrections or None)
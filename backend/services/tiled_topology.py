@@ -0,0 +1,320 @@
+"""
+Tiled, process-parallel topology validation for large layers.
+
+core.topology.validate_topology runs on one core over the whole layer. For layers with at
+least settings.TOPOLOGY_TILED_MIN_FEATURES features the topology agent uses this engine
+instead; it returns the same issues, in the same order except that gaps are sorted by location.
+
+Partitioning: the dataset's persisted spatial index (services.spatial_index) already lists the
+features in Hilbert order of their bounding-box centre; that order is cut into equal-count
+tiles of about TOPOLOGY_TILE_SIZE features, so tiles are spatially compact and evenly loaded.
+Every feature has exactly one home tile.
+
+Each tile is a task on a spawn process pool (TOPOLOGY_WORKERS processes). A task receives
+the store and index directories and its home positions only; the worker maps both, finds the
+halo (every feature whose bounds touch the home features' envelope) with an index query and
+decodes just home + halo. Stitching without duplicates:
+
+- overlaps: pair (i, j), i < j, is reported by the home tile of i; j may be a halo feature;
+- dangles: an endpoint is checked by the home tile of its line, against home + halo;
+- gaps: each tile unions its home polygons. A component of that union that no polygon of
+  another tile (necessarily in the halo) intersects keeps its holes in the global union, so the
+  worker reports them directly. Only the remaining boundary components are merged, in Hilbert
+  order (neighbours first) in further pool rounds, and holes are read from the merged union;
+  their bordering features are looked up among the boundary components' polygons only.
+  Gap issues are ordered by location.
+"""
+from __future__ import annotations
+
+import multiprocessing
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import geopandas as gpd
+import numpy as np
+import shapely
+
+from core.config import settings
+from core.topology import (
+    _coverage_union,
+    _dangle_issue,
+    _feature_ids,
+    _find_gaps,
+    _gap_issue,
+    _line_endpoints,
+    _location,
+    _overlap_issue,
+    _pairwise_intersection,
+    _valid_polygon_mask,
+)
+from services.geometry_store import GeometryStore, attach_geometry_store, get_geometry_store
+from services.spatial_index import SpatialIndex, attach_spatial_index, get_spatial_index
+
+
+_UNION_FAN_IN = 4  # partial unions merged per task in each gap reduction round
+
+_pool: Optional[ProcessPoolExecutor] = None
+_pool_lock = threading.Lock()
+
+
+def get_topology_pool() -> ProcessPoolExecutor:
+    """Return the process-wide topology pool (spawn context), creating it on first use."""
+    global _pool
+    if _pool is None:
+        with _pool_lock:
+            if _pool is None:
+                _pool = ProcessPoolExecutor(
+                    max_workers=_worker_count(),
+                    mp_context=multiprocessing.get_context("spawn"),
+                )
+    return _pool
+
+
+def shutdown_topology_pool(wait: bool = True) -> None:
+    """Shut down the topology pool (app shutdown); a later call recreates it."""
+    global _pool
+    with _pool_lock:
+        pool, _pool = _pool, None
+    if pool is not None:
+        pool.shutdown(wait=wait)
+
+
+def _worker_count() -> int:
+    return max(1, settings.TOPOLOGY_WORKERS or os.cpu_count() or 1)
+
+
+def hilbert_tiles(order: np.ndarray, tile_size: int, min_tiles: int = 1) -> List[np.ndarray]:
+    """
+    Cut Hilbert-ordered feature positions (SpatialIndex.order) into tiles of roughly equal
+    count, at least min_tiles of them. Returns sorted position arrays, one per tile.
+    """
+    if not len(order):
+        return []
+    n_tiles = min(len(order), max(min_tiles, -(-len(order) // max(1, tile_size))))
+    return [np.sort(chunk) for chunk in np.array_split(np.asarray(order), n_tiles)]
+
+
+def _tile_task(
+    directory: str,
+    index_directory: str,
+    home: np.ndarray,
+    envelope: np.ndarray,
+    check_gaps: bool,
+    check_overlaps: bool,
+    check_connectivity: bool,
+    tolerance: float,
+    dangle_tolerance: float,
+    min_gap_area: float,
+) -> Dict[str, Any]:
+    """Worker: topology checks for one tile's home features against home + halo."""
+    store = attach_geometry_store(directory)
+    pad = dangle_tolerance if check_connectivity else 0.0
+    # The index holds non-empty geometries only, so null/empty features never enter the halo.
+    local = attach_spatial_index(index_directory).query(envelope + np.array([-pad, -pad, pad, pad]))
+    geoms = store.geometries(local)
+    is_home = np.isin(local, home)
+    result: Dict[str, Any] = {}
+
+    if check_gaps or check_overlaps:
+        polygons = np.flatnonzero(_valid_polygon_mask(geoms))
+        home_polygons = polygons[is_home[polygons]]
+        if check_gaps:
+            foreign = polygons[~is_home[polygons]]
+            gaps, union, border = _tile_gaps(geoms[home_polygons], geoms[foreign], min_gap_area)
+            # Bordering features as global positions.
+            result["gaps"] = [(loc, area, local[home_polygons[np.asarray(b, dtype=np.intp)]]) for loc, area, b in gaps]
+            result["union"] = union
+            result["boundary_polygons"] = local[home_polygons[border]]
+        if check_overlaps:
+            result["overlaps"] = _tile_overlaps(geoms, local, polygons, home_polygons, tolerance)
+
+    if check_connectivity:
+        result["dangles"] = _tile_dangles(geoms, local, np.flatnonzero(is_home), dangle_tolerance)
+    return result
+
+
+def _tile_gaps(
+    polygons: np.ndarray,
+    foreign: np.ndarray,
+    min_area: float,
+) -> tuple[list, Optional[bytes], np.ndarray]:
+    """
+    Union the tile's polygons. Returns the gaps (core.topology._find_gaps records) of the
+    components no foreign polygon intersects, the WKB union of the other (boundary)
+    components or None, and the positions in polygons of the boundary components' members.
+
+    A foreign polygon lying inside a hole without touching it leaves that interior ring, and
+    so the reported gap, unchanged.
+    """
+    if not len(polygons):
+        return [], None, np.empty(0, dtype=np.int64)
+    parts = shapely.get_parts(_coverage_union(polygons))
+    parts = parts[~shapely.is_empty(parts)]
+    boundary = np.zeros(len(parts), dtype=bool)
+    if len(foreign) and len(parts):
+        part_idx, _ = shapely.STRtree(foreign).query(parts, predicate="intersects")
+        boundary[part_idx] = True
+    gaps = _find_gaps(parts[~boundary], polygons, min_area)
+    if not boundary.any():
+        return gaps, None, np.empty(0, dtype=np.int64)
+    members, _ = shapely.STRtree(parts[boundary]).query(polygons, predicate="intersects")
+    # Components of one union are disjoint: together they are a valid MultiPolygon as is.
+    return gaps, shapely.to_wkb(shapely.multipolygons(parts[boundary])), np.unique(members)
+
+
+def _tile_overlaps(
+    geoms: np.ndarray,
+    local: np.ndarray,
+    polygons: np.ndarray,
+    home_polygons: np.ndarray,
+    tolerance: float,
+) -> tuple[np.ndarray, np.ndarray, List[Optional[List[float]]]]:
+    """Overlapping pairs (i, j), i < j, whose first feature is in the tile (global positions)."""
+    empty = (np.empty(0, dtype=np.int64), np.empty(0, dtype=np.int64), [])
+    if not len(home_polygons) or len(polygons) < 2:
+        return empty
+    tree = shapely.STRtree(geoms[polygons])
+    left, right = tree.query(geoms[home_polygons], predicate="intersects")
+    left, right = home_polygons[left], polygons[right]
+    keep = local[left] < local[right]
+    left, right = left[keep], right[keep]
+
+    inter = _pairwise_intersection(geoms[left], geoms[right])
+    present = ~shapely.is_missing(inter)
+    hit = present.copy()
+    hit[present] = ~shapely.is_empty(inter[present]) & (shapely.area(inter[present]) > tolerance)
+    if not hit.any():
+        return empty
+    return local[left[hit]], local[right[hit]], [_location(g) for g in inter[hit]]
+
+
+def _tile_dangles(
+    geoms: np.ndarray,
+    local: np.ndarray,
+    home: np.ndarray,
+    tolerance: float,
+) -> tuple[np.ndarray, np.ndarray]:
+    """Unconnected endpoints of the tile's lines: (global owner positions, (m, 2) coords)."""
+    coords, owner = _line_endpoints(geoms[home])
+    if not len(coords):
+        return np.empty(0, dtype=np.int64), np.empty((0, 2))
+    owner = home[owner]
+    tree = shapely.STRtree(geoms)
+    pt_idx, geom_pos = tree.query(shapely.points(coords), predicate="dwithin", distance=tolerance)
+    other = geom_pos != owner[pt_idx]
+    connected = np.zeros(len(coords), dtype=bool)
+    connected[pt_idx[other]] = True
+    return local[owner[~connected]], coords[~connected]
+
+
+def _union_task(pieces: Sequence[bytes]) -> Optional[bytes]:
+    """Worker: union of partial coverage unions (WKB in, WKB out)."""
+    union = _coverage_union(shapely.from_wkb(np.array(pieces, dtype=object)))
+    return None if union.is_empty else shapely.to_wkb(union)
+
+
+def _merge_unions(pool: ProcessPoolExecutor, pieces: List[bytes]) -> Optional[bytes]:
+    """Reduce tile unions to one, merging Hilbert neighbours in parallel rounds."""
+    while len(pieces) > 1:
+        groups = [pieces[k:k + _UNION_FAN_IN] for k in range(0, len(pieces), _UNION_FAN_IN)]
+        merged = [pool.submit(_union_task, g) for g in groups]
+        pieces = [p for p in (f.result() for f in merged) if p is not None]
+    return pieces[0] if pieces else None
+
+
+def validate_topology_tiled(
+    gdf: gpd.GeoDataFrame,
+    store: GeometryStore,
+    index: SpatialIndex,
+    *,
+    check_gaps: bool = True,
+    check_overlaps: bool = True,
+    check_connectivity: bool = True,
+    tolerance: float = 0.0,
+    min_gap_area: float = 0.0,
+    tile_size: Optional[int] = None,
+) -> List[Dict[str, Any]]:
+    """
+    Tiled equivalent of core.topology.validate_topology (same issues; gaps sorted by location).
+
+    store must hold gdf's geometries in row order (services.geometry_store) and index must be
+    built from it; gdf supplies the feature ids. tile_size defaults to settings.TOPOLOGY_TILE_SIZE.
+    """
+    if gdf is None or gdf.empty or store.count != len(gdf) or index.count != store.count:
+        return []
+    workers = _worker_count()
+    size = tile_size if tile_size is not None else settings.TOPOLOGY_TILE_SIZE
+    tiles = hilbert_tiles(index.order, size, min_tiles=workers)
+    if not tiles:
+        return []
+
+    bounds = store.bounds
+    envelopes = np.array(
+        [[*bounds[home, :2].min(axis=0), *bounds[home, 2:].max(axis=0)] for home in tiles],
+        dtype=np.float64,
+    )
+    pool = get_topology_pool()
+    dangle_tolerance = tolerance if tolerance > 0 else 1e-9
+    futures = [
+        pool.submit(
+            _tile_task, str(store.directory), str(index.directory), home, envelope,
+            check_gaps, check_overlaps, check_connectivity, tolerance, dangle_tolerance, min_gap_area,
+        )
+        for home, envelope in zip(tiles, envelopes)
+    ]
+    results = [f.result() for f in futures]
+    fids = _feature_ids(gdf)
+    issues: List[Dict[str, Any]] = []
+
+    if check_gaps:
+        gaps = [gap for r in results for gap in r["gaps"]]
+        union = _merge_unions(pool, [r["union"] for r in results if r["union"] is not None])
+        if union is not None:
+            candidates = np.concatenate([r["boundary_polygons"] for r in results])
+            candidates.sort()
+            merged = _find_gaps(shapely.from_wkb(union), store.geometries(candidates), min_gap_area)
+            gaps.extend((loc, area, candidates[np.asarray(b, dtype=np.intp)]) for loc, area, b in merged)
+        for location, area, border in sorted(gaps, key=lambda g: g[0]):
+            issues.append(_gap_issue(location, area, [fids[p] for p in np.sort(border)]))
+
+    if check_overlaps:
+        pos_i = np.concatenate([r["overlaps"][0] for r in results])
+        pos_j = np.concatenate([r["overlaps"][1] for r in results])
+        locations = [loc for r in results for loc in r["overlaps"][2]]
+        for k in np.lexsort((pos_j, pos_i)):
+            issues.append(_overlap_issue(fids[pos_i[k]], fids[pos_j[k]], locations[k]))
+
+    if check_connectivity:
+        owners = np.concatenate([r["dangles"][0] for r in results])
+        coords = np.concatenate([r["dangles"][1] for r in results])
+        # A line's endpoints all come from its home tile, in order; a stable sort by owner
+        # restores the serial (feature, part, start/end) order.
+        for k in np.argsort(owners, kind="stable"):
+            issues.append(_dangle_issue(fids[owners[k]], coords[k]))
+    return issues
+
+
+def tiled_topology_inputs(
+    vector_path: Optional[Path],
+    gdf: Optional[gpd.GeoDataFrame],
+) -> Optional[Tuple[GeometryStore, SpatialIndex]]:
+    """
+    Geometry store and spatial index to validate gdf with the tiled engine, or None to use
+    the serial one.
+
+    Tiling is used when the layer has at least TOPOLOGY_TILED_MIN_FEATURES features
+    (0 = never) and the dataset's store matches gdf row for row. Both are built if missing.
+    """
+    threshold = settings.TOPOLOGY_TILED_MIN_FEATURES
+    if vector_path is None or gdf is None or threshold <= 0 or len(gdf) < threshold:
+        return None
+    store = get_geometry_store(Path(vector_path), gdf)
+    if store is None or store.count != len(gdf):
+        return None
+    index = get_spatial_index(Path(vector_path), store=store)
+    if index is None or index.count != store.count:
+        return None
+    return store, index
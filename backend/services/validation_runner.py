@@ -0,0 +1,226 @@
+"""
+Run the LangGraph validation workflow on a bounded worker pool.
+
+The /validate endpoints are async; calling validation_graph.invoke directly from them blocks
+the event loop, so one long topology run stalls every other request (including /health).
+run_validation_async hands the run to a ThreadPoolExecutor capped at
+settings.VALIDATION_MAX_WORKERS and awaits the result, keeping the event loop free.
+Runs beyond the limit queue in the executor until a worker is available.
+
+Async jobs (POST /validate/async) go through services.job_store instead of process memory:
+submit_validation_job records a pending job in SQLite and wakes a worker on a separate pool
+(settings.VALIDATION_JOB_WORKERS). Workers drain the queue by atomically claiming the oldest
+pending job, so jobs enqueued by any uvicorn worker, or left over from before a restart, are
+picked up by whichever process has capacity.
+
+Very large layers skip the graph and are validated batch by batch
+(services.streaming_validation) with bounded memory.
+
+Every completed run is stored in the content-addressed result cache (services.result_cache);
+run_validation(..., use_cache=True) and get_cached_result serve repeat requests from it.
+After corrections are applied, run_validation(..., incremental=True) builds the new result
+from the cached one and the recorded edits (services.incremental_validation).
+"""
+from __future__ import annotations
+
+import asyncio
+import functools
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+from api.models import ValidationResult
+from agents.orchestrator import empty_state, validation_graph
+from core.config import settings
+from services.batch_reader import count_features
+from services.incremental_validation import run_incremental_validation
+from services.job_store import ValidationJobStore, current_owner
+from services.result_cache import get_result_cache, validation_cache_key
+from services.streaming_validation import run_streaming_validation
+
+
+_executor: Optional[ThreadPoolExecutor] = None
+_executor_lock = threading.Lock()
+
+_job_executor: Optional[ThreadPoolExecutor] = None
+_job_stores: Dict[str, ValidationJobStore] = {}
+
+
+def get_validation_executor() -> ThreadPoolExecutor:
+    """Return the process-wide validation pool, creating it on first use."""
+    global _executor
+    if _executor is None:
+        with _executor_lock:
+            if _executor is None:
+                _executor = ThreadPoolExecutor(
+                    max_workers=max(1, settings.VALIDATION_MAX_WORKERS),
+                    thread_name_prefix="validation",
+                )
+    return _executor
+
+
+def _get_job_executor() -> ThreadPoolExecutor:
+    """Return the async-job pool (separate from request-driven runs), creating it on first use."""
+    global _job_executor
+    if _job_executor is None:
+        with _executor_lock:
+            if _job_executor is None:
+                _job_executor = ThreadPoolExecutor(
+                    max_workers=max(1, settings.VALIDATION_JOB_WORKERS),
+                    thread_name_prefix="validation-job",
+                )
+    return _job_executor
+
+
+def shutdown_validation_executor(wait: bool = True) -> None:
+    """Shut down the validation pools (app shutdown); a later call recreates them."""
+    global _executor, _job_executor
+    with _executor_lock:
+        executors = [_executor, _job_executor]
+        _executor = _job_executor = None
+    for executor in executors:
+        if executor is not None:
+            executor.shutdown(wait=wait)
+
+
+def get_job_store() -> ValidationJobStore:
+    """Job store under OUTPUT_DIR/jobs (one instance per resolved directory)."""
+    directory = settings.output_path / "jobs"
+    key = str(directory)
+    with _executor_lock:
+        store = _job_stores.get(key)
+        if store is None:
+            store = _job_stores[key] = ValidationJobStore(directory)
+    return store
+
+
+def get_cached_result(dataset_id: str, dataset_path: str) -> Optional[ValidationResult]:
+    """Cached result for the dataset's current content and settings, or None."""
+    return get_result_cache().get(dataset_id, validation_cache_key(Path(dataset_path)))
+
+
+def _use_streaming(dataset_path: str) -> bool:
+    """True if the dataset is large enough for batch-wise streaming validation."""
+    threshold = settings.VALIDATION_STREAMING_MIN_FEATURES
+    return threshold > 0 and count_features(Path(dataset_path)) >= threshold
+
+
+def run_validation(
+    dataset_id: str,
+    dataset_path: str,
+    *,
+    use_cache: bool = False,
+    incremental: bool = False,
+) -> ValidationResult:
+    """
+    Run the validation workflow synchronously and build the API result.
+
+    The result is stored in the result cache under the key computed before the run (so an
+    edit during the run is not cached as current). With use_cache=True a cached result for
+    the same content and settings is returned without running the workflow.
+
+    Datasets with at least VALIDATION_STREAMING_MIN_FEATURES features are validated in
+    batches (services.streaming_validation) instead of through the in-memory graph.
+
+    With incremental=True, a dataset edited by apply_correction_overrides since its last
+    cached run is re-checked only around the changed features; when that is not possible
+    the full workflow runs.
+    """
+    cache = get_result_cache()
+    key = validation_cache_key(Path(dataset_path))
+    if use_cache:
+        cached = cache.get(dataset_id, key)
+        if cached is not None:
+            return cached
+    streaming = _use_streaming(dataset_path)
+    if incremental and not streaming:
+        result = run_incremental_validation(dataset_id, dataset_path)
+        if result is not None:
+            return result
+    if streaming:
+        result = run_streaming_validation(dataset_id, dataset_path)
+    else:
+        final_state = validation_graph.invoke(empty_state(dataset_id, dataset_path))
+        issues = final_state.get("issues") or []
+        corrections = final_state.get("corrections") or []
+        result = ValidationResult(dataset_id=dataset_id, issues=issues, corrections=corrections if corrections else None)
+    cache.put(dataset_id, key, result)
+    return result
+
+
+async def run_validation_async(
+    dataset_id: str,
+    dataset_path: str,
+    *,
+    use_cache: bool = False,
+    incremental: bool = False,
+) -> ValidationResult:
+    """
+    Run the validation workflow on the worker pool without blocking the event loop.
+
+    With use_cache=True the cache is checked first on the default executor, so a hit is
+    served immediately instead of queueing behind long runs on the validation pool.
+    """
+    if use_cache:
+        cached = await asyncio.to_thread(get_cached_result, dataset_id, dataset_path)
+        if cached is not None:
+            return cached
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(
+        get_validation_executor(),
+        functools.partial(run_validation, dataset_id, dataset_path, incremental=incremental),
+    )
+
+
+def _drain_job_queue(store: ValidationJobStore) -> None:
+    """Worker loop: claim and run pending jobs until the queue is empty."""
+    owner = current_owner()
+    while True:
+        job = store.claim_next(owner)
+        if job is None:
+            return
+        try:
+            result = run_validation(job["dataset_id"], job["dataset_path"])
+        except Exception as exc:  # noqa: BLE001
+            store.fail(job["job_id"], str(exc))
+        else:
+            store.complete(job["job_id"], result)
+
+
+def submit_validation_job(dataset_id: str, dataset_path: str) -> Dict[str, Any]:
+    """
+    Enqueue an async validation job and wake a job worker. Returns the pending job dict.
+
+    Expired finished jobs are purged opportunistically on each submit.
+    """
+    store = get_job_store()
+    store.purge_expired(settings.VALIDATION_JOB_TTL_SECONDS)
+    job = store.create(dataset_id, dataset_path)
+    _get_job_executor().submit(_drain_job_queue, store)
+    return job
+
+
+async def submit_validation_job_async(dataset_id: str, dataset_path: str) -> Dict[str, Any]:
+    """submit_validation_job on the default executor (SQLite writes and the TTL purge block)."""
+    return await asyncio.to_thread(submit_validation_job, dataset_id, dataset_path)
+
+
+async def get_validation_job_async(job_id: str) -> Optional[Dict[str, Any]]:
+    """The job dict from the job store, read on the default executor; None if unknown."""
+    return await asyncio.to_thread(lambda: get_job_store().get(job_id))
+
+
+def resume_validation_jobs() -> int:
+    """
+    Startup hook: requeue jobs orphaned by a dead process and start workers for pending jobs.
+
+    Returns the number of jobs that were requeued.
+    """
+    store = get_job_store()
+    store.purge_expired(settings.VALIDATION_JOB_TTL_SECONDS)
+    requeued = store.requeue_orphaned_jobs()
+    if store.has_pending():
+        for _ in range(max(1, settings.VALIDATION_JOB_WORKERS)):
+            _get_job_executor().submit(_drain_job_queue, store)
+    return requeued
@@ -0,0 +1,173 @@
+"""
+Header-only metadata extraction for uploaded vector files (POST /upload).
+
+The upload response only needs feature_count, geometry_type, crs and bounds. Building a
+GeoDataFrame for that parses every geometry into Shapely objects, so upload latency grew
+with file size. read_vector_metadata asks GDAL for layer info instead (pyogrio.read_info):
+for shapefiles the count, shape type and extent come from the .shp/.shx headers and the CRS
+from the .prj; for GeoJSON the driver scans the file once without creating geometries.
+
+When a GeoJSON layer mixes geometry types GDAL reports "Unknown"; the types are then taken
+from the raw WKB headers (pyogrio.raw.read with no attribute columns), still without Shapely.
+If pyogrio cannot read the file the full GeoPandas read is used as a fallback.
+"""
+from __future__ import annotations
+
+import struct
+from pathlib import Path
+from typing import Iterable, List, Optional
+
+import geopandas as gpd
+
+try:
+    import pyogrio
+    from pyogrio.raw import read as _read_raw
+except ImportError:  # pragma: no cover - pyogrio ships with geopandas>=1.0
+    pyogrio = None  # type: ignore[assignment]
+    _read_raw = None  # type: ignore[assignment]
+
+
+# WKB base type codes (ISO/OGC); Z/M variants add 1000/2000/3000, EWKB sets high flag bits.
+_WKB_TYPE_NAMES = {
+    1: "Point",
+    2: "LineString",
+    3: "Polygon",
+    4: "MultiPoint",
+    5: "MultiLineString",
+    6: "MultiPolygon",
+    7: "GeometryCollection",
+}
+_GDAL_DIMENSION_SUFFIXES = (" ZM", " Z", " M")
+
+
+def read_vector_metadata(path: Path) -> Optional[dict]:
+    """
+    Return upload metadata for a vector file without loading its geometries.
+
+    Returns:
+        Dict with keys: feature_count, geometry_type, crs, bounds (same shape as
+        parse_geojson_metadata / parse_shapefile_metadata). None if the file cannot be read.
+        For shapefiles geometry_type is the header shape type (e.g. "Polygon" also covers
+        multipart polygons).
+    """
+    path = Path(path)
+    if not path.is_file():
+        return None
+    if pyogrio is None:
+        return read_vector_metadata_full(path)
+    try:
+        info = pyogrio.read_info(path, force_feature_count=True, force_total_bounds=True)
+    except Exception:
+        return read_vector_metadata_full(path)
+
+    feature_count = max(0, int(info.get("features") or 0))
+    crs = _normalize_crs(info.get("crs"))
+    if feature_count == 0:
+        return {"feature_count": 0, "geometry_type": None, "crs": crs, "bounds": None}
+
+    geometry_type = _gdal_geometry_type(info.get("geometry_type"))
+    if geometry_type is None:
+        geometry_type = _scan_geometry_types(path)
+
+    bounds = info.get("total_bounds")
+    bounds = [float(b) for b in bounds] if bounds is not None and len(bounds) == 4 else None
+
+    return {
+        "feature_count": feature_count,
+        "geometry_type": geometry_type,
+        "crs": crs,
+        "bounds": bounds,
+    }
+
+
+def read_vector_metadata_full(path: Path) -> Optional[dict]:
+    """Metadata from a full GeoPandas read (slow path; used when pyogrio info is unavailable)."""
+    try:
+        gdf = gpd.read_file(path)
+    except Exception:
+        return None
+
+    feature_count = len(gdf)
+    if gdf.empty or gdf.geometry is None:
+        return {
+            "feature_count": 0,
+            "geometry_type": None,
+            "crs": crs_to_string(gdf.crs) if gdf.crs is not None else None,
+            "bounds": None,
+        }
+
+    geom_types = gdf.geometry.geom_type.dropna().unique()
+    geometry_type = geom_types[0] if len(geom_types) == 1 else ",".join(sorted(geom_types))
+    crs = crs_to_string(gdf.crs)
+    try:
+        tb = gdf.total_bounds
+        bounds = tb.tolist() if tb is not None and len(tb) == 4 else None
+    except Exception:
+        bounds = None
+
+    return {
+        "feature_count": feature_count,
+        "geometry_type": geometry_type,
+        "crs": crs,
+        "bounds": bounds,
+    }
+
+
+def crs_to_string(crs) -> Optional[str]:
+    """Convert a pyproj/CRS object to a string (e.g. EPSG:4326)."""
+    if crs is None:
+        return None
+    try:
+        return crs.to_string() if hasattr(crs, "to_string") else str(crs)
+    except Exception:
+        return str(crs)
+
+
+def _normalize_crs(crs_text: Optional[str]) -> Optional[str]:
+    """CRS from read_info ("EPSG:4326" or WKT) in the same form as crs_to_string(gdf.crs)."""
+    if not crs_text:
+        return None
+    try:
+        from pyproj import CRS
+
+        return crs_to_string(CRS.from_user_input(crs_text))
+    except Exception:
+        return crs_text
+
+
+def _gdal_geometry_type(name: Optional[str]) -> Optional[str]:
+    """GDAL layer geometry type without dimension suffix; None for "Unknown" (mixed)."""
+    if not name or name == "Unknown":
+        return None
+    for suffix in _GDAL_DIMENSION_SUFFIXES:
+        if name.endswith(suffix):
+            return name[: -len(suffix)]
+    return name
+
+
+def _wkb_geometry_type(wkb: bytes) -> Optional[str]:
+    """Geometry type name from a WKB/EWKB header (byte order + uint32 type)."""
+    if wkb is None or len(wkb) < 5:
+        return None
+    (code,) = struct.unpack("<I" if wkb[0] == 1 else ">I", bytes(wkb[1:5]))
+    return _WKB_TYPE_NAMES.get((code & 0x0FFFFFFF) % 1000)
+
+
+def _join_types(types: Iterable[Optional[str]]) -> Optional[str]:
+    names: List[str] = sorted({t for t in types if t})
+    if not names:
+        return None
+    return names[0] if len(names) == 1 else ",".join(names)
+
+
+def _scan_geometry_types(path: Path) -> Optional[str]:
+    """Distinct geometry types in the layer from raw WKB (no attributes, no Shapely objects)."""
+    if _read_raw is None:
+        return None
+    try:
+        _, _, geometry, _ = _read_raw(path, columns=[])
+    except Exception:
+        return None
+    if geometry is None:
+        return None
+    return _join_types(_wkb_geometry_type(wkb) for wkb in geometry)
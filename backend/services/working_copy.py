@@ -0,0 +1,226 @@
+"""
+Columnar GeoParquet working copy of an uploaded dataset.
+
+Uploads arrive as text GeoJSON or shapefiles, and every consumer (validation agents,
+apply_correction_overrides) used to re-parse that original. After upload the dataset is
+converted once to GeoParquet in the dataset's derived directory
+(<dataset dir>/.derived/working.parquet); read_dataset loads from it when it is current.
+Parquet is columnar, so readers can project: the topology and geometry checks read only
+the geometry (plus the "id" column), the attribute agent only the attribute columns.
+
+The copy records the [size, mtime_ns] of the source files it was built from; if the
+original changes the copy is stale and read_dataset falls back to the original (and
+rebuilds the copy from what it read). pyarrow is optional: without it no working copy is
+written and every read goes to the original file.
+"""
+from __future__ import annotations
+
+import json
+import uuid
+from pathlib import Path
+from typing import Iterable, List, Optional, Sequence, Union
+
+import geopandas as gpd
+import numpy as np
+import pandas as pd
+import pyogrio
+
+from services.file_handler import DERIVED_DIR_NAME, get_dataset_stamps, get_derived_path
+
+try:
+    import pyarrow.parquet as pq
+except ImportError:  # pragma: no cover - optional dependency
+    pq = None  # type: ignore[assignment]
+
+
+WORKING_COPY_NAME = "working.parquet"
+_WORKING_COPY_META = "working.json"
+
+Frame = Union[gpd.GeoDataFrame, pd.DataFrame]
+
+
+def working_copy_supported() -> bool:
+    """True if pyarrow is installed, so GeoParquet working copies can be written and read."""
+    return pq is not None
+
+
+def get_working_copy_path(vector_path: Path) -> Optional[Path]:
+    """Path of the working copy for vector_path, or None if missing or stale."""
+    if pq is None:
+        return None
+    derived = Path(vector_path).parent / DERIVED_DIR_NAME
+    copy_path = derived / WORKING_COPY_NAME
+    try:
+        meta = json.loads((derived / _WORKING_COPY_META).read_text(encoding="utf-8"))
+        current = get_dataset_stamps(vector_path)
+    except (OSError, ValueError):
+        return None
+    if meta.get("source") != current or not copy_path.is_file():
+        return None
+    return copy_path
+
+
+def write_working_copy(vector_path: Path, gdf: gpd.GeoDataFrame) -> Optional[Path]:
+    """
+    Store gdf as the working copy of vector_path (gdf must be the current content).
+
+    The parquet file and its metadata are replaced atomically. Returns the copy's path,
+    or None if pyarrow is unavailable or the frame cannot be written.
+    """
+    if pq is None or gdf is None:
+        return None
+    derived = get_derived_path(vector_path)
+    copy_path = derived / WORKING_COPY_NAME
+    # Unique temp names: the upload-time conversion and a first validation may race.
+    token = uuid.uuid4().hex
+    tmp = derived / f"{WORKING_COPY_NAME}.{token}.tmp"
+    try:
+        stamps = get_dataset_stamps(vector_path)
+        gdf.to_parquet(tmp, index=None)
+        tmp.replace(copy_path)
+        meta_tmp = derived / f"{_WORKING_COPY_META}.{token}.tmp"
+        meta_tmp.write_text(json.dumps({"source": stamps}), encoding="utf-8")
+        meta_tmp.replace(derived / _WORKING_COPY_META)
+    except Exception:
+        tmp.unlink(missing_ok=True)
+        return None
+    return copy_path
+
+
+def build_working_copy(vector_path: Path) -> Optional[Path]:
+    """Convert the dataset at vector_path to its working copy (no-op if already current)."""
+    vector_path = Path(vector_path)
+    existing = get_working_copy_path(vector_path)
+    if existing is not None or pq is None:
+        return existing
+    try:
+        gdf = gpd.read_file(vector_path)
+    except Exception:
+        return None
+    return write_working_copy(vector_path, gdf)
+
+
+def _existing(names: Iterable[str], wanted: Optional[Iterable[str]]) -> Optional[List[str]]:
+    if wanted is None:
+        return None
+    available = set(names)
+    return [c for c in wanted if c in available]
+
+
+def _read_working_copy(copy_path: Path, columns: Optional[List[str]], geometry: bool) -> Frame:
+    schema = pq.read_schema(copy_path)
+    geo = json.loads(schema.metadata[b"geo"]) if schema.metadata and b"geo" in schema.metadata else {}
+    geom_col = geo.get("primary_column")
+    names = [n for n in schema.names if not n.startswith("__index_level_")]
+    attrs = [n for n in names if n != geom_col and n not in geo.get("columns", {})]
+    selected = _existing(attrs, columns) if columns is not None else attrs
+    if geometry and geom_col:
+        return gpd.read_parquet(copy_path, columns=[*selected, geom_col])
+    return pq.read_table(copy_path, columns=selected).to_pandas()
+
+
+def read_dataset(
+    vector_path: Path,
+    *,
+    columns: Optional[Iterable[str]] = None,
+    geometry: bool = True,
+) -> Optional[Frame]:
+    """
+    Read a dataset, from its working copy when current, otherwise from the original file.
+
+    Args:
+        vector_path: Primary vector file of the dataset.
+        columns: Attribute columns to read (missing names are ignored); None = all.
+        geometry: If False, return a plain DataFrame without the geometry column.
+
+    Returns:
+        GeoDataFrame (or DataFrame when geometry=False); None if missing or unreadable.
+        A full read of the original also (re)builds the working copy.
+    """
+    vector_path = Path(vector_path)
+    if not vector_path.exists():
+        return None
+    wanted = list(columns) if columns is not None else None
+    copy_path = get_working_copy_path(vector_path)
+    if copy_path is not None:
+        try:
+            return _read_working_copy(copy_path, wanted, geometry)
+        except Exception:
+            pass
+    try:
+        gdf = gpd.read_file(vector_path)
+    except Exception:
+        return None
+    write_working_copy(vector_path, gdf)
+    if wanted is not None:
+        attrs = _existing([c for c in gdf.columns if c != gdf.geometry.name], wanted)
+        gdf = gdf[[*attrs, gdf.geometry.name]]
+    if not geometry:
+        return pd.DataFrame(gdf.drop(columns=gdf.geometry.name))
+    return gdf
+
+
+def _read_working_copy_rows(copy_path: Path, positions: np.ndarray, columns: Optional[List[str]]) -> pd.DataFrame:
+    """Attribute rows at positions, decoding only the row groups that hold them."""
+    parquet = pq.ParquetFile(copy_path)
+    geo = json.loads(parquet.schema_arrow.metadata[b"geo"])
+    names = [
+        n for n in parquet.schema_arrow.names
+        if n not in geo.get("columns", {}) and not n.startswith("__index_level_")
+    ]
+    selected = _existing(names, columns) if columns is not None else names
+    sizes = np.array([parquet.metadata.row_group(g).num_rows for g in range(parquet.num_row_groups)], dtype=np.int64)
+    starts = np.concatenate([[0], np.cumsum(sizes)])
+    group_of = np.searchsorted(starts, positions, side="right") - 1
+    groups = np.unique(group_of)
+    if not len(groups):
+        return parquet.schema_arrow.empty_table().select(selected).to_pandas()
+    table = parquet.read_row_groups(groups.tolist(), columns=selected)
+    # Position of each wanted row inside the concatenation of the groups read.
+    offsets = np.concatenate([[0], np.cumsum(sizes[groups])])
+    local = offsets[np.searchsorted(groups, group_of)] + positions - starts[group_of]
+    return table.take(local).to_pandas()
+
+
+def read_dataset_rows(
+    vector_path: Path,
+    positions: Sequence[int],
+    *,
+    columns: Optional[Iterable[str]] = None,
+) -> Optional[pd.DataFrame]:
+    """
+    Attribute rows (no geometry) at the given feature positions, indexed by position.
+
+    Unlike read_dataset, only what holds those rows is decoded: the working copy's row
+    groups containing them, or, from the original, the span of features between the first
+    and last position (pyogrio skip_features / max_features).
+
+    Returns:
+        DataFrame in the order of positions; None if the dataset is missing or unreadable.
+    """
+    vector_path = Path(vector_path)
+    if not vector_path.exists():
+        return None
+    pos = np.asarray(positions, dtype=np.int64)
+    wanted = list(columns) if columns is not None else None
+    copy_path = get_working_copy_path(vector_path)
+    if copy_path is not None:
+        try:
+            return _read_working_copy_rows(copy_path, pos, wanted).set_axis(pos)
+        except Exception:
+            pass
+    try:
+        if not len(pos):
+            fields = list(pyogrio.read_info(vector_path)["fields"])
+            return pd.DataFrame(columns=_existing(fields, wanted) if wanted is not None else fields).set_axis(pos)
+        first = int(pos.min())
+        span = pyogrio.read_dataframe(
+            vector_path,
+            columns=wanted,
+            read_geometry=False,
+            skip_features=first,
+            max_features=int(pos.max()) - first + 1,
+        )
+    except Exception:
+        return None
+    return span.iloc[pos - first].set_axis(pos)
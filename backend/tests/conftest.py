@@ -17,3 +17,9 @@ from main import app
 def client():
     """FastAPI test client."""
     return TestClient(app)
+
+
+@pytest.fixture(autouse=True)
+def _no_shared_llm_cache(monkeypatch):
+    """Keep tests from reading or writing the shared LLM response cache under ./outputs."""
+    monkeypatch.setattr("core.config.settings.LLM_CACHE_ENABLED", False)
@@ -1,4 +1,7 @@
 """Tests for API routes."""
+import asyncio
+import json
+
 import pytest
 
 
@@ -171,3 +174,97 @@ def test_apply_corrections_dataset_not_found(client, tmp_path, monkeypatch):
     )
 
     assert response.status_code == 404
+
+
+def test_upload_geojson_returns_metadata(client, tmp_path, monkeypatch):
+    """POST /upload streams the file to disk and reports header metadata."""
+    monkeypatch.setattr("core.config.settings.UPLOAD_DIR", str(tmp_path))
+    body = (
+        b'{"type": "FeatureCollection", "features": [{"type": "Feature", "properties": {"id": 1}, '
+        b'"geometry": {"type": "Point", "coordinates": [1.0, 2.0]}}]}'
+    )
+    response = client.post("/api/v1/upload", files={"file": ("pts.geojson", body, "application/geo+json")})
+
+    assert response.status_code == 200
+    data = response.json()
+    assert data["feature_count"] == 1
+    assert data["geometry_type"] == "Point"
+    assert (tmp_path / data["dataset_id"] / "pts.geojson").read_bytes() == body
+
+
+def test_upload_too_large_returns_413_and_cleans_up(client, tmp_path, monkeypatch):
+    monkeypatch.setattr("core.config.settings.UPLOAD_DIR", str(tmp_path))
+    monkeypatch.setattr("core.config.settings.MAX_UPLOAD_SIZE_MB", 1)
+    body = b" " * (1024 * 1024 + 1)
+    response = client.post("/api/v1/upload", files={"file": ("big.geojson", body, "application/geo+json")})
+
+    assert response.status_code == 413
+    assert response.json()["detail"]["code"] == "FILE_TOO_LARGE"
+    assert list(tmp_path.iterdir()) == []
+
+
+def test_upload_over_limit_rejected_before_body_is_parsed(client, tmp_path, monkeypatch):
+    """Declared or streamed (chunked) bodies over the limit get 413 without reaching the endpoint."""
+    monkeypatch.setattr("core.config.settings.UPLOAD_DIR", str(tmp_path))
+    monkeypatch.setattr("core.config.settings.MAX_UPLOAD_SIZE_MB", 1)
+    boundary = "b0undary"
+    head = f'--{boundary}\r\nContent-Disposition: form-data; name="file"; filename="big.geojson"\r\n\r\n'.encode()
+    chunks = [head] + [b" " * (64 * 1024)] * 64 + [f"\r\n--{boundary}--\r\n".encode()]  # 4 MB
+
+    async def endpoint_reached(*args, **kwargs):
+        raise AssertionError("endpoint reached")
+
+    monkeypatch.setattr("api.routes.save_upload_stream", endpoint_reached)
+    headers = {"content-type": f"multipart/form-data; boundary={boundary}"}
+    declared = client.post("/api/v1/upload", content=b"x", headers={**headers, "content-length": str(4 * 1024 * 1024)})
+    assert declared.status_code == 413
+
+    # Chunked: drive the ASGI app directly (the test client buffers request bodies).
+    received, sent = [], []
+
+    async def receive():
+        received.append(1)
+        return {"type": "http.request", "body": chunks[len(received) - 1], "more_body": len(received) < len(chunks)}
+
+    async def send(message):
+        sent.append(message)
+
+    scope = {
+        "type": "http", "asgi": {"version": "3.0"}, "http_version": "1.1", "method": "POST", "scheme": "http",
+        "path": "/api/v1/upload", "raw_path": b"/api/v1/upload", "root_path": "", "query_string": b"",
+        "headers": [(b"content-type", headers["content-type"].encode()), (b"transfer-encoding", b"chunked")],
+        "client": ("test", 1), "server": ("test", 80),
+    }
+    asyncio.run(client.app(scope, receive, send))
+
+    assert sent[0]["status"] == 413
+    assert json.loads(b"".join(m.get("body", b"") for m in sent[1:])) == declared.json()
+    assert declared.json()["detail"]["code"] == "FILE_TOO_LARGE"
+    assert len(received) < 20  # stopped after about 1 MB of 4
+    assert list(tmp_path.iterdir()) == []
+
+
+def test_get_dataset_features_in_bbox(client, tmp_path, monkeypatch):
+    """GET /api/v1/datasets/{id}/features?bbox= returns only the features in the box."""
+    import geopandas as gpd
+    from shapely.geometry import Point
+
+    monkeypatch.setattr("core.config.settings.UPLOAD_DIR", str(tmp_path))
+    dataset_id = "bbox-dataset"
+    (tmp_path / dataset_id).mkdir()
+    gpd.GeoDataFrame(
+        {"id": ["a", "b", "c"]}, geometry=[Point(0, 0), Point(5, 5), Point(10, 10)], crs="EPSG:4326"
+    ).to_file(tmp_path / dataset_id / "data.geojson", driver="GeoJSON")
+
+    response = client.get(f"/api/v1/datasets/{dataset_id}/features", params={"bbox": "4,4,11,11"})
+
+    assert response.status_code == 200
+    assert response.headers.get("content-type", "").startswith("application/geo+json")
+    assert [f["properties"]["id"] for f in response.json()["features"]] == ["b", "c"]
+
+
+def test_get_dataset_features_rejects_bad_bbox(client, tmp_path, monkeypatch):
+    monkeypatch.setattr("core.config.settings.UPLOAD_DIR", str(tmp_path))
+    response = client.get("/api/v1/datasets/any/features", params={"bbox": "1,2,3"})
+    assert response.status_code == 400
+    assert response.json()["detail"]["code"] == "INVALID_BBOX"
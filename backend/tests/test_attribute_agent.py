@@ -7,6 +7,7 @@ import pytest
 from shapely.geometry import Point
 
 from agents.attribute_agent import run as attribute_agent_run
+from services.dataset_loader import DatasetHandle
 
 
 def _minimal_geojson_path(tmp_path: Path) -> Path:
@@ -64,10 +65,11 @@ def test_run_with_invalid_path_returns_existing_issues():
     assert result["issues"] == []
 
 
-def test_run_preserves_existing_issues(tmp_path):
-    """New attribute issues are appended to existing geometry (or other) issues."""
+def test_run_returns_only_new_issues(tmp_path):
+    """The agent returns only its own issues; the state reducer appends them to existing ones."""
     path = _minimal_geojson_path(tmp_path)
     from api.models import GeometryIssue
+    from agents.state import merge_issues
 
     existing = [
         GeometryIssue(feature_id=99, type="empty_geometry", severity="critical", location=None, description="Empty"),
@@ -81,11 +83,12 @@ def test_run_preserves_existing_issues(tmp_path):
     with patch("agents.attribute_agent.validate_attributes_with_llm", return_value=mock_issues):
         result = attribute_agent_run(state)
 
-    assert len(result["issues"]) == 2
-    assert result["issues"][0].feature_id == 99
-    assert result["issues"][0].type == "empty_geometry"
-    assert result["issues"][1].feature_id == 1
-    assert result["issues"][1].type == "attribute_inconsistency"
+    assert len(result["issues"]) == 1
+    assert result["issues"][0].feature_id == 1
+    assert result["issues"][0].type == "attribute_inconsistency"
+
+    merged = merge_issues(existing, result["issues"])
+    assert [i.type for i in merged] == ["empty_geometry", "attribute_inconsistency"]
 
 
 def test_run_with_injected_llm_uses_it(tmp_path):
@@ -105,3 +108,38 @@ def test_run_with_injected_llm_uses_it(tmp_path):
     result = attribute_agent_run(state, llm=llm)
     assert llm.invoked
     assert result["issues"] == []
+
+
+def test_profiling_issues_reported_and_only_free_text_sent_to_llm(tmp_path):
+    """Profiled issues need no LLM; the prompt only carries free-text fields (plus id)."""
+    n = 40
+    values = [float(i % 5) for i in range(n)]
+    values[3] = 1000.0
+    gdf = gpd.GeoDataFrame(
+        {"id": list(range(n)), "name": [f"Street {i}" for i in range(n)], "value": values},
+        geometry=[Point(i, i) for i in range(n)],
+    )
+    path = tmp_path / "profiled.geojson"
+    gdf.to_file(path, driver="GeoJSON")
+
+    class CapturingLLM:
+        def __init__(self):
+            self.prompts = []
+
+        def invoke(self, prompt: str, **kwargs):
+            self.prompts.append(prompt)
+            return type("Msg", (), {"content": '{"issues": []}'})()
+
+    llm = CapturingLLM()
+    result = attribute_agent_run({"dataset_path": str(path), "issues": []}, llm=llm)
+
+    assert [(i.feature_id, i.type) for i in result["issues"]] == [(3, "attribute_outlier")]
+    assert len(llm.prompts) == 1
+    data = llm.prompts[0].split("ATTRIBUTE_DATA=")[1]
+    assert '"name"' in data and '"value"' not in data
+
+    numeric_only = attribute_agent_run(
+        {"dataset": DatasetHandle(path, gdf=gdf[["id", "value", "geometry"]]), "issues": []}, llm=llm
+    )
+    assert [i.type for i in numeric_only["issues"]] == ["attribute_outlier"]
+    assert len(llm.prompts) == 1  # no free-text field: no LLM call
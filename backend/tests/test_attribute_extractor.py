@@ -1,5 +1,7 @@
 """Tests for services.attribute_extractor (issue #74)."""
 import geopandas as gpd
+import numpy as np
+import pandas as pd
 import pytest
 from shapely.geometry import Point
 
@@ -8,6 +10,8 @@ from services.attribute_extractor import (
     get_attribute_columns,
     get_attribute_records,
     load_attributes_from_path,
+    profile_attributes,
+    sample_attributes,
 )
 
 
@@ -121,3 +125,129 @@ def test_get_attribute_records_respects_max_fields():
     assert len(records) == 1
     assert "a" in records[0] and "b" in records[0]
     assert "c" not in records[0]
+
+
+def test_sample_attributes_returns_both_views_of_one_sample():
+    """Records and per-field values come from the same rows, as the single-view helpers return."""
+    gdf = _gdf_with_attrs(300, with_id_col=True)
+    gdf["score"] = np.linspace(0, 1, 300)
+
+    records, per_field = sample_attributes(gdf, sample_size=40, random_state=3)
+
+    assert records == get_attribute_records(gdf, sample_size=40, random_state=3)
+    assert per_field == get_attribute_columns(gdf, sample_size=40, random_state=3)
+    assert [r["value"] for r in records] == per_field["value"]
+    assert [r["feature_id"] for r in records] == per_field["id"]
+
+
+def test_sample_attributes_values_are_native_and_not_upcast():
+    """numpy scalars become Python values per column (an int id next to a float stays an int)."""
+    gdf = gpd.GeoDataFrame(
+        {"id": np.array([1, 2], dtype=np.int32), "x": [0.5, 1.5], "flag": np.array([True, False])},
+        geometry=[Point(0, 0), Point(1, 1)],
+    )
+
+    records, per_field = sample_attributes(gdf, sample_size=10)
+
+    assert records == [
+        {"feature_id": 1, "id": 1, "x": 0.5, "flag": True},
+        {"feature_id": 2, "id": 2, "x": 1.5, "flag": False},
+    ]
+    assert all(type(v) is int for v in per_field["id"])
+    assert type(records[0]["feature_id"]) is int
+
+
+def _profiled_gdf(n: int = 60):
+    names = ["Oak Ave"] * (n - 3) + ["oak ave", " Oak Ave", "Elm St"]
+    heights = [10.0 + (i % 7) for i in range(n)]
+    heights[5] = 950.0
+    codes = [str(100 + i) for i in range(n)]
+    codes[7] = "n/a"
+    notes = [None, "", "  "] + [f"note {i}" for i in range(n - 3)]
+    return gpd.GeoDataFrame(
+        {"id": [f"f{i}" for i in range(n)], "name": names, "height": heights, "code": codes, "note": notes},
+        geometry=[Point(i, 0) for i in range(n)],
+    )
+
+
+def test_profile_attributes_reports_deterministic_issues():
+    """Missing values, outliers, type mismatches and casing variants come from the full columns."""
+    profile = profile_attributes(_profiled_gdf())
+    found = {(i["field"], i["issue_type"], i["feature_id"]) for i in profile.issues}
+
+    assert found == {
+        ("height", "outlier", "f5"),
+        ("code", "type_mismatch", "f7"),
+        ("note", "missing_value", None),
+        ("name", "inconsistency", None),
+    }
+    (casing,) = [i for i in profile.issues if i["issue_type"] == "inconsistency"]
+    assert "'Oak Ave'" in casing["suggestion"] and "'oak ave'" in casing["suggestion"]
+    (missing,) = [i for i in profile.issues if i["issue_type"] == "missing_value"]
+    assert missing["suggestion"].startswith("3 of 60 values are missing")
+
+    assert "id" not in profile.fields
+    assert profile.fields["code"].kind == "numeric"
+    assert profile.fields["height"].quantiles["max"] == 950.0
+    assert profile.fields["name"].top_values[0] == ("Oak Ave", 57)
+    assert profile.fields["note"].missing_rate == pytest.approx(0.05)
+    assert profile.ambiguous_fields == ["name", "note"]
+
+
+def test_profile_attributes_mad_method_and_issue_cap():
+    """MAD outliers are found too; per-feature issues beyond the cap become one summary."""
+    values = [1.0, 2.0, 3.0, 2.0, 1.0, 2.0, 3.0, 2.0, 1.0, 2.0, 500.0, 600.0, 700.0]
+    gdf = gpd.GeoDataFrame({"v": values}, geometry=[Point(0, 0)] * len(values))
+
+    profile = profile_attributes(gdf, outlier_method="mad", max_issues_per_field=2)
+
+    assert [(i["feature_id"], i["issue_type"]) for i in profile.issues] == [
+        (12, "outlier"), (11, "outlier"), (None, "outlier")
+    ]
+    assert profile.issues[-1]["suggestion"].startswith("1 more values are outside")
+    assert profile.fields["v"].top_values[0] == (2.0, 5)
+    assert profile.fields["v"].distinct == 6
+    assert profile.ambiguous_fields == []
+
+
+def test_stratified_sample_puts_rare_values_nulls_and_extremes_first():
+    """A/B on seeded errors: the prompt's first records show them with stratified sampling only."""
+    rng = np.random.default_rng(0)
+    n = 2000
+    gdf = gpd.GeoDataFrame(
+        {
+            "id": range(n),
+            "landuse": rng.choice(["residential", "commercial", "park"], n).astype(object),
+            "height": rng.normal(12.0, 3.0, n),
+        },
+        geometry=[Point(0, 0)] * n,
+    )
+    gdf.loc[[17, 901], "landuse"] = "residental"
+    gdf.loc[1500, "landuse"] = None
+    gdf.loc[[44, 1999], "height"] = [950.0, -999.0]
+    seeded = {17, 901, 1500, 44, 1999}
+
+    stratified, per_field = sample_attributes(gdf, sample_size=100, random_state=1, strategy="stratified")
+    uniform = get_attribute_records(gdf, sample_size=100, random_state=1, strategy="uniform")
+
+    first = [r["feature_id"] for r in stratified[:10]]
+    landuse = [r["landuse"] for r in stratified[:10]]
+    assert "residental" in landuse and any(pd.isna(v) for v in landuse)
+    assert {44, 1999} <= set(first)
+    assert len(seeded & set(first)) > len(seeded & {r["feature_id"] for r in uniform[:10]})
+    assert len(stratified) == 100 and len({r["feature_id"] for r in stratified}) == 100
+    assert [r["height"] for r in stratified] == per_field["height"]
+    assert stratified == get_attribute_records(gdf, sample_size=100, random_state=1)  # the default
+
+
+def test_stratified_sample_handles_unhashable_values():
+    """List-valued columns are compared by their text, as in profile_attributes."""
+    gdf = gpd.GeoDataFrame(
+        {"id": [1, 2, 3], "tags": [["a"], ["b"], ["a"]]},
+        geometry=[Point(0, 0)] * 3,
+    )
+
+    records, per_field = sample_attributes(gdf, sample_size=3, random_state=0)
+
+    assert records[0]["tags"] == ["b"]  # the rarer value first
+    assert sorted(map(tuple, per_field["tags"])) == [("a",), ("a",), ("b",)]
@@ -1,9 +1,17 @@
 """Tests for services.attribute_llm_cost (issue #70)."""
+import base64
+import os
+
 import pytest
 
+from services import attribute_llm_cost
 from services.attribute_llm_cost import (
+    count_tokens,
     estimate_attribute_prompt_tokens,
     estimate_naive_tokens,
+    get_tokenizer,
+    tokenizer_encoding_name,
+    tokenizer_vocab_path,
 )
 
 
@@ -26,4 +34,50 @@ def test_estimate_naive_tokens():
     small = estimate_naive_tokens(100, 5)
     large = estimate_naive_tokens(10000, 10)
     assert large > small
-    assert small > 0
\ No newline at end of file
+    assert small > 0
+
+def test_count_tokens_uses_tokenizer_or_falls_back_to_estimate(monkeypatch, tmp_path):
+    """Without a vocab file tokens are chars / 4; with a tokenizer its encoding is counted."""
+    monkeypatch.setattr(attribute_llm_cost.settings, "TOKENIZER_VOCAB_DIR", str(tmp_path))
+    assert not tokenizer_vocab_path("o200k_base").exists()
+    assert count_tokens("abcdefghi") == 3
+
+    class WordTokenizer:
+        def encode(self, text, **_):
+            return text.split()
+
+    monkeypatch.setattr(attribute_llm_cost, "get_tokenizer", lambda model=None: WordTokenizer())
+    assert count_tokens("one two three four five") == 5
+
+
+def test_tokenizer_mode_matches_vocab_file_and_fallback_warns_once(monkeypatch, caplog):
+    """The tokenizer is used iff its vocab file is present; the estimate is announced once."""
+    monkeypatch.setattr(attribute_llm_cost, "_fallback_warned", False)
+    has_vocab = attribute_llm_cost.tiktoken is not None and tokenizer_vocab_path(tokenizer_encoding_name()).is_file()
+    assert (get_tokenizer() is not None) == has_vocab
+
+    with caplog.at_level("WARNING", logger="services.attribute_llm_cost"):
+        count_tokens("abcd")
+        count_tokens("efgh")
+    warnings = [r for r in caplog.records if "estimating tokens" in r.getMessage()]
+    assert len(warnings) == (0 if has_vocab else 1)
+
+
+def test_tokenizer_is_built_from_the_vocab_file_without_touching_the_environment(monkeypatch, tmp_path):
+    """The BPE file is read from the vocab dir directly; TIKTOKEN_CACHE_DIR is left as it was."""
+    pytest.importorskip("tiktoken")
+    import tiktoken.load
+
+    ranks = b"".join(base64.b64encode(bytes([b])) + b" %d\n" % b for b in range(256))
+    tokenizer_vocab_path("o200k_base", str(tmp_path)).write_bytes(ranks)
+    monkeypatch.setattr(tiktoken.load, "check_hash", lambda data, expected: True)
+    monkeypatch.setenv("TIKTOKEN_CACHE_DIR", "")
+    monkeypatch.setattr(attribute_llm_cost.settings, "TOKENIZER_VOCAB_DIR", str(tmp_path))
+    attribute_llm_cost._encoding.cache_clear()
+    try:
+        encoding = get_tokenizer("gpt-4o")
+        assert encoding is not None and encoding.name == "o200k_base"
+        assert count_tokens("abc", "gpt-4o") == 3
+        assert os.environ["TIKTOKEN_CACHE_DIR"] == ""
+    finally:
+        attribute_llm_cost._encoding.cache_clear()
@@ -1,10 +1,12 @@
 """Tests for correction_applier service (issue #106)."""
 import json
+import os
 
 import geopandas as gpd
 from shapely.geometry import Point
 
 from services.correction_applier import apply_correction_overrides
+from services.file_handler import get_dataset_fingerprint
 
 
 def _write_points_geojson(path, coords):
@@ -72,3 +74,17 @@ def test_invalid_wkt_raises(tmp_path):
         assert False, "expected ValueError"
     except ValueError as exc:
         assert "Invalid WKT" in str(exc)
+
+
+def test_apply_forgets_memoized_fingerprint(tmp_path):
+    """A rewrite with the same size and mtime still changes the dataset fingerprint."""
+    geojson_path = tmp_path / "data.geojson"
+    _write_points_geojson(geojson_path, [(-122.4, 37.77)])
+    before = geojson_path.stat()
+    first = get_dataset_fingerprint(geojson_path)
+
+    apply_correction_overrides(geojson_path, [{"action": "approve", "feature_id": 0, "attributes": {"name": "Q0"}}])
+    os.utime(geojson_path, ns=(before.st_atime_ns, before.st_mtime_ns))
+
+    assert geojson_path.stat().st_size == before.st_size
+    assert get_dataset_fingerprint(geojson_path) != first
@@ -0,0 +1,69 @@
+"""Tests for services.dataset_loader and shared dataset loading in the validation graph."""
+from pathlib import Path
+from unittest.mock import patch
+
+import geopandas as gpd
+import pytest
+from shapely.geometry import Polygon
+
+from agents.orchestrator import validation_graph
+from agents.state import empty_state, get_dataset
+from services.dataset_loader import DatasetHandle
+
+
+def _polygons_geojson(tmp_path: Path) -> Path:
+    gdf = gpd.GeoDataFrame(
+        {"id": [1, 2], "name": ["A", "B"]},
+        geometry=[
+            Polygon([(0, 0), (2, 0), (2, 2), (0, 2), (0, 0)]),
+            Polygon([(1, 1), (3, 1), (3, 3), (1, 3), (1, 1)]),
+        ],
+        crs="EPSG:4326",
+    )
+    path = tmp_path / "data.geojson"
+    gdf.to_file(path, driver="GeoJSON")
+    return path
+
+
+def test_handle_loads_file_once(tmp_path):
+    """Repeated load() calls return the same frame and read the file once."""
+    path = _polygons_geojson(tmp_path)
+    handle = DatasetHandle(path)
+
+    with patch("services.dataset_loader.gpd.read_file", wraps=gpd.read_file) as read_file:
+        first = handle.load()
+        second = handle.load()
+
+    assert read_file.call_count == 1
+    assert first is second
+    assert len(first) == 2
+
+
+def test_handle_missing_file_returns_none():
+    """A missing path yields None and is cached as loaded."""
+    handle = DatasetHandle("/nonexistent/file.geojson")
+    assert handle.load() is None
+    assert handle.is_loaded
+
+
+def test_get_dataset_falls_back_to_dataset_path(tmp_path):
+    """State without a handle still loads from dataset_path."""
+    path = _polygons_geojson(tmp_path)
+    gdf = get_dataset({"dataset_path": str(path)})
+    assert gdf is not None and len(gdf) == 2
+    assert get_dataset({"dataset_path": None}) is None
+
+
+def test_validation_graph_reads_dataset_once(tmp_path):
+    """One graph run parses the dataset once and shares it across all agents."""
+    path = _polygons_geojson(tmp_path)
+    state = empty_state("ds", str(path))
+
+    with patch("services.dataset_loader.gpd.read_file", wraps=gpd.read_file) as read_file, patch(
+        "agents.attribute_agent.validate_attributes_with_llm", return_value=[]
+    ):
+        final_state = validation_graph.invoke(state)
+
+    assert read_file.call_count == 1
+    types = {i.type for i in final_state["issues"]}
+    assert "topology_overlap" in types
@@ -1,6 +1,7 @@
 """Tests for services.file_handler."""
 import io
 from pathlib import Path
+from unittest.mock import patch
 
 import pytest
 
@@ -88,3 +89,70 @@ def test_get_primary_vector_path_geojson(tmp_path, monkeypatch):
     path = get_primary_vector_path(dataset_id)
     assert path is not None
     assert path.name == "data.geojson"
+
+
+def test_dataset_fingerprint_tracks_content(tmp_path):
+    """Fingerprint is stable for unchanged files and changes when the file is rewritten."""
+    from services.file_handler import get_dataset_fingerprint
+
+    path = tmp_path / "data.geojson"
+    path.write_text('{"type":"FeatureCollection","features":[]}')
+    first = get_dataset_fingerprint(path)
+    assert get_dataset_fingerprint(path) == first
+
+    path.write_text('{"type":"FeatureCollection","features":[],"name":"x"}')
+    assert get_dataset_fingerprint(path) != first
+
+
+def test_dataset_fingerprint_includes_shapefile_sidecars(tmp_path):
+    """Changing a .dbf sidecar changes a shapefile's fingerprint."""
+    from services.file_handler import get_dataset_fingerprint
+
+    shp = tmp_path / "roads.shp"
+    shp.write_bytes(b"shp")
+    (tmp_path / "roads.dbf").write_bytes(b"dbf-1")
+    first = get_dataset_fingerprint(shp)
+    (tmp_path / "roads.dbf").write_bytes(b"dbf-2")
+    assert get_dataset_fingerprint(shp) != first
+
+
+class _AsyncChunks:
+    """Minimal async reader (UploadFile-like) over in-memory bytes."""
+
+    def __init__(self, data: bytes) -> None:
+        self._buf = io.BytesIO(data)
+        self.reads = 0
+
+    async def read(self, size: int = -1) -> bytes:
+        self.reads += 1
+        return self._buf.read(size)
+
+
+def test_save_upload_stream_writes_in_chunks_and_seeds_fingerprint(tmp_path, monkeypatch):
+    import asyncio
+    import hashlib
+
+    from services.file_handler import _UPLOAD_CHUNK_SIZE, get_dataset_fingerprint, save_upload_stream
+
+    monkeypatch.setattr("core.config.settings.UPLOAD_DIR", str(tmp_path))
+    data = b'{"type": "FeatureCollection", "features": []}' + b" " * (2 * _UPLOAD_CHUNK_SIZE)
+    reader = _AsyncChunks(data)
+
+    dataset_id = asyncio.run(save_upload_stream(reader, "data.geojson", max_bytes=len(data)))
+
+    path = tmp_path / dataset_id / "data.geojson"
+    assert path.read_bytes() == data
+    assert reader.reads == 4  # three chunks + EOF
+    with patch("services.file_handler._sha256_file", side_effect=AssertionError("re-hashed")):
+        assert get_dataset_fingerprint(path) == hashlib.sha256(data).hexdigest()
+
+
+def test_save_upload_stream_aborts_over_limit(tmp_path, monkeypatch):
+    import asyncio
+
+    from services.file_handler import UploadTooLargeError, save_upload_stream
+
+    monkeypatch.setattr("core.config.settings.UPLOAD_DIR", str(tmp_path))
+    with pytest.raises(UploadTooLargeError):
+        asyncio.run(save_upload_stream(_AsyncChunks(b"x" * 100), "data.geojson", max_bytes=99))
+    assert list(tmp_path.iterdir()) == []
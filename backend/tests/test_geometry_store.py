@@ -0,0 +1,91 @@
+"""Tests for services.geometry_store (memory-mapped WKB geometry buffers)."""
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+
+import geopandas as gpd
+import numpy as np
+import shapely
+from shapely.geometry import LineString, Point, Polygon
+
+from services.geometry_store import attach_geometry_store, get_geometry_store, open_geometry_store
+
+
+def _dataset(tmp_path):
+    gdf = gpd.GeoDataFrame(
+        {"id": [1, 2, 3, 4]},
+        geometry=[
+            Polygon([(0, 0), (2, 0), (2, 2), (0, 2), (0, 0)]),
+            None,
+            LineString([(0, 0), (5, 5)]),
+            Point(3, 4),
+        ],
+        crs="EPSG:3857",
+    )
+    path = tmp_path / "data.geojson"
+    gdf.to_file(path, driver="GeoJSON")
+    return path, gdf
+
+
+def _worker_read(directory, indices):
+    store = attach_geometry_store(directory)
+    return len(store), [g.wkt if g is not None else None for g in store.geometries(indices)]
+
+
+def test_store_round_trips_geometries_and_bounds(tmp_path):
+    path, gdf = _dataset(tmp_path)
+    store = get_geometry_store(path)
+
+    assert len(store) == 4
+    decoded = store.geometries()
+    assert decoded[1] is None
+    assert all(shapely.equals(a, b) for a, b in zip(decoded[[0, 2, 3]], gdf.geometry.values[[0, 2, 3]]))
+    assert np.isnan(store.bounds[1]).all()
+    assert list(store.bounds[2]) == [0.0, 0.0, 5.0, 5.0]
+    assert store.geoseries([3]).crs == "EPSG:3857"
+    assert isinstance(store.offsets, np.memmap)
+
+
+def test_store_is_reused_until_dataset_changes(tmp_path):
+    path, gdf = _dataset(tmp_path)
+    first = get_geometry_store(path)
+    assert open_geometry_store(path).directory == first.directory
+
+    gdf.iloc[:2].to_file(path, driver="GeoJSON")
+    assert open_geometry_store(path) is None
+    assert len(get_geometry_store(path)) == 2
+
+
+def test_worker_process_attaches_without_receiving_geometries(tmp_path):
+    path, _ = _dataset(tmp_path)
+    store = get_geometry_store(path)
+
+    with ProcessPoolExecutor(max_workers=1, mp_context=multiprocessing.get_context("spawn")) as pool:
+        count, wkts = pool.submit(_worker_read, str(store.directory), [3, 1]).result(timeout=60)
+
+    assert count == 4
+    assert wkts == ["POINT (3 4)", None]
+
+
+def test_attached_stores_keep_current_build_of_few_datasets(tmp_path, monkeypatch):
+    from services import geometry_store
+
+    monkeypatch.setattr(geometry_store, "_attached", geometry_store.OrderedDict())
+    monkeypatch.setattr(geometry_store, "_MAX_ATTACHED", 2)
+    paths, gdf = [], None
+    for name in ("a", "b", "c"):
+        (tmp_path / name).mkdir()
+        path, gdf = _dataset(tmp_path / name)
+        paths.append(path)
+
+    first = get_geometry_store(paths[0]).directory
+    assert attach_geometry_store(first) is attach_geometry_store(str(first))
+    gdf.iloc[:2].to_file(paths[0], driver="GeoJSON")
+    rebuilt = get_geometry_store(paths[0]).directory
+    assert len(attach_geometry_store(rebuilt)) == 2
+    assert [s.directory for s in geometry_store._attached.values()] == [rebuilt]  # old build released
+
+    for path in paths[1:]:
+        attach_geometry_store(get_geometry_store(path).directory)
+    assert [s.directory.parent.parent.parent for s in geometry_store._attached.values()] == [
+        tmp_path / "b", tmp_path / "c"
+    ]
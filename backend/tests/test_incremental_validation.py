@@ -0,0 +1,187 @@
+"""Tests for services.change_log and services.incremental_validation."""
+from unittest.mock import patch
+
+import geopandas as gpd
+import numpy as np
+import pytest
+from shapely.geometry import LineString, box
+
+from agents.attribute_agent import run as attribute_run
+from agents.geometry_agent import validate_geodataframe
+from agents.orchestrator import _dict_to_geometry_issue
+from agents.topology_agent import run as topology_run
+from api.models import ValidationResult
+from services.change_log import read_change_log
+from services.correction_applier import apply_correction_overrides
+from services.dataset_loader import DatasetHandle
+from services.incremental_validation import run_incremental_validation
+from services.result_cache import get_result_cache, validation_cache_key
+from services.working_copy import read_dataset
+
+
+@pytest.fixture(autouse=True)
+def _outputs(tmp_path, monkeypatch):
+    monkeypatch.setattr("core.config.settings.OUTPUT_DIR", str(tmp_path / "outputs"))
+
+
+def _layer(seed: int = 5) -> gpd.GeoDataFrame:
+    """A 12 x 12 parcel grid with missing cells (gaps), random overlapping boxes and lines."""
+    rng = np.random.default_rng(seed)
+    missing = {(3, 3), (3, 4), (8, 8), (6, 2)}
+    geoms = [box(x, y, x + 1, y + 1) for x in range(12) for y in range(12) if (x, y) not in missing]
+    for _ in range(15):
+        x, y = rng.uniform(20, 40, 2)
+        geoms.append(box(x, y, x + rng.uniform(1, 4), y + rng.uniform(1, 4)))
+    for _ in range(30):
+        x, y = rng.uniform(0, 40, 2)
+        dx, dy = rng.uniform(-4, 4, 2)
+        geoms.append(LineString([(x, y), (x + dx, y + dy)]))
+    return gpd.GeoDataFrame({"id": [f"f{i}" for i in range(len(geoms))]}, geometry=geoms)
+
+
+def _write(tmp_path, gdf):
+    path = tmp_path / "layer.geojson"
+    gdf.to_file(path, driver="GeoJSON")
+    return path
+
+
+def _full_issues(path):
+    """Geometry + topology issues of a full run (the attribute agent needs an LLM)."""
+    gdf = read_dataset(path, columns=["id"])
+    issues = [_dict_to_geometry_issue(d) for d in validate_geodataframe(gdf)]
+    return issues + list(topology_run({"dataset": DatasetHandle(path)})["issues"])
+
+
+def _signature(issues):
+    return sorted(
+        (
+            i.type,
+            str(i.feature_id),
+            str(i.other_feature_id),
+            tuple(str(f) for f in i.bordering_feature_ids or []),
+            tuple(round(v, 6) for v in i.location or []),
+        )
+        for i in issues
+    )
+
+
+def _cache_full_result(path):
+    get_result_cache().put("ds", validation_cache_key(path), ValidationResult(dataset_id="ds", issues=_full_issues(path)))
+
+
+def _approve(feature_id, wkt=None, attributes=None):
+    return {"action": "approve", "feature_id": feature_id, "geometry_wkt": wkt, "attributes": attributes}
+
+
+def test_applier_records_changed_features(tmp_path):
+    path = _write(tmp_path, _layer())
+    base_key = validation_cache_key(path)
+
+    apply_correction_overrides(path, [_approve("f0", "POLYGON ((50 50, 51 50, 51 51, 50 51, 50 50))")])
+    apply_correction_overrides(path, [_approve("f5", attributes={"id": "renamed"})])
+
+    log = read_change_log(path)
+    assert log["base_key"] == base_key
+    assert log["changes"] == [
+        {"position": 0, "feature_id": "f0", "old_bounds": [0.0, 0.0, 1.0, 1.0], "attributes_changed": False},
+        {"position": 5, "feature_id": "f5", "old_bounds": [0.0, 5.0, 1.0, 6.0], "attributes_changed": True},
+    ]
+    # Any other rewrite of the file makes the log stale.
+    gpd.read_file(path).to_file(path, driver="GeoJSON")
+    assert read_change_log(path) is None
+
+
+def test_incremental_matches_full_validation(tmp_path):
+    gdf = _layer()
+    path = _write(tmp_path, gdf)
+    _cache_full_result(path)
+    lines = [i for i in range(len(gdf)) if gdf.geometry.iloc[i].geom_type == "LineString"]
+    boxes = [i for i in range(len(gdf)) if gdf.geometry.iloc[i].bounds[0] >= 20]
+
+    apply_correction_overrides(path, [
+        _approve("f39", "POLYGON ((60 60, 61 60, 61 61, 60 61, 60 60))"),  # widens the (3, 3)-(3, 4) gap
+        _approve("f100", "POLYGON ((0 0, 2 2, 2 0, 0 2, 0 0))"),  # bow-tie, overlapping the corner
+        _approve(f"f{boxes[0]}", "POLYGON ((8 8, 9 8, 9 9, 8 9, 8 8))"),  # fills the (8, 8) gap
+        _approve(f"f{lines[0]}", "LINESTRING (30 30, 31 31)"),
+    ])
+    apply_correction_overrides(path, [_approve(f"f{lines[1]}", "LINESTRING (31 31, 35 30)")])
+
+    incremental = run_incremental_validation("ds", str(path))
+
+    assert incremental is not None
+    assert _signature(incremental.issues) == _signature(_full_issues(path))
+    assert len(incremental.corrections) == len(incremental.issues)
+    assert get_result_cache().get("ds", validation_cache_key(path)) == incremental
+    assert read_change_log(path)["changes"] == []
+
+
+def test_incremental_gap_larger_than_first_window(tmp_path):
+    # A long corridor of missing cells; closing one end still leaves one gap spanning the grid.
+    cells = [(x, y) for x in range(20) for y in range(3) if not (y == 1 and 1 <= x <= 18)]
+    gdf = gpd.GeoDataFrame(
+        {"id": list(range(len(cells)))}, geometry=[box(x, y, x + 1, y + 1) for x, y in cells]
+    )
+    path = _write(tmp_path, gdf)
+    _cache_full_result(path)
+
+    apply_correction_overrides(path, [_approve(0, "POLYGON ((0 0, 2 0, 2 1, 0 1, 0 0))")])
+
+    incremental = run_incremental_validation("ds", str(path))
+    full = _full_issues(path)
+    assert [i.type for i in full].count("topology_gap") == 1
+    assert _signature(incremental.issues) == _signature(full)
+
+
+def test_incremental_rechecks_attributes_of_whole_layer(tmp_path):
+    """An attribute edit can change column-level issues (missing counts) and other features' outliers."""
+    heights = [10.0 + i % 3 for i in range(20)]
+    heights[4] = heights[9] = None
+    gdf = gpd.GeoDataFrame({"id": list(range(20)), "height": heights}, geometry=[box(i, 0, i + 1, 1) for i in range(20)])
+    path = _write(tmp_path, gdf)
+
+    def attribute_issues():
+        with patch("agents.attribute_agent.validate_attributes_with_llm", side_effect=AssertionError("LLM called")):
+            return list(attribute_run({"dataset": DatasetHandle(path)})["issues"])
+
+    get_result_cache().put(
+        "ds", validation_cache_key(path), ValidationResult(dataset_id="ds", issues=_full_issues(path) + attribute_issues())
+    )
+    apply_correction_overrides(path, [_approve(4, attributes={"height": 500.0})])
+
+    with patch("agents.attribute_agent.validate_attributes_with_llm", side_effect=AssertionError("LLM called")):
+        incremental = run_incremental_validation("ds", str(path))
+
+    expected = attribute_issues()
+    assert [(i.type, i.feature_id) for i in expected] == [("attribute_missing_value", None), ("attribute_outlier", 4)]
+    assert "1 of 20 values are missing" in expected[0].description
+    assert _signature(incremental.issues) == _signature(_full_issues(path) + expected)
+
+
+def test_incremental_falls_back_without_base_result(tmp_path):
+    path = _write(tmp_path, _layer())
+    assert run_incremental_validation("ds", str(path)) is None  # no change log
+
+    apply_correction_overrides(path, [_approve("f0", "POLYGON ((50 50, 51 50, 51 51, 50 51, 50 50))")])
+    assert run_incremental_validation("ds", str(path)) is None  # base result never cached
+
+
+def test_validate_incremental_via_api(client, tmp_path, monkeypatch):
+    monkeypatch.setattr("core.config.settings.UPLOAD_DIR", str(tmp_path / "uploads"))
+    dataset_dir = tmp_path / "uploads" / "ds"
+    dataset_dir.mkdir(parents=True)
+    path = _write(dataset_dir, gpd.GeoDataFrame({"id": [0, 1]}, geometry=[box(0, 0, 2, 2), box(5, 5, 6, 6)]))
+    _cache_full_result(path)
+
+    response = client.post(
+        "/api/v1/corrections/apply",
+        json={"dataset_id": "ds", "corrections": [
+            {"issue_index": 0, "action": "approve", "feature_id": 1, "geometry_wkt": "POLYGON ((1 1, 3 1, 3 3, 1 3, 1 1))"}
+        ]},
+    )
+    assert response.status_code == 200
+    response = client.post("/api/v1/validate", json={"dataset_id": "ds", "incremental": True})
+
+    assert response.status_code == 200
+    issues = response.json()["issues"]
+    assert [(i["type"], i["feature_id"], i["other_feature_id"]) for i in issues] == [("topology_overlap", 0, 1)]
+    assert read_change_log(path)["changes"] == []  # served incrementally, log rebased
@@ -0,0 +1,129 @@
+"""Tests for services.job_store and the persistent async validation job flow."""
+import os
+import socket
+import time
+from unittest.mock import patch
+
+import pytest
+
+from api.models import GeometryIssue, ValidationResult
+from services import validation_runner
+from services.job_store import JobStatus, ValidationJobStore, current_owner
+
+
+def _result(dataset_id: str = "ds") -> ValidationResult:
+    issue = GeometryIssue(feature_id=1, type="empty_geometry", severity="critical", location=None, description="Empty")
+    return ValidationResult(dataset_id=dataset_id, issues=[issue])
+
+
+def test_job_lifecycle_persists_result_on_disk(tmp_path):
+    """A claimed job completes with its result written to disk and readable from a new store."""
+    store = ValidationJobStore(tmp_path)
+    job = store.create("ds", "/data/ds.geojson")
+    assert job["status"] == JobStatus.PENDING
+
+    claimed = store.claim_next("worker-a")
+    assert claimed["job_id"] == job["job_id"]
+    assert store.claim_next("worker-b") is None
+    store.complete(job["job_id"], _result())
+
+    reopened = ValidationJobStore(tmp_path)
+    loaded = reopened.get(job["job_id"])
+    assert loaded["status"] == JobStatus.COMPLETED
+    assert loaded["result"].issues[0].type == "empty_geometry"
+    assert (tmp_path / f"{job['job_id']}.json").is_file()
+
+
+def test_failed_job_records_error(tmp_path):
+    store = ValidationJobStore(tmp_path)
+    job = store.create("ds", "/data/ds.geojson")
+    store.claim_next("worker-a")
+    store.fail(job["job_id"], "boom")
+    loaded = store.get(job["job_id"])
+    assert loaded["status"] == JobStatus.FAILED
+    assert loaded["error"] == "boom"
+    assert loaded["result"] is None
+
+
+def test_orphaned_running_job_is_requeued(tmp_path):
+    """A running job owned by a dead local process goes back to pending."""
+    store = ValidationJobStore(tmp_path)
+    job = store.create("ds", "/data/ds.geojson")
+    store.claim_next(f"{socket.gethostname()}:999999999")
+
+    assert store.requeue_orphaned_jobs() == 1
+    assert store.get(job["job_id"])["status"] == JobStatus.PENDING
+    assert store.claim_next("worker-b")["job_id"] == job["job_id"]
+
+
+def test_job_of_previous_process_with_same_pid_is_requeued(tmp_path):
+    """After a container restart the server is PID 1 again; the boot id tells it apart."""
+    store = ValidationJobStore(tmp_path)
+    old = store.create("ds", "/data/ds.geojson")
+    store.claim_next(f"{socket.gethostname()}:{os.getpid()}:previous-boot")
+    mine = store.create("ds", "/data/ds.geojson")
+    store.claim_next(current_owner())
+
+    assert store.requeue_orphaned_jobs() == 1
+    assert store.get(old["job_id"])["status"] == JobStatus.PENDING
+    assert store.get(mine["job_id"])["status"] == JobStatus.RUNNING
+
+
+def test_job_of_live_process_started_after_claim_is_requeued(tmp_path):
+    """Another live local PID only owns jobs claimed after it started (else the PID was reused)."""
+    store = ValidationJobStore(tmp_path)
+    parent = f"{socket.gethostname()}:{os.getppid()}:other-boot"
+    reused = store.create("ds", "/data/ds.geojson")
+    with patch("services.job_store.time.time", return_value=1000.0):  # claimed in 1970
+        store.claim_next(parent)
+    sibling = store.create("ds", "/data/ds.geojson")
+    store.claim_next(parent)
+
+    assert store.requeue_orphaned_jobs() == 1
+    assert store.get(reused["job_id"])["status"] == JobStatus.PENDING
+    assert store.get(sibling["job_id"])["status"] == JobStatus.RUNNING
+
+
+def test_purge_expired_removes_finished_jobs(tmp_path):
+    store = ValidationJobStore(tmp_path)
+    done = store.create("ds", "/data/ds.geojson")
+    store.claim_next("worker-a")
+    store.complete(done["job_id"], _result())
+    waiting = store.create("ds", "/data/ds.geojson")
+
+    time.sleep(0.01)
+    assert store.purge_expired(0) == 1
+    assert store.get(done["job_id"]) is None
+    assert not (tmp_path / f"{done['job_id']}.json").exists()
+    assert store.get(waiting["job_id"])["status"] == JobStatus.PENDING
+
+
+def test_async_validation_endpoint_completes_job(client, tmp_path, monkeypatch):
+    """POST /validate/async enqueues a persisted job that a poll returns once completed."""
+    monkeypatch.setattr("core.config.settings.UPLOAD_DIR", str(tmp_path / "uploads"))
+    monkeypatch.setattr("core.config.settings.OUTPUT_DIR", str(tmp_path / "outputs"))
+    dataset_dir = tmp_path / "uploads" / "ds"
+    dataset_dir.mkdir(parents=True)
+    (dataset_dir / "data.geojson").write_text('{"type":"FeatureCollection","features":[]}')
+
+    with patch.object(validation_runner, "run_validation", return_value=_result()):
+        response = client.post("/api/v1/validate/async", json={"dataset_id": "ds"})
+        assert response.status_code == 200
+        job_id = response.json()["job_id"]
+
+        deadline = time.time() + 5
+        status = None
+        while time.time() < deadline:
+            status = client.get(f"/api/v1/validate/jobs/{job_id}").json()
+            if status["status"] in (JobStatus.COMPLETED, JobStatus.FAILED):
+                break
+            time.sleep(0.02)
+
+    assert status["status"] == JobStatus.COMPLETED
+    assert status["result"]["issues"][0]["type"] == "empty_geometry"
+
+
+def test_unknown_job_returns_404(client, tmp_path, monkeypatch):
+    monkeypatch.setattr("core.config.settings.OUTPUT_DIR", str(tmp_path))
+    response = client.get("/api/v1/validate/jobs/missing")
+    assert response.status_code == 404
@@ -0,0 +1,127 @@
+"""Tests for services.llm_cache and response caching in services.llm_service."""
+import json
+from typing import Any
+
+import pytest
+
+from services.llm_cache import LLMResponseCache, get_llm_cache
+from services.llm_service import get_recommendation_suggestions_from_llm, validate_attributes_with_llm
+
+
+class CountingLLM:
+    """Fake LLM returning a fixed JSON payload and counting invoke() calls."""
+
+    def __init__(self, payload: Any) -> None:
+        self.content = payload if isinstance(payload, str) else json.dumps(payload)
+        self.calls = 0
+
+    def invoke(self, input: str, **_: Any) -> Any:
+        self.calls += 1
+        return type("Msg", (), {"content": self.content})
+
+
+@pytest.fixture
+def cache(tmp_path):
+    return LLMResponseCache(tmp_path / "llm.sqlite3", max_entries=100, ttl_seconds=3600)
+
+
+def test_get_put_and_counters(cache):
+    """Miss, then hit after put; counters track both."""
+    key = LLMResponseCache.make_key("prompt", "gpt-4o-mini", 2048)
+    assert cache.get(key) is None
+    cache.put(key, '{"issues": []}')
+    assert cache.get(key) == '{"issues": []}'
+    assert cache.stats() == {"hits": 1, "misses": 1, "entries": 1}
+
+
+def test_key_depends_on_model_and_max_tokens():
+    base = LLMResponseCache.make_key("prompt", "gpt-4o-mini", 2048)
+    assert LLMResponseCache.make_key("prompt", "gpt-4o", 2048) != base
+    assert LLMResponseCache.make_key("prompt", "gpt-4o-mini", 1024) != base
+    assert LLMResponseCache.make_key("prompt", "gpt-4o-mini", 2048) == base
+
+
+def test_expired_entry_is_a_miss(tmp_path, monkeypatch):
+    cache = LLMResponseCache(tmp_path / "llm.sqlite3", ttl_seconds=10)
+    now = [1000.0]
+    monkeypatch.setattr("services.llm_cache.time.time", lambda: now[0])
+    cache.put("k", "{}")
+    now[0] += 11
+    assert cache.get("k") is None
+    assert len(cache) == 0
+
+
+def test_lru_eviction(tmp_path, monkeypatch):
+    """Beyond max_entries, the least recently used entry is evicted."""
+    cache = LLMResponseCache(tmp_path / "llm.sqlite3", max_entries=2)
+    now = [1000.0]
+
+    def tick():
+        now[0] += 1
+        return now[0]
+
+    monkeypatch.setattr("services.llm_cache.time.time", tick)
+    cache.put("a", "1")
+    cache.put("b", "2")
+    assert cache.get("a") == "1"  # "a" is now more recent than "b"
+    cache.put("c", "3")
+    assert cache.get("b") is None
+    assert cache.get("a") == "1"
+    assert cache.get("c") == "3"
+
+
+def test_validate_attributes_reuses_cached_response(cache):
+    """Identical prompts call the LLM once; the second call is served from the cache."""
+    llm = CountingLLM({"issues": [{"feature_id": 1, "field": "name", "issue_type": "typo"}]})
+    records = [{"feature_id": 1, "name": "Mian St"}]
+
+    first = validate_attributes_with_llm(records, llm=llm, cache=cache)
+    second = validate_attributes_with_llm(records, llm=llm, cache=cache)
+
+    assert llm.calls == 1
+    assert first == second
+    assert first[0]["field"] == "name"
+    assert cache.stats()["hits"] == 1
+
+
+def test_invalid_json_response_is_not_cached(cache):
+    llm = CountingLLM("not json")
+    records = [{"feature_id": 1, "name": "A"}]
+    assert validate_attributes_with_llm(records, llm=llm, cache=cache) == []
+    assert validate_attributes_with_llm(records, llm=llm, cache=cache) == []
+    assert llm.calls == 2
+    assert len(cache) == 0
+
+
+def test_recommendation_suggestions_use_cache(cache):
+    llm = CountingLLM({"suggestions": [{"method": "buffer(0)", "confidence": 0.9, "explanation": "fix"}]})
+    issues = [{"type": "invalid_geometry", "severity": "critical", "description": "Self-intersection"}]
+
+    first = get_recommendation_suggestions_from_llm(issues, llm=llm, cache=cache)
+    second = get_recommendation_suggestions_from_llm(issues, llm=llm, cache=cache)
+
+    assert llm.calls == 1
+    assert first == second
+    assert first[0]["method"] == "buffer(0)"
+
+
+def test_shared_cache_serves_default_client_without_api_key(tmp_path, monkeypatch):
+    """A cache hit never constructs the default ChatOpenAI client."""
+    monkeypatch.setattr("core.config.settings.OUTPUT_DIR", str(tmp_path))
+    monkeypatch.setattr("core.config.settings.LLM_CACHE_ENABLED", True)
+    monkeypatch.setattr("core.config.settings.OPENAI_API_KEY", None)
+    shared = get_llm_cache()
+    assert shared is get_llm_cache()
+
+    records = [{"feature_id": 1, "name": "Mian St"}]
+    llm = CountingLLM({"issues": [{"feature_id": 1, "field": "name", "issue_type": "typo"}]})
+    validate_attributes_with_llm(records, llm=llm, cache=shared)
+
+    issues = validate_attributes_with_llm(records)
+    assert len(issues) == 1
+    assert llm.calls == 1
+
+
+def test_get_llm_cache_disabled(monkeypatch):
+    monkeypatch.setattr("core.config.settings.LLM_CACHE_ENABLED", False)
+    assert get_llm_cache() is None
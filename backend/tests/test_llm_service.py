@@ -4,9 +4,11 @@ from typing import Any, Dict, List
 
 import pytest
 
+from services.attribute_llm_cost import count_tokens
 from services.llm_service import (
     AttributeValidationConfig,
     build_attribute_validation_prompt,
+    pack_attribute_data,
     parse_llm_attribute_issues,
     validate_attributes_with_llm,
 )
@@ -39,6 +41,51 @@ def test_build_attribute_validation_prompt_includes_attribute_data():
     assert '"type"' in prompt
 
 
+def test_attribute_prompt_is_packed_to_token_budget(monkeypatch, tmp_path):
+    """Records fill the budget in sample order; uninformative fields go first, then low-entropy ones."""
+    # Count with the chars / 4 estimate so the budgets below do not depend on an installed vocab.
+    monkeypatch.setattr("services.attribute_llm_cost.settings.TOKENIZER_VOCAB_DIR", str(tmp_path))
+    records = [
+        {"feature_id": i, "id": i, "country": "NL", "kind": "ab"[i % 2], "name": f"Street number {i}"}
+        for i in range(200)
+    ]
+    per_field = {f: [r[f] for r in records] for f in ("id", "country", "kind", "name")}
+
+    prompt = build_attribute_validation_prompt(records, per_field, max_prompt_tokens=1500)
+    data = pack_attribute_data(records, per_field, max_prompt_tokens=1500)
+
+    assert count_tokens(prompt) <= 1500
+    assert data["records"] == [{"feature_id": i, "kind": "ab"[i % 2], "name": f"Street number {i}"}
+                               for i in range(len(data["records"]))]
+    assert len(data["records"]) >= 5
+    assert set(data["per_field_values"]) == {"kind", "name"}
+    assert data["per_field_values"]["kind"] == ["a", "b"]
+
+    # A tight budget drops the lowest-entropy field to keep at least a few records.
+    tight = pack_attribute_data(records, per_field, max_prompt_tokens=270)
+    assert len(tight["records"]) == 5 and "kind" not in tight["records"][0]
+
+    # No budget: plain caps, as before.
+    legacy = pack_attribute_data(records, per_field, max_prompt_tokens=0, max_records_in_prompt=10,
+                                 max_values_per_field=15)
+    assert legacy["records"] == records[:10]
+    assert legacy["per_field_values"]["country"] == ["NL"] * 15
+
+
+def test_packing_drops_the_field_with_the_most_skewed_value_counts_first(monkeypatch, tmp_path):
+    """Entropy is measured on value counts: a mostly-constant field goes before an even one."""
+    monkeypatch.setattr("services.attribute_llm_cost.settings.TOKENIZER_VOCAB_DIR", str(tmp_path))
+    records = [
+        {"feature_id": i, "kind": "ab"[i % 2], "flag": "y" if i == 7 else "x", "name": f"Street number {i}"}
+        for i in range(200)
+    ]
+    per_field = {f: [r[f] for r in records] for f in ("kind", "flag", "name")}
+
+    tight = pack_attribute_data(records, per_field, max_prompt_tokens=300)
+    assert len(tight["records"]) >= 5
+    assert "flag" not in tight["records"][0] and "kind" in tight["records"][0]
+
+
 def test_parse_llm_attribute_issues_valid_json():
     """Valid JSON with issues should be parsed into normalized dicts."""
     raw = json.dumps(
@@ -169,3 +216,51 @@ def test_parse_recommendation_suggestions():
     assert parse_recommendation_suggestions(None) == []
     assert parse_recommendation_suggestions("not json") == []
 
+
+
+def test_chunk_recommendation_issues_respects_budgets():
+    """Batches cover every issue in order and stay within output and prompt budgets."""
+    from services.llm_service import RECOMMENDATION_TOKENS_PER_SUGGESTION, chunk_recommendation_issues
+
+    issues = [{"type": "invalid_geometry", "severity": "critical", "description": "x" * 200} for _ in range(50)]
+    by_output = chunk_recommendation_issues(issues, max_output_tokens=20 + 5 * RECOMMENDATION_TOKENS_PER_SUGGESTION, max_prompt_tokens=100_000)
+    assert [len(b) for b in by_output] == [5] * 10
+    assert [i for b in by_output for i in b] == list(range(50))
+
+    by_prompt = chunk_recommendation_issues(issues, max_output_tokens=100_000, max_prompt_tokens=350)
+    assert all(1 <= len(b) <= 3 for b in by_prompt)
+    assert [i for b in by_prompt for i in b] == list(range(50))
+
+
+@pytest.mark.parametrize("tokenizer", [None, "words"])
+def test_chunk_recommendation_issues_counts_prompt_with_tokenizer(monkeypatch, tmp_path, tokenizer):
+    """Each batch's actual prompt fits the prompt budget, as counted by count_tokens."""
+    from services import attribute_llm_cost
+    from services.llm_service import build_recommendation_prompt, chunk_recommendation_issues, count_tokens
+
+    monkeypatch.setattr(attribute_llm_cost.settings, "TOKENIZER_VOCAB_DIR", str(tmp_path))
+    if tokenizer == "words":
+        class WordTokenizer:
+            def encode(self, text, **_):
+                return text.split()
+
+        monkeypatch.setattr(attribute_llm_cost, "get_tokenizer", lambda model=None: WordTokenizer())
+    issues = [
+        {"type": "invalid_geometry", "severity": "critical", "description": " ".join(["ring"] * (i % 40))}
+        for i in range(60)
+    ]
+
+    batches = chunk_recommendation_issues(issues, max_output_tokens=100_000, max_prompt_tokens=400)
+
+    assert [i for b in batches for i in b] == list(range(60))
+    assert len(batches) > 1
+    assert all(count_tokens(build_recommendation_prompt([issues[i] for i in b])) <= 400 for b in batches)
+
+
+def test_get_recommendation_suggestions_pad_missing_false_returns_short_list():
+    from services.llm_service import get_recommendation_suggestions_from_llm
+
+    llm = DummyLLM({"suggestions": [{"method": "buffer(0)", "confidence": 0.9, "explanation": "x"}]})
+    issues = [{"type": "a", "severity": "critical", "description": ""}] * 3
+    assert len(get_recommendation_suggestions_from_llm(issues, llm=llm)) == 3
+    assert len(get_recommendation_suggestions_from_llm(issues, llm=llm, pad_missing=False)) == 1
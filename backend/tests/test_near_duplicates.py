@@ -0,0 +1,130 @@
+"""Tests for services.near_duplicates."""
+import random
+
+import geopandas as gpd
+from shapely.geometry import Point
+
+from services import near_duplicates
+from services.attribute_extractor import profile_attributes
+from services.near_duplicates import bounded_edit_distance, cluster_values, normalize_value, split_street_type
+
+
+def _osa_distance(a: str, b: str) -> int:
+    d = [[i + j if i * j == 0 else 0 for j in range(len(b) + 1)] for i in range(len(a) + 1)]
+    for i in range(1, len(a) + 1):
+        for j in range(1, len(b) + 1):
+            d[i][j] = min(d[i - 1][j] + 1, d[i][j - 1] + 1, d[i - 1][j - 1] + (a[i - 1] != b[j - 1]))
+            if i > 1 and j > 1 and a[i - 1] == b[j - 2] and a[i - 2] == b[j - 1]:
+                d[i][j] = min(d[i][j], d[i - 2][j - 2] + 1)
+    return d[-1][-1]
+
+
+def test_cluster_values_groups_variants_under_most_frequent_spelling():
+    values = ["Main St", "Main Street", "main st.", "Mian Street", "Oak Ave", "Oak Avenue",
+              "Lot 1", "Lot 2", "Elm", "Elk", "Broadway", "Broadwya", "Birch Lane",
+              "Hill Road", "Mill Road", "Oak Drive", "Oak Grove"]
+    counts = [5, 9, 1, 1, 3, 1, 1, 1, 1, 1, 5, 1, 2, 3, 2, 8, 1]
+
+    clusters = [[values[k] for k in c] for c in cluster_values(values, counts)]
+
+    assert clusters == [
+        ["Main Street", "Main St", "main st.", "Mian Street"],
+        ["Broadway", "Broadwya"],
+        ["Oak Ave", "Oak Avenue"],
+    ]
+    # Distinct streets of similar frequency, or with another street type, are not linked.
+    assert not any(values.index("Mill Road") in c or values.index("Oak Grove") in c
+                   for c in cluster_values(values, counts))
+    assert normalize_value("  N. Main   St.", address=True) == "north main street"
+    assert normalize_value("  N. Main   St.") == "n main st"
+    # Without edit distance only values with the same key are grouped.
+    assert [[values[k] for k in c] for c in cluster_values(values, counts, max_distance=0)] == [
+        ["Main Street", "Main St", "main st."], ["Oak Ave", "Oak Avenue"]
+    ]
+
+
+def test_non_address_values_are_not_expanded_as_street_abbreviations(monkeypatch):
+    """In a size or compass column "S" and "South" are different values, not variants."""
+    values = ["S", "South", "M", "L", "XL", "s", "N", "North"]
+    counts = [40, 3, 50, 30, 10, 2, 5, 1]
+
+    assert [[values[k] for k in c] for c in cluster_values(values, counts)] == [["S", "s"]]
+    assert [[values[k] for k in c] for c in cluster_values(values, counts, address=True)] == [
+        ["S", "South", "s"], ["N", "North"]
+    ]
+
+    gdf = gpd.GeoDataFrame({"size": [v for v, c in zip(values, counts) for _ in range(c)]},
+                           geometry=[Point(0, 0)] * sum(counts))
+    issues = [i["suggestion"] for i in profile_attributes(gdf).issues]
+    assert issues == ["Same value written 2 ways ('S', 's'); use 'S'"]
+    monkeypatch.setattr("core.config.settings.ATTRIBUTE_ADDRESS_FIELDS", "street, size")
+    issues = [i["suggestion"] for i in profile_attributes(gdf).issues]
+    assert issues[0] == "Same value written 3 ways ('S', 'South', 's'); use 'S'"
+
+
+def test_bounded_edit_distance_matches_osa_distance():
+    rng = random.Random(3)
+    for _ in range(500):
+        a = "".join(rng.choices("abc ", k=rng.randint(0, 9)))
+        b = "".join(rng.choices("abc ", k=rng.randint(0, 9)))
+        limit = rng.randint(0, 3)
+        expected = _osa_distance(a, b)
+        assert bounded_edit_distance(a, b, limit) == (expected if expected <= limit else None)
+
+
+def test_distance_links_find_every_pair_within_distance(monkeypatch):
+    """The deletion index misses no pair a brute-force comparison finds, also in several passes."""
+    monkeypatch.setattr(near_duplicates, "_HASHES_PER_PASS", 1000)
+    rng = random.Random(7)
+    words = ["".join(rng.choices("abcdefgh", k=rng.randint(3, 6))) for _ in range(40)]
+    keys = sorted({
+        " ".join(rng.choices(words, k=rng.randint(1, 3)) + rng.choices(["", "road", "lane"]))
+        .strip() for _ in range(250)
+    })
+
+    links = {tuple(sorted(pair)) for pair in near_duplicates._distance_links(keys, 2)}
+
+    expected = set()
+    for i in range(len(keys)):
+        for j in range(i + 1, len(keys)):
+            (a, ta), (b, tb) = split_street_type(keys[i]), split_street_type(keys[j])
+            limit = min(2, len(a) // 4, len(b) // 4)
+            if ta == tb and limit and _osa_distance(a, b) <= limit:
+                expected.add((i, j))
+    assert expected  # the sample does contain near-duplicates
+    assert links == expected
+
+
+def test_cluster_values_keeps_distinct_street_names_apart():
+    """Look-alike real streets are not typos of each other; only rare misspellings are."""
+    streets = {
+        "Main Street": 40, "Main St": 6, "Washington Street": 14, "Washingtn Street": 1,
+        "Jefferson Avenue": 9, "Jeferson Avenue": 1, "Hill Road": 12, "Mill Road": 3,
+        "Pine Road": 8, "Pike Road": 7, "Oak Lane": 11, "Oak Place": 2, "Elm Street": 9,
+        "Elk Street": 1, "Oak Drive": 6, "Oak Grove": 1, "Park Avenue": 20, "Park Lane": 2,
+        "Church Street": 25, "Church Road": 4, "High Street": 30, "Mill Lane": 5,
+        "Station Road": 18, "Station Street": 2, "North Road": 7, "South Road": 6,
+        "Maple Avenue": 10, "Maple Drive": 1, "Cedar Court": 3, "Cedar Crescent": 1,
+        "King Street": 13, "Kings Road": 2, "Queen Street": 9, "Queens Road": 1,
+        "Victoria Road": 8, "Victoria Street": 3, "Bridge Street": 7, "Ridge Road": 4,
+        "Green Lane": 9, "Grove Lane": 3, "Lake View": 2, "Lake Road": 4,
+    }
+    values, counts = list(streets), list(streets.values())
+
+    clusters = [[values[k] for k in c] for c in cluster_values(values, counts)]
+
+    assert clusters == [["Main Street", "Main St"], ["Washington Street", "Washingtn Street"],
+                        ["Jefferson Avenue", "Jeferson Avenue"]]
+
+
+def test_profile_attributes_reports_typo_clusters():
+    names = ["Maple Street"] * 20 + ["Mapel Street"] * 2 + ["maple st"] + ["Cedar Road"] * 10 + ["Cedar Rd"]
+    gdf = gpd.GeoDataFrame({"id": range(len(names)), "name": names}, geometry=[Point(0, 0)] * len(names))
+
+    issues = {i["issue_type"]: i for i in profile_attributes(gdf).issues}
+
+    assert set(issues) == {"typo", "inconsistency"}
+    assert issues["typo"]["suggestion"] == (
+        "3 values look like variants of one name ('Maple Street', 'Mapel Street', 'maple st'); use 'Maple Street'"
+    )
+    assert issues["inconsistency"]["suggestion"].endswith("use 'Cedar Road'")
@@ -0,0 +1,72 @@
+"""Tests for agents.orchestrator: parallel validation nodes and deterministic issue merging."""
+import threading
+from pathlib import Path
+from unittest.mock import patch
+
+import geopandas as gpd
+import pytest
+from shapely.geometry import Polygon
+
+from api.models import GeometryIssue
+from agents.orchestrator import validation_graph
+from agents.state import empty_state, merge_issues
+
+
+def _issue(issue_type: str, feature_id: int = 0) -> GeometryIssue:
+    return GeometryIssue(feature_id=feature_id, type=issue_type, severity="warning", location=None, description=None)
+
+
+def _dataset(tmp_path: Path) -> Path:
+    gdf = gpd.GeoDataFrame(
+        {"id": [1, 2], "name": ["A", "B"]},
+        geometry=[
+            Polygon([(0, 0), (2, 0), (2, 2), (0, 2), (0, 0)]),
+            Polygon([(0, 0), (2, 2), (2, 0), (0, 2), (0, 0)]),  # bow-tie: invalid
+        ],
+        crs="EPSG:4326",
+    )
+    path = tmp_path / "data.geojson"
+    gdf.to_file(path, driver="GeoJSON")
+    return path
+
+
+def test_merge_issues_orders_by_category_regardless_of_arrival():
+    """Updates arriving in any order merge to geometry -> attribute -> topology."""
+    geometry = [_issue("self_intersection", 1), _issue("empty_geometry", 2)]
+    attribute = [_issue("attribute_typo", 3)]
+    topology = [_issue("topology_overlap", 4)]
+
+    a = merge_issues(merge_issues(merge_issues([], topology), attribute), geometry)
+    b = merge_issues(merge_issues(merge_issues([], geometry), topology), attribute)
+
+    expected = [1, 2, 3, 4]
+    assert [i.feature_id for i in a] == expected
+    assert [i.feature_id for i in b] == expected
+
+
+def test_validation_nodes_run_concurrently(tmp_path):
+    """Attribute and topology nodes execute at the same time (both reach a shared barrier)."""
+    path = _dataset(tmp_path)
+    barrier = threading.Barrier(2, timeout=5)
+    met = []
+
+    def _attribute_llm(*args, **kwargs):
+        barrier.wait()
+        met.append("attribute")
+        return [{"feature_id": 1, "field": "name", "issue_type": "typo", "severity": "warning", "suggestion": "x"}]
+
+    def _topology(*args, **kwargs):
+        barrier.wait()
+        met.append("topology")
+        return [{"feature_id": 1, "type": "topology_overlap", "severity": "warning", "location": None, "description": "o"}]
+
+    with patch("agents.attribute_agent.validate_attributes_with_llm", side_effect=_attribute_llm), patch(
+        "agents.topology_agent.validate_topology", side_effect=_topology
+    ):
+        final_state = validation_graph.invoke(empty_state("ds", str(path)))
+
+    assert sorted(met) == ["attribute", "topology"]
+    types = [i.type for i in final_state["issues"]]
+    assert types[0] in ("self_intersection", "invalid_geometry")
+    assert types[1:] == ["attribute_typo", "topology_overlap"]
+    assert len(final_state["corrections"]) == len(types)
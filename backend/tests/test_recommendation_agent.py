@@ -111,3 +111,91 @@ def test_run_correction_schema_compatible_with_apply_corrections():
     assert "confidence" in c and isinstance(c["confidence"], (int, float)) and 0 <= c["confidence"] <= 1
     assert "explanation" in c and isinstance(c["explanation"], str)
     assert "issue_index" in c and c["issue_index"] == 0
+
+
+class _BatchLLM:
+    """Fake LLM answering each recommendation prompt with one suggestion per listed issue."""
+
+    def __init__(self, fail_marker: str = "") -> None:
+        self.prompts = []
+        self.fail_marker = fail_marker
+
+    def invoke(self, input: str, **_):
+        import json
+
+        self.prompts.append(input)
+        rows = json.loads(input.split("ISSUES=\n", 1)[1])
+        if self.fail_marker and any(self.fail_marker in r["description"] for r in rows):
+            raise RuntimeError("API error")
+        return json.dumps({
+            "suggestions": [
+                {"method": f"fix {r['description']}", "confidence": 0.8, "explanation": "batched"}
+                for r in rows
+            ]
+        })
+
+
+_LETTERS = "abcdefghijklmnopqrstuvwxyz"
+
+
+def _many_issues(n):
+    return [
+        GeometryIssue(feature_id=i, type="self_intersection", severity="critical", location=None, description=f"issue {_LETTERS[i]}")
+        for i in range(n)
+    ]
+
+
+def test_run_with_llm_batches_and_stitches_by_issue_index(monkeypatch):
+    """Issues beyond one response budget are split into batches and mapped back in order."""
+    monkeypatch.setattr("core.config.settings.OPENAI_MAX_TOKENS", 200)  # 3 suggestions per batch
+    monkeypatch.setattr("core.config.settings.RECOMMENDATION_MAX_CONCURRENCY", 3)
+    llm = _BatchLLM()
+
+    result = recommendation_agent_run({"issues": _many_issues(10)}, llm=llm)
+
+    assert len(llm.prompts) == 4
+    corrections = result["corrections"]
+    assert [c["issue_index"] for c in corrections] == list(range(10))
+    assert [c["method"] for c in corrections] == [f"fix issue {_LETTERS[i]}" for i in range(10)]
+
+
+def test_run_with_llm_failed_batch_falls_back_to_rules_for_that_batch_only(monkeypatch):
+    monkeypatch.setattr("core.config.settings.OPENAI_MAX_TOKENS", 200)
+    llm = _BatchLLM(fail_marker="issue e")
+
+    corrections = recommendation_agent_run({"issues": _many_issues(7)}, llm=llm)["corrections"]
+
+    methods = [c["method"] for c in corrections]
+    assert methods[:3] == ["fix issue a", "fix issue b", "fix issue c"]
+    assert methods[3:6] == ["buffer(0)"] * 3
+    assert methods[6] == "fix issue g"
+
+
+def test_run_with_llm_requests_one_suggestion_per_issue_signature():
+    """Issues differing only by numbers share one LLM suggestion, fanned out to every index."""
+    issues = [
+        GeometryIssue(feature_id=i, type="topology_overlap", severity="warning", location=None, description=f"Overlap with feature {i + 1}")
+        for i in range(50)
+    ]
+    issues.append(GeometryIssue(feature_id=99, type="self_intersection", severity="critical", location=None, description="Self-intersection[1.5 2]"))
+    llm = _BatchLLM()
+
+    corrections = recommendation_agent_run({"issues": issues}, llm=llm)["corrections"]
+
+    assert len(llm.prompts) == 1
+    assert llm.prompts[0].count('"index"') == 2
+    assert [c["issue_index"] for c in corrections] == list(range(51))
+    assert {c["method"] for c in corrections[:50]} == {"fix Overlap with feature <n>"}
+    assert corrections[50]["method"] == "fix Self-intersection[<n> <n>]"
+
+
+def test_attribute_issue_descriptions_are_not_templated():
+    from agents.recommendation_agent import _group_issues
+
+    dicts = [
+        {"type": "attribute_outlier", "severity": "warning", "description": "Field 'lanes': use 2"},
+        {"type": "attribute_outlier", "severity": "warning", "description": "Field 'lanes': use 4"},
+        {"type": "topology_overlap", "severity": "warning", "description": "Overlap with feature 2"},
+        {"type": "topology_overlap", "severity": "warning", "description": "Overlap with feature 4"},
+    ]
+    assert [members for _, members in _group_issues(dicts)] == [[0], [1], [2, 3]]
@@ -0,0 +1,87 @@
+"""Tests for services.spatial_index (persisted packed Hilbert R-tree)."""
+import geopandas as gpd
+import numpy as np
+from shapely.geometry import Point, box
+
+from services.correction_applier import apply_correction_overrides
+from services.geometry_store import write_geometry_store
+from services.spatial_index import (
+    features_in_bbox,
+    get_spatial_index,
+    open_spatial_index,
+    write_spatial_index,
+)
+
+
+def _dataset(tmp_path, n=1000, seed=7):
+    rng = np.random.default_rng(seed)
+    xy = rng.uniform(0, 100, (n, 2))
+    size = rng.uniform(0.1, 3, n)
+    geoms = [box(x, y, x + s, y + s) for (x, y), s in zip(xy, size)]
+    geoms[5] = None
+    gdf = gpd.GeoDataFrame({"id": list(range(n))}, geometry=geoms, crs="EPSG:3857")
+    path = tmp_path / "data.geojson"
+    gdf.to_file(path, driver="GeoJSON")
+    return path, gdf
+
+
+def test_query_matches_brute_force(tmp_path):
+    path, gdf = _dataset(tmp_path)
+    index = get_spatial_index(path)
+    bounds = gdf.geometry.bounds.to_numpy()
+
+    assert len(index.levels) == 3  # 999 leaves -> 63 -> 4 nodes
+    rng = np.random.default_rng(1)
+    for _ in range(50):
+        x, y = rng.uniform(-5, 100, 2)
+        w, h = rng.uniform(0, 20, 2)
+        bbox = (x, y, x + w, y + h)
+        expected = np.flatnonzero(
+            (bounds[:, 0] <= bbox[2]) & (bounds[:, 2] >= bbox[0])
+            & (bounds[:, 1] <= bbox[3]) & (bounds[:, 3] >= bbox[1])
+        )
+        assert index.query(bbox).tolist() == expected.tolist()
+
+
+def test_index_is_persisted_and_reused(tmp_path):
+    path, _ = _dataset(tmp_path, n=50)
+    built = get_spatial_index(path)
+
+    reopened = open_spatial_index(path)
+    assert reopened is not None and reopened.directory == built.directory
+    assert get_spatial_index(path).directory == built.directory
+
+
+def test_small_and_empty_layers(tmp_path):
+    path, _ = _dataset(tmp_path, n=10)
+    index = get_spatial_index(path)
+    assert len(index.levels) == 1
+    assert index.query((-1e9, -1e9, 1e9, 1e9)).tolist() == [i for i in range(10) if i != 5]
+
+    empty = write_spatial_index(path, write_geometry_store(path, gpd.GeoSeries([None] * 10)))
+    assert empty.query((-1e9, -1e9, 1e9, 1e9)).tolist() == []
+
+
+def test_applying_corrections_drops_the_index(tmp_path):
+    path = tmp_path / "data.geojson"
+    gpd.GeoDataFrame({"id": [0, 1]}, geometry=[Point(0, 0), Point(5, 5)], crs="EPSG:4326").to_file(
+        path, driver="GeoJSON"
+    )
+    get_spatial_index(path)
+
+    apply_correction_overrides(path, [{"action": "approve", "feature_id": 0, "geometry_wkt": "POINT (9 9)"}])
+
+    assert open_spatial_index(path) is None
+    assert get_spatial_index(path).query((8, 8, 10, 10)).tolist() == [0]
+
+
+def test_features_in_bbox_returns_intersecting_rows(tmp_path):
+    path, gdf = _dataset(tmp_path, n=200)
+    bbox = (20, 20, 40, 30)
+
+    result = features_in_bbox(path, bbox)
+
+    expected = [i for i, g in enumerate(gdf.geometry) if g is not None and g.intersects(box(*bbox))]
+    assert result.index.tolist() == expected
+    assert result["id"].tolist() == expected
+    assert result.crs == gdf.crs
@@ -0,0 +1,55 @@
+"""Tests for services.streaming_profile."""
+import numpy as np
+import pandas as pd
+import pytest
+
+from services.attribute_extractor import profile_attributes
+from services.streaming_profile import QuantileSketch, StreamingProfiler
+
+
+def _frame(n=400):
+    rng = np.random.default_rng(3)
+    height = rng.normal(20, 3, n).round(1)
+    height[[17, 230, 391]] = [250.0, -90.0, 400.0]
+    floors = pd.Series(rng.integers(1, 6, n), dtype="int64")
+    code = pd.Series([str(v) for v in rng.integers(100, 120, n)], dtype=object)
+    code[[5, 300]] = ["n/a", "unknown"]
+    street = pd.Series(rng.choice(["Main Street", "Oak Avenue", "High Road"], n), dtype=object)
+    street[[40, 41, 350]] = ["main street", "Mian Street", "  "]
+    kind = pd.Series(rng.choice(["road", "path", None], n), dtype=object)
+    return pd.DataFrame(
+        {"id": np.arange(1000, 1000 + n), "height": height, "floors": floors, "code": code,
+         "street": street, "kind": kind, "flag": rng.random(n) > 0.5, "empty": [None] * n},
+        index=pd.RangeIndex(n),
+    )
+
+
+@pytest.mark.parametrize("method", ["iqr", "mad"])
+@pytest.mark.parametrize("batch", [7, 400])
+def test_streamed_profile_equals_full_profile(method, batch):
+    frame = _frame()
+    expected = profile_attributes(frame, outlier_method=method, max_issues_per_field=2)
+
+    profiler = StreamingProfiler(outlier_method=method, max_issues_per_field=2)
+    for start in range(0, len(frame), batch):
+        profiler.add(frame.iloc[start:start + batch])
+    streamed = profiler.result()
+
+    assert streamed.fields == expected.fields
+    assert streamed.issues == expected.issues
+    assert streamed.ambiguous_fields == expected.ambiguous_fields == ["street", "kind"]
+    assert any(i["issue_type"] == "outlier" and i["feature_id"] == 1391 for i in streamed.issues)
+
+
+def test_quantile_sketch_bounds_memory_and_rank_error():
+    values = np.random.default_rng(0).permutation(200_000).astype(float)
+    sketch = QuantileSketch(capacity=1000)
+    for start in range(0, len(values), 4096):
+        sketch.add(values[start:start + 4096])
+
+    q = sketch.quantiles()
+    assert not sketch.exact and sum(len(level) for level in sketch._levels) < 10_000
+    assert (q["min"], q["max"]) == (0.0, 199_999.0)
+    for key, rank in (("q1", 0.25), ("median", 0.5), ("q3", 0.75)):
+        assert abs(q[key] - rank * 200_000) < 0.02 * 200_000
+    assert abs(sketch.count_outside(10_000, 189_999) - 20_000) < 0.02 * 200_000
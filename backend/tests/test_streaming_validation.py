@@ -0,0 +1,142 @@
+"""Tests for services.batch_reader and services.streaming_validation."""
+from unittest.mock import patch
+
+import geopandas as gpd
+import pandas as pd
+import pytest
+from shapely.geometry import Polygon
+
+from agents.geometry_agent import validate_geodataframe
+from agents.state import _issue_category_rank
+from agents.topology_agent import run as topology_run
+from services.batch_reader import count_features, iter_dataset_batches
+from services.dataset_loader import DatasetHandle
+from services import streaming_validation
+from services.streaming_validation import AttributeReservoir, iter_streaming_issues
+from services.tiled_topology import shutdown_topology_pool
+from services.working_copy import build_working_copy
+
+_SQUARE = Polygon([(0, 0), (1, 0), (1, 1), (0, 1), (0, 0)])
+_BOWTIE = Polygon([(0, 0), (1, 1), (1, 0), (0, 1), (0, 0)])
+
+
+def _dataset(tmp_path, n=23):
+    gdf = gpd.GeoDataFrame(
+        {"name": [f"f{i}" for i in range(n)], "kind": ["road" if i % 3 else "Road" for i in range(n)]},
+        geometry=[_BOWTIE if i % 5 == 0 else (None if i == 7 else _SQUARE) for i in range(n)],
+        crs="EPSG:3857",
+    )
+    path = tmp_path / "data.geojson"
+    gdf.to_file(path, driver="GeoJSON")
+    return path
+
+
+@pytest.mark.parametrize("working_copy", [False, True])
+def test_batches_cover_layer_with_global_index(tmp_path, working_copy):
+    path = _dataset(tmp_path)
+    if working_copy:
+        pytest.importorskip("pyarrow")
+        build_working_copy(path)
+    full = gpd.read_file(path)
+
+    batches = list(iter_dataset_batches(path, batch_size=10))
+
+    assert [len(b) for b in batches] == [10, 10, 3]
+    assert count_features(path) == 23
+    joined = pd.concat(batches)
+    assert list(joined.index) == list(range(23))
+    assert list(joined["name"]) == list(full["name"])
+    assert joined.crs == full.crs
+    assert joined.geometry.equals(full.geometry)
+
+
+def test_streaming_geometry_issues_match_full_read(tmp_path):
+    path = _dataset(tmp_path)
+    expected = validate_geodataframe(gpd.read_file(path))
+
+    with patch("agents.attribute_agent.validate_attributes_with_llm", return_value=[]):
+        batches = list(iter_streaming_issues(str(path), batch_size=4))
+
+    streamed = [issue.model_dump() for batch in batches[:-2] for issue in batch]
+    assert len(batches) == 8  # 6 geometry batches, then the attribute and topology batches
+    # The LLM finds nothing; the profiler reports "Road" as a variant of "road".
+    assert [(i.type, i.feature_id) for i in batches[-2]] == [("attribute_inconsistency", None)]
+    assert [(i["feature_id"], i["type"]) for i in streamed] == [(d["feature_id"], d["type"]) for d in expected]
+
+
+@pytest.mark.parametrize("tiled_min_features", [0, 5])
+def test_streaming_runs_topology_on_geometry_store(tmp_path, monkeypatch, tiled_min_features):
+    """Topology of the whole layer, serial or tiled, from the store written while streaming."""
+    path = _dataset(tmp_path)
+    serial = topology_run({"dataset": DatasetHandle(path)})["issues"]
+    monkeypatch.setattr("core.config.settings.TOPOLOGY_TILED_MIN_FEATURES", tiled_min_features)
+    monkeypatch.setattr("core.config.settings.TOPOLOGY_TILE_SIZE", 6)
+    monkeypatch.setattr("core.config.settings.TOPOLOGY_WORKERS", 2)
+
+    try:
+        with patch("agents.attribute_agent.validate_attributes_with_llm", return_value=[]), patch(
+            "services.streaming_validation._topology_issues", wraps=streaming_validation._topology_issues
+        ) as topology:
+            batches = list(iter_streaming_issues(str(path), batch_size=4))
+    finally:
+        shutdown_topology_pool()
+
+    assert (tmp_path / ".derived" / "geometry" / "current.json").exists()
+    assert topology.call_args.args[2].dtype == "int64"  # feature ids kept typed, not as objects
+    assert serial and [(i.type, i.feature_id, i.other_feature_id) for i in batches[-1]] == [
+        (i.type, i.feature_id, i.other_feature_id) for i in serial
+    ]
+
+
+def test_streaming_profiles_every_row_not_the_sample(tmp_path):
+    """Profile issues count the whole layer even though the LLM only gets the reservoir."""
+    path = tmp_path / "data.geojson"
+    gpd.GeoDataFrame(
+        {"height": [None if i % 4 == 0 else 10.0 + i % 3 for i in range(40)]},
+        geometry=[_SQUARE] * 40,
+        crs="EPSG:3857",
+    ).to_file(path, driver="GeoJSON")
+
+    with patch("agents.attribute_agent.validate_attributes_with_llm", return_value=[]):
+        batches = list(iter_streaming_issues(str(path), batch_size=6, sample_size=5))
+
+    assert [i.description for i in batches[-2]] == ["Field 'height': 10 of 40 values are missing (25.0%)"]
+
+
+def test_reservoir_caps_size_and_is_batch_size_independent():
+    frame = pd.DataFrame({"v": range(1000)})
+
+    def sample(batch):
+        reservoir = AttributeReservoir(50, seed=0)
+        for start in range(0, len(frame), batch):
+            reservoir.add(frame.iloc[start:start + batch])
+        return reservoir.frame()
+
+    small, large = sample(7), sample(400)
+    assert len(small) == 50 and small.index.is_unique
+    assert list(small.index) == list(large.index)
+    assert list(small["v"]) == list(small.index)
+    assert small.index.max() > 500  # later rows are sampled too
+
+
+def test_run_validation_streams_large_layers(tmp_path, monkeypatch):
+    from services.validation_runner import run_validation
+
+    monkeypatch.setattr("core.config.settings.OUTPUT_DIR", str(tmp_path / "out"))
+    monkeypatch.setattr("core.config.settings.VALIDATION_STREAMING_MIN_FEATURES", 10)
+    monkeypatch.setattr("core.config.settings.VALIDATION_BATCH_SIZE", 5)
+    path = _dataset(tmp_path)
+
+    with patch("services.validation_runner.validation_graph.invoke", side_effect=AssertionError("graph used")), patch(
+        "agents.attribute_agent.validate_attributes_with_llm",
+        return_value=[{"feature_id": 3, "field": "kind", "issue_type": "inconsistency", "severity": "warning", "suggestion": "use 'road'"}],
+    ):
+        result = run_validation("ds", str(path))
+
+    types = [i.type for i in result.issues]
+    assert types.count("self_intersection") == 5
+    assert "attribute_inconsistency" in types
+    # Grouped geometry -> attribute -> topology, as the in-memory workflow orders them.
+    ranks = [_issue_category_rank(i) for i in result.issues]
+    assert ranks == sorted(ranks)
+    assert len(result.corrections) == len(result.issues)
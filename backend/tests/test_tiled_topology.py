@@ -0,0 +1,159 @@
+"""Tests for services.tiled_topology (tiled, multi-process topology validation)."""
+import geopandas as gpd
+import numpy as np
+import pytest
+from shapely.geometry import LineString, Polygon, box
+
+from agents.topology_agent import run as topology_run
+from core.topology import TopologyIssueType, validate_topology
+from services.dataset_loader import DatasetHandle
+from services.geometry_store import get_geometry_store
+from services.spatial_index import get_spatial_index, hilbert_order
+from services.tiled_topology import (
+    hilbert_tiles,
+    shutdown_topology_pool,
+    tiled_topology_inputs,
+    validate_topology_tiled,
+)
+
+
+@pytest.fixture(autouse=True)
+def _two_workers(monkeypatch):
+    monkeypatch.setattr("core.config.settings.TOPOLOGY_WORKERS", 2)
+    yield
+    shutdown_topology_pool()
+
+
+def _mixed_layer(n: int = 160, seed: int = 3) -> gpd.GeoDataFrame:
+    """Random overlapping squares (with a few holes) plus short random lines."""
+    rng = np.random.default_rng(seed)
+    geoms = []
+    for _ in range(n):
+        x, y = rng.uniform(0, 100, 2)
+        s = rng.uniform(1, 6)
+        geoms.append(box(x, y, x + s, y + s))
+    # A ring of four boxes around an uncovered square: one gap spanning several tiles.
+    geoms += [box(200, 200, 206, 202), box(200, 204, 206, 206), box(200, 202, 202, 204), box(204, 202, 206, 204)]
+    for _ in range(n // 2):
+        x, y = rng.uniform(0, 100, 2)
+        dx, dy = rng.uniform(-5, 5, 2)
+        geoms.append(LineString([(x, y), (x + dx, y + dy)]))
+    geoms += [None, Polygon()]
+    return gpd.GeoDataFrame({"id": [f"f{i}" for i in range(len(geoms))]}, geometry=geoms)
+
+
+def _write(tmp_path, gdf):
+    path = tmp_path / "layer.geojson"
+    gdf.to_file(path, driver="GeoJSON")
+    return path
+
+
+def _prepared(tmp_path, gdf):
+    """Geometry store and spatial index for gdf written as a dataset."""
+    path = _write(tmp_path, gdf)
+    store = get_geometry_store(path, gdf)
+    return store, get_spatial_index(path, store=store)
+
+
+def _gaps_last_sorted(issues):
+    """Serial gap order follows the union's internal order; compare gaps by location."""
+    gaps = sorted((i for i in issues if i["type"] == TopologyIssueType.GAP), key=lambda i: i["location"])
+    return [i for i in issues if i["type"] != TopologyIssueType.GAP] + gaps
+
+
+def _assert_same(tiled, serial):
+    tiled, serial = _gaps_last_sorted(tiled), _gaps_last_sorted(serial)
+    assert [(i["type"], i["feature_id"], i["other_feature_id"]) for i in tiled] == [
+        (i["type"], i["feature_id"], i["other_feature_id"]) for i in serial
+    ]
+    for a, b in zip(tiled, serial):
+        assert a["description"] == b["description"]
+        assert a["location"] == pytest.approx(b["location"])
+
+
+def test_hilbert_tiles_partition_every_located_feature():
+    gdf = _mixed_layer()
+    bounds = gdf.geometry.bounds.to_numpy()
+    tiles = hilbert_tiles(hilbert_order(bounds), tile_size=17, min_tiles=4)
+
+    positions = np.concatenate(tiles)
+    assert len(tiles) >= 4
+    assert sorted(positions.tolist()) == [i for i in range(len(gdf)) if not np.isnan(bounds[i]).any()]
+    assert max(len(t) for t in tiles) - min(len(t) for t in tiles) <= 1
+
+
+def test_tiled_matches_serial_topology(tmp_path):
+    gdf = _mixed_layer()
+    store, index = _prepared(tmp_path, gdf)
+
+    tiled = validate_topology_tiled(gdf, store, index, tile_size=13)
+    serial = validate_topology(gdf)
+
+    assert any(i["type"] == TopologyIssueType.OVERLAP for i in serial)
+    assert any(i["type"] == TopologyIssueType.DANGLE for i in serial)
+    assert any(i["type"] == TopologyIssueType.GAP for i in serial)
+    _assert_same(tiled, serial)
+
+
+def test_overlap_across_tiles_reported_once(tmp_path):
+    # Far-apart clusters force the two halves of the overlapping pair into different tiles.
+    geoms = [box(0, 0, 2, 2), box(1, 1, 3, 3)] + [box(1000 + i * 10, 0, 1001 + i * 10, 1) for i in range(6)]
+    gdf = gpd.GeoDataFrame({"id": list(range(len(geoms)))}, geometry=geoms)
+    store, index = _prepared(tmp_path, gdf)
+
+    issues = validate_topology_tiled(gdf, store, index, check_gaps=False, check_connectivity=False, tile_size=1)
+
+    assert [(i["feature_id"], i["other_feature_id"]) for i in issues] == [(0, 1)]
+
+
+def _ring(x, y):
+    """Four boxes enclosing the uncovered square (x + 2, y + 2)-(x + 4, y + 4)."""
+    return [box(x, y, x + 6, y + 2), box(x, y + 4, x + 6, y + 6), box(x, y + 2, x + 2, y + 4), box(x + 4, y + 2, x + 6, y + 4)]
+
+
+@pytest.mark.parametrize("tile_size", [1, 4])
+def test_gaps_stitched_across_and_within_tiles(tmp_path, tile_size):
+    # tile_size=1: every ring is split over four tiles and only appears after the merge.
+    # tile_size=4: each ring is one tile far from the others, so its hole is found in the worker.
+    geoms = _ring(0, 0) + _ring(100, 0) + _ring(0, 100)
+    gdf = gpd.GeoDataFrame({"id": list(range(len(geoms)))}, geometry=geoms)
+    store, index = _prepared(tmp_path, gdf)
+
+    issues = validate_topology_tiled(
+        gdf, store, index, check_overlaps=False, check_connectivity=False, tile_size=tile_size
+    )
+
+    assert [i["location"] for i in issues] == [[3.0, 3.0], [3.0, 103.0], [103.0, 3.0]]
+    assert [i["bordering_feature_ids"] for i in issues] == [[0, 1, 2, 3], [8, 9, 10, 11], [4, 5, 6, 7]]
+    assert [i["area"] for i in issues] == [4.0, 4.0, 4.0]
+    large_only = validate_topology_tiled(
+        gdf, store, index, check_overlaps=False, check_connectivity=False, min_gap_area=5.0, tile_size=tile_size
+    )
+    assert large_only == []
+
+
+def test_tiled_inputs_only_above_threshold(tmp_path, monkeypatch):
+    gdf = _mixed_layer(n=20)
+    path = _write(tmp_path, gdf)
+
+    monkeypatch.setattr("core.config.settings.TOPOLOGY_TILED_MIN_FEATURES", 0)
+    assert tiled_topology_inputs(path, gdf) is None
+    monkeypatch.setattr("core.config.settings.TOPOLOGY_TILED_MIN_FEATURES", len(gdf) + 1)
+    assert tiled_topology_inputs(path, gdf) is None
+    monkeypatch.setattr("core.config.settings.TOPOLOGY_TILED_MIN_FEATURES", len(gdf))
+    store, index = tiled_topology_inputs(path, gdf)
+    assert store.count == index.count == len(gdf)
+
+
+def test_topology_agent_uses_tiled_engine_for_large_layers(tmp_path, monkeypatch):
+    gdf = _mixed_layer(n=60)
+    path = _write(tmp_path, gdf)
+    serial = topology_run({"dataset": DatasetHandle(path)})["issues"]
+
+    monkeypatch.setattr("core.config.settings.TOPOLOGY_TILED_MIN_FEATURES", 1)
+    monkeypatch.setattr("core.config.settings.TOPOLOGY_TILE_SIZE", 10)
+    tiled = topology_run({"dataset": DatasetHandle(path)})["issues"]
+
+    assert (tmp_path / ".derived" / "geometry" / "current.json").exists()
+    assert (tmp_path / ".derived" / "spatial_index" / "current.json").exists()
+    assert sorted((i.type, str(i.feature_id)) for i in tiled) == sorted((i.type, str(i.feature_id)) for i in serial)
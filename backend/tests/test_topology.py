@@ -124,3 +124,100 @@ def test_validate_topology_issue_structure():
         assert "location" in issue
         assert "description" in issue
         assert issue["type"].startswith("topology_")
+
+
+def test_validate_topology_overlaps_match_pairwise_check():
+    """Indexed overlap detection reports exactly the pairs a brute-force check finds, in order."""
+    from shapely.geometry import box
+
+    polys = [box(i * 0.8, (i % 3) * 0.5, i * 0.8 + 1, (i % 3) * 0.5 + 1) for i in range(30)]
+    gdf = gpd.GeoDataFrame({"id": [100 + i for i in range(30)]}, geometry=polys)
+
+    expected = [
+        (100 + i, 100 + j)
+        for i in range(30)
+        for j in range(i + 1, 30)
+        if polys[i].intersection(polys[j]).area > 0
+    ]
+    issues = validate_topology(gdf, check_gaps=False, check_connectivity=False)
+    assert [(i["feature_id"], i["other_feature_id"]) for i in issues] == expected
+
+
+def test_validate_topology_t_junction_and_multiline_endpoints():
+    """An endpoint on another line's interior is connected; each MultiLineString part has endpoints."""
+    from shapely.geometry import MultiLineString
+
+    gdf = gpd.GeoDataFrame(
+        {"id": [1, 2, 3]},
+        geometry=[
+            LineString([(0, 0), (2, 0)]),
+            LineString([(1, 0), (1, 1)]),  # starts on the interior of feature 1
+            MultiLineString([[(5, 5), (6, 5)], [(6, 5), (7, 5)]]),
+        ],
+    )
+    issues = validate_topology(gdf, check_gaps=False, check_overlaps=False)
+    dangles = [(i["feature_id"], i["location"]) for i in issues if i["type"] == TopologyIssueType.DANGLE]
+    assert (2, [1.0, 0.0]) not in dangles
+    assert (2, [1.0, 1.0]) in dangles
+    assert [loc for fid, loc in dangles if fid == 3] == [[5.0, 5.0], [6.0, 5.0], [6.0, 5.0], [7.0, 5.0]]
+
+
+def _ring_coverage():
+    """Four parcels around an uncovered 2x2 square, plus a 0.1x1 sliver enclosed by four more."""
+    from shapely.geometry import box
+
+    return gpd.GeoDataFrame(
+        {"id": ["n", "s", "w", "e", "a", "b", "c", "d"]},
+        geometry=[
+            box(0, 4, 6, 6), box(0, 0, 6, 2), box(0, 2, 2, 4), box(4, 2, 6, 4),
+            box(10, 0, 11, 1), box(11.1, 0, 12, 1), box(10, 1, 12, 2), box(10, -1, 12, 0),
+        ],
+    )
+
+
+def test_gaps_report_area_and_bordering_features():
+    """Each hole carries its area and the ids of the features around it."""
+    issues = validate_topology(_ring_coverage(), check_overlaps=False, check_connectivity=False)
+    gaps = sorted(issues, key=lambda i: i["area"], reverse=True)
+
+    assert [g["area"] for g in gaps] == pytest.approx([4.0, 0.1])
+    assert gaps[0]["location"] == pytest.approx([3.0, 3.0])
+    assert gaps[0]["bordering_feature_ids"] == ["n", "s", "w", "e"]
+    assert gaps[0]["description"] == "Gap in polygon coverage (area 4) bordered by features n, s, w, e"
+    assert gaps[1]["bordering_feature_ids"] == ["a", "b", "c", "d"]
+
+
+def test_min_gap_area_skips_slivers():
+    issues = validate_topology(_ring_coverage(), check_overlaps=False, check_connectivity=False, min_gap_area=0.5)
+    assert [i["area"] for i in issues] == pytest.approx([4.0])
+
+
+def test_gaps_same_for_coverage_and_overlapping_input():
+    """A valid coverage goes through coverage_union_all; an overlap forces union_all. Same holes."""
+    from shapely.geometry import box
+
+    coverage = _ring_coverage()
+    overlapping = gpd.GeoDataFrame(
+        {"id": [*coverage["id"], "x"]}, geometry=[*coverage.geometry, box(0, 0, 1, 1)]
+    )
+    gaps = lambda gdf: sorted(
+        (tuple(i["location"]), i["area"])
+        for i in validate_topology(gdf, check_overlaps=False, check_connectivity=False)
+    )
+    assert gaps(coverage) == pytest.approx(gaps(overlapping))
+
+
+def test_gap_union_failure_is_logged(monkeypatch, caplog):
+    import shapely
+
+    import core.topology as topology
+
+    def fail(polygons):
+        raise shapely.errors.GEOSException("TopologyException: side location conflict")
+
+    monkeypatch.setattr(topology, "_coverage_union", fail)
+    with caplog.at_level("WARNING", logger="core.topology"):
+        issues = validate_topology(_ring_coverage(), check_overlaps=False, check_connectivity=False)
+
+    assert issues == []
+    assert "Gap detection failed" in caplog.text
@@ -66,10 +66,11 @@ def test_run_with_invalid_path_returns_existing_issues():
     assert result["issues"] == []
 
 
-def test_run_preserves_existing_issues(tmp_path):
-    """New topology issues are appended to existing geometry/attribute issues."""
+def test_run_returns_only_new_issues(tmp_path):
+    """The agent returns only topology issues; the state reducer appends them to existing ones."""
     path = _minimal_geojson_path(tmp_path)
     from api.models import GeometryIssue
+    from agents.state import merge_issues
 
     existing = [
         GeometryIssue(
@@ -93,11 +94,12 @@ def test_run_preserves_existing_issues(tmp_path):
     with patch("agents.topology_agent.validate_topology", return_value=mock_violations):
         result = topology_agent_run(state)
 
-    assert len(result["issues"]) == 2
-    assert result["issues"][0].feature_id == 99
-    assert result["issues"][0].type == "empty_geometry"
-    assert result["issues"][1].feature_id == 0
-    assert result["issues"][1].type == "topology_gap"
+    assert len(result["issues"]) == 1
+    assert result["issues"][0].feature_id == 0
+    assert result["issues"][0].type == "topology_gap"
+
+    merged = merge_issues(existing, result["issues"])
+    assert [i.feature_id for i in merged] == [99, 0]
 
 
 def test_run_with_real_overlap(tmp_path):
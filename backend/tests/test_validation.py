@@ -94,3 +94,16 @@ def test_agent_validate_file():
     assert isinstance(issues, list)
     for i in issues:
         assert "feature_id" in i and "type" in i and "severity" in i
+
+
+def test_validate_geometries_matches_per_feature_checks():
+    """Column-wise validation yields the same issues, in order, as _check_geometry per feature."""
+    bowtie = Polygon([(0, 0), (2, 2), (2, 0), (0, 2), (0, 0)])
+    geoms = [Point(0, 0), None, bowtie, Polygon(), Point(1, 1), bowtie]
+    gdf = gpd.GeoDataFrame({"id": [f"f{i}" for i in range(len(geoms))]}, geometry=geoms)
+
+    expected = []
+    for i, geom in enumerate(geoms):
+        expected.extend(_check_geometry(geom, feature_id=f"f{i}"))
+
+    assert validate_geometries(gdf) == expected
@@ -0,0 +1,167 @@
+"""Tests for services.validation_runner (validation off the event loop)."""
+import asyncio
+import threading
+from unittest.mock import patch
+
+import httpx
+import pytest
+
+from main import app
+from services import validation_runner
+from services.validation_runner import run_validation_async
+
+
+def _fake_invoke_recording_thread(seen):
+    def _invoke(state):
+        seen.append(threading.current_thread().name)
+        return {"issues": [], "corrections": []}
+
+    return _invoke
+
+
+def test_run_validation_async_uses_worker_pool(tmp_path, monkeypatch):
+    """The graph runs on a 'validation' worker thread, not the event loop thread."""
+    monkeypatch.setattr("core.config.settings.OUTPUT_DIR", str(tmp_path / "outputs"))
+    path = tmp_path / "data.geojson"
+    path.write_text('{"type":"FeatureCollection","features":[]}')
+    seen = []
+    with patch.object(validation_runner.validation_graph, "invoke", side_effect=_fake_invoke_recording_thread(seen)):
+        result = asyncio.run(run_validation_async("ds", str(path)))
+
+    assert result.dataset_id == "ds"
+    assert result.issues == []
+    assert result.corrections is None
+    assert seen and seen[0].startswith("validation")
+
+
+def test_job_endpoints_use_job_store_off_event_loop(tmp_path, monkeypatch):
+    """Submitting and polling a job touch SQLite (and purge expired jobs) on executor threads."""
+    from services.job_store import ValidationJobStore
+
+    monkeypatch.setattr("core.config.settings.UPLOAD_DIR", str(tmp_path))
+    monkeypatch.setattr("core.config.settings.OUTPUT_DIR", str(tmp_path / "outputs"))
+    (tmp_path / "ds").mkdir()
+    (tmp_path / "ds" / "data.geojson").write_text('{"type":"FeatureCollection","features":[]}')
+    seen = []
+    for name in ("purge_expired", "create", "get"):
+        method = getattr(ValidationJobStore, name)
+
+        def recording(self, *args, _method=method, _name=name, **kwargs):
+            seen.append((_name, threading.current_thread() is threading.main_thread()))
+            return _method(self, *args, **kwargs)
+
+        monkeypatch.setattr(ValidationJobStore, name, recording)
+
+    async def _scenario():
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as ac:
+            job = (await ac.post("/api/v1/validate/async", json={"dataset_id": "ds"})).json()
+            return await ac.get(f"/api/v1/validate/jobs/{job['job_id']}")
+
+    with patch.object(validation_runner.validation_graph, "invoke", return_value={"issues": [], "corrections": []}):
+        poll = asyncio.run(_scenario())
+
+    assert poll.status_code == 200
+    assert [n for n, _ in seen][:3] == ["purge_expired", "create", "get"]
+    assert not any(on_loop for _, on_loop in seen)
+
+
+def test_health_responds_while_validation_runs(tmp_path, monkeypatch):
+    """A blocked validation run does not stall other requests on the event loop."""
+    monkeypatch.setattr("core.config.settings.UPLOAD_DIR", str(tmp_path))
+    monkeypatch.setattr("core.config.settings.OUTPUT_DIR", str(tmp_path / "outputs"))
+    (tmp_path / "ds").mkdir()
+    (tmp_path / "ds" / "data.geojson").write_text('{"type":"FeatureCollection","features":[]}')
+
+    release = threading.Event()
+    started = threading.Event()
+
+    def _slow_invoke(state):
+        started.set()
+        release.wait(timeout=10)
+        return {"issues": [], "corrections": []}
+
+    async def _scenario():
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as ac:
+            validate = asyncio.create_task(ac.post("/api/v1/validate", json={"dataset_id": "ds"}))
+            while not started.is_set():
+                await asyncio.sleep(0.01)
+            health = await asyncio.wait_for(ac.get("/health"), timeout=5)
+            still_running = not validate.done()
+            release.set()
+            return health, still_running, await validate
+
+    with patch.object(validation_runner.validation_graph, "invoke", side_effect=_slow_invoke):
+        health, still_running, validate = asyncio.run(_scenario())
+
+    assert health.status_code == 200
+    assert still_running
+    assert validate.status_code == 200
+
+
+def test_get_validation_results_served_from_cache(client, tmp_path, monkeypatch):
+    """Repeated GET /validate/{id} runs the workflow once; a correction invalidates the cache."""
+    import geopandas as gpd
+    from shapely.geometry import Point
+
+    monkeypatch.setattr("core.config.settings.UPLOAD_DIR", str(tmp_path / "uploads"))
+    monkeypatch.setattr("core.config.settings.OUTPUT_DIR", str(tmp_path / "outputs"))
+    dataset_dir = tmp_path / "uploads" / "ds"
+    dataset_dir.mkdir(parents=True)
+    gpd.GeoDataFrame({"id": [0]}, geometry=[Point(0, 0)], crs="EPSG:4326").to_file(
+        dataset_dir / "data.geojson", driver="GeoJSON"
+    )
+
+    calls = []
+
+    def _invoke(state):
+        calls.append(state["dataset_id"])
+        return {"issues": [], "corrections": []}
+
+    with patch.object(validation_runner.validation_graph, "invoke", side_effect=_invoke):
+        assert client.get("/api/v1/validate/ds").status_code == 200
+        assert client.get("/api/v1/validate/ds").status_code == 200
+        assert len(calls) == 1
+
+        response = client.post(
+            "/api/v1/corrections/apply",
+            json={
+                "dataset_id": "ds",
+                "corrections": [
+                    {"issue_index": 0, "action": "approve", "feature_id": 0, "geometry_wkt": "POINT (1 1)"}
+                ],
+            },
+        )
+        assert response.status_code == 200
+        assert client.get("/api/v1/validate/ds").status_code == 200
+        assert len(calls) == 2
+
+
+@pytest.mark.parametrize(
+    "setting, value",
+    [
+        ("RECOMMENDATION_MAX_PROMPT_TOKENS", 1234),
+        ("TOPOLOGY_TILED_MIN_FEATURES", 7),
+        ("TOPOLOGY_TILE_SIZE", 3),
+    ],
+)
+def test_validation_cache_key_covers_settings(tmp_path, monkeypatch, setting, value):
+    from services.result_cache import validation_cache_key
+
+    path = tmp_path / "data.geojson"
+    path.write_text('{"type": "FeatureCollection", "features": []}', encoding="utf-8")
+    before = validation_cache_key(path)
+    monkeypatch.setattr(f"core.config.settings.{setting}", value)
+    assert validation_cache_key(path) != before
+
+
+def test_validation_cache_key_covers_tokenizer(tmp_path, monkeypatch):
+    from services import result_cache
+
+    path = tmp_path / "data.geojson"
+    path.write_text('{"type": "FeatureCollection", "features": []}', encoding="utf-8")
+    monkeypatch.setattr(result_cache, "get_tokenizer", lambda model=None: None)
+    estimated = result_cache.validation_cache_key(path)
+    monkeypatch.setattr(result_cache, "get_tokenizer", lambda model=None: object())
+    assert result_cache.validation_cache_key(path) != estimated
@@ -0,0 +1,61 @@
+"""Tests for services.vector_metadata (header-only upload metadata)."""
+from unittest.mock import patch
+
+import geopandas as gpd
+import pytest
+from shapely.geometry import LineString, MultiPolygon, Point, Polygon
+
+from services.geojson_parser import parse_geojson_metadata
+from services.shapefile_parser import parse_shapefile_metadata
+from services.vector_metadata import read_vector_metadata, read_vector_metadata_full
+
+_TRI = Polygon([(0, 0), (1, 0), (1, 1), (0, 0)])
+_MULTI = MultiPolygon([Polygon([(2, 2), (3, 2), (3, 3), (2, 2)])])
+
+
+@pytest.mark.parametrize(
+    "geoms",
+    [
+        [_TRI, _TRI],
+        [_TRI, _MULTI],
+        [Point(0, 0), LineString([(0, 0), (1, 1)])],
+        [_TRI, None],
+        [],
+    ],
+    ids=["polygons", "mixed-multi", "point-line", "with-null", "empty"],
+)
+def test_geojson_metadata_matches_full_read(tmp_path, geoms):
+    path = tmp_path / "data.geojson"
+    gpd.GeoDataFrame({"id": list(range(len(geoms)))}, geometry=geoms, crs="EPSG:4326").to_file(path, driver="GeoJSON")
+    assert read_vector_metadata(path) == read_vector_metadata_full(path)
+
+
+def test_parsers_do_not_build_geodataframe(tmp_path):
+    """Upload metadata is read from headers; gpd.read_file is never called."""
+    gdf = gpd.GeoDataFrame({"id": [1, 2]}, geometry=[_TRI, _MULTI], crs="EPSG:3857")
+    gdf.to_file(tmp_path / "data.geojson", driver="GeoJSON")
+    shp_dir = tmp_path / "shp"
+    shp_dir.mkdir()
+    gdf.to_file(shp_dir / "data.shp")
+
+    with patch("services.vector_metadata.gpd.read_file", side_effect=AssertionError("full read")):
+        geojson_meta = parse_geojson_metadata(tmp_path / "data.geojson")
+        shp_meta = parse_shapefile_metadata(shp_dir)
+
+    assert geojson_meta == {
+        "feature_count": 2,
+        "geometry_type": "MultiPolygon,Polygon",
+        "crs": "EPSG:3857",
+        "bounds": [0.0, 0.0, 3.0, 3.0],
+    }
+    assert shp_meta["feature_count"] == 2
+    assert shp_meta["geometry_type"] == "Polygon"
+    assert shp_meta["crs"] == "EPSG:3857"
+    assert shp_meta["bounds"] == [0.0, 0.0, 3.0, 3.0]
+
+
+def test_unreadable_file_returns_none(tmp_path):
+    path = tmp_path / "bad.geojson"
+    path.write_text("not geojson", encoding="utf-8")
+    assert parse_geojson_metadata(path) is None
+    assert parse_geojson_metadata(tmp_path / "missing.geojson") is None
@@ -0,0 +1,106 @@
+"""Tests for services.working_copy (GeoParquet working copy + column projection)."""
+from unittest.mock import patch
+
+import geopandas as gpd
+import pandas as pd
+import pytest
+from shapely.geometry import Polygon
+
+from agents.orchestrator import validation_graph
+from agents.state import empty_state
+from services.correction_applier import apply_correction_overrides
+from services.working_copy import build_working_copy, get_working_copy_path, read_dataset, read_dataset_rows
+
+pytest.importorskip("pyarrow")
+
+
+def _write_dataset(tmp_path):
+    gdf = gpd.GeoDataFrame(
+        {"id": [1, 2], "name": ["A", "B"], "kind": ["road", "rd"]},
+        geometry=[
+            Polygon([(0, 0), (2, 0), (2, 2), (0, 2), (0, 0)]),
+            Polygon([(1, 1), (3, 1), (3, 3), (1, 3), (1, 1)]),
+        ],
+        crs="EPSG:4326",
+    )
+    path = tmp_path / "data.geojson"
+    gdf.to_file(path, driver="GeoJSON")
+    return path
+
+
+def test_build_working_copy_round_trips(tmp_path):
+    path = _write_dataset(tmp_path)
+    copy_path = build_working_copy(path)
+
+    assert copy_path is not None and copy_path.parent.name == ".derived"
+    assert get_working_copy_path(path) == copy_path
+    with patch("services.working_copy.gpd.read_file", side_effect=AssertionError("original re-parsed")):
+        from_copy = read_dataset(path)
+    pd.testing.assert_frame_equal(from_copy, gpd.read_file(path))
+    assert from_copy.crs == "EPSG:4326"
+
+
+def test_read_dataset_projects_columns(tmp_path):
+    path = _write_dataset(tmp_path)
+    build_working_copy(path)
+
+    geoms = read_dataset(path, columns=["id", "missing"])
+    assert list(geoms.columns) == ["id", "geometry"]
+    assert isinstance(geoms, gpd.GeoDataFrame)
+
+    attrs = read_dataset(path, geometry=False)
+    assert list(attrs.columns) == ["id", "name", "kind"]
+    assert not isinstance(attrs, gpd.GeoDataFrame)
+
+
+def test_working_copy_goes_stale_when_original_changes(tmp_path):
+    path = _write_dataset(tmp_path)
+    build_working_copy(path)
+
+    mutated = apply_correction_overrides(
+        path, [{"action": "approve", "feature_id": 1, "attributes": {"name": "Main"}}]
+    )
+    assert mutated == 1
+    assert get_working_copy_path(path) is None
+
+    reread = read_dataset(path)
+    assert reread.loc[0, "name"] == "Main"
+    assert get_working_copy_path(path) is not None
+
+
+def test_validation_graph_reads_projections_from_working_copy(tmp_path):
+    """With a working copy the agents never parse the original and results are unchanged."""
+    path = _write_dataset(tmp_path)
+    with patch("agents.attribute_agent.validate_attributes_with_llm", return_value=[]):
+        expected = validation_graph.invoke(empty_state("ds", str(path)))
+        build_working_copy(path)
+        with patch("services.working_copy.gpd.read_file", side_effect=AssertionError("original re-parsed")):
+            actual = validation_graph.invoke(empty_state("ds", str(path)))
+
+    assert actual["issues"] == expected["issues"]
+    assert actual["corrections"] == expected["corrections"]
+
+
+@pytest.mark.parametrize("working_copy", [False, True])
+def test_read_dataset_rows_reads_only_the_given_positions(tmp_path, working_copy):
+    gdf = gpd.GeoDataFrame(
+        {"id": range(50), "name": [f"n{i}" for i in range(50)]},
+        geometry=[Polygon([(i, 0), (i + 1, 0), (i + 1, 1), (i, 0)]) for i in range(50)],
+        crs="EPSG:4326",
+    )
+    path = tmp_path / "data.geojson"
+    gdf.to_file(path, driver="GeoJSON")
+    if working_copy:
+        # Several row groups, of which only those holding the positions are decoded.
+        gdf.to_parquet(build_working_copy(path), row_group_size=8)
+
+    # With a working copy the original is not touched; without one it is never read whole.
+    reader = "pyogrio.read_dataframe" if working_copy else "gpd.read_file"
+    with patch(f"services.working_copy.{reader}", side_effect=AssertionError("unexpected read")):
+        rows = read_dataset_rows(path, [41, 3, 17, 18], columns=["name"])
+        empty = read_dataset_rows(path, [])
+
+    assert rows.index.tolist() == [41, 3, 17, 18]
+    assert rows.columns.tolist() == ["name"]
+    assert rows["name"].tolist() == ["n41", "n3", "n17", "n18"]
+    assert empty.empty and "name" in empty.columns
@@ -153,7 +153,11 @@ export function QualityReport({ payload }: QualityReportProps) {
               </div>
               <div>
                 <dt>Records in LLM prompt</dt>
-                <dd>{validation_config.attribute_max_records_in_prompt}</dd>
+                <dd>{validation_config.attribute_max_records_in_prompt || "No cap"}</dd>
+              </div>
+              <div>
+                <dt>LLM prompt token budget</dt>
+                <dd>{validation_config.attribute_max_prompt_tokens || "None"}</dd>
               </div>
               <div>
                 <dt>LLM model</dt>
@@ -6,6 +6,10 @@ export type GeometryIssue = {
   severity: string;
   location?: number[] | null;
   description?: string | null;
+  /** Second feature of a topology_overlap pair. */
+  other_feature_id?: unknown;
+  /** Features bordering a topology_gap. */
+  bordering_feature_ids?: unknown[] | null;
 };
 
 export type ValidationResult = {
@@ -30,6 +34,8 @@ export type ValidationConfigResponse = {
   geometry_validation_enabled: boolean;
   attribute_sample_size: number;
   attribute_max_records_in_prompt: number;
+  /** Input-token budget of the attribute prompt (0 = none). */
+  attribute_max_prompt_tokens?: number;
   openai_model: string;
   topology_checks: {
     gaps: boolean;
@@ -54,7 +54,10 @@ export function renderReportMarkdown(payload: QualityReportPayload): string {
     );
     lines.push(`| Attribute sample size | ${validation_config.attribute_sample_size} |`);
     lines.push(
-      `| Records in LLM prompt | ${validation_config.attribute_max_records_in_prompt} |`,
+      `| Records in LLM prompt | ${validation_config.attribute_max_records_in_prompt || "no cap"} |`,
+    );
+    lines.push(
+      `| LLM prompt token budget | ${validation_config.attribute_max_prompt_tokens || "none"} |`,
     );
     lines.push(`| LLM model | ${validation_config.openai_model} |`);
     const tc = validation_config.topology_checks;
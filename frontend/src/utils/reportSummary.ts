@@ -78,7 +78,8 @@ const DEFAULT_VALIDATION_CONFIG: ValidationConfigResponse = {
   ],
   geometry_validation_enabled: true,
   attribute_sample_size: 500,
-  attribute_max_records_in_prompt: 10,
+  attribute_max_records_in_prompt: 0,
+  attribute_max_prompt_tokens: 6000,
   openai_model: "gpt-4o-mini",
   topology_checks: { gaps: true, overlaps: true, connectivity: true },
 };